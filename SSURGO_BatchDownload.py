@@ -67,6 +67,46 @@
 # ID604, ID670, WA651
 #
 # 2021-11-22 Remove renaming of the WSS unzipped folder - Adolfo Diaz
+#
+# 2026-10-17 Added optional concurrent download mode (parameter 7, maximum concurrent downloads).
+#            A pool of worker threads downloads the zip files and puts them on a bounded queue.
+#            The main thread unzips and imports each survey as its download finishes, so the
+#            tabular imports overlap the network wait. GetDownload split into DownloadZip and UnzipDownload.
+# 2026-10-17 Downloads are written in chunks to a '.part' file and resumed with an HTTP Range
+#            request after a dropped connection. Retries use exponential backoff instead of
+#            fixed sleeps. The finished zip file is checked (size and CRC) before it is unzipped.
+# 2026-10-17 Added optional zip file cache (parameter 8, cache folder and parameter 9, cache size in GB).
+#            Cached zip files are named by areasymbol and SAVEREST date. When the cache is larger
+#            than the size limit, the least recently used zip files are deleted.
+# 2026-10-17 Added optional streaming tabular import (parameter 10). The tabular text files are
+#            read directly from the zip file by ImportTabular; only the spatial and metadata
+#            files are extracted.
+# 2026-10-17 Tabular import now uses a batched import (ImportTextBatched). Values are converted in blocks
+#            using per-column converters built from the mdstattabcols table and written through a
+#            pluggable row writer. Rows/sec for each table are reported at the end.
+# 2026-10-17 The concurrent download mode is now a staged pipeline (ProcessSurveysPipeline):
+#            download -> unzip -> tabular import -> metadata, with a bounded queue between the
+#            stages. Added parameter 11, number of unzip threads. Busy and blocked time for
+#            each stage is reported at the end so that the thread counts can be tuned.
+# 2026-10-17 Added optional metadata-only date check (parameter 12). The current SAVEREST dates are read
+#            from Soil Data Access in one batched query ('SDA') or from a local catalog snapshot file and
+#            compared with the local copies. Only surveys that are missing or out of date are downloaded.
+#
+# 2026-10-17 Parameters 7-12 have not been added to the three download tools in the Soil Data Development
+#            Toolbox yet. Until they are, the tools run with the defaults below (one download, no cache,
+#            extracted tabular files, one unzip thread, no date check). To turn them on, open the
+#            Properties of each tool that uses this script and append these parameters, in this
+#            order, after parameter 6 (all Optional, Input):
+#
+#            7  Maximum concurrent downloads      Long            default 1
+#            8  Zip file cache folder             Folder          default none (no cache)
+#            9  Zip file cache size (GB)          Double          default 10
+#            10 Stream tabular import from zip    Boolean         default False (needs parameter 4)
+#            11 Number of unzip threads           Long            default 1
+#            12 Survey catalog for date check     String          'SDA', a catalog file path, or blank
+#
+#            When the script is run from the command line, the same values are passed as positional
+#            arguments after the first seven, using '#' for any value that should keep its default.
 ## ===================================================================================
 class MyError(Exception):
     pass
@@ -320,6 +360,181 @@ def GetTabularDate(newFolder):
         #errorMsg()
         return tabDate
 
+## ===================================================================================
+def GetCatalogDates(catalogSource, asList):
+    # Get the current SAVEREST date for each of the requested survey areas without downloading
+    # anything. catalogSource is either 'SDA', which sends one batched query for all of the
+    # areasymbols to Soil Data Access, or the path to a local catalog snapshot file.
+    #
+    # Returns a dictionary with AREASYMBOL as key and YYYYMMDD as integer value (None on failure)
+
+    try:
+        if catalogSource.upper() == "SDA":
+            return GetCatalogDatesSDA(asList)
+
+        elif os.path.isfile(catalogSource):
+            return GetCatalogDatesFile(catalogSource)
+
+        else:
+            raise MyError, "Survey catalog file (" + catalogSource + ") not found"
+
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return None
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def GetCatalogDatesSDA(asList):
+    # Query the SACATALOG table in Soil Data Access for the SAVEREST dates of all of the
+    # listed areasymbols using a single POST REST request.
+    #
+    # Returns a dictionary with AREASYMBOL as key and YYYYMMDD as integer value
+
+    dDates = dict()
+    sQuery = "SELECT areasymbol, CONVERT(varchar(8), saverest, 112) AS saverest FROM sacatalog WHERE areasymbol IN (" + ", ".join(["'" + areaSym + "'" for areaSym in asList]) + ")"
+
+    PrintMsg(" \nGetting survey dates for " + Number_Format(len(asList), 0, True) + " survey areas from Soil Data Access...", 0)
+    url = "https://sdmdataaccess.sc.egov.usda.gov/Tabular/SDMTabularService/post.rest"
+    dRequest = dict()
+    dRequest["format"] = "JSON"
+    dRequest["query"] = sQuery
+    jData = json.dumps(dRequest)
+
+    # Send request to SDA Tabular service
+    req = urllib2.Request(url, jData)
+    resp = urllib2.urlopen(req, timeout=60)
+    data = json.loads(resp.read())
+    resp.close()
+
+    if not "Table" in data:
+        raise MyError, "Soil Data Access query failed to return survey dates"
+
+    for rec in data["Table"]:
+        # Data as a list of lists. Service returns everything as string.
+        dDates[rec[0].upper()] = int(rec[1])
+
+    return dDates
+
+## ===================================================================================
+def GetCatalogDatesFile(catalogFile):
+    # Read SAVEREST dates from a local catalog snapshot. Each line must start with the areasymbol
+    # and the date, either as a csv file (AREASYMBOL,YYYY-MM-DD) or in the pipe-delimited
+    # sacatlog.txt format, where the date is the 4th value (ex. 02/01/2018 15:54:22).
+    # Lines without a valid date, such as a header line, are skipped.
+    #
+    # Returns a dictionary with AREASYMBOL as key and YYYYMMDD as integer value
+
+    dDates = dict()
+    dateFormats = ["%Y-%m-%d", "%Y%m%d", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S"]
+    PrintMsg(" \nGetting survey dates from " + catalogFile + "...", 0)
+    fh = open(catalogFile, "rb")
+
+    try:
+        for rec in fh:
+            if rec.find("|") > -1:
+                vals = [val.strip().strip('"') for val in rec.split("|")]
+                vals = [vals[0], vals[3]] if len(vals) > 3 else []
+
+            else:
+                vals = [val.strip().strip('"') for val in rec.split(",")]
+
+            if len(vals) < 2:
+                continue
+
+            for dateFormat in dateFormats:
+                try:
+                    dDates[vals[0].upper()] = int(datetime.strptime(vals[1], dateFormat).strftime("%Y%m%d"))
+                    break
+
+                except ValueError:
+                    pass
+
+    finally:
+        fh.close()
+
+    if len(dDates) == 0:
+        raise MyError, "No survey dates found in " + catalogFile
+
+    return dDates
+
+## ===================================================================================
+def RefreshSurveyList(outputFolder, asList, bImport, catalogSource):
+    # Metadata-only date check. Gets the current SAVEREST date for every requested survey
+    # from the catalog (GetCatalogDates) and compares it with the date of the local copy
+    # (Template database or tabular/sacatlog.txt), without downloading or deleting anything.
+    # The catalog dates replace the dates in asDict.
+    #
+    # Returns 2 lists of areasymbols: surveys that are missing or out of date and need to be
+    # downloaded, and surveys that are current. (None, None) if the catalog could not be read.
+
+    global areaSym  # GetTemplateDate uses this
+
+    try:
+        dDates = GetCatalogDates(catalogSource, asList)
+
+        if dDates is None:
+            raise MyError, ""
+
+        updateList = list()
+        currentList = list()
+
+        for areaSym in asList:
+            surveyInfo = asDict[areaSym].split(",")
+
+            if areaSym in dDates:
+                catalogDate = str(dDates[areaSym])
+                surveyInfo[1] = " " + catalogDate[0:4] + "-" + catalogDate[4:6] + "-" + catalogDate[6:8]
+                asDict[areaSym] = ",".join(surveyInfo)
+
+            else:
+                PrintMsg("\t" + areaSym + " not found in survey catalog, using date from survey list", 1)
+
+            try:
+                surveyDate = int(surveyInfo[1].strip().replace("-", ""))
+
+            except:
+                updateList.append(areaSym)
+                continue
+
+            newFolder = os.path.join(outputFolder, areaSym.upper())
+            localDate = 0
+
+            if os.path.isdir(newFolder):
+                newDB = os.path.join(os.path.join(newFolder, "tabular"), "soil_d_" + areaSym.lower() + ".mdb")
+
+                if bImport and arcpy.Exists(newDB):
+                    localDate = GetTemplateDate(newDB)
+
+                else:
+                    localDate = GetTabularDate(newFolder)
+
+            if surveyDate > localDate:
+                updateList.append(areaSym)
+
+            else:
+                currentList.append(areaSym)
+
+        PrintMsg(" \n" + Number_Format(len(updateList), 0, True) + " of " + Number_Format(len(asList), 0, True) + " surveys are missing or out of date", 0)
+
+        return updateList, currentList
+
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return None, None
+
+    except (socket.error, httplib.HTTPException, urllib2.URLError), e:
+        PrintMsg("Soil Data Access connection failure (" + str(e) + ")", 2)
+        return None, None
+
+    except:
+        errorMsg()
+        return None, None
+
 ## ===================================================================================
 def GetReason(responseCode):
     # Get SSURGO version from the Template database "SYSTEM Template Database Information" table
@@ -385,7 +600,7 @@ def GetReason(responseCode):
 
 ## ===================================================================================
 def GetDownload(areasym, surveyDate, importDB, newFolder):
-    # download survey from Web Soil Survey URL and return name of the zip file
+    # download survey from Web Soil Survey URL and unzip it into the output folder
     # want to set this up so that download will retry several times in case of error
     # return empty string in case of complete failure. Allow main to skip a failed
     # survey, but keep a list of failures
@@ -393,10 +608,67 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
     # Only the version of zip file without a Template database is downloaded. The user
     # must have a locale copy of the Template database that has been modified to allow
     # automatic tabular imports.
+    #
+    # 2026-10-17 The actual download was moved to DownloadZip so that it can also be
+    # run by the download worker threads. Unzipping is handled by UnzipDownload.
+    # Returns the path of the zip file, which is only kept when bStreamTabular is True.
 
-    # create URL string from survey string and WSS 3.0 cache URL
+    try:
+        if cacheFolder and os.path.isfile(os.path.join(cacheFolder, GetZipName(areasym, surveyDate))):
+            PrintMsg("\tCopying " + areasym + " from local zip file cache...", 0)
+
+        else:
+            PrintMsg("\tDownloading " + areasym + " from Web Soil Survey...", 0)
+
+        local_zip = DownloadZip(areasym, surveyDate, outputFolder, cacheFolder, cacheLimit)
+
+        if not UnzipDownload(outputFolder, newFolder, importDB, os.path.basename(local_zip), bStreamTabular):
+            return ""
+
+        return local_zip
+
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return ""
+
+    except socket.timeout, e:
+        PrintMsg("\t\t" + areasym + " - server timeout error", 1)
+        return ""
+
+    except socket.error, e:
+        PrintMsg("\t\t" + areasym + " - Web Soil Survey connection failure", 1)
+        return ""
+
+    except (httplib.HTTPException, urllib2.URLError):
+        PrintMsg("\t\t" + areasym + " - Web Soil Survey connection failure", 1)
+        return ""
+
+    except:
+        # problem deleting partial zip file after connection error?
+        # saw some locked, zero-byte zip files associated with connection errors
+        PrintMsg("\tFailed to download zipfile", 0)
+        errorMsg()
+        return ""
 
+## ===================================================================================
+def DownloadZip(areaSym, surveyDate, outputFolder, cacheFolder="", cacheLimit=0, maxTries=5):
+    # Download the survey zip file from the Web Soil Survey cache and return the path
+    # of the local zip file.
+    #
+    # This function does not make any arcpy calls and does not trap errors. It raises
+    # MyError, socket or httplib errors so that it can be run from a download worker
+    # thread and have the messages reported by the main thread.
+    #
+    # 2026-10-17 The zip file is downloaded in chunks to a '.part' file. After a dropped
+    # connection the download is retried using an HTTP Range request that resumes at the
+    # end of the '.part' file. Retries wait 2, 4, 8, 16 seconds. The finished file is checked
+    # (size and zip CRC) before it is renamed to the final zip file name.
+    #
+    # 2026-10-17 If a cacheFolder is given, the zip file is copied from the local cache when
+    # it has already been downloaded, and new downloads are added to the cache.
 
+    # create URL string from survey string and WSS 3.0 cache URL
     #baseURL = "https://websoilsurvey-dev.dev.sc.egov.usda.gov/DSD/Download/Cache/SSA/" # Testing downloads from Dev
     #baseURL = "http://websoilsurvey-dev.dev.sc.egov.usda.gov/DSD/Download/Cache/SSA/"  # bad url
     baseURL = "https://websoilsurvey.sc.egov.usda.gov/DSD/Download/Cache/SSA/"
@@ -405,178 +677,322 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
     # baseURL = "https://soilsdashboard.sc.egov.usda.gov/DataManager/WSSFileShare?dir=DownloadSoilsData/PreCache/SSA/"
     #baseURL = "http://websoilsurvey.sc.egov.usda.gov/DSD/Download/Cache/SSA/"
 
+    zipName = GetZipName(areaSym, surveyDate)
+    zipURL = baseURL + zipName
+
+    # set the download's output location and filename
+    local_zip = os.path.join(outputFolder, zipName)
+    part_zip = local_zip + ".part"  # partial download, kept between attempts
+
+    if not os.path.isdir(outputFolder):
+        raise MyError, "Unable to open output folder (" + outputFolder + ") to save zip file"
+
+    # make sure the output zip file doesn't already exist
+    if os.path.isfile(local_zip):
+        os.remove(local_zip)
+
+    if cacheFolder and GetCachedZip(cacheFolder, zipName, local_zip):
+        return local_zip
+
+    iTry = 0
+
+    while True:
+        iTry += 1
+
+        try:
+            zipSize = DownloadChunks(zipURL, part_zip)
+
+            if zipSize > 0 and os.path.getsize(part_zip) < zipSize:
+                # Connection was closed before the end of the file. Resume on the next try.
+                raise httplib.IncompleteRead(str(os.path.getsize(part_zip)), zipSize - os.path.getsize(part_zip))
+
+            if VerifyZip(part_zip, zipSize):
+                break
+
+            # Complete but corrupt download. Start over from the beginning.
+            os.remove(part_zip)
+
+            if iTry >= maxTries:
+                raise MyError, "Downloaded zipfile for " + areaSym + " failed the integrity check"
+
+        except urllib2.HTTPError, e:
+            if e.code == 416:
+                # Requested range not satisfiable, the partial file is no good
+                os.remove(part_zip)
+
+            elif e.code != 408 and e.code < 500:
+                # Not Found, Forbidden, etc. Retrying won't help.
+                raise MyError, "SSURGO zip file request failed. Error code: " + str(e.code)
+
+            if iTry >= maxTries:
+                raise
+
+        except (IOError, httplib.HTTPException):
+            # Dropped connection or timeout. Keep the partial file and resume.
+            if iTry >= maxTries:
+                raise
+
+        # exponential backoff before the next try
+        sleep(2 ** iTry)
+
+    os.rename(part_zip, local_zip)
+
+    if cacheFolder:
+        AddZipToCache(cacheFolder, cacheLimit, local_zip)
+
+    return local_zip
+
+## ===================================================================================
+def GetZipName(areaSym, surveyDate):
+    # Name of the Web Soil Survey zip file for this survey and SAVEREST date (YYYYMMDD).
+    # The zip file cache uses the same name as its key.
+
+    # Use this zipfile for downloads without the Template database
+    zipDate = str(surveyDate)[0:4] + "-" + str(surveyDate)[4:6] + "-" + str(surveyDate)[6:8]
+    zipName = "wss_SSA_" + areaSym + "_[" + str(zipDate) + "].zip"  # use this name for Public cache
+
+    return zipName
+
+## ===================================================================================
+def GetCachedZip(cacheFolder, zipName, local_zip):
+    # Copy a previously downloaded zip file from the cache folder to local_zip.
+    # The modified time of the cached file is updated so that the least recently used
+    # files are the first to be removed by AddZipToCache.
+    #
+    # Returns True if the zip file was found in the cache and passed the zip CRC check.
+
+    cacheLock.acquire()
+
     try:
-        # List of states that use a Template database other than US_2003.
-        # This list will have to be updated in the future if it is used to
-        # get downloads with the Template database included in the zipfile.
-        dbInfo = {'AK':'AK', 'CT':'CT', 'FL':'FL', 'GA':'GA', 'HI':'HI', 'IA':'IA', \
-        'ID':'ID', 'IN':'IN', 'ME':'ME', 'MI':'MI', 'MN':'MN', 'MT':'MT', 'NC':'NC', \
-        'NE':'NE', 'NJ':'NJ', 'OH':'OH', 'OR':'OR', 'PA':'PA', 'SD':'SD', 'UT':'UT', \
-        'VT':'VT', 'WA':'WA', 'WI':'WI', 'WV':'WV', 'WY':'WY', 'FM':'HI', 'PB':'HI'}
-
-        # Incorporate the name of the Template database into the URL
-        st = areaSym[0:2]
-
-        if st in dbInfo:
-            db = "_soildb_" + dbInfo[st] + "_2003"
-        else:
-            db = "_soildb_US_2003"
+        cached_zip = os.path.join(cacheFolder, zipName)
 
-        # Use this zipfile for downloads without the Template database
-        zipDate = str(surveyDate)[0:4] + "-" + str(surveyDate)[4:6] + "-" + str(surveyDate)[6:8]
-        zipName = "wss_SSA_" + areaSym + "_[" + str(zipDate) + "].zip"  # use this name for Public cache
+        if not os.path.isfile(cached_zip):
+            return False
 
-        # Use this URL for downloads with the state or US_2003 database
-        #zipName = "wss_SSA_" + areaSym + db + "_[" + surveyDate + "].zip"
+        if not VerifyZip(cached_zip, 0):
+            # damaged cache file, download it again
+            os.remove(cached_zip)
+            return False
 
-        zipURL = baseURL + zipName
+        shutil.copyfile(cached_zip, local_zip)
+        os.utime(cached_zip, None)
+        return True
 
-        # set the download's output location and filename
-        local_zip = os.path.join(outputFolder, zipName)
+    finally:
+        cacheLock.release()
+
+## ===================================================================================
+def AddZipToCache(cacheFolder, cacheLimit, local_zip):
+    # Copy a verified download into the cache folder and then remove the least recently
+    # used zip files until the cache is no larger than cacheLimit (bytes, 0 for no limit).
+
+    cacheLock.acquire()
+
+    try:
+        if not os.path.isdir(cacheFolder):
+            os.makedirs(cacheFolder)
+
+        cached_zip = os.path.join(cacheFolder, os.path.basename(local_zip))
+        shutil.copyfile(local_zip, cached_zip + ".part")
+
+        if os.path.isfile(cached_zip):
+            os.remove(cached_zip)
+
+        os.rename(cached_zip + ".part", cached_zip)
+
+        if cacheLimit > 0:
+            cacheFiles = list()
+            cacheSize = 0
+
+            for zipPath in glob.glob(os.path.join(cacheFolder, "wss_SSA_*.zip")):
+                zipStat = os.stat(zipPath)
+                cacheFiles.append((zipStat.st_mtime, zipStat.st_size, zipPath))
+                cacheSize += zipStat.st_size
+
+            cacheFiles.sort()  # oldest first
+
+            for mTime, zipSize, zipPath in cacheFiles:
+                if cacheSize <= cacheLimit:
+                    break
+
+                if zipPath == cached_zip:
+                    # never remove the file that was just added
+                    continue
+
+                os.remove(zipPath)
+                cacheSize -= zipSize
+
+    finally:
+        cacheLock.release()
+
+## ===================================================================================
+def DownloadChunks(zipURL, part_zip, chunkSize=1048576):
+    # Download zipURL to the part_zip file in chunks. If part_zip already exists, request
+    # only the remaining bytes and append them. Servers that ignore the Range header send
+    # the whole file and the part_zip file is overwritten.
+    #
+    # Returns the expected size of the complete file in bytes (0 if unknown).
 
-        if not os.path.isdir(outputFolder):
-            raise MyError, "Unable to open output folder (" + outputFolder + ") to save zip file"
+    startByte = 0
 
-        # make sure the output zip file doesn't already exist
-        if os.path.isfile(local_zip):
-            os.remove(local_zip)
+    if os.path.isfile(part_zip):
+        startByte = os.path.getsize(part_zip)
 
-        PrintMsg("\tDownloading " + areaSym + " from Web Soil Survey...", 0)
+    zipRequest = urllib2.Request(zipURL)
 
-        # Test replacement for owbs code for getting SSURGO download-zip file
-        # The following code snippet seems to be a major improvement. Need to add status check though.
-        zipDL = urllib2.urlopen(zipURL)
-        time.sleep(1)
+    if startByte > 0:
+        zipRequest.add_header("Range", "bytes=" + str(startByte) + "-")
 
-        if zipDL is None:
-            raise MyError, "Empty download from URL"
+    zipDL = urllib2.urlopen(zipRequest, timeout=60)
 
-        time.sleep(1)
+    try:
         zipCode = zipDL.code
         zipMD = zipDL.info()
         zipType = zipMD.subtype
-        zipSize = int(zipMD.get('Content-Length'))
 
-        #PrintMsg("\tZip Code: " + str(zipCode), 1)
+        if zipCode == 206:
+            # Resuming. Content-Range looks like: bytes 1000-9999/10000
+            fileMode = 'ab'
+            totalSize = zipMD.get('Content-Range', '').split('/')[-1]
+
+        elif zipCode == 200:
+            fileMode = 'wb'
+            totalSize = zipMD.get('Content-Length', '')
 
-        if zipCode != 200:
+        else:
             raise MyError, "SSURGO zip file request failed. Error code: " + str(zipCode)
 
         if zipType != '.zip':
             raise MyError, "Failed to get requested zipfile from Web Soil Survey"
 
-        if os.path.isdir(outputFolder):
-            # Sometimes it appears that I'm losing connection to our network share
+        if totalSize.isdigit():
+            totalSize = int(totalSize)
 
-            try:
-                fh = open(local_zip, 'wb')  # Getting some IOErrors. No such file or directory (zipfile path)
-                time.sleep(1)
+        else:
+            totalSize = 0
 
-            except IOError:
-                raise MyError, "\tUnable to write to " + local_zip
+        # Sometimes it appears that I'm losing connection to our network share
+        try:
+            fh = open(part_zip, fileMode)  # Getting some IOErrors. No such file or directory (zipfile path)
 
-            if os.path.isfile(local_zip):
+        except IOError:
+            raise MyError, "\tUnable to write to " + part_zip
+
+        try:
+            while True:
+                chunk = zipDL.read(chunkSize)
+
+                if not chunk:
+                    break
 
                 try:
-                    fh.write(zipDL.read())
-                    fh.close()
+                    fh.write(chunk)
 
-                except:
+                except IOError:
                     raise MyError, "\tUnable to save requested zipfile"
 
-        else:
-            raise MyError, "\tUnable to reach output directory: " + outputFolder
+        finally:
+            fh.close()
 
-        del fh, zipDL
+    finally:
+        zipDL.close()
 
-        zipfile.ZipFile.debug = 3
+    return totalSize
 
-        if os.path.isfile(local_zip):
-            # got a zip file, go ahead and extract it
+## ===================================================================================
+def VerifyZip(zipPath, zipSize):
+    # Check a downloaded zip file before it is extracted. The file size must match the size
+    # reported by the server (when known) and every member must pass the zip CRC-32 check.
 
-            zipSize = (os.stat(local_zip).st_size / (1024.0 * 1024.0))
+    if zipSize > 0 and os.path.getsize(zipPath) != zipSize:
+        return False
 
-            if zipSize > 0:
+    try:
+        z = zipfile.ZipFile(zipPath, "r")
 
-                # Download appears to be successful
-                PrintMsg("\tUnzipping " + zipName + " (" + Number_Format(zipSize, 3, True) + " MB) to " + outputFolder + "...", 0)
+        try:
+            badFile = z.testzip()
 
-                try:
-                    z = zipfile.ZipFile(local_zip, "r")
-                    z.extractall(outputFolder)
-                    z.close()
+        finally:
+            z.close()
 
-                except zipfile.BadZipfile:
-                    PrintMsg("Bad zip file?", 2)
-                    return False
+    except (zipfile.BadZipfile, zipfile.LargeZipFile, IOError):
+        return False
 
-                except:
-                    PrintMsg(" \nUnhandled error unzipping " + local_zip, 2)
-                    return False
+    return badFile is None
 
-                # remove zip file after it has been extracted,
-                # allowing a little extra time for file lock to clear
-                sleep(3)
-                os.remove(local_zip)
+## ===================================================================================
+def StageWorker(stageName, stageFunc, inQueue, outQueue, dStageStats, statsLock, stopEvent):
+    # Worker thread for one stage of the download pipeline (see ProcessSurveysPipeline).
+    #
+    # Takes survey records [areasymbol, surveyDate, local zip path, error message] from inQueue,
+    # runs stageFunc on each record and puts it on outQueue. Records that failed in an earlier
+    # stage are passed through. outQueue is bounded, so the put waits while the next stage
+    # is behind (backpressure). Busy and blocked seconds are added to dStageStats[stageName].
+    # A None record stops the worker. No arcpy calls are made here.
 
-                # rename output folder to NRCS Geodata Standard for Soils
-                if os.path.isdir(os.path.join(outputFolder, zipName[:-4])):
-                    # this is an older zip file that has the 'wss_' directory structure
-                    time.sleep(1)
-                    #os.rename(os.path.join(outputFolder, zipName[:-4]), newFolder)
+    while True:
+        rec = inQueue.get()
 
-                elif os.path.isdir(os.path.join(outputFolder, areaSym.upper())):
-                    # this must be a newer zip file using the uppercase AREASYMBOL directory
-                    time.sleep(1)
-                    #os.rename(os.path.join(outputFolder, areaSym.upper()), newFolder)
+        if rec is None or stopEvent.is_set():
+            break
 
-                elif os.path.isdir(newFolder):
-                    # this is a future zip file using the correct field office naming convention (soil_ne109)
-                    # it does not require renaming.
-                    pass
+        startTime = time.time()
 
-                else:
-                    # none of the subfolders within the zip file match any of the expected names
-                    raise MyError, "Subfolder within the zip file does not match the standard naminig convention"
+        if rec[3] == "":
+            stageFunc(rec)
 
-            else:
-                # Downloaded a zero-byte zip file
-                # download for this survey failed, may try again
-                PrintMsg("\tEmpty zip file downloaded for " + areaSym + ": " + surveyName, 1)
-                os.remove(local_zip)
+        with statsLock:
+            dStageStats[stageName][1] += 1
+            dStageStats[stageName][2] += time.time() - startTime
 
-            return True
+        startTime = time.time()
+        outQueue.put(rec)
 
-        else:
-            # Don't have a zip file, need to find out circumstances and document
-            # rename downloaded database using standard convention, skip import
-            raise MyError, "Missing zip file (" + local_zip + ")"
-            return False
+        with statsLock:
+            dStageStats[stageName][3] += time.time() - startTime
 
+    return
+
+## ===================================================================================
+def DownloadStage(rec):
+    # Download stage of the pipeline. Sets the local zip path (rec[2]) or the error message (rec[3]).
+    # Retries are handled by DownloadZip.
+
+    areaSym, surveyDate = rec[0:2]
+
+    try:
+        rec[2] = DownloadZip(areaSym, surveyDate, outputFolder, cacheFolder, cacheLimit)
 
     except MyError, e:
-        # Example: raise MyError, "This is an error message"
-        PrintMsg(str(e), 2)
-        return ""
+        rec[3] = str(e).strip()
 
     except socket.timeout, e:
-        PrintMsg("\t\t" + areaSym + " - server timeout error", 1)
-        return ""
+        rec[3] = areaSym + " - server timeout error"
 
-    except socket.error, e:
-        PrintMsg("\t\t" + areasym + " - Web Soil Survey connection failure", 1)
-        return ""
+    except (socket.error, httplib.HTTPException, urllib2.URLError), e:
+        rec[3] = areaSym + " - Web Soil Survey connection failure"
 
-    except httplib.BadStatusLine:
-        PrintMsg("\t\t" + areasym + " - Web Soil Survey connection failure", 1)
-        return ""
+    except:
+        rec[3] = areaSym + " - failed to download zipfile (" + str(sys.exc_info()[1]) + ")"
+
+    return
+
+## ===================================================================================
+def UnzipStage(rec):
+    # Unzip stage of the pipeline. Extracts the zip file into the output folder and sets the
+    # error message (rec[3]) if there was a problem.
+
+    try:
+        ExtractZip(outputFolder, os.path.join(outputFolder, rec[0].upper()), rec[2], bStreamTabular)
+
+    except MyError, e:
+        rec[3] = str(e).strip()
 
     except:
-        # problem deleting partial zip file after connection error?
-        # saw some locked, zero-byte zip files associated with connection errors
-        PrintMsg("\tFailed to download zipfile", 0)
-        errorMsg()
-        return ""
+        rec[3] = "Unhandled error unzipping " + rec[2] + " (" + str(sys.exc_info()[1]) + ")"
+
+    return
 
 ## ===================================================================================
 def CheckExistingDataset(areaSym, surveyDate, newFolder, newDB):
@@ -739,18 +1155,13 @@ def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iT
             #
             PrintMsg(" \nProcessing survey " + areaSym + " (" + str(iGet) + " of " + str(iTotal) + "):  " + surveyName, 0)
 
-            # First attempt to download zip file
+            # Download zip file. Retries with resume are handled by DownloadZip.
             zipName = GetDownload(areaSym, surveyDate, importDB, newFolder)
 
             if zipName == "":
-                # First download attempt failed, try downloading zip file a second time
-                sleep(5)
-                zipName = GetDownload(areaSym, surveyDate, importDB, newFolder)
-
-                if zipName == "":
-                    # Failed second attempt to download zip file
-                    # Give up on this survey
-                    raise MyError, ""
+                # Failed to download zip file
+                # Give up on this survey
+                raise MyError, ""
 
             #bZip = UnzipDownload(outputFolder, newFolder, importDB, zipName)
 
@@ -769,7 +1180,13 @@ def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iT
                 if iGet == iTotal:
                     bLast = True
 
-                if not ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
+                bImported = ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast, zipName)
+
+                if os.path.isfile(zipName):
+                    # zip file was kept for the streaming tabular import
+                    os.remove(zipName)
+
+                if not bImported:
                     # Bail clear out of the whole download process
                     raise MyError, ""
 
@@ -790,72 +1207,246 @@ def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iT
         return "Failed"
 
 ## ===================================================================================
-def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
-    # Given zip file name, try to unzip it
+def ProcessSurveysPipeline(outputFolder, importDB, asList, bImport, bRemoveTXT, maxDownloads, maxUnzip):
+    # Download and import the specified SSURGO datasets as a staged pipeline:
+    #
+    #   download (maxDownloads threads) -> unzip (maxUnzip threads) -> tabular import -> metadata
+    #
+    # Each stage hands the surveys to the next one through a bounded queue, so a slow stage holds
+    # back the stages in front of it instead of letting zip files and unzipped folders pile up on
+    # disk. The tabular import and metadata stages use arcpy, so they both run in the main thread,
+    # one survey at a time, while the download and unzip threads work on the next surveys.
+    #
+    # Stage utilization (busy and blocked time) is reported at the end so that the worker
+    # counts can be tuned.
+    #
+    # Returns lists of successful, skipped and failed areasymbols
+
+    global areaSym, surveyName  # CheckExistingDataset, GetTemplateDate and AddMuName use these
+
+    goodList = list()
+    skippedList = list()
+    failedList = list()
+    failedCnt = 0
+    jobQueue = Queue.Queue()
+    zipQueue = Queue.Queue(maxDownloads * 2)  # downloaded zip files waiting to be unzipped
+    unzipQueue = Queue.Queue(maxUnzip + 1)    # unzipped surveys waiting for the tabular import
+    stopEvent = threading.Event()
+    statsLock = threading.Lock()
+    dStageStats = dict()  # stage name: [workers, surveys, busy seconds, blocked seconds]
+    workers = list()
+    startTime = time.time()
 
     try:
-        local_zip = os.path.join(outputFolder, zipName)
-        zipfile.ZipFile.debug = 3
+        # Check for existing datasets before starting the downloads, skipping the
+        # surveys that are already current.
+        dSurveys = dict()  # areasymbol: (surveyName, newFolder, newDB)
 
-        if os.path.isfile(local_zip):
-            # got a zip file, go ahead and extract it
+        for areaSym in asList:
+            surveyInfo = asDict[areaSym].split(",")
 
-            zipSize = (os.stat(local_zip).st_size / (1024.0 * 1024.0))
+            try:
+                surveyDate = int(surveyInfo[1].strip().replace("-", ""))
 
-            if zipSize > 0:
+            except:
+                failedList.append(areaSym)
+                continue
 
-                # Download appears to be successful
-                PrintMsg("\tUnzipping " + zipName + " (" + Number_Format(zipSize, 3, True) + " MB) to " + outputFolder + "...", 0)
+            surveyName = surveyInfo[2].strip()
+            newFolder = os.path.join(outputFolder, areaSym.upper())
 
-                try:
-                    z = zipfile.ZipFile(local_zip, "r")
-                    z.extractall(outputFolder)
-                    z.close()
+            if bImport:
+                newDB = os.path.join(os.path.join(newFolder, "tabular"), "soil_d_" + areaSym.lower() + ".mdb")
 
-                except zipfile.BadZipfile:
-                    PrintMsg("Bad zip file?", 2)
-                    return False
+            else:
+                newDB = ""
 
-                except:
-                    PrintMsg(" \nUnhandled error unzipping " + local_zip, 2)
-                    return False
+            if CheckExistingDataset(areaSym, surveyDate, newFolder, newDB):
+                dSurveys[areaSym] = (surveyName, newFolder, newDB)
+                jobQueue.put([areaSym, surveyDate, "", ""])
 
-                # remove zip file after it has been extracted,
-                # allowing a little extra time for file lock to clear
-                sleep(3)
-                os.remove(local_zip)
+            else:
+                skippedList.append(areaSym)
+                arcpy.SetProgressorPosition()
+
+        iJobs = len(dSurveys)
+
+        if iJobs == 0:
+            return goodList, skippedList, failedList
+
+        iDownloads = min(maxDownloads, iJobs)
+        iUnzip = min(maxUnzip, iJobs)
+        dStageStats["download"] = [iDownloads, 0, 0.0, 0.0]
+        dStageStats["unzip"] = [iUnzip, 0, 0.0, 0.0]
+        dStageStats["import"] = [1, 0, 0.0, 0.0]
+        dStageStats["metadata"] = [1, 0, 0.0, 0.0]
+        PrintMsg(" \nProcessing " + str(iJobs) + " survey(s) using " + str(iDownloads) + " download and " + str(iUnzip) + " unzip threads", 0)
+
+        for i in range(iDownloads):
+            # one stop signal for each download worker, placed after all of the jobs
+            jobQueue.put(None)
+
+        for stageName, stageFunc, inQueue, outQueue, iWorkers in [("download", DownloadStage, jobQueue, zipQueue, iDownloads), ("unzip", UnzipStage, zipQueue, unzipQueue, iUnzip)]:
+            for i in range(iWorkers):
+                worker = threading.Thread(target=StageWorker, args=(stageName, stageFunc, inQueue, outQueue, dStageStats, statsLock, stopEvent))
+                worker.daemon = True
+                worker.start()
+                workers.append(worker)
+
+        # Import each survey in the order the unzip stage finishes them
+        iGet = 0
+
+        while iGet < iJobs:
+            areaSym, surveyDate, local_zip, errMsg = unzipQueue.get()
+            iGet += 1
+            surveyName, newFolder, newDB = dSurveys[areaSym]
+            arcpy.SetProgressorLabel("Importing survey " + areaSym + "  (number " + str(iGet) + " of " + str(iJobs) + " downloads)")
+            PrintMsg(" \nProcessing survey " + areaSym + " (" + str(iGet) + " of " + str(iJobs) + "):  " + surveyName, 0)
+
+            if errMsg != "":
+                PrintMsg("\t" + errMsg, 1)
+                bProcessed = False
 
-                # rename output folder to NRCS Geodata Standard for Soils
-                if os.path.isdir(os.path.join(outputFolder, zipName[:-4])):
-                    # this is an older zip file that has the 'wss_' directory structure
-                    os.rename(os.path.join(outputFolder, zipName[:-4]), newFolder)
+            else:
+                bProcessed = True
 
-                elif os.path.isdir(os.path.join(outputFolder, areaSym.upper())):
-                    # this must be a newer zip file using the uppercase AREASYMBOL directory
-                    os.rename(os.path.join(outputFolder, areaSym.upper()), newFolder)
+                if bImport:
+                    stageStart = time.time()
+                    bProcessed = ImportTabular(areaSym, newFolder, importDB, newDB, False, iGet == iJobs, local_zip, False)
+                    dStageStats["import"][1] += 1
+                    dStageStats["import"][2] += time.time() - stageStart
 
-                elif os.path.isdir(newFolder):
-                    # this is a future zip file using the correct field office naming convention (soil_ne109)
-                    # it does not require renaming.
-                    pass
+                if bProcessed and bImport:
+                    # Shapefile metadata and MUNAME. Uses the zip file for mapunit.txt in streaming mode.
+                    stageStart = time.time()
+                    zipTab = None
 
-                else:
-                    # none of the subfolders within the zip file match any of the expected names
-                    raise MyError, "Subfolder within the zip file does not match the standard naminig convention"
+                    if os.path.isfile(local_zip):
+                        zipTab = zipfile.ZipFile(local_zip, "r")
 
-            else:
-                # Downloaded a zero-byte zip file
-                # download for this survey failed, may try again
-                PrintMsg("\tEmpty zip file downloaded for " + areaSym + ": " + surveyName, 1)
+                    try:
+                        AddMuName(newFolder, iGet == iJobs, bMuName, zipTab)
+
+                    finally:
+                        if not zipTab is None:
+                            zipTab.close()
+
+                    # text files are kept until AddMuName has read mapunit.txt
+                    if bRemoveTXT:
+                        RemoveTabularText(os.path.join(newFolder, "tabular"))
+
+                    dStageStats["metadata"][1] += 1
+                    dStageStats["metadata"][2] += time.time() - stageStart
+
+            if local_zip != "" and os.path.isfile(local_zip):
+                # zip file was kept for the streaming tabular import
                 os.remove(local_zip)
 
-            return True
+            if bProcessed:
+                failedCnt = 0
+                goodList.append(areaSym)
 
-        else:
-            # Don't have a zip file, need to find out circumstances and document
-            # rename downloaded database using standard convention, skip import
-            raise MyError, "Missing zip file (" + local_zip + ")"
-            return False
+            else:
+                failedList.append(areaSym)
+                failedCnt += 1
+
+            if failedCnt > 4:
+                raise MyError, "Five consecutive download failures, bailing out"
+
+            if len(failedList) > 24:
+                raise MyError, "Twenty-five download failures, bailing out"
+
+            arcpy.SetProgressorPosition()
+
+        # Every survey has been through the pipeline. One stop signal for each unzip worker.
+        for i in range(iUnzip):
+            zipQueue.put(None)
+
+        ReportStageUtilization(dStageStats, time.time() - startTime)
+
+        return goodList, skippedList, failedList
+
+    finally:
+        # Stop any workers that are still running, wait for them to finish and clean up
+        # zip files that were downloaded but not processed.
+        stopEvent.set()
+
+        for worker in workers + [None]:
+            # None is a last pass to empty the queues after all of the workers have stopped
+            while True:
+                # Empty the stage queues so that no worker is left waiting on a put
+                for stageQueue in (zipQueue, unzipQueue):
+                    while True:
+                        try:
+                            rec = stageQueue.get_nowait()
+
+                            if not rec is None and rec[2] != "" and os.path.isfile(rec[2]):
+                                os.remove(rec[2])
+
+                        except Queue.Empty:
+                            break
+
+                if worker is None or not worker.is_alive():
+                    break
+
+                for i in range(len(workers)):
+                    try:
+                        # wake up any unzip workers waiting for a download
+                        zipQueue.put_nowait(None)
+
+                    except Queue.Full:
+                        break
+
+                worker.join(1.0)
+
+## ===================================================================================
+def ReportStageUtilization(dStageStats, wallTime):
+    # Print the utilization of each pipeline stage. Busy is the share of the stage's worker time
+    # spent doing work. Blocked is the share spent waiting for room in the next stage's queue;
+    # a stage that is mostly blocked has more workers than it needs, and a stage that is close
+    # to 100% busy is the bottleneck.
+
+    try:
+        PrintMsg(" \nPipeline stage utilization (" + Number_Format(wallTime, 1, True) + " seconds):", 0)
+
+        for stageName in ["download", "unzip", "import", "metadata"]:
+            if not stageName in dStageStats:
+                continue
+
+            iWorkers, iSurveys, busyTime, blockedTime = dStageStats[stageName]
+            workerTime = max(iWorkers * wallTime, 0.001)
+            PrintMsg("\t" + stageName + ": " + str(iWorkers) + " worker(s), " + Number_Format(iSurveys, 0, True) + " surveys, " + Number_Format(100.0 * busyTime / workerTime, 0, True) + "% busy, " + Number_Format(100.0 * blockedTime / workerTime, 0, True) + "% blocked", 0)
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def UnzipDownload(outputFolder, newFolder, importDB, zipName, bStream=False):
+    # Given zip file name, try to unzip it
+    #
+    # 2026-10-17 Now used by GetDownload and the concurrent download pool. No longer renames
+    # the unzipped folder (see 2021-11-22) and gets the areasymbol from newFolder instead of
+    # the global variable.
+    #
+    # 2026-10-17 bStream option. The tabular text files are not extracted (except for version.txt
+    # and sacatlog.txt, which are used for the version and date checks) and the zip file is kept,
+    # so that ImportTabular can read the text files directly from the zip file.
+    #
+    # 2026-10-17 The extraction was moved to ExtractZip, which is also run by the unzip stage
+    # of the download pipeline.
+
+    try:
+        local_zip = os.path.join(outputFolder, zipName)
+
+        if os.path.isfile(local_zip) and os.stat(local_zip).st_size > 0:
+            # Download appears to be successful
+            zipSize = (os.stat(local_zip).st_size / (1024.0 * 1024.0))
+            PrintMsg("\tUnzipping " + zipName + " (" + Number_Format(zipSize, 3, True) + " MB) to " + outputFolder + "...", 0)
+
+        return ExtractZip(outputFolder, newFolder, local_zip, bStream)
 
     except MyError, e:
         # Example: raise MyError, "This is an error message"
@@ -867,6 +1458,86 @@ def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
         errorMsg()
         return False
 
+## ===================================================================================
+def ExtractZip(outputFolder, newFolder, local_zip, bStream=False):
+    # Extract a downloaded zip file into the output folder. No arcpy calls are made here,
+    # so this can be run by the unzip threads. Problems are raised as MyError.
+    #
+    # In bStream mode the tabular text files are left in the zip file, which is kept.
+    # Otherwise the zip file is removed after it has been extracted.
+
+    areaSym = os.path.basename(newFolder)
+    zipName = os.path.basename(local_zip)
+    zipfile.ZipFile.debug = 3
+
+    if not os.path.isfile(local_zip):
+        # Don't have a zip file, need to find out circumstances and document
+        raise MyError, "Missing zip file (" + local_zip + ")"
+
+    if os.stat(local_zip).st_size == 0:
+        # Downloaded a zero-byte zip file
+        # download for this survey failed, may try again
+        os.remove(local_zip)
+        raise MyError, "Empty zip file downloaded for " + areaSym
+
+    try:
+        z = zipfile.ZipFile(local_zip, "r")
+
+        try:
+            if bStream:
+                z.extractall(outputFolder, [member for member in z.namelist() if not IsTabularText(member)])
+
+            else:
+                z.extractall(outputFolder)
+
+        finally:
+            z.close()
+
+    except zipfile.BadZipfile:
+        raise MyError, "Bad zip file? (" + zipName + ")"
+
+    if not bStream:
+        # remove zip file after it has been extracted,
+        # allowing a little extra time for file lock to clear
+        sleep(3)
+        os.remove(local_zip)
+
+    # Older zip files use the 'wss_' directory structure, newer zip files use the uppercase
+    # AREASYMBOL directory and future zip files may use the field office naming convention (soil_ne109)
+    if not (os.path.isdir(os.path.join(outputFolder, zipName[:-4])) or os.path.isdir(os.path.join(outputFolder, areaSym.upper())) or os.path.isdir(newFolder)):
+        # none of the subfolders within the zip file match any of the expected names
+        raise MyError, "Subfolder within the zip file does not match the standard naminig convention"
+
+    return True
+
+## ===================================================================================
+def IsTabularText(member):
+    # True for zip file members that are tabular text files read by the streaming
+    # tabular import. version.txt and sacatlog.txt are always extracted.
+
+    memberPath = member.lower().split("/")
+
+    if len(memberPath) < 2 or memberPath[-2] != "tabular" or not memberPath[-1].endswith(".txt"):
+        return False
+
+    return not memberPath[-1] in ("version.txt", "sacatlog.txt")
+
+## ===================================================================================
+def OpenTabularText(tabularFolder, txtFile, zipTab=None):
+    # Open one of the SSURGO tabular text files (ex. 'comp.txt'), either from the tabular
+    # folder or, when zipTab is an open zipfile, straight from the downloaded zip file.
+
+    if zipTab is None:
+        return open(os.path.join(tabularFolder, txtFile), 'rb')
+
+    for member in zipTab.namelist():
+        memberPath = member.lower().split("/")
+
+        if len(memberPath) > 1 and memberPath[-2] == "tabular" and memberPath[-1] == txtFile.lower():
+            return zipTab.open(member, 'r')
+
+    raise MyError, "Tabular file " + txtFile + " not found in zip file"
+
 ## ===============================================================================================================
 def GetTableInfo(newDB):
     # Adolfo's function
@@ -923,6 +1594,225 @@ def GetTableInfo(newDB):
         errorMsg()
         return tblInfo
 
+## ===================================================================================
+def GetColumnInfo(newDB):
+    # Read the column metadata from the MDSTATTABCOLS table for the batched tabular import.
+    #
+    # Returns a dictionary with the table physical name as key and a list of
+    # (column physical name, logical data type, field size) in column sequence order.
+    # The column sequence matches the column order in the SSURGO text files.
+
+    try:
+        colInfo = dict()
+        mdTable = os.path.join(newDB, "mdstattabcols")
+
+        if not arcpy.Exists(mdTable):
+            raise MyError, "Missing mdstattabcols table"
+
+        fldNames = ["tabphyname", "colsequence", "colphyname", "logicaldatatype", "fieldsize"]
+
+        with arcpy.da.SearchCursor(mdTable, fldNames) as cur:
+            for rec in cur:
+                tabName = rec[0].lower()
+
+                if not tabName in colInfo:
+                    colInfo[tabName] = list()
+
+                colInfo[tabName].append((rec[1], rec[2].lower(), rec[3].lower(), rec[4]))
+
+        for tabName in colInfo:
+            colInfo[tabName] = [(colName, dataType, fldSize) for seq, colName, dataType, fldSize in sorted(colInfo[tabName])]
+
+        return colInfo
+
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return dict()
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===================================================================================
+def GetConverters(colList, dFldLengths, codePage=None):
+    # Create one conversion function for each column in a SSURGO text file. Done once per
+    # table so that the batched import does not have to look up the data type for every value.
+    #
+    # colList is the list of (column name, logical data type, field size) from GetColumnInfo.
+    # dFldLengths has the output field length for each string column name (0 for other types).
+    #
+    # Integer and Float columns are converted to int and float. All other columns are kept as
+    # strings, truncated to the output field length and optionally decoded using codePage.
+    # Empty strings are converted to None (null).
+
+    converters = list()
+
+    for colName, dataType, fldSize in colList:
+        fldLen = dFldLengths.get(colName, 0)
+
+        if dataType == "integer":
+            converters.append(lambda val: int(val) if val else None)
+
+        elif dataType == "float":
+            converters.append(lambda val: float(val) if val else None)
+
+        elif codePage and fldLen > 0:
+            converters.append(lambda val, n=fldLen: val.decode(codePage)[0:n] if val else None)
+
+        elif codePage:
+            converters.append(lambda val: val.decode(codePage) if val else None)
+
+        elif fldLen > 0:
+            converters.append(lambda val, n=fldLen: val[0:n] if val else None)
+
+        else:
+            converters.append(lambda val: val if val else None)
+
+    return converters
+
+## ===================================================================================
+def GetFieldLengths(colList, dFldLengths):
+    # Output field length for each column in colList (0 for non-string columns), in the
+    # same order as the converters from GetConverters. Used by ImportTextBatched for rows
+    # that can't be converted.
+
+    return [dFldLengths.get(colName, 0) for colName, dataType, fldSize in colList]
+
+## ===================================================================================
+def StringRow(rowInFile, fldLengths, nLengths):
+    # Fallback for ImportTextBatched when a row doesn't match the column metadata or fails the
+    # conversion. All values are kept as strings, empty strings are converted to None and
+    # string values are truncated to the width of the target field.
+
+    newRow = list()
+
+    for fldNo, val in enumerate(rowInFile):
+        if not val:
+            newRow.append(None)
+
+        elif fldNo < nLengths and fldLengths[fldNo] > 0:
+            newRow.append(val[0:fldLengths[fldNo]])
+
+        else:
+            newRow.append(val)
+
+    return newRow
+
+## ===================================================================================
+def ImportTextBatched(txtFH, outputTbl, fldNames, converters, rowWriter, rowFilter=None, blockSize=10000, fldLengths=None):
+    # Batched import of one pipe-delimited SSURGO text file.
+    #
+    # Rows are read from txtFH and type-converted in blocks of blockSize rows, and each block is
+    # passed to rowWriter(outputTbl, fldNames, rows). WriteRowsArcpy is the normal rowWriter.
+    # WriteRowsSQLite can be used as a local stand-in (functools.partial(WriteRowsSQLite, conn)).
+    #
+    # rowFilter(row) is applied to each converted row and can return a modified row, or None
+    # to skip the row. Rows that don't match the column metadata or fail the conversion are
+    # passed as strings (empty strings as None), the same as the original row-by-row import.
+    # fldLengths is the output field length for each column (0 for non-string columns, see
+    # GetFieldLengths) and is used to truncate the strings in those rows.
+    #
+    # Returns the number of rows read from the text file.
+
+    iRows = 0
+    nCols = len(converters)
+    reader = csv.reader(txtFH, delimiter='|', quotechar='"')
+
+    if fldLengths is None:
+        fldLengths = list()
+
+    nLengths = len(fldLengths)
+
+    while True:
+        rows = list()
+        iRead = 0
+
+        for rowInFile in itertools.islice(reader, blockSize):
+            iRead += 1
+
+            if len(rowInFile) == nCols:
+                try:
+                    newRow = [conv(val) for conv, val in zip(converters, rowInFile)]
+
+                except ValueError:
+                    newRow = StringRow(rowInFile, fldLengths, nLengths)
+
+            else:
+                newRow = StringRow(rowInFile, fldLengths, nLengths)
+
+            if not rowFilter is None:
+                newRow = rowFilter(newRow)
+
+                if newRow is None:
+                    continue
+
+            rows.append(newRow)
+
+        if iRead == 0:
+            break
+
+        if len(rows) > 0:
+            try:
+                rowWriter(outputTbl, fldNames, rows)
+
+            except:
+                errorMsg()
+                raise MyError, "Error writing lines " + Number_Format(iRows + 1, 0, True) + " to " + Number_Format(iRows + iRead, 0, True) + " into " + os.path.basename(outputTbl)
+
+        iRows += iRead
+
+    return iRows
+
+## ===================================================================================
+def WriteRowsArcpy(outputTbl, fldNames, rows):
+    # Bulk writer for ImportTextBatched. Writes a block of rows using an arcpy InsertCursor.
+
+    with arcpy.da.InsertCursor(outputTbl, fldNames) as cursor:
+        for row in rows:
+            cursor.insertRow(row)
+
+    return
+
+## ===================================================================================
+def WriteRowsSQLite(conn, outputTbl, fldNames, rows):
+    # Bulk writer for ImportTextBatched that uses executemany on a sqlite3 connection.
+    # Local stand-in for WriteRowsArcpy when testing or timing the import outside of ArcGIS.
+    # The table must already exist in the SQLite database.
+
+    if fldNames == "*":
+        sql = "INSERT INTO " + os.path.basename(outputTbl) + " VALUES (" + ", ".join(["?"] * len(rows[0])) + ")"
+
+    else:
+        sql = "INSERT INTO " + os.path.basename(outputTbl) + " (" + ", ".join(fldNames) + ") VALUES (" + ", ".join(["?"] * len(fldNames)) + ")"
+
+    conn.executemany(sql, rows)
+
+    return
+
+## ===================================================================================
+def ReportImportRates(dImportStats):
+    # Print rows per second for each table imported by ImportTextBatched, slowest tables first.
+    # dImportStats has table name as key and [row count, seconds] as value.
+
+    try:
+        PrintMsg(" \nTabular import rates:", 0)
+
+        for secs, tbl, rowCnt in sorted([(stats[1], tbl, stats[0]) for tbl, stats in dImportStats.items()], reverse=True):
+            if secs > 0:
+                rate = rowCnt / secs
+
+            else:
+                rate = rowCnt
+
+            PrintMsg("\t" + tbl + ": " + Number_Format(rowCnt, 0, True) + " rows in " + Number_Format(secs, 1, True) + " seconds (" + Number_Format(rate, 0, True) + " rows/sec)", 0)
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
 ## ===================================================================================
 def SortMapunits(newDB):
     # Populate table 'SYSTEM - Mapunit Sort Specifications'. Required for Soil Data Viewer
@@ -1032,10 +1922,21 @@ def SortMapunits(newDB):
         return False
 
 ## ===================================================================================
-def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
+def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast, zipPath="", bMetadata=True):
     # Given zip file name, try to unzip it and then import the text files into the
     # Template database
     #
+    # 2026-10-17 If the zip file still exists (streaming mode, see UnzipDownload) the
+    # tabular text files are read directly from the zip file.
+    #
+    # 2026-10-17 Text files are imported using ImportTextBatched. Row counts and times for each
+    # table are added to the global dImportStats dictionary.
+    #
+    # 2026-10-17 bMetadata False skips AddMuName, which is run as a separate stage by the
+    # download pipeline.
+    #
+    zipTab = None
+
     try:
         # get database name from file listing in the new folder
         env.workspace = newFolder
@@ -1055,8 +1956,14 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
         # Using Adolfo's csv reader method to import tabular data from text files...
         tabularFolder = os.path.join(newFolder, "tabular")
 
+        if zipPath != "" and os.path.isfile(zipPath):
+            zipTab = zipfile.ZipFile(zipPath, "r")
+
+            if len([member for member in zipTab.namelist() if IsTabularText(member)]) < 1:
+                raise MyError, "No text files found in the tabular folder of " + os.path.basename(zipPath)
+
         # if the tabular directory is empty return False
-        if len(os.listdir(tabularFolder)) < 1:
+        elif len(os.listdir(tabularFolder)) < 1:
             raise MyError, "No text files found in the tabular folder"
 
         # Compare SSURGO version number (version.txt) with version number in Access database.
@@ -1070,6 +1977,12 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
         if len(tblInfo) == 0:
             raise MyError, "Failed to get information from mdstattabs table"
 
+        # Column data types from mdstattabcols, used to set up the value converters for each table
+        colInfo = GetColumnInfo(newDB)
+
+        if len(colInfo) == 0:
+            raise MyError, "Failed to get information from mdstattabcols table"
+
         # Create a list of textfiles to be imported. The import process MUST follow the
         # order in this list in order to maintain referential integrity. This list
         # will need to be updated if the SSURGO data model is changed in the future.
@@ -1124,9 +2037,6 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
 
             arcpy.SetProgressorLabel("Importing " + tbl + "...")
 
-            # Full path to SSURGO text file
-            txtPath = os.path.join(tabularFolder, txtFile + ".txt")
-
             # continue if the target table exists
             if arcpy.Exists(os.path.join(env.workspace, tbl)):
                 # Make sure there is no table with same name already present in ArcMap TOC
@@ -1135,52 +2045,34 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
                     delView = arcpy.mapping.ListTableViews(mxd, tbl, df)[0]
                     arcpy.mapping.RemoveTableView(df, delView)
 
-                # Create cursor for all fields to populate the current table
-                with arcpy.da.InsertCursor(os.path.join(env.workspace, tbl), "*") as cursor:
-                    # counter for current record number
-                    iRows = 1
-                    fldLengths = list()
-                    fldList = arcpy.Describe(os.path.join(env.workspace, tbl)).fields
-
-                    for fld in fldList:
-                        if fld.type != "OID":
+                # Output field length for each string field, used to truncate any string
+                # values that exceed the width of the target field
+                dFldLengths = dict()
+                fldList = arcpy.Describe(os.path.join(env.workspace, tbl)).fields
 
-                            if fld.type.lower() == "string":
-                                fldLengths.append(fld.length)
+                for fld in fldList:
+                    if fld.type.lower() == "string":
+                        dFldLengths[fld.name.lower()] = fld.length
 
-                            else:
-                                fldLengths.append(0)
-
-                    try:
-                        # Use csv reader to read each line in the text file
-                        for row in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                            # replace all blank values with 'None' so that the values are properly inserted
-                            # into integer values otherwise insertRow fails
-                            # truncate any string values that exceed the width of the target field
-                            newRow = list()
-                            fldNo = 0
+                converters = GetConverters(colInfo.get(tbl.lower(), []), dFldLengths)
+                fldLengths = GetFieldLengths(colInfo.get(tbl.lower(), []), dFldLengths)
+                txtFH = OpenTabularText(tabularFolder, txtFile + ".txt", zipTab)
+                startTime = time.time()
 
-                            for value in row:
-                                fldLen = fldLengths[fldNo]
-
-                                if value == '':
-                                    # substitute null for empty string
-                                    value = None
+                try:
+                    iRows = ImportTextBatched(txtFH, os.path.join(env.workspace, tbl), "*", converters, WriteRowsArcpy, fldLengths=fldLengths)
 
-                                elif fldLen:
-                                    # truncate string value
-                                    value = value[0:fldLen]
+                except MyError, e:
+                    raise MyError, str(e) + " (" + txtFile + ".txt)"
 
-                                newRow.append(value)
-                                fldNo += 1
+                finally:
+                    txtFH.close()
 
-                            cursor.insertRow(newRow)
-                            iRows += 1
+                if not tbl in dImportStats:
+                    dImportStats[tbl] = [0, 0.0]
 
-                    except:
-                        errorMsg()
-                        #PrintMsg(" \n" + str(row), 1)
-                        raise MyError, "Error loading line no. " + Number_Format(iRows, 0, True) + " of " + txtFile + ".txt"
+                dImportStats[tbl][0] += iRows
+                dImportStats[tbl][1] += time.time() - startTime
 
             else:
                 raise MyError, "Required table '" + tbl + "' not found in " + newDB
@@ -1252,7 +2144,8 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
             arcpy.SetProgressorLabel("Tabular import complete")
 
             # Import SSURGO metadata for shapefiles
-            bNamed = AddMuName(newFolder, bLast, bMuName)
+            if bMetadata:
+                bNamed = AddMuName(newFolder, bLast, bMuName, zipTab)
 
             # Check scratchfolder for xxImport*.log files
             # For some reason they are being put in the folder above env.scratchFolder (or is it one above scratchworkspace?)
@@ -1270,12 +2163,7 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
 
             # Remove all the text files from the tabular folder
             if bRemoveTXT:
-                txtList = glob.glob(os.path.join(tabularFolder, "*.txt"))
-                PrintMsg("\tRemoving textfiles...", 0)
-
-                for txtFile in txtList:
-                    if not txtFile.endswith("version.txt"):
-                        os.remove(txtFile)
+                RemoveTabularText(tabularFolder)
 
         return True
 
@@ -1288,8 +2176,25 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
         errorMsg()
         return False
 
+    finally:
+        if not zipTab is None:
+            zipTab.close()
+
+## ===================================================================================
+def RemoveTabularText(tabularFolder):
+    # Remove all the text files except version.txt from the tabular folder
+
+    txtList = glob.glob(os.path.join(tabularFolder, "*.txt"))
+    PrintMsg("\tRemoving textfiles...", 0)
+
+    for txtFile in txtList:
+        if not txtFile.endswith("version.txt"):
+            os.remove(txtFile)
+
+    return
+
 ## ===================================================================================
-def AddMuName(newFolder, bLast, bMuName):
+def AddMuName(newFolder, bLast, bMuName, zipTab=None):
     # Add metadata and optionally add muname column (map unit name) to soil polygon shapefile
     #
     # Started having problems with Addfield when the shapefile is on a Network Share.
@@ -1309,7 +2214,7 @@ def AddMuName(newFolder, bLast, bMuName):
         spatialFolder = os.path.join(newFolder, "spatial")
         env.workspace = spatialFolder
 
-        if not os.path.isfile(muTxt):
+        if zipTab is None and not os.path.isfile(muTxt):
             raise MyError, "Cannot find " + muTxt
 
         # Some of the tabular only shapefiles on WSS were created as polyline instead of
@@ -1333,8 +2238,9 @@ def AddMuName(newFolder, bLast, bMuName):
                     arcpy.AddField_management (muShp, "FARMLNDCL", "TEXT", "", "", 175)
 
                     # read mukey and muname into dictionary from mapunit.txt file
-                    with open(muTxt, 'r') as f:
-                        data = f.readlines()
+                    f = OpenTabularText(tabPath, "mapunit.txt", zipTab)
+                    data = f.readlines()
+                    f.close()
 
                     for rec in data:
                         s = rec.replace('"','')
@@ -1440,7 +2346,7 @@ def AddMuName(newFolder, bLast, bMuName):
 # main
 # Import system modules
 import arcpy, sys, os, locale, string, traceback, urllib, urllib2, shutil, zipfile, subprocess, glob, socket, csv, re
-import httplib
+import httplib, threading, Queue, time, itertools, json
 
 from arcpy import env
 from datetime import datetime
@@ -1458,6 +2364,46 @@ try:
     bRemoveTXT = arcpy.GetParameter(5)
     bMuName = arcpy.GetParameter(6)
 
+    # Optional maximum number of concurrent downloads. Older versions of the tool
+    # do not have this parameter, so default to one download at a time.
+    try:
+        maxDownloads = int(arcpy.GetParameterAsText(7))
+
+    except:
+        maxDownloads = 1
+
+    # Optional zip file cache folder and cache size limit in GB. Zip files are kept in the
+    # cache after they are unzipped, so that a survey with the same SAVEREST date can be
+    # extracted again without downloading it from Web Soil Survey.
+    try:
+        cacheFolder = arcpy.GetParameterAsText(8)
+
+    except:
+        cacheFolder = ""
+
+    try:
+        cacheLimit = int(float(arcpy.GetParameterAsText(9)) * 1024 * 1024 * 1024)
+
+    except:
+        cacheLimit = 10 * 1024 * 1024 * 1024  # 10 GB
+
+    # Optional number of unzip threads for the download pipeline
+    try:
+        maxUnzip = int(arcpy.GetParameterAsText(11))
+
+    except:
+        maxUnzip = 1
+
+    # Optional metadata-only date check. 'SDA' or the path to a local survey catalog file
+    # (AREASYMBOL,SAVEREST). Only surveys that are missing or older than the catalog date are downloaded.
+    try:
+        catalogSource = arcpy.GetParameterAsText(12)
+
+    except:
+        catalogSource = ""
+
+    cacheLock = threading.Lock()
+
     # Set tabular import to False if no Template database is specified
     if importDB == "":
         PrintMsg(" \nWarning! Tabular import turned off (no database specified)", 1)
@@ -1466,11 +2412,20 @@ try:
     else:
         bImport = True
 
+    # Optional streaming tabular import. The tabular text files are read directly from the
+    # zip file instead of being extracted to the tabular folder. Requires a Template database.
+    try:
+        bStreamTabular = bool(arcpy.GetParameter(10)) and bImport
+
+    except:
+        bStreamTabular = False
+
     # initialize error and progress trackers
     failedList = list()  # track list of failed downloads
     failedCnt = 0        # track consecutive failures
     skippedList = list() # track list of downloads that were skipped because a newer version already exists
     goodList = list()    # list of successful surveys
+    dImportStats = dict() # row count and seconds for each table imported by ImportTextBatched
     iGet = 0
 
     PrintMsg(" \n" + str(len(surveyList)) + " soil survey(s) selected for Web Soil Survey download", 0)
@@ -1490,42 +2445,58 @@ try:
         asDict[areaSym] = survey
 
     asList.sort()
+    downloadList = asList
 
-    arcpy.SetProgressor("step", "Downloading SSURGO data...",  0, len(asList), 1)
+    if catalogSource != "":
+        # Compare catalog dates with the local copies before contacting Web Soil Survey
+        downloadList, currentList = RefreshSurveyList(outputFolder, asList, bImport, catalogSource)
 
-    # Proccess list of areasymbols
-    #
-    for areaSym in asList:
-        #
-        # Run import process in order of listed Areasymbol values
+        if downloadList is None:
+            raise MyError, ""
+
+        skippedList.extend(currentList)
+
+    arcpy.SetProgressor("step", "Downloading SSURGO data...",  0, len(downloadList), 1)
+
+    if maxDownloads > 1 or maxUnzip > 1:
+        # Download and unzip several surveys at the same time while importing the finished ones
+        goodList, pipeSkipped, failedList = ProcessSurveysPipeline(outputFolder, importDB, downloadList, bImport, bRemoveTXT, maxDownloads, maxUnzip)
+        skippedList.extend(pipeSkipped)
+
+    else:
+        # Proccess list of areasymbols
         #
-        iGet += 1
+        for areaSym in downloadList:
+            #
+            # Run import process in order of listed Areasymbol values
+            #
+            iGet += 1
 
-        # Run import process
-        iTotal = len(asList)
-        arcpy.SetProgressorLabel("Downloading survey " + areaSym + " from Web Soil Survey  (number " + str(iGet) + " of " + str(len(asList)) + " total)")
-        bProcessed = ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iTotal)
+            # Run import process
+            iTotal = len(downloadList)
+            arcpy.SetProgressorLabel("Downloading survey " + areaSym + " from Web Soil Survey  (number " + str(iGet) + " of " + str(len(downloadList)) + " total)")
+            bProcessed = ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iTotal)
 
-        if bProcessed == "Failed":
-            failedList.append(areaSym)
-            failedCnt += 1
-            #raise MyError, ""
+            if bProcessed == "Failed":
+                failedList.append(areaSym)
+                failedCnt += 1
+                #raise MyError, ""
 
-        elif bProcessed == "Skipped":
-            skippedList.append(areaSym)
+            elif bProcessed == "Skipped":
+                skippedList.append(areaSym)
 
-        elif bProcessed == "Successful":
-            # download successful
-            failedCnt = 0
-            goodList.append(areaSym)
+            elif bProcessed == "Successful":
+                # download successful
+                failedCnt = 0
+                goodList.append(areaSym)
 
-        if failedCnt > 4:
-            raise MyError, "Five consecutive download failures, bailing out"
+            if failedCnt > 4:
+                raise MyError, "Five consecutive download failures, bailing out"
 
-        if len(failedList) > 24:
-            raise MyError, "Twenty-five download failures, bailing out"
+            if len(failedList) > 24:
+                raise MyError, "Twenty-five download failures, bailing out"
 
-        arcpy.SetProgressorPosition()
+            arcpy.SetProgressorPosition()
 
     if len(failedList) > 0 or len(skippedList) > 0:
         if len(skippedList) == len(asList):
@@ -1550,6 +2521,9 @@ try:
             PrintMsg(" \nAll " + Number_Format(len(asList), 0, True) + " surveys succcessfully downloaded (no tabular import) \n ", 0)
 
 
+    if len(dImportStats) > 0:
+        ReportImportRates(dImportStats)
+
     arcpy.SetProgressorLabel("Processing complete...")
     env.workspace = outputFolder
 
@@ -71,6 +71,35 @@
 # interphhc
 
 # 2020-03-30. Removed the above columns from the ImportTables function as well.
+#
+# 2026-10-17. Added batched import (ImportTextBatched) for the csv tabular import. Rows are converted in
+#             blocks using per-column converters built from mdstattabcols and written through a
+#             pluggable row writer (arcpy InsertCursor, or executemany into SQLite for testing).
+#             Rows/sec for each table are reported at the end of the import.
+#
+# 2026-10-17. Replaced the key value lists used to skip duplicate sdv* records with a set-based dedup
+#             index (GetDedupIndex, DedupFilter), which also covers distinterpmd. The index is loaded
+#             from the records already in the output database, so it carries over between runs.
+#
+# 2026-10-17. Added optional parallel tabular import (parameter 7, number of processes). Each survey's text
+#             files are parsed by a worker process and the parsed records are written to the geodatabase
+#             by a single writer in referential order (ImportTabularParallel, ParseSurveyTabular).
+#
+# 2026-10-17. Added incremental update mode (parameter 8). Survey SAVEREST dates are compared with an existing
+#             gSSURGO database. Only the new and updated surveys are appended. The old versions of the updated
+#             surveys are deleted afterwards (cascading from areasymbol through the mdstatrshipdet relationships),
+#             and a failed import removes the appended records again.
+#
+# 2026-10-17. No tool in the Soil Data Development Toolbox runs this script; the 'Create gSSURGO DB'
+#             tools use SSURGO_Convert_to_GeodatabaseF.py. To run it as a script tool, copy one of those
+#             tools, point it at this script, and append these parameters after parameter 6
+#             (both Optional, Input):
+#
+#             7  Number of tabular import processes   Long       default 1 (serial import)
+#             8  Update existing database             Boolean    default False
+#
+#             Scripts that import this module pass the same settings to gSSURGO() as the
+#             maxWorkers and bIncremental keyword arguments.
 
 
 ## ===================================================================================
@@ -722,6 +751,306 @@ def GetTableInfo(newDB):
         errorMsg()
         return dict()
 
+## ===================================================================================
+def GetColumnInfo(newDB):
+    # Read the column metadata from the MDSTATTABCOLS table for the batched tabular import.
+    #
+    # Returns a dictionary with the table physical name as key and a list of
+    # (column physical name, logical data type, field size) in column sequence order.
+    # The column sequence matches the column order in the SSURGO text files.
+
+    try:
+        colInfo = dict()
+        mdTable = os.path.join(newDB, "mdstattabcols")
+
+        if not arcpy.Exists(mdTable):
+            raise MyError, "Missing mdstattabcols table"
+
+        fldNames = ["tabphyname", "colsequence", "colphyname", "logicaldatatype", "fieldsize"]
+
+        with arcpy.da.SearchCursor(mdTable, fldNames) as cur:
+            for rec in cur:
+                tabName = rec[0].lower()
+
+                if not tabName in colInfo:
+                    colInfo[tabName] = list()
+
+                colInfo[tabName].append((rec[1], rec[2].lower(), rec[3].lower(), rec[4]))
+
+        for tabName in colInfo:
+            colInfo[tabName] = [(colName, dataType, fldSize) for seq, colName, dataType, fldSize in sorted(colInfo[tabName])]
+
+        return colInfo
+
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return dict()
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===================================================================================
+def GetConverters(colList, dFldLengths, codePage=None):
+    # Create one conversion function for each column in a SSURGO text file. Done once per
+    # table so that the batched import does not have to look up the data type for every value.
+    #
+    # colList is the list of (column name, logical data type, field size) from GetColumnInfo.
+    # dFldLengths has the output field length for each string column name (0 for other types).
+    #
+    # Integer and Float columns are converted to int and float. All other columns are kept as
+    # strings, truncated to the output field length and optionally decoded using codePage.
+    # Empty strings are converted to None (null).
+
+    converters = list()
+
+    for colName, dataType, fldSize in colList:
+        fldLen = dFldLengths.get(colName, 0)
+
+        if dataType == "integer":
+            converters.append(lambda val: int(val) if val else None)
+
+        elif dataType == "float":
+            converters.append(lambda val: float(val) if val else None)
+
+        elif codePage and fldLen > 0:
+            converters.append(lambda val, n=fldLen: val.decode(codePage)[0:n] if val else None)
+
+        elif codePage:
+            converters.append(lambda val: val.decode(codePage) if val else None)
+
+        elif fldLen > 0:
+            converters.append(lambda val, n=fldLen: val[0:n] if val else None)
+
+        else:
+            converters.append(lambda val: val if val else None)
+
+    return converters
+
+## ===================================================================================
+def GetFieldLengths(colList, dFldLengths):
+    # Output field length for each column in colList (0 for non-string columns), in the
+    # same order as the converters from GetConverters. Used by ImportTextBatched for rows
+    # that can't be converted.
+
+    return [dFldLengths.get(colName, 0) for colName, dataType, fldSize in colList]
+
+## ===================================================================================
+def StringRow(rowInFile, fldLengths, nLengths):
+    # Fallback for ImportTextBatched when a row doesn't match the column metadata or fails the
+    # conversion. All values are kept as strings, empty strings are converted to None and
+    # string values are truncated to the width of the target field.
+
+    newRow = list()
+
+    for fldNo, val in enumerate(rowInFile):
+        if not val:
+            newRow.append(None)
+
+        elif fldNo < nLengths and fldLengths[fldNo] > 0:
+            newRow.append(val[0:fldLengths[fldNo]])
+
+        else:
+            newRow.append(val)
+
+    return newRow
+
+## ===================================================================================
+def ImportTextBatched(txtFH, outputTbl, fldNames, converters, rowWriter, rowFilter=None, blockSize=10000, fldLengths=None):
+    # Batched import of one pipe-delimited SSURGO text file.
+    #
+    # Rows are read from txtFH and type-converted in blocks of blockSize rows, and each block is
+    # passed to rowWriter(outputTbl, fldNames, rows). WriteRowsArcpy is the normal rowWriter.
+    # WriteRowsSQLite can be used as a local stand-in (functools.partial(WriteRowsSQLite, conn)).
+    #
+    # rowFilter(row) is applied to each converted row and can return a modified row, or None
+    # to skip the row. Rows that don't match the column metadata or fail the conversion are
+    # passed as strings (empty strings as None), the same as the original row-by-row import.
+    # fldLengths is the output field length for each column (0 for non-string columns, see
+    # GetFieldLengths) and is used to truncate the strings in those rows.
+    #
+    # Returns the number of rows read from the text file.
+
+    iRows = 0
+    nCols = len(converters)
+    reader = csv.reader(txtFH, delimiter='|', quotechar='"')
+
+    if fldLengths is None:
+        fldLengths = list()
+
+    nLengths = len(fldLengths)
+
+    while True:
+        rows = list()
+        iRead = 0
+
+        for rowInFile in itertools.islice(reader, blockSize):
+            iRead += 1
+
+            if len(rowInFile) == nCols:
+                try:
+                    newRow = [conv(val) for conv, val in zip(converters, rowInFile)]
+
+                except ValueError:
+                    newRow = StringRow(rowInFile, fldLengths, nLengths)
+
+            else:
+                newRow = StringRow(rowInFile, fldLengths, nLengths)
+
+            if not rowFilter is None:
+                newRow = rowFilter(newRow)
+
+                if newRow is None:
+                    continue
+
+            rows.append(newRow)
+
+        if iRead == 0:
+            break
+
+        if len(rows) > 0:
+            try:
+                rowWriter(outputTbl, fldNames, rows)
+
+            except:
+                errorMsg()
+                raise MyError, "Error writing lines " + Number_Format(iRows + 1, 0, True) + " to " + Number_Format(iRows + iRead, 0, True) + " into " + os.path.basename(outputTbl)
+
+        iRows += iRead
+
+    return iRows
+
+## ===================================================================================
+def WriteRowsArcpy(outputTbl, fldNames, rows):
+    # Bulk writer for ImportTextBatched. Writes a block of rows using an arcpy InsertCursor.
+
+    with arcpy.da.InsertCursor(outputTbl, fldNames) as cursor:
+        for row in rows:
+            cursor.insertRow(row)
+
+    return
+
+## ===================================================================================
+def WriteRowsSQLite(conn, outputTbl, fldNames, rows):
+    # Bulk writer for ImportTextBatched that uses executemany on a sqlite3 connection.
+    # Local stand-in for WriteRowsArcpy when testing or timing the import outside of ArcGIS.
+    # The table must already exist in the SQLite database.
+
+    if fldNames == "*":
+        sql = "INSERT INTO " + os.path.basename(outputTbl) + " VALUES (" + ", ".join(["?"] * len(rows[0])) + ")"
+
+    else:
+        sql = "INSERT INTO " + os.path.basename(outputTbl) + " (" + ", ".join(fldNames) + ") VALUES (" + ", ".join(["?"] * len(fldNames)) + ")"
+
+    conn.executemany(sql, rows)
+
+    return
+
+## ===================================================================================
+def ReportImportRates(dImportStats):
+    # Print rows per second for each table imported by ImportTextBatched, slowest tables first.
+    # dImportStats has table name as key and [row count, seconds] as value.
+
+    try:
+        PrintMsg(" \nTabular import rates:", 0)
+
+        for secs, tbl, rowCnt in sorted([(stats[1], tbl, stats[0]) for tbl, stats in dImportStats.items()], reverse=True):
+            if secs > 0:
+                rate = rowCnt / secs
+
+            else:
+                rate = rowCnt
+
+            PrintMsg("\t" + tbl + ": " + Number_Format(rowCnt, 0, True) + " rows in " + Number_Format(secs, 1, True) + " seconds (" + Number_Format(rate, 0, True) + " rows/sec)", 0)
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def CointerpRow(row):
+    # rowFilter for the batched cointerp import. Only ruledepth 0 and NCCPI (mrulekey 54955)
+    # rows are kept, without the columns that were removed from the gSSURGO cointerp table.
+    # should I make the 54955 a dynamic variable?
+
+    if str(row[6]) == '0' or str(row[1]) == '54955':
+        return row[0:7] + row[11:13] + row[15:19]
+
+    return None
+
+## ===================================================================================
+def GetDedupIndex(outputWS):
+    # Set up the primary key dedup index for tables that are repeated in every survey (sdv*)
+    # or that have a natural key (distinterpmd). Records with a key value that has already
+    # been imported are skipped.
+    #
+    # Returns a dictionary with the table name as key and [key field indexes, set of key values]
+    # as value. The field indexes are for the list of fields without OBJECTID. The key value
+    # sets are loaded from any records already in the output tables, so the index carries over
+    # between runs that append surveys to an existing database.
+
+    try:
+        dDedup = dict()
+
+        # key field names for each table
+        dKeyFields = dict()
+        dKeyFields['sdvfolderattribute'] = ["attributekey"]
+        dKeyFields['sdvattribute'] = ["attributekey"]
+        dKeyFields['sdvfolder'] = ["folderkey"]
+        dKeyFields['sdvalgorithm'] = ["algorithmsequence"]
+        dKeyFields['distinterpmd'] = ["distinterpmdkey"]
+
+        for tbl, keyFields in dKeyFields.items():
+            outputTbl = os.path.join(outputWS, tbl)
+
+            if not arcpy.Exists(outputTbl):
+                continue
+
+            fldNames = [fld.name.lower() for fld in arcpy.Describe(outputTbl).fields if fld.type != "OID"]
+            keyIndexes = [fldNames.index(keyField) for keyField in keyFields]
+            keySet = set()
+
+            with arcpy.da.SearchCursor(outputTbl, keyFields) as cur:
+                for rec in cur:
+                    keySet.add(DedupKey(rec, range(len(keyFields))))
+
+            dDedup[tbl] = [keyIndexes, keySet]
+
+        return dDedup
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===================================================================================
+def DedupKey(row, keyIndexes):
+    # Key value for the dedup index. Values are compared as strings so that a key read
+    # as text ('123') matches the same key read from an integer field (123).
+
+    if len(keyIndexes) == 1:
+        return str(row[keyIndexes[0]])
+
+    return tuple([str(row[i]) for i in keyIndexes])
+
+## ===================================================================================
+def DedupFilter(keyIndexes, keySet):
+    # Create a rowFilter for ImportTextBatched (or any row loop) that returns None for
+    # records whose key is already in keySet. New keys are added to keySet.
+
+    def dedupRow(row):
+        keyVal = DedupKey(row, keyIndexes)
+
+        if keyVal in keySet:
+            return None
+
+        keySet.add(keyVal)
+        return row
+
+    return dedupRow
+
 ## ===================================================================================
 def ImportMDTables(newDB, dbList):
     # Import as single set of metadata tables from first survey area's Access database
@@ -972,34 +1301,12 @@ def ImportTables(outputWS, dbList, dbVersion):
         if len(tblList) == 0:
             raise MyError, "No tables found in " +  outputWS
 
-        # Set up enforcement of unique keys for SDV tables
+        # Set up enforcement of unique keys for SDV tables and other tables with a natural key
         #
-        dIndex = dict()  # dictionary storing field index for primary key of each SDV table
-        dKeys = dict()  # dictionary containing a list of key values for each SDV table
-        dFields = dict() # dictionary containing list of fields for eacha SDV table
-
-        keyIndx = dict()  # dictionary containing key field index number for each SDV table
-        keyFields = dict() # dictionary containing a list of key field names for each SDV table
-        keyFields['sdvfolderattribute'] = "attributekey"
-        keyFields['sdvattribute'] = "attributekey"
-        keyFields['sdvfolder'] = "folderkey"
-        keyFields['sdvalgorithm'] = "algorithmsequence"
-        sdvTables = ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']
-
-        for sdvTbl in sdvTables:
+        dDedup = GetDedupIndex(outputWS)  # key field indexes and set of key values for each table
 
-            keyField = keyFields[sdvTbl]
-
-            fldList = arcpy.Describe(os.path.join(outputWS, sdvTbl)).fields
-            fldNames = list()
-
-            for fld in fldList:
-                if fld.type != "OID":
-                    fldNames.append(fld.name.lower())
-
-            #dFields[sdvTbl] = fldNames                 # store list of fields for this SDV table
-            dIndex[sdvTbl] = fldNames.index(keyField)  # store field index for primary key in this SDV table
-            dKeys[sdvTbl] = []                         # initialize key values list for this SDV table
+        if len(dDedup) == 0:
+            raise MyError, "Failed to set up unique key index for SDV tables"
 
         # End of enforce unique keys setup...
 
@@ -1066,7 +1373,7 @@ def ImportTables(outputWS, dbList, dbVersion):
                                 if not inFld.type == "OID":
                                     mdbFieldNames.append(inFld.name.upper())
 
-                        if not tblName in sdvTables:
+                        if not tblName in dDedup:
                             # Import all tables except SDV*
 
                             with arcpy.da.SearchCursor(inputTbl, mdbFieldNames) as inCursor:
@@ -1078,16 +1385,16 @@ def ImportTables(outputWS, dbList, dbVersion):
 
                         else:
                             # Import SDV tables while enforcing unique key values
-                            # 'sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm'
+                            # 'sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm', 'distinterpmd'
                             #
+                            keyIndexes, keySet = dDedup[tblName]
+                            dedupRow = DedupFilter(keyIndexes, keySet)
+
                             with arcpy.da.SearchCursor(inputTbl, mdbFieldNames) as inCursor:
 
                                 with arcpy.da.InsertCursor(outputTbl, mdbFieldNames) as outCursor:
                                     for inRow in inCursor:
-                                        keyVal = inRow[dIndex[tblName]]
-
-                                        if not keyVal in dKeys[tblName]:
-                                            dKeys[tblName].append(keyVal)
+                                        if not dedupRow(inRow) is None:
                                             outCursor.insertRow(inRow)
 
                             if inputTbl == "sdvattribute":
@@ -1132,13 +1439,267 @@ def ImportTables(outputWS, dbList, dbVersion):
         return False
 
 ## ===================================================================================
-def ImportTabular(newDB, dbList, dbVersion, codePage):
+def TabularTextFiles():
+    # Create a list of textfiles to be imported. The import process MUST follow the
+    # order in this list in order to maintain referential integrity. This list
+    # will need to be updated if the SSURGO data model is changed in the future.
+    #
+    txtFiles = ["distmd","legend","distimd","distlmd","lareao","ltext","mapunit", \
+    "comp","muaggatt","muareao","mucrpyd","mutext","chorizon","ccancov","ccrpyd", \
+    "cdfeat","cecoclas","ceplants","cerosnac","cfprod","cgeomord","chydcrit", \
+    "cinterp","cmonth", "cpmatgrp", "cpwndbrk","crstrcts","csfrags","ctxfmmin", \
+    "ctxmoicl","ctext","ctreestm","ctxfmoth","chaashto","chconsis","chdsuffx", \
+    "chfrags","chpores","chstrgrp","chtext","chtexgrp","chunifie","cfprodo","cpmat","csmoist", \
+    "cstemp","csmorgc","csmorhpp","csmormr","csmorss","chstr","chtextur", \
+    "chtexmod","sacatlog","sainterp","sdvalgorithm","sdvattribute","sdvfolder","sdvfolderattribute"]
+
+    return txtFiles
+
+## ===================================================================================
+def ParseSurveyTabular(inputDB, dbVersion, codePage, tableSpecs):
+    # Worker process function for ImportTabularParallel. Reads and type-converts all of the
+    # text files for one survey area, without writing anything to the output geodatabase.
+    # No arcpy calls are made here, so that several surveys can be parsed at the same time.
+    #
+    # tableSpecs is a list of (txtFile, tbl, colList, dFldLengths) in referential import order.
+    #
+    # Returns (areasymbol, list of (tbl, rows) in the same order as tableSpecs, featdesc rows, error message).
+    # The error message is an empty string if the survey was parsed successfully.
+
+    soilsFolder = os.path.dirname(os.path.dirname(inputDB))
+    fnAreasymbol = soilsFolder[(soilsFolder.rfind("_") + 1):].upper()
+    tblRows = list()
+    featRows = list()
+
+    try:
+        tabularFolder = os.path.join(soilsFolder, "tabular")
+
+        if not os.path.isdir(tabularFolder) or len(os.listdir(tabularFolder)) < 1:
+            raise MyError, "No text files found in the tabular folder"
+
+        # Make sure that input tabular data has the correct SSURGO version for this script
+        versionTxt = os.path.join(tabularFolder, "version.txt")
+        ssurgoVersion = 0
+
+        if os.path.isfile(versionTxt):
+            fh = open(versionTxt, "r")
+            ssurgoVersion = int(fh.readline().split(".")[0])
+            fh.close()
+
+        if ssurgoVersion <> dbVersion:
+            raise MyError, "Tabular data in " + tabularFolder + " (SSURGO Version " + str(ssurgoVersion) + ") is not supported"
+
+        csv.field_size_limit(512000)
+
+        for txtFile, tbl, colList, dFldLengths in tableSpecs:
+            txtPath = os.path.join(tabularFolder, txtFile + ".txt")
+
+            if not os.path.isfile(txtPath):
+                raise MyError, "Missing tabular data file (" + txtPath + ")"
+
+            if tbl.endswith("text"):
+                # handle non-utf8 characters
+                converters = GetConverters(colList, dFldLengths, codePage)
+                rowFilter = None
+
+            elif tbl == "cointerp":
+                # skip the cointerp columns and records not used by gSSURGO
+                converters = GetConverters(colList, dFldLengths)
+                rowFilter = CointerpRow
+
+            else:
+                converters = GetConverters(colList, dFldLengths)
+                rowFilter = None
+
+            rows = list()
+            txtFH = open(txtPath, 'rb')
+
+            try:
+                ImportTextBatched(txtFH, tbl, "*", converters, lambda outputTbl, fldNames, newRows: rows.extend(newRows), rowFilter, fldLengths=GetFieldLengths(colList, dFldLengths))
+
+            finally:
+                txtFH.close()
+
+            tblRows.append((tbl, rows))
+
+        # featdesc records from the spatial folder (soilsf_t_al001.txt)
+        txtPath = os.path.join(soilsFolder, "spatial", "soilsf_t_" + fnAreasymbol + ".txt")
+
+        if os.path.isfile(txtPath):
+            txtFH = open(txtPath, 'rb')
+
+            try:
+                for rowInFile in csv.reader(txtFH, delimiter='|', quotechar='"'):
+                    featRows.append([None if value == '' else value for value in rowInFile])
+
+            finally:
+                txtFH.close()
+
+        return fnAreasymbol, tblRows, featRows, ""
+
+    except MyError, e:
+        return fnAreasymbol, list(), list(), str(e)
+
+    except:
+        return fnAreasymbol, list(), list(), "Error parsing tabular data: " + traceback.format_exc()
+
+## ===================================================================================
+def ImportTabularParallel(newDB, dbList, dbVersion, codePage, colInfo, dDedup, dImportStats, maxWorkers):
+    # Parallel version of the ImportTabular text file import. The text files for each survey are
+    # parsed and type-converted in a pool of worker processes (ParseSurveyTabular). This process
+    # is the only writer. Surveys are written in dbList order and tables in TabularTextFiles order,
+    # so that referential integrity is maintained. Duplicate sdv* records are skipped here using
+    # the dedup index, since it is shared by all surveys.
+    #
+    # The number of parsed surveys waiting to be written is limited to twice the number of workers.
+
+    try:
+        import multiprocessing, collections
+
+        # Table information and field lengths are the same for all surveys
+        tblInfo = GetTableInfo(newDB)
+        tableSpecs = list()
+        dFldNames = dict()
+
+        for txtFile in TabularTextFiles():
+            if not txtFile in tblInfo:
+                raise MyError, "Textfile reference '" + txtFile + "' not found in 'mdstattabs table'"
+
+            tbl, aliasName = tblInfo[txtFile]
+
+            if not arcpy.Exists(os.path.join(newDB, tbl)):
+                raise MyError, "Required table '" + tbl + "' not found in " + newDB
+
+            fldNames = list()
+            dFldLengths = dict()  # output field length for each string field
+
+            for fld in arcpy.Describe(os.path.join(newDB, tbl)).fields:
+                if fld.type != "OID":
+                    fldNames.append(fld.name)
+
+                    if fld.type.lower() == "string":
+                        dFldLengths[fld.name.lower()] = fld.length
+
+            if len(fldNames) == 0:
+                raise MyError, "Failed to get field names for " + tbl
+
+            dFldNames[tbl] = fldNames
+            tableSpecs.append((txtFile, tbl, colInfo.get(tbl.lower(), []), dFldLengths))
+
+        featTbl = os.path.join(newDB, "featdesc")
+        featFlds = [fld.name for fld in arcpy.Describe(featTbl).fields if fld.type != "OID"]
+        monthList = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+        monthTbl = os.path.join(newDB, "month")
+
+        # Within ArcMap sys.executable is ArcMap.exe, which can't be used for the worker processes
+        if not os.path.basename(sys.executable).lower().startswith("python"):
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+
+        PrintMsg(" \nParsing tabular data using " + str(maxWorkers) + " processes", 0)
+        pool = multiprocessing.Pool(maxWorkers)
+        bPoolOK = False
+
+        try:
+            jobs = collections.deque()
+            dbQueue = collections.deque(dbList)
+            iCntr = 0
+
+            while len(dbQueue) > 0 or len(jobs) > 0:
+
+                while len(dbQueue) > 0 and len(jobs) < (maxWorkers * 2):
+                    jobs.append(pool.apply_async(ParseSurveyTabular, (dbQueue.popleft(), dbVersion, codePage, tableSpecs)))
+
+                fnAreasymbol, tblRows, featRows, errMsg = jobs.popleft().get()
+                iCntr += 1
+
+                if errMsg != "":
+                    raise MyError, fnAreasymbol + ": " + errMsg
+
+                arcpy.SetProgressorLabel("Importing " +  fnAreasymbol + " tabular data  (" + Number_Format(iCntr, 0, True) + " of " + Number_Format(len(dbList), 0, True) + ")")
+
+                for tbl, rows in tblRows:
+                    startTime = time.time()
+
+                    if tbl in dDedup:
+                        # enforce unique key values
+                        dedupRow = DedupFilter(dDedup[tbl][0], dDedup[tbl][1])
+                        newRows = [row for row in rows if not dedupRow(row) is None]
+
+                    else:
+                        newRows = rows
+
+                    if len(newRows) > 0:
+                        try:
+                            WriteRowsArcpy(os.path.join(newDB, tbl), dFldNames[tbl], newRows)
+
+                        except:
+                            errorMsg()
+                            raise MyError, "Error writing " + fnAreasymbol + " records into " + tbl
+
+                    if not tbl in dImportStats:
+                        dImportStats[tbl] = [0, 0.0]
+
+                    dImportStats[tbl][0] += len(rows)
+                    dImportStats[tbl][1] += time.time() - startTime
+
+                # Populate the month table (pre-populated in the Access Template database, no text file)
+                if int(arcpy.GetCount_management(monthTbl).getOutput(0)) < 12:
+                    with arcpy.da.InsertCursor(monthTbl, ["monthseq", "monthname"]) as cur:
+                        for seq, month in enumerate(monthList):
+                            cur.insertRow([(seq + 1), month])
+
+                if len(featRows) > 0:
+                    try:
+                        WriteRowsArcpy(featTbl, featFlds, featRows)
+
+                    except:
+                        errorMsg()
+                        raise MyError, "Error writing " + fnAreasymbol + " records into featdesc"
+
+                # Check the database to make sure that it completed properly, with at least the
+                # SAVEREST date populated in the SACATALOG table.
+                if GetTemplateDate(newDB, fnAreasymbol) == 0:
+                    raise MyError, "Failed to get Template Date for " + fnAreasymbol
+
+            bPoolOK = True
+
+        finally:
+            if bPoolOK:
+                pool.close()
+
+            else:
+                pool.terminate()
+
+            pool.join()
+
+        arcpy.ResetProgressor()
+
+        return True
+
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def ImportTabular(newDB, dbList, dbVersion, codePage, maxWorkers=1):
     # Use csv reader method of importing text files into geodatabase for those
     # that do not have a populated SSURGO database
     #
     # 2015-12-16 Need to eliminate duplicate records in sdv* tables. Also need to index primary keys
     # for each of these tables.
     #
+    # 2026-10-17 All tables are imported using ImportTextBatched. Values are converted in blocks
+    # using the column data types from mdstattabcols. Reports rows/sec for each table.
+    # Duplicate sdv* and distinterpmd records are skipped using the dedup index (GetDedupIndex).
+    #
+    # 2026-10-17 If maxWorkers is greater than 1, the surveys are parsed in separate worker
+    # processes and written by this process (ImportTabularParallel).
+    #
     try:
         # new code from ImportTables
         #codePage = 'cp1252'
@@ -1152,42 +1713,37 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
         PrintMsg(" \nImporting tabular data...", 0)
 
         iCntr = 0
+        dImportStats = dict()  # row count and seconds for each table imported by ImportTextBatched
+
+        # Column data types from mdstattabcols, used to set up the value converters for each table
+        colInfo = GetColumnInfo(newDB)
 
-        # Set up enforcement of unique keys for SDV tables
+        if len(colInfo) == 0:
+            raise MyError, ""
+
+        # Set up enforcement of unique keys for SDV tables and other tables with a natural key
         #
-        sdvTables = ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']
-        dIndex = dict()  # dictionary storing field index for primary key of each SDV table
-        dKeys = dict()  # dictionary containing a list of key values for each SDV table
-        dFields = dict() # dictionary containing list of fields for eacha SDV table
-
-        keyIndx = dict()  # dictionary containing key field index number for each SDV table
-        keyFields = dict() # dictionary containing a list of key field names for each SDV table
-        keyFields['sdvfolderattribute'] = "attributekey"
-        keyFields['sdvattribute'] = "attributekey"
-        keyFields['sdvfolder'] = "folderkey"
-        keyFields['sdvalgorithm'] = "algorithmsequence"
-
-        for sdvTbl in sdvTables:
-            #sdvTbl = os.path.join(outputWS, "sdvfolderattribute")
-            #indx = keyIndx[sdvTbl]
-            keyField = keyFields[sdvTbl]
-
-            fldList = arcpy.Describe(os.path.join(newDB, sdvTbl)).fields
-            fldNames = list()
+        dDedup = GetDedupIndex(newDB)  # key field indexes and set of key values for each table
 
-            for fld in fldList:
-                if fld.type != "OID":
-                    fldNames.append(fld.name.lower())
+        if len(dDedup) == 0:
+            raise MyError, "Failed to set up unique key index for SDV tables"
 
-            dFields[sdvTbl] = fldNames                 # store list of fields for this SDV table
-            dIndex[sdvTbl] = fldNames.index(keyField)  # store field index for primary key in this SDV table
-            dKeys[sdvTbl] = []                         # initialize key values list for this SDV table
 
+        if maxWorkers > 1 and len(dbList) > 1:
+            # Parse the surveys in worker processes. All records are written by ImportTabularParallel,
+            # so there is nothing left for the sequential import below.
+            if not ImportTabularParallel(newDB, dbList, dbVersion, codePage, colInfo, dDedup, dImportStats, maxWorkers):
+                raise MyError, ""
+
+            sequentialList = list()
+
+        else:
+            sequentialList = dbList
 
         # Add SDV* table relationships. These aren't part of the XML workspace doc as of FY2018 gSSURGO
         # Not normally necessary, but useful for diagnostics
 
-        for inputDB in dbList:
+        for inputDB in sequentialList:
             iCntr += 1
             newFolder = os.path.dirname(os.path.dirname(inputDB)) # survey dataset folder
 
@@ -1224,14 +1780,7 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             # order in this list in order to maintain referential integrity. This list
             # will need to be updated if the SSURGO data model is changed in the future.
             #
-            txtFiles = ["distmd","legend","distimd","distlmd","lareao","ltext","mapunit", \
-            "comp","muaggatt","muareao","mucrpyd","mutext","chorizon","ccancov","ccrpyd", \
-            "cdfeat","cecoclas","ceplants","cerosnac","cfprod","cgeomord","chydcrit", \
-            "cinterp","cmonth", "cpmatgrp", "cpwndbrk","crstrcts","csfrags","ctxfmmin", \
-            "ctxmoicl","ctext","ctreestm","ctxfmoth","chaashto","chconsis","chdsuffx", \
-            "chfrags","chpores","chstrgrp","chtext","chtexgrp","chunifie","cfprodo","cpmat","csmoist", \
-            "cstemp","csmorgc","csmorhpp","csmormr","csmorss","chstr","chtextur", \
-            "chtexmod","sacatlog","sainterp","sdvalgorithm","sdvattribute","sdvfolder","sdvfolderattribute"]
+            txtFiles = TabularTextFiles()
             # Need to add featdesc import as a separate item (ie. spatial\soilsf_t_al001.txt: featdesc)
 
             # Static Metadata Table that records the metadata for all columns of all tables
@@ -1272,153 +1821,60 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                     # For a geodatabase, I need to remove OBJECTID from the fields list
                     fldList = arcpy.Describe(tbl).fields
                     fldNames = list()
-                    #fldLengths = list()
+                    dFldLengths = dict()  # output field length for each string field
 
                     for fld in fldList:
                         if fld.type != "OID":
                             fldNames.append(fld.name)
 
+                            if fld.type.lower() == "string":
+                                dFldLengths[fld.name.lower()] = fld.length
+
                     if len(fldNames) == 0:
                         raise MyError, "Failed to get field names for " + tbl
 
-                    if not tbl in ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']:
-                        # Import all tables except SDV
-                        #
-                        time.sleep(0.05)  # Occasional write errors
-
-                        if tbl.endswith("text"):
-                            with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                                # counter for current record number
-                                iRows = 1  # input textfile line number
-
-                                #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
-
-                                    try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                            # replace all blank values with 'None' so that the values are properly inserted
-                                            # into integer values otherwise insertRow fails
-                                            fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
-                                            #fixedRow = [x if x else None for x in rowInFile]  # figure out which tables have non-utf8 characters
-                                            cursor.insertRow(fixedRow) # was fixedRow
-                                            iRows += 1
-
-                                    except:
-                                        PrintMsg(" \n" + str(fixedRow), 1)
-                                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
-                                        raise MyError, err
-
-                                else:
-                                    raise MyError, "Missing tabular data file (" + txtPath + ")"
-
-                        elif tbl == "cointerp":
-
-                            with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                                # counter for current record number
-                                iRows = 1  # input textfile line number
-
-                                #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
-
-                                    try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                            # replace all blank values with 'None' so that the values are properly inserted
-                                            # into integer values otherwise insertRow fails
-                                            #fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
-                                            r1 = rowInFile[0:7]
-                                            r2 = rowInFile[11:13]
-                                            r3 = rowInFile[15:19]
-                                            r1.extend(r2)
-                                            r1.extend(r3)
-                                            fixedRow = [x if x else None for x in r1]  # figure out which tables have non-utf8 characters
-                                            #mrulekey = fixedRow[1]
-                                            #ruledepth = fixedRow[6]
-
-                                            if (fixedRow[6] == '0') or (fixedRow[1] == '54955'):
-                                                # NCCPI or ruledepth zero
-                                                # should I make the 54955 a dynamic variable?
-                                                cursor.insertRow(fixedRow) # was fixedRow
-                                                #PrintMsg("\t" + str(fixedRow[1]) + ";\t" + str(fixedRow[2]) + ";\t" + str(fixedRow[6]), 1)
-                                            iRows += 1
-
-                                    except:
-                                        #PrintMsg(" \n" + ", ".join(fldNames), 1)
-                                        PrintMsg(str(fixedRow), 1)
-                                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
-                                        raise MyError, err
-
-                                else:
-                                    raise MyError, "Missing tabular data file (" + txtPath + ")"
+                    # Import all tables, skipping duplicate records in the SDV tables
+                    #
+                    time.sleep(0.05)  # Occasional write errors
 
+                    #if os.path.isfile(txtPath):
+                    if not arcpy.Exists(txtPath):
+                        raise MyError, "Missing tabular data file (" + txtPath + ")"
 
-                        else:
-                            with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                                # counter for current record number
-                                iRows = 1  # input textfile line number
+                    if tbl.endswith("text"):
+                        # handle non-utf8 characters
+                        converters = GetConverters(colInfo.get(tbl.lower(), []), dFldLengths, codePage)
+                        rowFilter = None
+
+                    elif tbl == "cointerp":
+                        # skip the cointerp columns and records not used by gSSURGO
+                        converters = GetConverters(colInfo.get(tbl.lower(), []), dFldLengths)
+                        rowFilter = CointerpRow
+
+                    elif tbl in dDedup:
+                        # enforce unique key values
+                        # 'sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm', 'distinterpmd'
+                        converters = GetConverters(colInfo.get(tbl.lower(), []), dFldLengths)
+                        rowFilter = DedupFilter(dDedup[tbl][0], dDedup[tbl][1])
 
-                                #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
+                    else:
+                        converters = GetConverters(colInfo.get(tbl.lower(), []), dFldLengths)
+                        rowFilter = None
 
-                                    try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
+                    startTime = time.time()
+                    txtFH = open(txtPath, 'rb')
 
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                            # replace all blank values with 'None' so that the values are properly inserted
-                                            # into integer values otherwise insertRow fails
-                                            #fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
-                                            fixedRow = [x if x else None for x in rowInFile]  # figure out which tables have non-utf8 characters
-                                            cursor.insertRow(fixedRow) # was fixedRow
-                                            iRows += 1
+                    try:
+                        iRows = ImportTextBatched(txtFH, os.path.join(newDB, tbl), fldNames, converters, WriteRowsArcpy, rowFilter, fldLengths=GetFieldLengths(colInfo.get(tbl.lower(), []), dFldLengths))
 
-                                    except:
-                                        PrintMsg(" \n" + str(fixedRow), 1)
-                                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
-                                        raise MyError, err
+                    finally:
+                        txtFH.close()
 
-                                else:
-                                    raise MyError, "Missing tabular data file (" + txtPath + ")"
+                    if not tbl in dImportStats:
+                        dImportStats[tbl] = [0, 0.0]
 
-                    else:
-                        # Import SDV tables while enforcing unique key constraints
-                        # 'sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm'
-                        #
-                        with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                            # counter for current record number
-                            iRows = 1
-
-                            if os.path.isfile(txtPath):
-
-                                try:
-                                    # Use csv reader to read each line in the text file
-                                    time.sleep(0.5)  # trying to prevent error reading text file
-
-                                    for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                        newRow = list()
-                                        fldNo = 0
-                                        keyVal = int(rowInFile[dIndex[tbl]])
-
-                                        if not keyVal in dKeys[tbl]:
-                                            # write new record to SDV table
-                                            dKeys[tbl].append(keyVal)
-                                            newRow = [x if x else None for x in rowInFile]
-                                            cursor.insertRow(newRow)  # was newRow
-                                        iRows += 1
-
-                                except:
-                                    err = "Error importing line " + Number_Format(iRows, 0, True) + " from " + txtPath + " \n " + str(newRow)
-                                    PrintMsg(err, 1)
-                                    #errorMsg()
-                                    raise MyError, "Error writing line " + Number_Format(iRows, 0, True) + " of " + txtPath
-
-                            else:
-                                raise MyError, "Missing tabular data file (" + txtPath + ")"
+                    dImportStats[tbl][0] += iRows
+                    dImportStats[tbl][1] += time.time() - startTime
 
                     # Check table count
                     # This isn't correct. May need to look at accumulating total table count in a dictionary
@@ -1574,6 +2030,7 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             PrintMsg(" \nUnable to create new rulekey index on the cointerp table", 1)
 
         arcpy.SetProgressorLabel("Tabular import complete")
+        ReportImportRates(dImportStats)
 
         return True
 
@@ -1673,6 +2130,357 @@ def IdentifyNewInterps(outputWS):
         errorMsg()
         return False
 
+## ===================================================================================
+def GetSurveyDates(outputWS):
+    # Get the SAVEREST date for each survey area already in an existing gSSURGO database
+    #
+    # Returns a dictionary with AREASYMBOL as key and 'YYYY-MM-DD' date string as value
+
+    try:
+        dDates = dict()
+        saCatalog = os.path.join(outputWS, "sacatalog")
+
+        if not arcpy.Exists(saCatalog):
+            raise MyError, "Missing sacatalog table in " + outputWS
+
+        with arcpy.da.SearchCursor(saCatalog, ["AREASYMBOL", "SAVEREST"]) as cur:
+            for rec in cur:
+                dDates[rec[0].upper()] = str(rec[1]).split(" ")[0]
+
+        return dDates
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return None
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def GetInputSurveyDate(inputFolder, areaSym, useTextFiles):
+    # Get the SAVEREST date for an input survey area, either from the tabular/sacatlog.txt file
+    # or from the Template database.
+    #
+    # Returns 'YYYY-MM-DD' date string, or an empty string if the date could not be read.
+
+    try:
+        tabularFolder = os.path.join(inputFolder, "soil_" + areaSym, "tabular")
+
+        if useTextFiles:
+            # Example date (which is index 3 in pipe-delimited file):  02/01/2018 15:54:22
+            saCatalog = os.path.join(tabularFolder, "sacatlog.txt")
+
+            if not os.path.isfile(saCatalog):
+                return ""
+
+            fh = open(saCatalog, "r")
+            rec = fh.readline()
+            fh.close()
+            dateObj = datetime.datetime.strptime(rec.split("|")[3], "%m/%d/%Y %H:%M:%S")
+
+            return dateObj.strftime("%Y-%m-%d")
+
+        else:
+            dbDate = GetTemplateDate(os.path.join(tabularFolder, "soil_d_" + areaSym + ".mdb"), areaSym)
+
+            if dbDate == 0:
+                return ""
+
+            return dbDate
+
+    except:
+        errorMsg()
+        return ""
+
+## ===================================================================================
+def GetIncrementalSurveys(outputWS, inputFolder, areasymbolList, useTextFiles):
+    # Compare the SAVEREST date for each input survey with the same survey in an existing
+    # gSSURGO database. Used by the incremental update mode of gSSURGO.
+    #
+    # Returns 2 lists of areasymbols (or None, None if there was a problem):
+    #   updateList: surveys that are new or newer than the existing database and need to be imported
+    #   staleList: surveys in the existing database that have an older date and need to be removed first
+
+    try:
+        dDates = GetSurveyDates(outputWS)
+
+        if dDates is None:
+            raise MyError, ""
+
+        PrintMsg(" \nComparing survey dates with existing database (" + Number_Format(len(dDates), 0, True) + " surveys)...", 0)
+        updateList = list()
+        staleList = list()
+
+        for areaSym in areasymbolList:
+            newDate = GetInputSurveyDate(inputFolder, areaSym, useTextFiles)
+
+            if newDate == "":
+                raise MyError, "Unable to get SAVEREST date for input survey " + areaSym.upper()
+
+            oldDate = dDates.get(areaSym.upper(), "")
+
+            if oldDate == "":
+                # new survey area
+                updateList.append(areaSym)
+
+            elif newDate > oldDate:
+                # updated survey area
+                PrintMsg("\t" + areaSym.upper() + " updated from " + oldDate + " to " + newDate, 0)
+                updateList.append(areaSym)
+                staleList.append(areaSym)
+
+        PrintMsg(" \n" + Number_Format(len(updateList), 0, True) + " of " + Number_Format(len(areasymbolList), 0, True) + " surveys need to be imported (" + Number_Format(len(updateList) - len(staleList), 0, True) + " new, " + Number_Format(len(staleList), 0, True) + " updated)", 0)
+
+        return updateList, staleList
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return None, None
+
+    except:
+        errorMsg()
+        return None, None
+
+## ===================================================================================
+def GetMaxOIDs(outputWS):
+    # Get the highest OBJECTID in each featureclass and table of an existing gSSURGO database
+    # before an incremental update. Records appended by the update have higher OBJECTIDs, so
+    # these values separate the original records from the new ones (DeleteSurveys, RollbackSurveys).
+    #
+    # Returns a dictionary with the lowercase table name as key and the max OBJECTID (0 for
+    # an empty table) as value, or None if there was a problem.
+
+    try:
+        dMaxOID = dict()
+        tblList = ["mupolygon", "muline", "mupoint", "featline", "featpoint", "sapolygon"] + [tbl.lower() for tbl in GetTableList(outputWS)]
+
+        for tbl in tblList:
+            tblPath = os.path.join(outputWS, tbl)
+
+            if not arcpy.Exists(tblPath):
+                continue
+
+            oidFld = arcpy.Describe(tblPath).OIDFieldName
+            dMaxOID[tbl] = 0
+
+            with arcpy.da.SearchCursor(tblPath, ["OID@"], sql_clause=(None, "ORDER BY " + oidFld + " DESC")) as cur:
+                for rec in cur:
+                    dMaxOID[tbl] = rec[0]
+                    break
+
+        return dMaxOID
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def RollbackSurveys(outputWS, dMaxOID):
+    # Remove the records appended by a failed incremental update, leaving the existing
+    # gSSURGO database as it was. dMaxOID is from GetMaxOIDs.
+
+    try:
+        PrintMsg(" \nRemoving the partially imported surveys from " + os.path.basename(outputWS) + "...", 1)
+        iDeleted = 0
+
+        for tbl, maxOID in sorted(dMaxOID.items()):
+            tblPath = os.path.join(outputWS, tbl)
+            sql = arcpy.Describe(tblPath).OIDFieldName + " > " + str(maxOID)
+
+            with arcpy.da.UpdateCursor(tblPath, ["OID@"], where_clause=sql) as cur:
+                for rec in cur:
+                    cur.deleteRow()
+                    iDeleted += 1
+
+        PrintMsg("\tDeleted " + Number_Format(iDeleted, 0, True) + " records. " + os.path.basename(outputWS) + " was not updated", 1)
+
+        return True
+
+    except:
+        errorMsg()
+        PrintMsg("Unable to remove the partially imported surveys. " + os.path.basename(outputWS) + " should be recreated", 2)
+        return False
+
+## ===================================================================================
+def DeleteSurveys(outputWS, areasymbolList, dMaxOID):
+    # Remove all records for the listed survey areas from an existing gSSURGO database.
+    #
+    # Records in the featureclasses and tables with an AREASYMBOL column are deleted first. The
+    # deletes then cascade down through the child tables using the table relationships in
+    # mdstatrshipdet (legend -> lkey -> mapunit -> mukey -> component -> cokey -> chorizon...).
+    #
+    # Called after the updated surveys have been imported. Only records with an OBJECTID up to
+    # the max in dMaxOID (GetMaxOIDs) are deleted, so the new versions of the surveys are kept
+    # even where they reuse the old key values. The distmd records and the interp sdvattribute
+    # records that only belonged to the removed surveys are then deleted (DeleteSurveyMetadata).
+
+    try:
+        PrintMsg(" \nRemoving " + Number_Format(len(areasymbolList), 0, True) + " out of date surveys from " + os.path.basename(outputWS) + "...", 0)
+
+        # parent table, parent key column and child key column for each child table
+        dRelates = dict()
+        rsTbl = os.path.join(outputWS, "mdstatrshipdet")
+
+        if not arcpy.Exists(rsTbl):
+            raise MyError, "Missing mdstatrshipdet table in " + outputWS
+
+        with arcpy.da.SearchCursor(rsTbl, ["ltabphyname", "rtabphyname", "ltabcolphyname", "rtabcolphyname"]) as cur:
+            for rec in cur:
+                parentTbl, childTbl, parentKey, childKey = [val.lower() for val in rec]
+
+                if not parentTbl in dRelates:
+                    dRelates[parentTbl] = list()
+
+                dRelates[parentTbl].append((childTbl, parentKey, childKey))
+
+        tblList = ["mupolygon", "muline", "mupoint", "featline", "featpoint", "sapolygon"] + [tbl.lower() for tbl in GetTableList(outputWS)]
+        asList = [areaSym.upper() for areaSym in areasymbolList]
+        iDeleted = 0
+
+        # distmd is the parent of distlegendmd, so the cascade doesn't reach it. Save the
+        # distmdkeys of the removed surveys for DeleteSurveyMetadata.
+        distmdKeys = set()
+        sql = "areasymbol IN ('" + "', '".join(asList) + "')"
+
+        with arcpy.da.SearchCursor(os.path.join(outputWS, "distlegendmd"), ["distmdkey"], where_clause=sql) as cur:
+            for rec in cur:
+                distmdKeys.add(rec[0])
+
+        for tbl in tblList:
+            if arcpy.Exists(os.path.join(outputWS, tbl)) and FindField(os.path.join(outputWS, tbl), "areasymbol") != "":
+                iDeleted += DeleteRows(outputWS, tbl, "areasymbol", asList, dRelates, dMaxOID)
+
+        iDeleted += DeleteSurveyMetadata(outputWS, distmdKeys, dRelates, dMaxOID)
+
+        PrintMsg("\tDeleted " + Number_Format(iDeleted, 0, True) + " records", 0)
+
+        # Tables derived from the soil data are not updated here
+        env.workspace = outputWS
+        derivedList = arcpy.ListTables("SDV_*") + arcpy.ListTables("Valu1")
+
+        if len(derivedList) > 0:
+            PrintMsg("\tThese tables still contain ratings for the old versions of the updated surveys and should be recreated: " + ", ".join(derivedList), 1)
+
+        return True
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def DeleteRows(outputWS, tbl, keyField, keyValues, dRelates, dMaxOID):
+    # Delete records from tbl where keyField is in keyValues, then do the same for each of
+    # the child tables in dRelates using the key values of the deleted records.
+    # keyValues are split into groups of 500 to keep the where clause a reasonable size.
+    # Records with an OBJECTID above the max in dMaxOID (new records) are not deleted.
+    #
+    # Returns the total number of records deleted.
+
+    tblPath = os.path.join(outputWS, tbl)
+
+    if not arcpy.Exists(tblPath) or len(keyValues) == 0:
+        return 0
+
+    childList = dRelates.get(tbl, [])
+    parentKeys = sorted(set([parentKey for childTbl, parentKey, childKey in childList]))
+    dValues = dict()
+
+    for parentKey in parentKeys:
+        dValues[parentKey] = set()
+
+    fld = arcpy.ListFields(tblPath, FindField(tblPath, keyField))[0]
+    keyValues = sorted(keyValues)
+    oidSQL = " AND " + arcpy.Describe(tblPath).OIDFieldName + " <= " + str(dMaxOID.get(tbl, 0))
+    iDeleted = 0
+
+    for i in range(0, len(keyValues), 500):
+        if fld.type == "String":
+            sql = fld.name + " IN ('" + "', '".join([str(val) for val in keyValues[i:i + 500]]) + "')"
+
+        else:
+            sql = fld.name + " IN (" + ", ".join([str(val) for val in keyValues[i:i + 500]]) + ")"
+
+        with arcpy.da.UpdateCursor(tblPath, ["OID@"] + parentKeys, where_clause="(" + sql + ")" + oidSQL) as cur:
+            for rec in cur:
+                for indx, parentKey in enumerate(parentKeys):
+                    if not rec[indx + 1] is None:
+                        dValues[parentKey].add(rec[indx + 1])
+
+                cur.deleteRow()
+                iDeleted += 1
+
+    for childTbl, parentKey, childKey in childList:
+        iDeleted += DeleteRows(outputWS, childTbl, childKey, list(dValues[parentKey]), dRelates, dMaxOID)
+
+    return iDeleted
+
+## ===================================================================================
+def DeleteSurveyMetadata(outputWS, distmdKeys, dRelates, dMaxOID):
+    # Delete the distmd records (and their distinterpmd records) of removed surveys once no
+    # distlegendmd record uses them, then delete the interp sdvattribute and sdvfolderattribute
+    # records whose rule is no longer in distinterpmd. Interps that are still in any remaining
+    # survey are kept, because the sdv* records are shared by all surveys.
+    #
+    # Returns the number of records deleted.
+
+    distmdTbl = os.path.join(outputWS, "distmd")
+    distlegendTbl = os.path.join(outputWS, "distlegendmd")
+    distinterpTbl = os.path.join(outputWS, "distinterpmd")
+
+    if len(distmdKeys) == 0 or not arcpy.Exists(distmdTbl):
+        return 0
+
+    with arcpy.da.SearchCursor(distlegendTbl, ["distmdkey"]) as cur:
+        for rec in cur:
+            distmdKeys.discard(rec[0])
+
+    if len(distmdKeys) == 0:
+        return 0
+
+    # interp rules of the removed surveys
+    ruleNames = set()
+    sql = "distmdkey IN ('" + "', '".join([str(key) for key in sorted(distmdKeys)]) + "')"
+
+    with arcpy.da.SearchCursor(distinterpTbl, ["rulename"], where_clause=sql) as cur:
+        for rec in cur:
+            ruleNames.add(rec[0])
+
+    iDeleted = DeleteRows(outputWS, "distmd", "distmdkey", list(distmdKeys), dRelates, dMaxOID)
+
+    with arcpy.da.SearchCursor(distinterpTbl, ["rulename"]) as cur:
+        for rec in cur:
+            ruleNames.discard(rec[0])
+
+    # sdvattribute records for the interps that are gone
+    attKeys = list()
+    sdvTbl = os.path.join(outputWS, "sdvattribute")
+
+    if len(ruleNames) > 0 and arcpy.Exists(sdvTbl):
+        with arcpy.da.UpdateCursor(sdvTbl, ["attributekey", "nasisrulename"], where_clause="nasisrulename IS NOT NULL") as cur:
+            for rec in cur:
+                if rec[1] in ruleNames:
+                    attKeys.append(rec[0])
+                    cur.deleteRow()
+                    iDeleted += 1
+
+        iDeleted += DeleteRows(outputWS, "sdvfolderattribute", "attributekey", attKeys, dict(), dMaxOID)
+
+    return iDeleted
+
+## ===================================================================================
+def AddAttributeIndex(tblPath, fldName, indxName):
+    # Add an attribute index unless it already exists (incremental update of an existing database)
+
+    if len(arcpy.ListIndexes(tblPath, indxName)) == 0:
+        arcpy.AddIndex_management(tblPath, fldName, indxName)
+
+    return
+
 ## ===================================================================================
 def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt):
     # Merge all spatial layers into a set of file geodatabase featureclasses
@@ -1715,7 +2523,7 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
 
             # Add spatial index
             arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MUPOLYGON"))
-            arcpy.AddIndex_management(os.path.join(outputWS, "MUPOLYGON"), "AREASYMBOL", "Indx_MupolyAreasymbol")
+            AddAttributeIndex(os.path.join(outputWS, "MUPOLYGON"), "AREASYMBOL", "Indx_MupolyAreasymbol")
 
         #PrintMsg(" \nSkipping import for other featureclasses until problem with shapefile primary key is fixed", 0)
         #return True
@@ -1734,7 +2542,7 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MULINE"))
 
             # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "MULINE"), "AREASYMBOL", "Indx_MulineAreasymbol")
+            AddAttributeIndex(os.path.join(outputWS, "MULINE"), "AREASYMBOL", "Indx_MulineAreasymbol")
 
         # Merge process MUPOINT
         if len(mupointList) > 0:
@@ -1750,7 +2558,7 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MUPOINT"))
 
             # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "MUPOINT"), "AREASYMBOL", "Indx_MupointAreasymbol")
+            AddAttributeIndex(os.path.join(outputWS, "MUPOINT"), "AREASYMBOL", "Indx_MupointAreasymbol")
 
         # Merge process FEATLINE
         if len(sflineList) > 0:
@@ -1766,7 +2574,7 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             arcpy.AddSpatialIndex_management (os.path.join(outputWS, "FEATLINE"))
 
             # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "FEATLINE"), "AREASYMBOL", "Indx_SFLineAreasymbol")
+            AddAttributeIndex(os.path.join(outputWS, "FEATLINE"), "AREASYMBOL", "Indx_SFLineAreasymbol")
 
         # Merge process FEATPOINT
         if len(sfpointList) > 0:
@@ -1785,7 +2593,7 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             arcpy.AddSpatialIndex_management (os.path.join(outputWS, "FEATPOINT"))
 
             # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "FEATPOINT"), "AREASYMBOL", "Indx_SFPointAreasymbol")
+            AddAttributeIndex(os.path.join(outputWS, "FEATPOINT"), "AREASYMBOL", "Indx_SFPointAreasymbol")
 
         # Merge process SAPOLYGON
         if len(sapolyList) > 0:
@@ -2168,8 +2976,18 @@ def UpdateMetadata(outputWS, target, surveyInfo, description):
         False
 
 ## ===================================================================================
-def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bClipped, areasymbolList):
+def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bClipped, areasymbolList, maxWorkers=1, bIncremental=False):
     # main function
+    #
+    # 2026-10-17 maxWorkers is the number of worker processes used to parse the tabular text files
+    #
+    # 2026-10-17 bIncremental updates an existing gSSURGO database instead of creating a new one.
+    # Only surveys that are new or have a newer SAVEREST date are imported. Older versions
+    # of the updated surveys are removed after all of the new data has been imported
+    # (DeleteSurveys). If the import fails, the appended records are removed (RollbackSurveys).
+
+    dMaxOID = dict()    # max OBJECTID of each table before an incremental update
+    bImported = False   # all spatial and tabular data imported
 
     try:
         # Creating the file geodatabase uses the ImportXMLWorkspaceDocument command which requires
@@ -2343,6 +3161,26 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
             # Spatial sort has already been handled using the soil survey boundary layer.
             pass
 
+        bUpdate = False  # incremental update of an existing gSSURGO database
+
+        if bIncremental and arcpy.Exists(outputWS):
+            updateList, staleList = GetIncrementalSurveys(outputWS, inputFolder, areasymbolList, useTextFiles)
+
+            if updateList is None:
+                raise MyError, ""
+
+            if len(updateList) == 0:
+                PrintMsg(" \nAll surveys in " + outputWS + " are up to date", 0)
+                return True
+
+            dMaxOID = GetMaxOIDs(outputWS)
+
+            if dMaxOID is None:
+                raise MyError, ""
+
+            areasymbolList = updateList
+            bUpdate = True
+
         # Save the total featurecount for all input shapefiles
         mupolyCnt = 0
         mulineCnt = 0
@@ -2505,7 +3343,14 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
             outputWS = os.path.join(outFolder, gdbName)
             featCnt = (mupolyCnt, mulineCnt, mupointCnt, sflineCnt, sfpointCnt, sapolyCnt)  # 0 mupoly, 1 muline, 2 mupoint, 3 sfline, 4 sfpoint, 5 sapoly
 
-            bGeodatabase = CreateSSURGO_DB(outputWS, inputXML, areasymbolList, aliasName)
+            if bUpdate:
+                # Existing features are included in the featureclass counts checked by AppendFeatures
+                fcList = ["MUPOLYGON", "MULINE", "MUPOINT", "FEATLINE", "FEATPOINT", "SAPOLYGON"]
+                featCnt = tuple([featCnt[i] + int(arcpy.GetCount_management(os.path.join(outputWS, fc)).getOutput(0)) for i, fc in enumerate(fcList)])
+                bGeodatabase = True
+
+            else:
+                bGeodatabase = CreateSSURGO_DB(outputWS, inputXML, areasymbolList, aliasName)
 
             if bGeodatabase:
                 # Successfully created a new geodatabase
@@ -2522,16 +3367,24 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
                         raise MyError, "Could not find " + outputWS + " to append tables to"
 
                     if useTextFiles:
-                        bMD = ImportMDTabular(outputWS, dbPath, codePage)  # new, import md tables from text files of last survey area
+                        if bUpdate:
+                            bMD = True  # md tables are already populated
+
+                        else:
+                            bMD = ImportMDTabular(outputWS, dbPath, codePage)  # new, import md tables from text files of last survey area
 
                         if bMD == False:
                             raise MyError, ""
 
                         # import attribute data from text files in tabular folder
-                        bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage)
+                        bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage, maxWorkers)
 
                     else:
-                        bMD = ImportMDTables(outputWS, dbList)
+                        if bUpdate:
+                            bMD = True  # md tables are already populated
+
+                        else:
+                            bMD = ImportMDTables(outputWS, dbList)
 
                         if bMD == False:
                             raise MyError, ""
@@ -2542,14 +3395,13 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
                     if bTabular == True:
                         # Successfully imported all tabular data (textfiles or Access database tables)
                         PrintMsg(" \nAll spatial and tabular data imported", 0)
+                        bImported = True
 
                     else:
-                        PrintMsg("Failed to export all data to gSSURGO. Tabular export error.", 2)
-                        return False
+                        raise MyError, "Failed to export all data to gSSURGO. Tabular export error."
 
                 else:
-                    PrintMsg("Failed to export all data to gSSURGO. Spatial export error", 2)
-                    return False
+                    raise MyError, "Failed to export all data to gSSURGO. Spatial export error"
 
             else:
                 return False
@@ -2559,7 +3411,13 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
             #bFixed = IdentifyNewInterps(outputWS)
 
             # Create table relationships and indexes
-            bRL = CreateTableRelationships(outputWS)
+            if not bUpdate:
+                bRL = CreateTableRelationships(outputWS)
+
+            elif len(staleList) > 0:
+                # The new versions of the updated surveys are in place. Remove the old ones.
+                if not DeleteSurveys(outputWS, staleList, dMaxOID):
+                    raise MyError, "Unable to remove the out of date surveys (" + ", ".join([areaSym.upper() for areaSym in staleList]) + ") from " + outputWS
 
             # Query the output SACATALOG table to get list of surveys that were exported to the gSSURGO
             #
@@ -2625,10 +3483,18 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
 
     except MyError, e:
         PrintMsg(str(e), 2)
+
+        if len(dMaxOID) > 0 and not bImported:
+            RollbackSurveys(outputWS, dMaxOID)
+
         return False
 
     except:
         errorMsg()
+
+        if len(dMaxOID) > 0 and not bImported:
+            RollbackSurveys(outputWS, dMaxOID)
+
         return True
 
 ## ===================================================================================
@@ -2912,7 +3778,7 @@ def GetFCType(fc):
 ## ===================================================================================
 
 # Import system modules
-import arcpy, sys, string, os, traceback, locale, time, datetime, csv
+import arcpy, sys, string, os, traceback, locale, time, datetime, csv, itertools
 from operator import itemgetter, attrgetter
 import xml.etree.cElementTree as ET
 from arcpy import env
@@ -2929,6 +3795,18 @@ try:
         aliasName = arcpy.GetParameterAsText(5)       # String to be appended to featureclass aliases
         useTextFiles = arcpy.GetParameter(6)
 
+        try:
+            maxWorkers = int(arcpy.GetParameterAsText(7))  # number of processes used to parse the tabular text files
+
+        except:
+            maxWorkers = 1
+
+        try:
+            bIncremental = arcpy.GetParameter(8)            # only import new or updated surveys into an existing database
+
+        except:
+            bIncremental = False
+
         #dbVersion = 2  # This is the SSURGO version supported by this script and the gSSURGO schema (XML Workspace document)
 
         # Check to see if we got an ssaLayer
@@ -2941,7 +3819,7 @@ try:
         else:
             areasymbolList = list()
 
-        bGood = gSSURGO(inputFolder, surveyList, outputWS, AOI, aliasName, useTextFiles, False, areasymbolList)
+        bGood = gSSURGO(inputFolder, surveyList, outputWS, AOI, aliasName, useTextFiles, False, areasymbolList, maxWorkers, bIncremental)
 
 except MyError, e:
     PrintMsg(str(e), 2)
@@ -0,0 +1,1125 @@
+# gSSURGO_Benchmark.py
+#
+# 2026-10-17
+#
+# Creates a synthetic SSURGO-shaped database and runs the aggregation benchmarks against it.
+#
+# The generator is deterministic: the same scale and seed always produce the same records, and
+# each survey area uses its own random sequence and key range, so a survey's records do not depend
+# on how many surveys are generated. Tables: legend, sacatalog, mapunit, muaggatt, component,
+# chorizon, chtexturegrp, chfrags, comonth, cosoilmoist, cointerp, corestrictions, distinterpmd
+# and the sdv* tables. Key cardinality (components per map unit, horizons per component, rules per
+# component etc.) and null rates follow dScales and dNullRates.
+#
+# Output is one of:
+#
+#   *.gdb     A copy of a template gSSURGO database (parameter 4) with its soil data replaced by the
+#             synthetic records and one square MUPOLYGON per map unit. The md* and sdv* metadata tables
+#             are kept from the template, and the interp rule names are taken from its sdvattribute
+#             table. Benchmarks: gSSURGO_CreateSoilMap (one headless run per entry in dSoilMapBenchmarks,
+#             timed through the CreateSoilMap run log), gSSURGO_CreateSoilMap.CreateWideRatingTable (dWideBenchmarks,
+#             with a parity check of each column against the SDV_ table from a CreateSoilMap run), gSSURGO_ValuTable
+#             (CreateMemoryQueryTables, CalcRZAWS, CalcAWSSOC, CalcNCCPI3 and CalcPWSL) and gSSURGO_ValidateData.
+#             Requires arcpy.
+#
+#   *.sqlite  A generator smoke test that does not need ArcGIS. The sdv* tables only describe the test
+#             attributes. Simplified SQL versions of the component, comonth, horizon and interp
+#             aggregations (dSQLiteSmokeTests) check that the generated tables join and aggregate,
+#             each writing its map unit ratings to an sdv_ table. They are not the gSSURGO_CreateSoilMap
+#             functions, so no timings are reported for them.
+#
+# Each .gdb benchmark runs in its own process so that the peak memory is its own. The rows/sec, elapsed
+# time and peak memory for each one are printed and appended to <output>_Benchmark.jsonl. Only the
+# .gdb benchmarks are reported there.
+#
+# Usage:
+#   python gSSURGO_Benchmark.py <output .gdb or .sqlite> [survey | state | conus] [seed] [template gSSURGO .gdb]
+#
+# The scale may also be a number of survey areas (with the 'survey' settings for everything else).
+
+## ===================================================================================
+class MyError(Exception):
+    pass
+
+## ===================================================================================
+def errorMsg():
+    try:
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        theMsg = tbinfo + " \n" + str(sys.exc_type)+ ": " + str(sys.exc_value) + " \n"
+        PrintMsg(theMsg, 2)
+
+    except:
+        PrintMsg("Unhandled error in errorMsg method", 2)
+        pass
+
+## ===================================================================================
+def PrintMsg(msg, severity=0):
+    # Adds tool message to the geoprocessor, or prints it when arcpy is not available
+    #
+    #Split the message on \n first, so that if it's multiple lines, a GPMessage will be added for each line
+    try:
+        for string in msg.split('\n'):
+            if arcpy is None:
+                if severity == 2:
+                    sys.stderr.write(string + "\n")
+
+                else:
+                    sys.stdout.write(string + "\n")
+
+            elif severity == 0:
+                arcpy.AddMessage(string)
+
+            elif severity == 1:
+                arcpy.AddWarning(string)
+
+            elif severity == 2:
+                arcpy.AddError(" \n" + string)
+
+    except:
+        pass
+
+## ===================================================================================
+def Number_Format(num, places=0, bCommas=True):
+    try:
+    # Format a number according to locality and given places
+        locale.setlocale(locale.LC_ALL, "")
+        if bCommas:
+            theNumber = locale.format("%.*f", (places, num), True)
+
+        else:
+            theNumber = locale.format("%.*f", (places, num), False)
+        return theNumber
+
+    except:
+        errorMsg()
+        return "???"
+
+## ===================================================================================
+def GetPeakMemory():
+    # Return the peak memory (MB) used by this process, or None if it is not available.
+    # Same as gSSURGO_CreateSoilMap.GetPeakMemory.
+    #
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            hProcess = ctypes.windll.kernel32.GetCurrentProcess()
+
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(hProcess, ctypes.byref(counters), counters.cb):
+                return None
+
+            return round(counters.PeakWorkingSetSize / 1048576.0, 1)
+
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        if sys.platform == "darwin":
+            return round(peak / 1048576.0, 1)   # bytes
+
+        return round(peak / 1024.0, 1)          # kilobytes
+
+    except:
+        return None
+
+## ===================================================================================
+def GetScale(scaleName):
+    # Return the generator settings for a named scale, or for a number of survey areas
+    #
+    if scaleName in dScales:
+        return dict(dScales[scaleName])
+
+    try:
+        dScale = dict(dScales["survey"])
+        dScale["surveys"] = int(scaleName)
+        return dScale
+
+    except ValueError:
+        raise MyError, "Unknown scale: " + str(scaleName) + " (use " + ", ".join(sorted(dScales)) + " or a number of survey areas)"
+
+## ===================================================================================
+def NullOr(rnd, fld, val):
+    # Return None at the null rate set for this column in dNullRates, otherwise val
+    #
+    if fld in dNullRates and rnd.random() < dNullRates[fld]:
+        return None
+
+    return val
+
+## ===================================================================================
+def SplitPercent(rnd, coCnt):
+    # Return coCnt component percents in descending order. Most map units add up to 100,
+    # some leave room for unnamed inclusions.
+    #
+    weights = [rnd.random() ** 2 + 0.05 for i in range(coCnt)]
+    total = 100 if rnd.random() < 0.85 else rnd.randint(85, 99)
+    pctList = [max(1, int(total * w / sum(weights))) for w in weights]
+    pctList.sort(reverse=True)
+    pctList[0] += max(0, total - sum(pctList))
+
+    return pctList
+
+## ===================================================================================
+def GenerateHorizons(rnd):
+    # Return a list of horizon records [hzname, desgnmaster, top, bot, texture] for one component.
+    # Depths are contiguous from 0 to a bottom depth between 100 and 203cm, with an O horizon on
+    # some components and bedrock at the bottom of others.
+    #
+    hzList = list()
+    hzCnt = rnd.randint(dScale["horizons"][0], dScale["horizons"][1])
+    bottom = rnd.choice([150, 152, 183, 200, 203]) if rnd.random() < 0.8 else rnd.randint(100, 203)
+    bRock = rnd.random() < 0.12
+    top = 0
+
+    if rnd.random() < 0.06:
+        thk = rnd.randint(2, 10)
+        hzList.append(["Oi", "O", 0, thk, "SPM"])
+        top = thk
+
+    mineralCnt = max(1, hzCnt - len(hzList) - (1 if bRock else 0))
+    masters = ["A", "B", "B", "B", "C", "C"]
+
+    for i in range(mineralCnt):
+        if i == mineralCnt - 1 and not bRock:
+            bot = bottom
+
+        else:
+            remaining = bottom - top - (mineralCnt - i - 1) * 5
+            bot = top + max(5, min(remaining, rnd.randint(8, 60)))
+
+            if bot >= bottom:
+                bot = bottom - 5 * (mineralCnt - i - 1)
+
+        if bot <= top:
+            break
+
+        master = masters[min(i, len(masters) - 1)]
+        hzList.append([master + str(i + 1) if master != "A" else "Ap", master, top, bot, rnd.choice(textureList)])
+        top = bot
+
+    if bRock and top < 203:
+        hzList.append(["R", "R", top, min(203, top + rnd.randint(20, 50)), "BR"])
+
+    return hzList
+
+## ===================================================================================
+def GenerateSurvey(surveyIdx, ruleList):
+    # Generate the records for one survey area. Yields (table name, record) tuples with the
+    # record in dColumns order.
+    #
+    # Keys are derived from the survey index so that they are unique database-wide:
+    # lkey = survey, mukey = survey * 100000 + map unit, cokey = mukey * 10 + component,
+    # chkey = cokey * 10 + horizon, comonthkey = cokey * 100 + month.
+    #
+    rnd = random.Random(seed * 1000003 + surveyIdx)
+    stateAbbrev = stateList[surveyIdx % len(stateList)]
+    areasymbol = stateAbbrev + str(surveyIdx // len(stateList) + 1).zfill(3)
+    areaname = "Synthetic County " + str(surveyIdx + 1) + ", " + stateAbbrev
+    lkey = str(surveyIdx + 1)
+    saverest = datetime.datetime(2015, 9, 1) + datetime.timedelta(days=rnd.randint(0, 3000))
+
+    yield "legend", (areasymbol, areaname, "Non-MLRA Soil Survey Area", lkey)
+    yield "sacatalog", (areasymbol, areaname, saverest, "SSURGO " + str(rnd.randint(10, 25)), lkey)
+
+    for rule in ruleList:
+        yield "distinterpmd", (rule[0], rule[1], rule[2], areasymbol + ":" + rule[0])
+
+    muCnt = max(1, int(rnd.gauss(dScale["mapunits"], dScale["mapunits"] * 0.25)))
+
+    for muIdx in range(muCnt):
+        mukey = (surveyIdx + 1) * 100000 + muIdx
+        musym = str(rnd.randint(1, 999)) + rnd.choice(["", "A", "B", "C", "D", "E"])
+        bWater = rnd.random() < 0.02
+        bMisc = rnd.random() < 0.04 and not bWater
+
+        if bWater:
+            coList = [["Water", "Miscellaneous area", 100]]
+
+        else:
+            coCnt = min(9, max(1, int(rnd.expovariate(1.0 / dScale["components"])) + 1))
+            pctList = SplitPercent(rnd, coCnt)
+            coList = list()
+
+            for i in range(coCnt):
+                if (i == 0 and bMisc) or (i > 0 and rnd.random() < 0.08):
+                    coList.append([rnd.choice(miscList), "Miscellaneous area", pctList[i]])
+
+                else:
+                    coList.append([rnd.choice(seriesList), rnd.choice(["Series", "Series", "Series", "Taxadjunct", "Family"]), pctList[i]])
+
+        muname = coList[0][0] + ", " + str(rnd.randint(0, 35)) + " to " + str(rnd.randint(36, 70)) + " percent slopes"
+        yield "mapunit", (musym, muname, rnd.choice(["Consociation", "Complex", "Association"]), round(rnd.uniform(5, 25000), 0), NullOr(rnd, "farmlndcl", rnd.choice(farmlandList)), lkey, str(mukey))
+
+        muSlope = list()
+        muDrainage = list()
+        muHydgrp = list()
+        muHydric = 0
+        muFlood = list()
+
+        for coIdx in range(len(coList)):
+            compname, compkind, comppct = coList[coIdx]
+            cokey = mukey * 10 + coIdx
+            bSoil = compkind != "Miscellaneous area"
+            slope = NullOr(rnd, "slope_r", round(rnd.uniform(0, 45) ** 0.9, 1))
+            drainagecl = NullOr(rnd, "drainagecl", rnd.choice(drainageList)) if bSoil else None
+            hydgrp = NullOr(rnd, "hydgrp", rnd.choice(hydgrpList)) if bSoil else None
+            hydric = "Yes" if drainagecl in ["Poorly drained", "Very poorly drained"] else ("No" if bSoil else rnd.choice(["No", "Unranked"]))
+            taxorder = NullOr(rnd, "taxorder", rnd.choice(taxorderList)) if bSoil else None
+            taxsubgrp = None if taxorder is None else rnd.choice(["Typic", "Aquic", "Histic", "Oxyaquic", "Lithic"]) + " " + taxorder.lower()[:-1]
+
+            yield "component", (comppct, compname, compkind, "Yes" if comppct >= 15 else "No", NullOr(rnd, "localphase", rnd.choice(["eroded", "rocky", "flooded", "drained"])),
+                                slope, drainagecl, hydgrp, hydric, taxorder, taxsubgrp, NullOr(rnd, "tfact", rnd.randint(1, 5)) if bSoil else None, str(mukey), str(cokey))
+
+            muSlope.append((comppct, slope))
+            muDrainage.append((comppct, drainagecl))
+            muHydgrp.append((comppct, hydgrp))
+
+            if hydric == "Yes":
+                muHydric += comppct
+
+            # Horizons. Miscellaneous areas have none.
+            if bSoil:
+                for hzIdx, hz in enumerate(GenerateHorizons(rnd)):
+                    hzname, desgnmaster, top, bot, texture = hz
+                    chkey = cokey * 10 + hzIdx
+
+                    if desgnmaster == "R":
+                        yield "chorizon", (hzname, desgnmaster, top, bot, bot - top, None, None, None, None, None, round(rnd.uniform(0.01, 1.0), 2), 0.0, None, None, None, str(cokey), str(chkey))
+
+                    else:
+                        sand = round(rnd.uniform(5, 85), 1)
+                        clay = round(rnd.uniform(2, min(60, 100 - sand)), 1)
+                        silt = round(100 - sand - clay, 1)
+                        om = round(rnd.uniform(20, 60), 1) if desgnmaster == "O" else round(rnd.expovariate(1 / 1.5) if top < 30 else rnd.uniform(0, 0.8), 2)
+
+                        yield "chorizon", (hzname, desgnmaster, top, bot, bot - top, NullOr(rnd, "sandtotal_r", sand), NullOr(rnd, "silttotal_r", silt), NullOr(rnd, "claytotal_r", clay),
+                                           NullOr(rnd, "om_r", om), NullOr(rnd, "dbthirdbar_r", round(rnd.uniform(1.1, 1.7), 2)), NullOr(rnd, "ksat_r", round(rnd.lognormvariate(2, 1), 2)),
+                                           NullOr(rnd, "awc_r", round(rnd.uniform(0.04, 0.22), 2)), NullOr(rnd, "ec_r", round(rnd.expovariate(1.0), 1)),
+                                           NullOr(rnd, "ph1to1h2o_r", round(rnd.uniform(4.5, 8.4), 1)), NullOr(rnd, "kwfact", rnd.choice([".10", ".17", ".24", ".28", ".32", ".37", ".43"])), str(cokey), str(chkey))
+
+                    yield "chtexturegrp", (texture, "No", "Yes", texture, str(chkey), str(chkey * 10))
+
+                    fragCnt = 0 if rnd.random() < 0.6 else rnd.randint(1, 2)
+
+                    for fragIdx in range(fragCnt):
+                        yield "chfrags", (NullOr(rnd, "fragvol_r", rnd.randint(1, 60)), rnd.choice(["Mixed rock fragments", "Limestone", "Sandstone", "Granite"]), str(chkey), str(chkey * 10 + fragIdx))
+
+                # Restrictions
+                if rnd.random() < 0.3:
+                    resdept = rnd.randint(20, 180)
+                    resdepb = NullOr(rnd, "resdepb_r", resdept + rnd.randint(5, 50))
+                    yield "corestrictions", (rnd.choice(reskindList), NullOr(rnd, "reshard", rnd.choice(["Very weakly cemented", "Strongly cemented", "Indurated"])), resdept, resdepb,
+                                             None if resdepb is None else resdepb - resdept, str(cokey), str(cokey * 10))
+
+            # Months. Flooding and ponding classes, and soil moisture status by depth.
+            floodcl = rnd.choice(floodList) if bSoil else None
+            wetDepth = rnd.choice([None, None, 0, 15, 30, 46, 76, 107, 152]) if bSoil else None
+
+            for monthIdx in range(12):
+                comonthkey = cokey * 100 + monthIdx
+                bWet = not wetDepth is None and (monthIdx < 5 or monthIdx > 9)
+                monthFlood = floodcl if (floodcl != "None" and (monthIdx < 6)) else ("None" if bSoil else None)
+                yield "comonth", (monthIdx + 1, monthList[monthIdx], NullOr(rnd, "flodfreqcl", monthFlood), NullOr(rnd, "pondfreqcl", "None" if bSoil else None), str(cokey), str(comonthkey))
+
+                if bSoil:
+                    if bWet:
+                        yield "cosoilmoist", (0, wetDepth, "Moist", str(comonthkey), str(comonthkey * 10))
+                        yield "cosoilmoist", (wetDepth, 203, "Wet", str(comonthkey), str(comonthkey * 10 + 1))
+
+                    else:
+                        yield "cosoilmoist", (0, 203, "Moist", str(comonthkey), str(comonthkey * 10))
+
+            muFlood.append((comppct, floodcl))
+
+            # Interpretations. One main rule record (ruledepth 0) and a few reason records for each rule.
+            if bSoil or rnd.random() < 0.5:
+                for ruleIdx in range(len(ruleList)):
+                    mrulekey, mrulename, ruledesign = ruleList[ruleIdx]
+
+                    if not bSoil:
+                        yield "cointerp", (str(cokey), mrulekey, mrulename, 0, mrulekey, mrulename, 0, None, "Not rated", str(cokey) + ":" + mrulekey)
+                        continue
+
+                    interphr = round(rnd.random(), 2) if rnd.random() < 0.75 else rnd.choice([0.0, 1.0])
+                    interphrc = interpClasses[ruledesign][0 if interphr == 0 else (2 if interphr == 1 else 1)]
+                    yield "cointerp", (str(cokey), mrulekey, mrulename, 0, mrulekey, mrulename, 0, NullOr(rnd, "interphr", interphr), interphrc, str(cokey) + ":" + mrulekey)
+
+                    for seqnum in range(1, rnd.randint(1, dScale["reasons"]) + 1):
+                        rulekey = mrulekey + "." + str(seqnum)
+                        yield "cointerp", (str(cokey), mrulekey, mrulename, seqnum, rulekey, "Reason " + str(seqnum), 1, round(rnd.random(), 2), rnd.choice(reasonList), str(cokey) + ":" + rulekey)
+
+        # Map unit aggregated attributes, dominant component and dominant condition
+        drclass = max([(sum([p for p, c in muDrainage if c == cl]), cl) for p, cl in muDrainage])[1]
+        hydgrp = sorted(muHydgrp, key=lambda x: -x[0])[0][1]
+        floodcl = max([(sum([p for p, c in muFlood if c == cl]), cl) for p, cl in muFlood])[1]
+        yield "muaggatt", (musym, muname, hydgrp, drclass, floodcl, muHydric, muSlope[0][1], str(mukey))
+
+## ===================================================================================
+def GenerateSDVTables():
+    # Yields the sdvfolder, sdvalgorithm, sdvattribute and sdvfolderattribute records for the
+    # SQLite smoke test. The gSSURGO geodatabase keeps the sdv* tables from its template.
+    #
+    yield "sdvfolder", (1, "Synthetic Benchmark", "Attributes used by gSSURGO_Benchmark", 1)
+
+    for algorithmsequence, algorithmname, algorithminitials in sdvAlgorithms:
+        yield "sdvalgorithm", (algorithmsequence, algorithmname, algorithminitials)
+
+    for attributekey, rec in enumerate(sorted(dSQLiteSmokeTests.items())):
+        name, dBench = rec
+        yield "sdvattribute", (attributekey + 1, dBench["attributename"], dBench["table"], dBench["column"], dBench["level"], dBench["algorithm"], dBench.get("rule"), "SDV_" + name)
+        yield "sdvfolderattribute", (1, attributekey + 1)
+
+## ===================================================================================
+def GetRuleList(templateDB):
+    # Return a list of [rulekey, rulename, ruledesign] for the synthetic cointerp table. With a
+    # template geodatabase, the rules are the interpretations in its sdvattribute table so that
+    # CreateSoilMap can map them. ruledesign 1 = limitation, 2 = suitability.
+    #
+    ruleNames = list()
+
+    if not templateDB is None:
+        with arcpy.da.SearchCursor(os.path.join(templateDB, "sdvattribute"), ["nasisrulename", "ruledesign"], where_clause="attributetype = 'Interpretation'", sql_clause=(None, "ORDER BY nasisrulename")) as cur:
+            for rec in cur:
+                if not rec[0] is None and not rec[0] in [r[0] for r in ruleNames]:
+                    ruleNames.append([rec[0], 2 if rec[1] == 2 else 1])
+
+    if len(ruleNames) == 0:
+        ruleNames = [[rule, design] for rule, design in defaultRules]
+
+    ruleNames = ruleNames[0:dScale["rules"]]
+
+    return [[str(17000 + i), rule, design] for i, (rule, design) in enumerate(ruleNames)]
+
+## ===================================================================================
+def WriteSQLite(outputDB, ruleList):
+    # Generate the synthetic tables into a new SQLite database. Returns a dictionary of record counts.
+    #
+    if os.path.exists(outputDB):
+        os.remove(outputDB)
+
+    conn = sqlite3.connect(outputDB)
+    dCounts = dict()
+    dRows = dict()
+
+    for tbl in tblOrder:
+        conn.execute("CREATE TABLE " + tbl + " (" + ", ".join(dColumns[tbl]) + ")")
+        dCounts[tbl] = 0
+        dRows[tbl] = list()
+
+    def FlushRows(tbl):
+        conn.executemany("INSERT INTO " + tbl + " VALUES (" + ", ".join(["?"] * len(dColumns[tbl])) + ")", dRows[tbl])
+        dCounts[tbl] += len(dRows[tbl])
+        del dRows[tbl][:]
+
+    for tbl, rec in GenerateSDVTables():
+        dRows[tbl].append(rec)
+
+    for surveyIdx in range(dScale["surveys"]):
+        for tbl, rec in GenerateSurvey(surveyIdx, ruleList):
+            dRows[tbl].append(rec)
+
+            if len(dRows[tbl]) >= 10000:
+                FlushRows(tbl)
+
+    for tbl in tblOrder:
+        FlushRows(tbl)
+
+    for tbl, fld in indexList:
+        conn.execute("CREATE INDEX idx_" + tbl + "_" + fld + " ON " + tbl + " (" + fld + ")")
+
+    conn.commit()
+    conn.close()
+
+    return dCounts
+
+## ===================================================================================
+def WriteGeodatabase(outputDB, templateDB, ruleList):
+    # Copy the template gSSURGO database, replace its soil data with the synthetic records and
+    # create one square MUPOLYGON per map unit. Only the generated columns that exist in the
+    # template schema are written. Returns a dictionary of record counts.
+    #
+    if arcpy.Exists(outputDB):
+        arcpy.Delete_management(outputDB)
+
+    arcpy.Copy_management(templateDB, outputDB)
+    env.workspace = outputDB
+
+    muPolygon = os.path.join(outputDB, "MUPOLYGON")
+    muDesc = arcpy.Describe(muPolygon)
+    ext = muDesc.extent
+    cellSize = 0.001 if muDesc.spatialReference.type == "Geographic" else 100.0
+    xMin = 0.0 if ext is None or ext.XMin is None else ext.XMin
+    yMin = 0.0 if ext is None or ext.YMin is None else ext.YMin
+
+    # Remove the template soil data, keeping the md* and sdv* metadata tables. Output tables
+    # from the tools being benchmarked (SDV_*, Valu1, MuTest) are removed.
+    for fc in arcpy.ListFeatureClasses("*"):
+        arcpy.DeleteRows_management(os.path.join(outputDB, fc))
+
+    for tbl in arcpy.ListTables("*"):
+        if tbl.upper().startswith("SDV_") or tbl.upper() in ["VALU1", "MUTEST"]:
+            arcpy.Delete_management(os.path.join(outputDB, tbl))
+
+        elif not tbl.lower().startswith("md") and not tbl.lower().startswith("sdv"):
+            arcpy.DeleteRows_management(os.path.join(outputDB, tbl))
+
+    dCursors = dict()
+    dIndexes = dict()
+    dCounts = dict()
+
+    try:
+        for tbl in tblOrder:
+            if tbl.startswith("sdv") or not arcpy.Exists(os.path.join(outputDB, tbl)):
+                continue
+
+            tblFields = [fld.name.lower() for fld in arcpy.ListFields(os.path.join(outputDB, tbl))]
+            flds = [fld for fld in dColumns[tbl] if fld in tblFields]
+            dIndexes[tbl] = [dColumns[tbl].index(fld) for fld in flds]
+            dCursors[tbl] = arcpy.da.InsertCursor(os.path.join(outputDB, tbl), flds)
+            dCounts[tbl] = 0
+
+        polyCur = arcpy.da.InsertCursor(muPolygon, ["SHAPE@", "AREASYMBOL", "SPATIALVER", "MUSYM", "MUKEY"])
+        dCounts["mupolygon"] = 0
+        rowCnt = int(math.ceil(math.sqrt(dScale["surveys"] * dScale["mapunits"])))
+
+        for surveyIdx in range(dScale["surveys"]):
+            arcpy.SetProgressorLabel("Generating survey " + str(surveyIdx + 1) + " of " + str(dScale["surveys"]))
+
+            for tbl, rec in GenerateSurvey(surveyIdx, ruleList):
+                if tbl == "legend":
+                    areasymbol = rec[0]
+
+                elif tbl == "mapunit":
+                    # Square polygon in a grid ordered by map unit
+                    i = dCounts["mupolygon"]
+                    x = xMin + (i % rowCnt) * cellSize
+                    y = yMin + (i // rowCnt) * cellSize
+                    pts = arcpy.Array([arcpy.Point(x, y), arcpy.Point(x, y + cellSize), arcpy.Point(x + cellSize, y + cellSize), arcpy.Point(x + cellSize, y), arcpy.Point(x, y)])
+                    polyCur.insertRow([arcpy.Polygon(pts, muDesc.spatialReference), areasymbol, 1, rec[0], rec[-1]])
+                    dCounts["mupolygon"] += 1
+
+                if tbl in dCursors:
+                    dCursors[tbl].insertRow([rec[i] for i in dIndexes[tbl]])
+                    dCounts[tbl] += 1
+
+    finally:
+        # Deleting the dictionary entries releases the insert cursors
+        dCursors.clear()
+
+        try:
+            del polyCur
+
+        except:
+            pass
+
+    return dCounts
+
+## ===================================================================================
+def ReadSQLite(conn, sql):
+    # Return an iterator of records and a counter for the records read
+    #
+    dCount = {"records":0}
+
+    def Records():
+        for rec in conn.execute(sql):
+            dCount["records"] += 1
+            yield rec
+
+    return Records(), dCount
+
+## ===================================================================================
+def GroupBy(recs, keyIndex=0):
+    # Group an iterator of records that is sorted on the key column
+    #
+    return itertools.groupby(recs, operator.itemgetter(keyIndex))
+
+## ===================================================================================
+def DominantCondition(compList, domainOrder):
+    # compList is [(comppct, rating), ...]. Returns the rating with the highest sum of comppct
+    # and that sum. Ties go to the higher rating in domainOrder.
+    #
+    dSum = collections.defaultdict(int)
+
+    for comppct, rating in compList:
+        dSum[rating] += comppct
+
+    rating = max(dSum, key=lambda r: (dSum[r], domainOrder.index(r) if r in domainOrder else -1))
+
+    return rating, dSum[rating]
+
+## ===================================================================================
+def SmokeTestSQLite(outputDB, name):
+    # Generator smoke test. Run one simplified aggregation against the SQLite database and write
+    # the map unit ratings to an SDV_ table. These are hand-written SQL versions of the methods,
+    # not the gSSURGO_CreateSoilMap Aggregate functions. Returns the record counts.
+    #
+    dBench = dSQLiteSmokeTests[name]
+    conn = sqlite3.connect(outputDB)
+    method = dBench["method"]
+    results = list()
+
+    if method == "DCP":
+        recs, dCount = ReadSQLite(conn, "SELECT mukey, comppct_r, " + dBench["column"] + " FROM component ORDER BY mukey, comppct_r DESC, cokey")
+
+        for mukey, grp in GroupBy(recs):
+            rec = grp.next()
+            results.append((mukey, rec[1], rec[2]))
+
+    elif method == "DCD":
+        recs, dCount = ReadSQLite(conn, "SELECT mukey, comppct_r, " + dBench["column"] + " FROM component ORDER BY mukey")
+
+        for mukey, grp in GroupBy(recs):
+            rating, pct = DominantCondition([(r[1], r[2]) for r in grp], dBench["domain"])
+            results.append((mukey, pct, rating))
+
+    elif method == "WTA":
+        recs, dCount = ReadSQLite(conn, "SELECT mukey, comppct_r, " + dBench["column"] + " FROM component ORDER BY mukey")
+
+        for mukey, grp in GroupBy(recs):
+            compList = [(r[1], r[2]) for r in grp if not r[2] is None]
+            sumPct = sum([p for p, v in compList])
+
+            if sumPct > 0:
+                results.append((mukey, sumPct, round(sum([p * v for p, v in compList]) / float(sumPct), 2)))
+
+    elif method == "MaxMin":
+        recs, dCount = ReadSQLite(conn, "SELECT mukey, comppct_r, " + dBench["column"] + " FROM component ORDER BY mukey")
+
+        for mukey, grp in GroupBy(recs):
+            compList = [(r[2], r[1]) for r in grp if not r[2] is None]
+
+            if len(compList) > 0:
+                val = max(compList)
+                results.append((mukey, val[1], val[0]))
+
+    elif method == "PP":
+        recs, dCount = ReadSQLite(conn, "SELECT mukey, comppct_r, " + dBench["column"] + " FROM component ORDER BY mukey")
+
+        for mukey, grp in GroupBy(recs):
+            compList = [(r[1], r[2]) for r in grp]
+            results.append((mukey, sum([p for p, v in compList]), sum([p for p, v in compList if v == dBench["value"]])))
+
+    elif method in ["Hz_WTA_WTA", "Hz_WTA_SUM"]:
+        # Clipped horizon thickness weighting for the depth range, then component percent weighting
+        top, bot = dBench["depths"]
+        recs, dCount = ReadSQLite(conn, "SELECT c.mukey, c.cokey, c.comppct_r, h.hzdept_r, h.hzdepb_r, h." + dBench["column"] + " FROM component c INNER JOIN chorizon h ON c.cokey = h.cokey " + \
+                                  "WHERE h.hzdept_r < " + str(bot) + " AND h.hzdepb_r > " + str(top) + " ORDER BY c.mukey, c.cokey")
+
+        for mukey, grp in GroupBy(recs):
+            sumPct = 0
+            muSum = 0.0
+
+            for cokey, hzGrp in GroupBy(grp, 1):
+                hzList = list(hzGrp)
+                thkSum = 0
+                valSum = 0.0
+
+                for rec in hzList:
+                    if rec[5] is None:
+                        continue
+
+                    thk = min(bot, rec[4]) - max(top, rec[3])
+                    thkSum += thk
+                    valSum += thk * rec[5]
+
+                if thkSum > 0:
+                    compVal = valSum if method == "Hz_WTA_SUM" else valSum / thkSum
+                    sumPct += hzList[0][2]
+                    muSum += hzList[0][2] * compVal
+
+            if sumPct > 0:
+                results.append((mukey, sumPct, round(muSum / sumPct, 3)))
+
+    elif method == "Mo_DCD":
+        # Highest class for each component over the months, then dominant condition
+        recs, dCount = ReadSQLite(conn, "SELECT c.mukey, c.cokey, c.comppct_r, m." + dBench["column"] + " FROM component c INNER JOIN comonth m ON c.cokey = m.cokey ORDER BY c.mukey, c.cokey")
+        domain = dBench["domain"]
+
+        for mukey, grp in GroupBy(recs):
+            compList = list()
+
+            for cokey, moGrp in GroupBy(grp, 1):
+                moList = list(moGrp)
+                vals = [r[3] for r in moList if r[3] in domain]
+                compList.append((moList[0][2], max(vals, key=domain.index) if len(vals) > 0 else None))
+
+            rating, pct = DominantCondition(compList, domain)
+            results.append((mukey, pct, rating))
+
+    elif method == "DTWT":
+        # Shallowest 'Wet' soil moisture depth for each component (201 when there is none), then weighted average
+        recs, dCount = ReadSQLite(conn, "SELECT c.mukey, c.cokey, c.comppct_r, MIN(s.soimoistdept_r) FROM component c INNER JOIN comonth m ON c.cokey = m.cokey " + \
+                                  "LEFT OUTER JOIN cosoilmoist s ON m.comonthkey = s.comonthkey AND s.soimoiststat = 'Wet' GROUP BY c.mukey, c.cokey, c.comppct_r ORDER BY c.mukey")
+
+        for mukey, grp in GroupBy(recs):
+            compList = [(r[2], 201 if r[3] is None else min(r[3], 201)) for r in grp]
+            sumPct = sum([p for p, v in compList])
+
+            if sumPct > 0:
+                results.append((mukey, sumPct, round(sum([p * v for p, v in compList]) / float(sumPct), 0)))
+
+    elif method == "Interp_DCD":
+        rule = conn.execute("SELECT rulename FROM distinterpmd ORDER BY rulekey LIMIT 1").fetchone()[0]
+        recs, dCount = ReadSQLite(conn, "SELECT c.mukey, c.comppct_r, i.interphrc FROM component c INNER JOIN cointerp i ON c.cokey = i.cokey " + \
+                                  "WHERE i.mrulename = '" + rule.replace("'", "''") + "' AND i.ruledepth = 0 ORDER BY c.mukey")
+
+        for mukey, grp in GroupBy(recs):
+            rating, pct = DominantCondition([(r[1], r[2]) for r in grp], interpClasses[1] + ["Not rated"])
+            results.append((mukey, pct, rating))
+
+    else:
+        raise MyError, "Unknown benchmark method: " + method
+
+    outputTbl = "SDV_" + name
+    conn.execute("DROP TABLE IF EXISTS " + outputTbl)
+    conn.execute("CREATE TABLE " + outputTbl + " (mukey, comppct_r, rating)")
+    conn.executemany("INSERT INTO " + outputTbl + " VALUES (?, ?, ?)", results)
+    conn.commit()
+    conn.close()
+
+    return {"benchmark":name, "method":method, "records":dCount["records"], "outputrecords":len(results), "smoketest":True}
+
+## ===================================================================================
+def BenchSoilMap(outputDB, name):
+    # Run gSSURGO_CreateSoilMap in headless mode for one entry in dSoilMapBenchmarks.
+    # The stage timings come from the CreateSoilMap run log (<gdb>_RunLog.jsonl).
+    #
+    import gSSURGO_CreateSoilMap
+
+    sdvAtt, aggMethod, top, bot, begMo, endMo = dSoilMapBenchmarks[name]
+    gSSURGO_CreateSoilMap.bRatingCache = False
+    gSSURGO_CreateSoilMap.bRunLog = True
+    inputLayer = "Benchmark_MUPOLYGON"
+    arcpy.MakeFeatureLayer_management(os.path.join(outputDB, "MUPOLYGON"), inputLayer)
+
+    start = time.time()
+    # Same settings as a gSSURGO_CreateSoilMaps batch run: no component percent cutoff and
+    # nulls treated as zero (bZero)
+    outputTbl = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, "", "", top, bot, begMo, endMo, "", True, 0, False, "Representative", "", None, "")
+    seconds = time.time() - start
+
+    dResult = {"benchmark":name, "method":aggMethod, "records":None, "outputrecords":None, "seconds":round(seconds, 3)}
+
+    if outputTbl is None:
+        dResult["status"] = "failed"
+        return dResult
+
+    # The last run log line written by this process
+    logFile = os.path.splitext(outputDB)[0] + "_RunLog.jsonl"
+    dRun = None
+
+    with open(logFile, "r") as fh:
+        for line in fh:
+            rec = json.loads(line)
+
+            if rec["pid"] == os.getpid():
+                dRun = rec
+
+    if not dRun is None:
+        dResult["status"] = dRun["status"]
+        dResult["stages"] = dRun["stages"]
+
+        for dStage in dRun["stages"]:
+            if dStage["stage"] == "CreateRatingTable":
+                dResult["records"] = dStage["records"]
+
+            elif dStage["stage"] in gSSURGO_CreateSoilMap.dAggMethods:
+                dResult["method"] = dStage["stage"]
+                dResult["aggregateseconds"] = dStage["seconds"]
+
+    # Counted here, outside the timed run (the run log records the SDV_Data records aggregated)
+    if arcpy.Exists(outputTbl):
+        dResult["outputrecords"] = int(arcpy.GetCount_management(outputTbl).getOutput(0))
+
+    return dResult
+
+## ===================================================================================
+def BenchWideRatingTable(outputDB, name):
+    # Time gSSURGO_CreateSoilMap.CreateWideRatingTable for one entry in dWideBenchmarks, then check
+    # each wide table column against the SDV_ table from a headless CreateSoilMap run with the same
+    # settings (not timed). The status lists any attribute whose ratings differ.
+    #
+    import gSSURGO_CreateSoilMap
+
+    aggMethod, bZero, attList = dWideBenchmarks[name]
+    gSSURGO_CreateSoilMap.bRatingCache = False
+    gSSURGO_CreateSoilMap.bRunLog = False
+    inputLayer = "Benchmark_MUPOLYGON"
+    arcpy.MakeFeatureLayer_management(os.path.join(outputDB, "MUPOLYGON"), inputLayer)
+    wideTbl = os.path.join(outputDB, "SDV_" + name)
+
+    start = time.time()
+    wideAtts = gSSURGO_CreateSoilMap.CreateWideRatingTable(inputLayer, [[att, aggMethod] for att in attList], wideTbl, 0, bZero)
+    seconds = time.time() - start
+
+    recCnt = int(arcpy.GetCount_management(os.path.join(outputDB, "component")).getOutput(0))
+    dResult = {"benchmark":name, "method":"CreateWideRatingTable", "records":recCnt, "outputrecords":None, "seconds":round(seconds, 3)}
+
+    if len(wideAtts) == 0:
+        dResult["status"] = "failed"
+        return dResult
+
+    dResult["outputrecords"] = int(arcpy.GetCount_management(wideTbl).getOutput(0))
+    dDiffs = dict()
+
+    for sdvAtt in wideAtts:
+        ratingTbl = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, "", "", 0, 0, "January", "December", "", bZero, 0, False, "Representative", "", None, "")
+
+        if ratingTbl is None:
+            dDiffs[sdvAtt] = None
+            continue
+
+        diffList = gSSURGO_CreateSoilMap.CheckWideRatingTable(wideTbl, sdvAtt, ratingTbl)
+        dDiffs[sdvAtt] = None if diffList is None else len(diffList)
+
+    dResult["parity"] = dDiffs
+    badList = [sdvAtt for sdvAtt, diffCnt in sorted(dDiffs.items()) if diffCnt != 0]
+
+    if len(badList) == 0:
+        dResult["status"] = "ok"
+
+    else:
+        dResult["status"] = "parity failed: " + ", ".join([sdvAtt + " (" + ("no SDV_ table" if dDiffs[sdvAtt] is None else str(dDiffs[sdvAtt]) + " map units") + ")" for sdvAtt in badList])
+        PrintMsg(name + " " + dResult["status"], 1)
+
+    return dResult
+
+## ===================================================================================
+def BenchValuTable(outputDB, name):
+    # Run gSSURGO_ValuTable.CreateValuTable and time each of its calculation functions
+    #
+    import gSSURGO_ValuTable
+
+    dTimes = collections.OrderedDict()
+
+    def Timed(funcName):
+        func = getattr(gSSURGO_ValuTable, funcName)
+
+        def TimedFunction(*args):
+            funcStart = time.time()
+
+            try:
+                return func(*args)
+
+            finally:
+                dTimes[funcName] = round(dTimes.get(funcName, 0.0) + time.time() - funcStart, 3)
+
+        return TimedFunction
+
+    # The query tables are built in memory unless bMemoryQuery has been turned off
+    if gSSURGO_ValuTable.bMemoryQuery:
+        queryFunction = "CreateMemoryQueryTables"
+
+    else:
+        queryFunction = "CreateQueryTables"
+
+    for funcName in [queryFunction, "CalcRZDepth", "CalcRZAWS", "CalcAWSSOC", "CalcNCCPI2", "CalcNCCPI3", "CalcPWSL"]:
+        setattr(gSSURGO_ValuTable, funcName, Timed(funcName))
+
+    start = time.time()
+    bValu = gSSURGO_ValuTable.CreateValuTable(outputDB)
+    seconds = time.time() - start
+
+    valuTbl = os.path.join(outputDB, "Valu1")
+    outCnt = int(arcpy.GetCount_management(valuTbl).getOutput(0)) if arcpy.Exists(valuTbl) else None
+    recCnt = int(arcpy.GetCount_management(os.path.join(outputDB, "chorizon")).getOutput(0))
+
+    return {"benchmark":name, "method":"CreateValuTable", "records":recCnt, "outputrecords":outCnt, "seconds":round(seconds, 3), "status":"ok" if bValu else "failed", "functions":dTimes}
+
+## ===================================================================================
+def BenchValidateData(outputDB, name):
+    # Run the gSSURGO_ValidateData script (it has no main guard) with the database as its parameter
+    #
+    scriptPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gSSURGO_ValidateData.py")
+    sys.argv = [scriptPath, outputDB]
+
+    start = time.time()
+    runpy.run_path(scriptPath, run_name="__main__")
+    seconds = time.time() - start
+
+    recCnt = int(arcpy.GetCount_management(os.path.join(outputDB, "component")).getOutput(0))
+
+    return {"benchmark":name, "method":"ValidateData", "records":recCnt, "outputrecords":None, "seconds":round(seconds, 3)}
+
+## ===================================================================================
+def RunBenchmark(params):
+    # Worker process function. Runs one benchmark and adds the peak memory of the process.
+    #
+    benchFunction, outputDB, name, dScaleSettings, seedValue = params
+
+    global dScale, seed
+    dScale = dScaleSettings
+    seed = seedValue
+
+    try:
+        dResult = globals()[benchFunction](outputDB, name)
+
+    except:
+        errorMsg()
+        dResult = {"benchmark":name, "status":"failed", "records":None, "seconds":None}
+
+    dResult["peakmem"] = GetPeakMemory()
+
+    if dResult.get("records") and dResult.get("seconds"):
+        dResult["rowspersec"] = round(dResult["records"] / max(dResult.get("aggregateseconds", dResult["seconds"]), 0.001), 1)
+
+    else:
+        dResult["rowspersec"] = None
+
+    return dResult
+
+## ===================================================================================
+def RunBenchmarks(outputDB, scaleName, templateDB):
+    # Generate the synthetic database, run each benchmark in its own process and report the results
+    #
+    try:
+        bSQLite = os.path.splitext(outputDB)[1].lower() in [".sqlite", ".db"]
+
+        if not bSQLite:
+            if arcpy is None:
+                raise MyError, "arcpy is required for a geodatabase. Use a .sqlite output to run the generator smoke test."
+
+            if templateDB is None or not arcpy.Exists(templateDB):
+                raise MyError, "A template gSSURGO database is required for a geodatabase output"
+
+        PrintMsg(" \nGenerating '" + scaleName + "' synthetic SSURGO database (" + Number_Format(dScale["surveys"], 0, True) + " survey areas, seed " + str(seed) + ")", 0)
+        start = time.time()
+
+        if bSQLite:
+            ruleList = GetRuleList(None)
+            dCounts = WriteSQLite(outputDB, ruleList)
+            taskList = [("SmokeTestSQLite", outputDB, name, dScale, seed) for name in sorted(dSQLiteSmokeTests)]
+
+        else:
+            ruleList = GetRuleList(templateDB)
+            dCounts = WriteGeodatabase(outputDB, templateDB, ruleList)
+            taskList = [("BenchSoilMap", outputDB, name, dScale, seed) for name in sorted(dSoilMapBenchmarks)]
+            taskList.extend([("BenchWideRatingTable", outputDB, name, dScale, seed) for name in sorted(dWideBenchmarks)])
+            taskList.append(("BenchValuTable", outputDB, "ValuTable", dScale, seed))
+            taskList.append(("BenchValidateData", outputDB, "ValidateData", dScale, seed))
+
+        generateSeconds = time.time() - start
+        PrintMsg("\tGenerated " + Number_Format(sum(dCounts.values()), 0, True) + " records in " + str(round(generateSeconds, 1)) + " seconds", 0)
+
+        for tbl in sorted(dCounts):
+            PrintMsg("\t\t" + tbl.ljust(20) + Number_Format(dCounts[tbl], 0, True).rjust(14), 0)
+
+        logFile = os.path.splitext(outputDB)[0] + "_Benchmark.jsonl"
+        runDate = time.strftime("%Y-%m-%d %H:%M:%S")
+        resultList = list()
+
+        if bSQLite:
+            # The smoke test queries are not the gSSURGO_CreateSoilMap functions, so they are not timed
+            PrintMsg(" \nGenerator smoke test (not a benchmark)", 0)
+            PrintMsg(" \n" + "Test".ljust(36) + "Method".ljust(26) + "Records".rjust(14) + "Map units".rjust(14) + "Status".rjust(10), 0)
+
+        else:
+            PrintMsg(" \n" + "Benchmark".ljust(36) + "Method".ljust(26) + "Records".rjust(14) + "Seconds".rjust(10) + "Rows/sec".rjust(14) + "Peak MB".rjust(10), 0)
+
+        for task in taskList:
+            # A new process for each benchmark so that the peak memory is not carried over
+            pool = multiprocessing.Pool(1, maxtasksperchild=1)
+
+            try:
+                dResult = pool.apply(RunBenchmark, (task,))
+
+            finally:
+                pool.close()
+                pool.join()
+
+            dResult["rundate"] = runDate
+            dResult["scale"] = scaleName
+            dResult["seed"] = seed
+            dResult["database"] = outputDB
+            resultList.append(dResult)
+
+            if bSQLite:
+                PrintMsg(str(dResult["benchmark"]).ljust(36) + str(dResult.get("method")).ljust(26) + \
+                         ("" if dResult.get("records") is None else Number_Format(dResult["records"], 0, True)).rjust(14) + \
+                         ("" if dResult.get("outputrecords") is None else Number_Format(dResult["outputrecords"], 0, True)).rjust(14) + \
+                         dResult.get("status", "ok").rjust(10), 0)
+                continue
+
+            PrintMsg(str(dResult["benchmark"]).ljust(36) + str(dResult.get("method")).ljust(26) + \
+                     ("" if dResult.get("records") is None else Number_Format(dResult["records"], 0, True)).rjust(14) + \
+                     ("" if dResult.get("seconds") is None else str(dResult["seconds"])).rjust(10) + \
+                     ("" if dResult["rowspersec"] is None else Number_Format(dResult["rowspersec"], 0, True)).rjust(14) + \
+                     ("" if dResult["peakmem"] is None else str(dResult["peakmem"])).rjust(10), 0)
+
+        if bSQLite:
+            PrintMsg(" \nSmoke test results are not written to the benchmark log \n ", 0)
+            return resultList
+
+        with open(logFile, "a") as fh:
+            for dResult in resultList:
+                fh.write(json.dumps(dResult, default=str, sort_keys=True) + "\n")
+
+        PrintMsg(" \nBenchmark results appended to " + logFile + " \n ", 0)
+
+        return resultList
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return None
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+## ====================================== Main Body ==================================
+# Import modules
+import os, sys, string, locale, traceback, collections, datetime, itertools, json, math, multiprocessing, operator, random, runpy, sqlite3, time
+
+try:
+    # arcpy is only needed for the geodatabase output
+    import arcpy
+    from arcpy import env
+
+except:
+    arcpy = None
+
+# Generator settings for each scale. Counts are means; actual counts vary by survey and map unit.
+#   surveys     number of survey areas
+#   mapunits    map units per survey area
+#   components  components per map unit
+#   horizons    (min, max) horizons per soil component
+#   rules       interpretation rules in cointerp
+#   reasons     maximum reason records per rule
+dScales = dict()
+dScales["survey"] = {"surveys":1, "mapunits":300, "components":2.5, "horizons":(3, 7), "rules":20, "reasons":3}
+dScales["state"] = {"surveys":60, "mapunits":300, "components":2.5, "horizons":(3, 7), "rules":20, "reasons":3}
+dScales["conus"] = {"surveys":3100, "mapunits":100, "components":2.5, "horizons":(3, 7), "rules":20, "reasons":3}
+
+# Fraction of NULL values for these columns
+dNullRates = {"farmlndcl":0.05, "localphase":0.75, "slope_r":0.02, "drainagecl":0.04, "hydgrp":0.05, "taxorder":0.06, "tfact":0.08,
+              "sandtotal_r":0.03, "silttotal_r":0.03, "claytotal_r":0.03, "om_r":0.05, "dbthirdbar_r":0.06, "ksat_r":0.03, "awc_r":0.04,
+              "ec_r":0.4, "ph1to1h2o_r":0.08, "kwfact":0.2, "fragvol_r":0.05, "reshard":0.3, "resdepb_r":0.2, "flodfreqcl":0.1,
+              "pondfreqcl":0.1, "interphr":0.03}
+
+# Generated columns for each table, in GenerateSurvey record order
+dColumns = dict()
+dColumns["sdvfolder"] = ["folderkey", "foldername", "folderdescription", "foldersequence"]
+dColumns["sdvalgorithm"] = ["algorithmsequence", "algorithmname", "algorithminitials"]
+dColumns["sdvattribute"] = ["attributekey", "attributename", "attributetablename", "attributecolumnname", "attributelevel", "algorithmname", "nasisrulename", "resultcolumnname"]
+dColumns["sdvfolderattribute"] = ["folderkey", "attributekey"]
+dColumns["legend"] = ["areasymbol", "areaname", "areatypename", "lkey"]
+dColumns["sacatalog"] = ["areasymbol", "areaname", "saverest", "saversion", "sacatalogkey"]
+dColumns["distinterpmd"] = ["rulekey", "rulename", "ruledesign", "distinterpmdkey"]
+dColumns["mapunit"] = ["musym", "muname", "mukind", "muacres", "farmlndcl", "lkey", "mukey"]
+dColumns["muaggatt"] = ["musym", "muname", "hydgrpdcd", "drclassdcd", "flodfreqdcd", "hydclprs", "slopegraddcp", "mukey"]
+dColumns["component"] = ["comppct_r", "compname", "compkind", "majcompflag", "localphase", "slope_r", "drainagecl", "hydgrp", "hydricrating", "taxorder", "taxsubgrp", "tfact", "mukey", "cokey"]
+dColumns["chorizon"] = ["hzname", "desgnmaster", "hzdept_r", "hzdepb_r", "hzthk_r", "sandtotal_r", "silttotal_r", "claytotal_r", "om_r", "dbthirdbar_r", "ksat_r", "awc_r", "ec_r", "ph1to1h2o_r", "kwfact", "cokey", "chkey"]
+dColumns["chtexturegrp"] = ["texture", "stratextsflag", "rvindicator", "texdesc", "chkey", "chtgkey"]
+dColumns["chfrags"] = ["fragvol_r", "fragkind", "chkey", "chfragskey"]
+dColumns["corestrictions"] = ["reskind", "reshard", "resdept_r", "resdepb_r", "resthk_r", "cokey", "corestrictkey"]
+dColumns["comonth"] = ["monthseq", "month", "flodfreqcl", "pondfreqcl", "cokey", "comonthkey"]
+dColumns["cosoilmoist"] = ["soimoistdept_r", "soimoistdepb_r", "soimoiststat", "comonthkey", "cosoilmoistkey"]
+dColumns["cointerp"] = ["cokey", "mrulekey", "mrulename", "seqnum", "rulekey", "rulename", "ruledepth", "interphr", "interphrc", "cointerpkey"]
+
+tblOrder = ["sdvfolder", "sdvalgorithm", "sdvattribute", "sdvfolderattribute", "legend", "sacatalog", "distinterpmd", "mapunit", "muaggatt", "component",
+            "chorizon", "chtexturegrp", "chfrags", "corestrictions", "comonth", "cosoilmoist", "cointerp"]
+indexList = [("mapunit", "mukey"), ("component", "mukey"), ("component", "cokey"), ("chorizon", "cokey"), ("comonth", "cokey"), ("comonth", "comonthkey"),
+             ("cosoilmoist", "comonthkey"), ("cointerp", "cokey"), ("cointerp", "mrulename"), ("corestrictions", "cokey"), ("chfrags", "chkey")]
+
+# SSURGO domain values used by the generator
+stateList = ["AL", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT",
+             "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"]
+monthList = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+drainageList = ["Excessively drained", "Somewhat excessively drained", "Well drained", "Moderately well drained", "Somewhat poorly drained", "Poorly drained", "Very poorly drained"]
+hydgrpList = ["A", "B", "C", "D", "A/D", "B/D", "C/D"]
+floodList = ["None", "None", "None", "Very rare", "Rare", "Occasional", "Frequent", "Very frequent"]
+floodDomain = ["None", "Very rare", "Rare", "Occasional", "Frequent", "Very frequent"]
+taxorderList = ["Alfisols", "Aridisols", "Entisols", "Histosols", "Inceptisols", "Mollisols", "Spodosols", "Ultisols", "Vertisols"]
+textureList = ["L", "SIL", "SL", "CL", "SICL", "LS", "S", "C", "SIC", "GR-L", "CB-SL", "MUCK"]
+reskindList = ["Lithic bedrock", "Paralithic bedrock", "Densic material", "Fragipan", "Duripan", "Abrupt textural change", "Natric", "Petrocalcic"]
+farmlandList = ["All areas are prime farmland", "Farmland of statewide importance", "Not prime farmland", "Prime farmland if drained"]
+seriesList = ["Adair", "Barnes", "Clarion", "Drummer", "Fayette", "Houston", "Miami", "Nicollet", "Sharpsburg", "Tama", "Webster", "Zook"]
+miscList = ["Water", "Pits", "Rock outcrop", "Urban land", "Dumps"]
+interpClasses = {1:["Not limited", "Somewhat limited", "Very limited"], 2:["Well suited", "Moderately suited", "Poorly suited"]}
+reasonList = ["Depth to saturated zone", "Slope", "Flooding", "Shrink-swell", "Depth to bedrock", "Too clayey"]
+defaultRules = [["ENG - Dwellings With Basements", 1], ["ENG - Septic Tank Absorption Fields", 1], ["ENG - Local Roads and Streets", 1],
+                ["AGR - Farm and Garden Composting Facility - Surface", 2], ["FOR - Potential Seedling Mortality", 1],
+                ["NCCPI - National Commodity Crop Productivity Index (Ver 3.0)", 2]]
+sdvAlgorithms = [(1, "Dominant Component", "DCP"), (2, "Dominant Condition", "DCD"), (3, "Weighted Average", "WTA"),
+                 (4, "Minimum or Maximum", "MAX"), (5, "Percent Present", "PP")]
+
+# SQLite generator smoke tests, see SmokeTestSQLite
+dSQLiteSmokeTests = dict()
+dSQLiteSmokeTests["DrainageClass_DCP"] = {"attributename":"Drainage Class", "table":"component", "column":"drainagecl", "level":"component", "algorithm":"Dominant Component", "method":"DCP"}
+dSQLiteSmokeTests["DrainageClass_DCD"] = {"attributename":"Drainage Class", "table":"component", "column":"drainagecl", "level":"component", "algorithm":"Dominant Condition", "method":"DCD", "domain":drainageList}
+dSQLiteSmokeTests["Slope_WTA"] = {"attributename":"Slope", "table":"component", "column":"slope_r", "level":"component", "algorithm":"Weighted Average", "method":"WTA"}
+dSQLiteSmokeTests["Slope_Max"] = {"attributename":"Slope", "table":"component", "column":"slope_r", "level":"component", "algorithm":"Minimum or Maximum", "method":"MaxMin"}
+dSQLiteSmokeTests["Hydric_PP"] = {"attributename":"Hydric Classification - Presence", "table":"component", "column":"hydricrating", "level":"component", "algorithm":"Percent Present", "method":"PP", "value":"Yes"}
+dSQLiteSmokeTests["pH_0to25_WTA"] = {"attributename":"pH (1 to 1 Water)", "table":"chorizon", "column":"ph1to1h2o_r", "level":"horizon", "algorithm":"Weighted Average", "method":"Hz_WTA_WTA", "depths":(0, 25)}
+dSQLiteSmokeTests["AWS_0to100_SUM"] = {"attributename":"Available Water Storage", "table":"chorizon", "column":"awc_r", "level":"horizon", "algorithm":"Weighted Average", "method":"Hz_WTA_SUM", "depths":(0, 100)}
+dSQLiteSmokeTests["FloodFreq_Mo_DCD"] = {"attributename":"Flooding Frequency Class", "table":"comonth", "column":"flodfreqcl", "level":"comonth", "algorithm":"Dominant Condition", "method":"Mo_DCD", "domain":floodDomain}
+dSQLiteSmokeTests["DTWT_WTA"] = {"attributename":"Depth to Water Table", "table":"cosoilmoist", "column":"soimoistdept_r", "level":"comonth", "algorithm":"Weighted Average", "method":"DTWT"}
+dSQLiteSmokeTests["Interp_DCD"] = {"attributename":"Dwellings With Basements", "table":"cointerp", "column":"interphrc", "level":"component", "algorithm":"Dominant Condition", "method":"Interp_DCD", "rule":defaultRules[0][0]}
+
+# gSSURGO_CreateSoilMap benchmarks: (sdvAtt, aggMethod, top, bot, begMo, endMo). Together they cover the
+# aggregation methods in dAggMethods; the method that actually ran is taken from the run log. The months
+# are the gSSURGO_CreateSoilMaps defaults (January to December) and are only used by comonth attributes.
+dSoilMapBenchmarks = dict()
+dSoilMapBenchmarks["HydricRating_Mapunit"] = ("Hydric Rating by Map Unit", "", 0, 0, "January", "December")
+dSoilMapBenchmarks["DrainageClass_DCP"] = ("Drainage Class", "Dominant Component", 0, 0, "January", "December")
+dSoilMapBenchmarks["DrainageClass_DCD"] = ("Drainage Class", "Dominant Condition", 0, 0, "January", "December")
+dSoilMapBenchmarks["Slope_DCP"] = ("Slope", "Dominant Component", 0, 0, "January", "December")
+dSoilMapBenchmarks["Slope_WTA"] = ("Slope", "Weighted Average", 0, 0, "January", "December")
+dSoilMapBenchmarks["Slope_MaxMin"] = ("Slope", "Minimum or Maximum", 0, 0, "January", "December")
+dSoilMapBenchmarks["Hydric_PP"] = ("Hydric Classification - Presence", "Percent Present", 0, 0, "January", "December")
+dSoilMapBenchmarks["DTWT_DCP"] = ("Depth to Water Table", "Dominant Component", 0, 0, "January", "December")
+dSoilMapBenchmarks["DTWT_DCD"] = ("Depth to Water Table", "Dominant Condition", 0, 0, "January", "December")
+dSoilMapBenchmarks["DTWT_WTA"] = ("Depth to Water Table", "Weighted Average", 0, 0, "January", "December")
+dSoilMapBenchmarks["FloodFreq_DCD"] = ("Flooding Frequency Class", "Dominant Condition", 0, 0, "January", "December")
+dSoilMapBenchmarks["FloodFreq_DCP"] = ("Flooding Frequency Class", "Dominant Component", 0, 0, "January", "December")
+dSoilMapBenchmarks["pH_0to25_WTA"] = ("pH (1 to 1 Water)", "Weighted Average", 0, 25, "January", "December")
+dSoilMapBenchmarks["pH_0to25_DCP"] = ("pH (1 to 1 Water)", "Dominant Component", 0, 25, "January", "December")
+dSoilMapBenchmarks["pH_0to25_MaxMin"] = ("pH (1 to 1 Water)", "Minimum or Maximum", 0, 25, "January", "December")
+dSoilMapBenchmarks["AWS_0to100_WTA"] = ("Available Water Storage", "Weighted Average", 0, 100, "January", "December")
+dSoilMapBenchmarks["Dwellings_DCD"] = ("Dwellings With Basements", "Dominant Condition", 0, 0, "January", "December")
+dSoilMapBenchmarks["Dwellings_ML"] = ("Dwellings With Basements", "Most Limiting", 0, 0, "January", "December")
+dSoilMapBenchmarks["Dwellings_WTA"] = ("Dwellings With Basements", "Weighted Average", 0, 0, "January", "December")
+
+# gSSURGO_CreateSoilMap.CreateWideRatingTable benchmarks: (aggMethod, bZero, attribute list). Each one is
+# also a parity check against the SDV_ tables CreateSoilMap creates. The bZero False entries cover the
+# NULL filter, which only applies to the dominant condition and weighted average.
+dWideBenchmarks = dict()
+dWideBenchmarks["Wide_DCP"] = ("Dominant Component", True, ["Slope", "Drainage Class", "Hydrologic Soil Group", "T Factor"])
+dWideBenchmarks["Wide_DCP_Nulls"] = ("Dominant Component", False, ["Slope", "Drainage Class", "Hydrologic Soil Group", "T Factor"])
+dWideBenchmarks["Wide_DCD"] = ("Dominant Condition", True, ["Slope", "Drainage Class", "Hydrologic Soil Group", "T Factor"])
+dWideBenchmarks["Wide_DCD_Nulls"] = ("Dominant Condition", False, ["Slope", "Drainage Class", "Hydrologic Soil Group", "T Factor"])
+dWideBenchmarks["Wide_WTA"] = ("Weighted Average", True, ["Slope", "T Factor"])
+dWideBenchmarks["Wide_WTA_Nulls"] = ("Weighted Average", False, ["Slope", "T Factor"])
+
+dScale = dScales["survey"]
+seed = 1
+
+if __name__ == "__main__":
+    try:
+        if len(sys.argv) < 2:
+            raise MyError, "Usage: gSSURGO_Benchmark.py <output .gdb or .sqlite> [survey | state | conus] [seed] [template gSSURGO .gdb]"
+
+        outputDB = sys.argv[1]
+        scaleName = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "" else "survey"
+        seed = int(sys.argv[3]) if len(sys.argv) > 3 and sys.argv[3] != "" else 1
+        templateDB = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != "" else None
+        dScale = GetScale(scaleName)
+
+        RunBenchmarks(outputDB, scaleName, templateDB)
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+
+    except:
+        errorMsg()
@@ -127,6 +127,63 @@
 # sdvAtt.startswith("Surface") or sdvAtt.endswith("(Surface)") -> "SURFACE" in sdvAtt
 # it was erroring out Soil Health - Surface Texture
 
+# 2026-10-17 The SDV_Data query table is now kept in memory (SDVTable class) as integer-encoded
+# typed-array columns. The CreateRatingTable functions append to it and the Aggregate functions
+# sort and filter it through SDVSearchCursor, so only the final map unit output table is
+# written to the geodatabase. Set bMemoryTable = False to go back to the on-disk table.
+#
+# 2026-10-17 AggregateHz_WTA_SUM, AggregateHz_WTA_WTA and AggregateHz_MaxMin_WTA use the numpy
+# kernel in HorizonComponentSums when SDV_Data is in memory. WTA_SUM now writes the map unit
+# sum of comppct_r to COMPPCT_R instead of whichever component was processed last.
+#
+# 2026-10-17 Added ReadHorizonTable. When gSSURGO_CreateSoilMaps sets hzCacheRange, the chorizon
+# table is read once for all of the depth ranges and each range is filtered in memory.
+#
+# 2026-10-17 Rating cache. Aggregated output tables are saved to <gdb>_RatingCache.sqlite keyed
+# by the CreateSoilMap parameters and a database fingerprint (SACATALOG SAVEREST dates plus table
+# record counts). A repeat request skips the table reads and aggregation and goes straight to the
+# map layer. Stale entries are removed automatically and the cache is trimmed by least recent use.
+#
+# 2026-10-17 Batch table cache. When gSSURGO_CreateSoilMaps sets bTableCache, ReadTable keeps the
+# columns it reads in dTableCache so that the next attribute in the batch does not read the
+# same mapunit, component, chorizon or comonth records again (see ReadCachedTable).
+#
+# 2026-10-17 CreateSoilMap can be run headless (mxd = None). Only the rating table is created and
+# saved to the rating cache. Used by the gSSURGO_CreateSoilMaps worker processes (ComputeSoilRatings).
+#
+# 2026-10-17 The aggregation functions are listed in the dAggMethods dispatch table with their data
+# level, depth parameters and output values rule (RegisterAggregations). SelectAggregation picks the
+# method using the same rules as before and RunAggregation calls it. The dominant component, weighted
+# average and percent present methods are registered with their tie-break and NULL rules and a map unit
+# kernel (MapunitDCP, MapunitWTA, MapunitPP); AggregateComponents runs the cursor, output table and
+# output values for them. The kernels are shared with CreateWideRatingTable.
+#
+# 2026-10-17 CreateWideRatingTable builds one mapunit-level table for a list of component-level
+# properties (dominant component, dominant condition or weighted average) from a single read of
+# the COMPONENT table, in place of separate SDV_ tables merged by gSSURGO_MergeRatingTables.
+#
+# 2026-10-17 MUKEY, COKEY, CHKEY and COMONTHKEY values get database-wide integer ids (SSURGOKeyIndex).
+# The in-memory SDV_Data tables share them and AggregateComponents and AggregateCo_DCD work on the ids,
+# converting back to MUKEY strings only for the output table.
+#
+# 2026-10-17 Streaming mode for CONUS-scale databases. When streamMemory (MB) is set and the estimated
+# memory for the soil table reads is larger, the survey areas are processed in chunks of legends
+# (CreateStreamRatingTable). Each chunk is rated and appended to the output table; only the output
+# values and legend values are kept from one chunk to the next.
+#
+# streamMemory is not a parameter of the Create Soil Map tool (the toolbox is unchanged). It is off by
+# default (0). To use streaming mode, set streamMemory near the end of this script to the memory budget
+# in MB (for example 4096 for a CONUS database), or set gSSURGO_CreateSoilMap.streamMemory from a
+# script that imports this module before calling CreateSoilMap. Only the key sets for the chunk
+# being processed are kept (GetStreamKeys), and each chunk only repeats the table reads and the
+# aggregation (CreateRatingData and RunAggregation), not the rest of CreateSoilMap.
+#
+# 2026-10-17 Run log. When bRunLog is set (off by default, gSSURGO_Benchmark turns it on), each
+# CreateSoilMap run appends one JSON line to <gdb>_RunLog.jsonl with the elapsed time, record count
+# and peak memory for each stage (GetSDVAtts, ReadTable, CreateInitialTable, CreateRatingTable, the
+# Aggregate function, CreateMapLayer and UpdateMetadata). Set bRunLogTable to also write them to the
+# SDV_RunLog table in the geodatabase.
+
 ## ===================================================================================
 class MyError(Exception):
     pass
@@ -284,6 +341,141 @@ def elapsedTime(start):
         errorMsg()
         return ""
 
+## ===================================================================================
+def GetPeakMemory():
+    # Return the peak memory (MB) used by this process, or None if it is not available. 2026-10-17
+    #
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            hProcess = ctypes.windll.kernel32.GetCurrentProcess()
+
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(hProcess, ctypes.byref(counters), counters.cb):
+                return None
+
+            return round(counters.PeakWorkingSetSize / 1048576.0, 1)
+
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        if sys.platform == "darwin":
+            return round(peak / 1048576.0, 1)   # bytes
+
+        return round(peak / 1024.0, 1)          # kilobytes
+
+    except:
+        return None
+
+## ===================================================================================
+def StartRunLog(gdb, sdvAtt, aggMethod, top, bot):
+    # Start recording stage timings and counters for one CreateSoilMap run. 2026-10-17
+    #
+    # Returns False if the run log is turned off or a run is already being recorded.
+    #
+    if not bRunLog or len(dRunLog) > 0:
+        return False
+
+    dRunLog["runid"] = hashlib.md5(str(os.getpid()) + ":" + repr(time.time()) + ":" + str(sdvAtt)).hexdigest()
+    dRunLog["rundate"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    dRunLog["gdb"] = gdb
+    dRunLog["sdvatt"] = sdvAtt
+    dRunLog["aggmethod"] = aggMethod
+    dRunLog["top"] = top
+    dRunLog["bot"] = bot
+    dRunLog["pid"] = os.getpid()
+    dRunLog["status"] = "failed"   # changed by CreateSoilMap when the run finishes
+    dRunLog["outputtable"] = None
+    dRunLog["start"] = time.time()
+    dRunLog["stages"] = list()
+
+    return True
+
+## ===================================================================================
+def LogStage(stage, start, recCnt=None, detail=None):
+    # Add the elapsed time since start, an optional record count and the peak memory so far
+    # to the stage list of the current run. 2026-10-17
+    #
+    if len(dRunLog) == 0:
+        return
+
+    dStage = dict()
+    dStage["stage"] = stage
+    dStage["detail"] = detail
+    dStage["seconds"] = round(time.time() - start, 3)
+    dStage["records"] = recCnt
+    dStage["peakmem"] = GetPeakMemory()
+
+    if not streamLkeys is None:
+        dStage["chunk"] = True
+
+    dRunLog["stages"].append(dStage)
+
+## ===================================================================================
+def WriteRunLog():
+    # Finish the current run and append it as one JSON line to <gdb>_RunLog.jsonl. 2026-10-17
+    # When bRunLogTable is set, each stage is also written as a record in the SDV_RunLog table.
+    #
+    try:
+        if len(dRunLog) == 0:
+            return False
+
+        dRunLog["seconds"] = round(time.time() - dRunLog.pop("start"), 3)
+        dRunLog["peakmem"] = GetPeakMemory()
+
+        logFile = os.path.splitext(dRunLog["gdb"])[0] + "_RunLog.jsonl"
+
+        with open(logFile, "a") as fh:
+            fh.write(json.dumps(dRunLog, default=str, sort_keys=True) + "\n")
+
+        if bRunLogTable:
+            logTbl = os.path.join(dRunLog["gdb"], "SDV_RunLog")
+
+            if not arcpy.Exists(logTbl):
+                arcpy.CreateTable_management(dRunLog["gdb"], "SDV_RunLog")
+                arcpy.AddField_management(logTbl, "RUNID", "TEXT", "", "", 32)
+                arcpy.AddField_management(logTbl, "RUNDATE", "TEXT", "", "", 20)
+                arcpy.AddField_management(logTbl, "SDVATT", "TEXT", "", "", 254)
+                arcpy.AddField_management(logTbl, "STATUS", "TEXT", "", "", 20)
+                arcpy.AddField_management(logTbl, "STAGE", "TEXT", "", "", 40)
+                arcpy.AddField_management(logTbl, "DETAIL", "TEXT", "", "", 254)
+                arcpy.AddField_management(logTbl, "SECONDS", "DOUBLE")
+                arcpy.AddField_management(logTbl, "RECORDS", "LONG")
+                arcpy.AddField_management(logTbl, "PEAKMEM", "DOUBLE")
+
+            logFlds = ["RUNID", "RUNDATE", "SDVATT", "STATUS", "STAGE", "DETAIL", "SECONDS", "RECORDS", "PEAKMEM"]
+            runInfo = [dRunLog["runid"], dRunLog["rundate"], dRunLog["sdvatt"], dRunLog["status"]]
+
+            with arcpy.da.InsertCursor(logTbl, logFlds) as cur:
+                for dStage in dRunLog["stages"]:
+                    detail = dStage["detail"]
+
+                    if not detail is None:
+                        detail = str(detail)[0:254]
+
+                    cur.insertRow(runInfo + [dStage["stage"], detail, dStage["seconds"], dStage["records"], dStage["peakmem"]])
+
+                cur.insertRow(runInfo + ["Total", dRunLog["outputtable"], dRunLog["seconds"], None, dRunLog["peakmem"]])
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+    finally:
+        dRunLog.clear()
+
 ## ===================================================================================
 def get_random_color(pastel_factor=0.5):
     # Part of generate_random_color
@@ -3586,8 +3778,28 @@ def ReadTable(tbl, flds, wc, level, sql):
 
         #if dSDV["effectivelogicaldatatype"].lower() in ["vtext", "narrative text"] and len(flds) == 2:
 
+        if bTableCache and streamLkeys is None:
+            # 2026-10-17 Batch mode. Use the columns saved by an earlier map in this session.
+            dTbl, iCnt = ReadCachedTable(tbl, flds, wc, sql)
+
+            if bVerbose:
+                PrintMsg(" \nProcessed " + Number_Format(iCnt, 0, True) + " cached " + tbl + " records in " + elapsedTime(start), 0)
+
+            LogStage("ReadTable", start, iCnt, tbl + " (cached)")
+            return dTbl
+
+        # 2026-10-17 Streaming mode. Only keep the records for the current chunk of survey areas.
+        if streamLkeys is None:
+            keySet = None
+
+        else:
+            keySet = GetStreamKeys(flds[0].upper())
+
         with arcpy.da.SearchCursor(tbl, flds, where_clause=wc, sql_clause=sql) as cur:
             for rec in cur:
+                if not keySet is None and not rec[0] in keySet:
+                    continue
+
                 val = list(rec[1:])
                 
                 try:
@@ -3603,6 +3815,241 @@ def ReadTable(tbl, flds, wc, level, sql):
             theMsg = " \nProcessed " + Number_Format(iCnt, 0, True) + " " +tbl + " records in " + elapsedTime(start)
             PrintMsg(theMsg, 0)
 
+        LogStage("ReadTable", start, iCnt, tbl)
+        return dTbl
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===================================================================================
+class CachedColumn(object):
+    # One column of a dTableCache entry, stored as a typed array like SDVTable. 2026-10-17
+    #
+    # Text values are integer codes into a list of unique values (code 0 is NULL). Integer
+    # and Double fields are stored as doubles and Single fields as single precision, with NaN
+    # as the NULL value. Any other field type (dates) is kept as a list.
+    #
+    def __init__(self, fldType):
+        self.type = fldType
+
+        if fldType == "String":
+            self.data = array.array('l')
+            self.values = [None]
+            self.dCodes = {None:0}
+
+        elif fldType == "Single":
+            self.data = array.array('f')
+
+        elif fldType in ["SmallInteger", "Integer", "Double"]:
+            self.data = array.array('d')
+
+        else:
+            self.data = list()
+
+    def append(self, val):
+        if self.type == "String":
+            try:
+                self.data.append(self.dCodes[val])
+
+            except KeyError:
+                self.dCodes[val] = len(self.values)
+                self.data.append(len(self.values))
+                self.values.append(val)
+
+        elif isinstance(self.data, list):
+            self.data.append(val)
+
+        elif val is None:
+            self.data.append(float("nan"))
+
+        else:
+            self.data.append(val)
+
+    def reorder(self, rowList):
+        # Put the rows in the order of rowList (the row numbers of the saved entry)
+        #
+        if isinstance(self.data, list):
+            self.data = [self.data[i] for i in rowList]
+
+        else:
+            self.data = array.array(self.data.typecode, [self.data[i] for i in rowList])
+
+    def decode(self):
+        # Return the column as the values a SearchCursor would return
+        #
+        if self.type == "String":
+            values = self.values
+            return [values[code] for code in self.data]
+
+        if isinstance(self.data, list):
+            return self.data
+
+        if self.type in ["SmallInteger", "Integer"]:
+            return [None if val != val else int(val) for val in self.data]
+
+        return [None if val != val else val for val in self.data]
+
+    def size(self):
+        # Estimated size in bytes
+        #
+        if isinstance(self.data, list):
+            return 32 * len(self.data)
+
+        if self.type == "String":
+            return self.data.itemsize * len(self.data) + sum([len(val) + 40 for val in self.values[1:]])
+
+        return self.data.itemsize * len(self.data)
+
+## ===================================================================================
+def ReadCachedTable(tbl, flds, wc, sql):
+    # Same output as the ReadTable cursor loop, but the records come from dTableCache. 2026-10-17
+    #
+    # Used when gSSURGO_CreateSoilMaps sets bTableCache so that a batch of maps does not
+    # read the same mapunit, component, chorizon and comonth records for every attribute.
+    #
+    # Each cache entry is keyed by (gdb, table, where clause, sql clause) and holds one
+    # CachedColumn for each field that has been requested so far, in cursor order. When a
+    # later attribute needs more fields, only those fields are read and added to the entry.
+    # The rows are tracked by OBJECTID so that the new columns can be lined up with the saved
+    # ones. Least recently used entries are dropped when the estimated size of the cache is
+    # larger than tableCacheLimit bytes.
+    #
+    # Returns the ReadTable dictionary and the number of records.
+    #
+    cacheKey = (gdb, tbl.upper(), str(wc), str(sql))
+    entry = dTableCache.pop(cacheKey, None)   # put back below as the most recently used
+    newFlds = [fld for fld in flds if entry is None or not fld in entry["columns"]]
+
+    if len(newFlds) > 0:
+        if entry is None:
+            dFldTypes = dict([(fld.name.upper(), fld.type) for fld in arcpy.ListFields(tbl)])
+
+        else:
+            dFldTypes = entry["types"]
+
+        oids = array.array('l')
+        newCols = [CachedColumn(dFldTypes.get(fld.upper(), "")) for fld in newFlds]
+
+        with arcpy.da.SearchCursor(tbl, ["OID@"] + newFlds, where_clause=wc, sql_clause=sql) as cur:
+            for rec in cur:
+                oids.append(rec[0])
+
+                for i in range(len(newFlds)):
+                    newCols[i].append(rec[i + 1])
+
+        if entry is not None and oids != entry["oids"]:
+            # Records have been added or removed since the entry was saved. Align the
+            # new columns to the saved rows by OBJECTID, or start over if they don't match.
+            dRow = dict()
+
+            for i in range(len(oids)):
+                dRow[oids[i]] = i
+
+            if len(dRow) != len(entry["oids"]) or not all([oid in dRow for oid in entry["oids"]]):
+                return ReadCachedTable(tbl, flds, wc, sql)
+
+            rowList = [dRow[oid] for oid in entry["oids"]]
+
+            for col in newCols:
+                col.reorder(rowList)
+
+        if entry is None:
+            entry = {"oids":oids, "types":dFldTypes, "columns":dict(), "size":oids.itemsize * len(oids)}
+
+        for i in range(len(newFlds)):
+            entry["columns"][newFlds[i]] = newCols[i]
+            entry["size"] += newCols[i].size()
+
+    dTableCache[cacheKey] = entry
+
+    # Drop the least recently used tables when the cache is too large
+    cacheSize = sum([e["size"] for e in dTableCache.values()])
+
+    for key in dTableCache.keys():
+        if cacheSize <= tableCacheLimit or key == cacheKey:
+            break
+
+        cacheSize -= dTableCache.pop(key)["size"]
+
+    # Rebuild the ReadTable dictionary. The first field is the key.
+    cols = [entry["columns"][fld].decode() for fld in flds]
+    dTbl = dict()
+
+    for rec in zip(*cols):
+        val = list(rec[1:])
+
+        try:
+            dTbl[rec[0]].append(val)
+
+        except:
+            dTbl[rec[0]] = [val]
+
+    return dTbl, len(entry["oids"])
+
+## ===================================================================================
+def ReadHorizonTable(tbl, flds, wc, level, sql, top, bot):
+    # Read the chorizon table for a single depth range. 2026-10-17
+    #
+    # When gSSURGO_CreateSoilMaps sets hzCacheRange to cover all of its depth ranges, the
+    # table is read once for that full range and saved in dHorizonCache. Each depth range is
+    # then filtered from the saved records using the same test as hzQuery. Otherwise (and in
+    # streaming mode) this is the same as ReadTable(tbl, flds, wc, level, sql).
+    #
+    try:
+        if hzCacheRange is None or not streamLkeys is None or top < hzCacheRange[0] or bot > hzCacheRange[1] or not "HZDEPT_R" in flds or not "HZDEPB_R" in flds:
+            return ReadTable(tbl, flds, wc, level, sql)
+
+        cacheKey = (gdb, tbl, tuple(flds), str(sql))
+
+        if not cacheKey in dHorizonCache:
+            cacheTop, cacheBot = hzCacheRange
+            tf = "HZDEPT_R"
+            bf = "HZDEPB_R"
+
+            if (cacheBot - cacheTop) == 1:
+                cacheQuery = "((" + tf + " = " + str(cacheTop) + " or " + bf + " = " + str(cacheBot) + ") or ( " + tf + " <= " + str(cacheTop) + " and " + bf + " >= " + str(cacheBot) + " ) )"
+
+            else:
+                rng = str(tuple(range(cacheTop, cacheBot)))
+                cacheQuery = "((" + tf + " in " + rng + " or " + bf + " in " + rng + ") or ( " + tf + " <= " + str(cacheTop) + " and " + bf + " >= " + str(cacheBot) + " ) )"
+
+            if bVerbose:
+                PrintMsg(" \nReading " + tbl + " once for " + str(cacheTop) + " to " + str(cacheBot) + "cm", 1)
+
+            dHorizonCache[cacheKey] = ReadTable(tbl, flds, cacheQuery, level, sql)
+
+        # ReadTable drops the key field from each record
+        start = time.time()
+        iTop = flds.index("HZDEPT_R") - 1
+        iBot = flds.index("HZDEPB_R") - 1
+        dTbl = dict()
+        iCnt = 0
+
+        for cokey, chrecs in dHorizonCache[cacheKey].items():
+            for chrec in chrecs:
+                hzdept = chrec[iTop]
+                hzdepb = chrec[iBot]
+
+                if (bot - top) == 1:
+                    bMatch = (hzdept == top or hzdepb == bot)
+
+                else:
+                    bMatch = (not hzdept is None and top <= hzdept < bot) or (not hzdepb is None and top <= hzdepb < bot)
+
+                if not bMatch and not hzdept is None and not hzdepb is None:
+                    bMatch = (hzdept <= top and hzdepb >= bot)
+
+                if bMatch:
+                    iCnt += 1
+
+                    try:
+                        dTbl[cokey].append(chrec)
+
+                    except:
+                        dTbl[cokey] = [chrec]
+
+        LogStage("ReadHorizonTable", start, iCnt, tbl + " " + str(top) + " to " + str(bot) + " cm")
         return dTbl
 
     except:
@@ -3685,6 +4132,117 @@ def GetAreasymbols(gdb):
         errorMsg()
         return dAreasymbols
 
+## ===================================================================================
+def GetStreamChunks(gdb, dAreasymbols):
+    # Split the legends in dAreasymbols into chunks for streaming mode. 2026-10-17
+    #
+    # The memory needed for each legend is estimated from its mapunit count and the average
+    # number of rating table records per mapunit, at streamRowBytes per record. Legends are
+    # taken in areasymbol order and a new chunk is started when streamMemory would be exceeded.
+    #
+    # Returns a list of LKEY lists. A single chunk means that streaming is not needed.
+    #
+    try:
+        dMuCnt = dict()   # mapunit count for each legend
+
+        with arcpy.da.SearchCursor(os.path.join(gdb, "mapunit"), ["LKEY"]) as cur:
+            for rec in cur:
+                try:
+                    dMuCnt[rec[0]] += 1
+
+                except:
+                    dMuCnt[rec[0]] = 1
+
+        muCnt = max(1, sum(dMuCnt.values()))
+        coCnt = max(1, int(arcpy.GetCount_management(os.path.join(gdb, "component")).getOutput(0)))
+        ratingTbl = dSDV["attributetablename"].lower()
+
+        if ratingTbl in ["mapunit", "muaggatt", "mucropyld", "mutext"]:
+            muRecs = max(1.0, float(arcpy.GetCount_management(os.path.join(gdb, ratingTbl)).getOutput(0)) / muCnt)
+
+        else:
+            muRecs = float(coCnt) / muCnt
+
+            if dSDV["horzlevelattribflag"] == 1:
+                muRecs = muRecs * max(1.0, float(arcpy.GetCount_management(os.path.join(gdb, "chorizon")).getOutput(0)) / coCnt)
+
+            elif ratingTbl in ["comonth", "cosoilmoist"]:
+                muRecs = muRecs * max(1.0, float(arcpy.GetCount_management(os.path.join(gdb, ratingTbl)).getOutput(0)) / coCnt)
+
+            # cointerp and the other component tables have about one record per component for a single rating
+
+        muLimit = max(1, int((streamMemory * 1024.0 * 1024.0) / (muRecs * streamRowBytes)))
+
+        chunkList = list()
+        lkeyList = list()
+        chunkCnt = 0
+
+        for lkey, areasym in sorted(dAreasymbols.items(), key=lambda x: x[1]):
+            legendCnt = dMuCnt.get(lkey, 0)
+
+            if len(lkeyList) > 0 and chunkCnt + legendCnt > muLimit:
+                chunkList.append(lkeyList)
+                lkeyList = list()
+                chunkCnt = 0
+
+            lkeyList.append(lkey)
+            chunkCnt += legendCnt
+
+        if len(lkeyList) > 0:
+            chunkList.append(lkeyList)
+
+        if len(chunkList) > 1:
+            PrintMsg(" \nStreaming mode: " + Number_Format(len(chunkList), 0, True) + " chunks of up to " + Number_Format(muLimit, 0, True) + " map units", 0)
+
+        return chunkList
+
+    except:
+        errorMsg()
+        return list()
+
+## ===================================================================================
+def GetStreamKeys(keyName):
+    # Return the set of keyName values that belong to the current streaming chunk (streamLkeys).
+    # 2026-10-17
+    #
+    # The MUKEY set comes from the mapunit records for the chunk's legends, COKEY values from
+    # the component records for those mapunits and CHKEY or COMONTHKEY values from the records
+    # for those components. Each set is built the first time a table read needs it and only
+    # the sets for the current chunk are kept in dStreamKeys (CreateStreamRatingTable clears
+    # them for each chunk). Returns None for key fields that are not filtered.
+    #
+    try:
+        if keyName in dStreamKeys:
+            return dStreamKeys[keyName]
+
+        dParents = {"MUKEY":["mapunit", "LKEY"], "COKEY":["component", "MUKEY"], "CHKEY":["chorizon", "COKEY"], "COMONTHKEY":["comonth", "COKEY"]}
+
+        if not keyName in dParents:
+            return None
+
+        tbl, parentName = dParents[keyName]
+
+        if parentName == "LKEY":
+            parentKeys = set(streamLkeys)
+
+        else:
+            parentKeys = GetStreamKeys(parentName)
+
+        keySet = set()
+
+        with arcpy.da.SearchCursor(os.path.join(gdb, tbl), [parentName, keyName]) as cur:
+            for rec in cur:
+                if rec[0] in parentKeys:
+                    keySet.add(rec[1])
+
+        dStreamKeys[keyName] = keySet
+
+        return keySet
+
+    except:
+        errorMsg()
+        return None
+
 ## ===================================================================================
 def GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV):
     # Create a dictionary containing SDV attributes for the selected attribute fields
@@ -3997,6 +4555,14 @@ def CreateInitialTable(gdb, allFields, dFieldInfo):
                     #PrintMsg("\tAdding field " + fld + " to initialTbl as a " + dFieldInfo[fld][0], 1)
                     arcpy.AddField_management(os.path.join(tblLoc, initialTbl), fld.upper(), dFieldInfo[fld][0], "", "", dFieldInfo[fld][1])
 
+        # 2026-10-17 Keep the SDV_Data records in memory. The on-disk table stays empty
+        # and is only used as the schema template for CreateOutputTable.
+        global dMemTables
+        dMemTables = dict()
+
+        if bMemoryTable:
+            dMemTables[os.path.join(tblLoc, initialTbl)] = SDVTable(os.path.join(tblLoc, initialTbl), allFields, dFieldInfo)
+
         return os.path.join(tblLoc, initialTbl)
 
     except:
@@ -4004,623 +4570,680 @@ def CreateInitialTable(gdb, allFields, dFieldInfo):
         return None
 
 ## ===================================================================================
-def GetMapunitSymbols(gdb):
-    # Populate dictionary using mukey and musym
-    # This function is for development purposes only and will probably not be
-    # used in the final version.
+class SSURGOKeyIndex(object):
+    # Dense integer ids for the values of one SSURGO key field (MUKEY, COKEY, CHKEY, COMONTHKEY)
+    # in one database. 2026-10-17
+    #
+    # The ids are assigned in the order the keys are first seen and are kept for the whole
+    # session (see GetKeyIndex), so every SDV_Data table built from the same database uses the
+    # same ids. Aggregate functions can then use arrays or integer-keyed dictionaries and only
+    # convert back to the key string when writing the output table.
+    #
+    def __init__(self):
+        self.codes = dict()      # key -> id
+        self.keys = list()       # id -> key
 
-    dSymbols = dict()
-    env.workspace = gdb
+    def encode(self, key):
+        try:
+            return self.codes[key]
 
-    try:
+        except KeyError:
+            code = len(self.keys)
+            self.codes[key] = code
+            self.keys.append(key)
+            return code
 
-        with arcpy.da.SearchCursor("MAPUNIT", ["MUKEY", "MUSYM"]) as mCur:
-            for rec in mCur:
-                dSymbols[rec[0]] = rec[1]
+    def decode(self, code):
+        if code is None or code < 0:
+            return None
 
-        return dSymbols
+        return self.keys[code]
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return dSymbols
+## ===================================================================================
+def GetKeyIndex(keyName):
+    # Return the SSURGOKeyIndex for keyName in the current database (gdb). 2026-10-17
+    #
+    indexKey = (gdb, keyName.upper())
 
-    except:
-        errorMsg()
-        return dSymbols
+    if not indexKey in dKeyIndex:
+        dKeyIndex[indexKey] = SSURGOKeyIndex()
+
+    return dKeyIndex[indexKey]
 
 ## ===================================================================================
-def CreateOutputTable(initialTbl, outputTbl, dFieldInfo):
-    # Create the initial output table that will contain key fields from all levels plus the input rating field
+class KeyCodeCursor(object):
+    # Wraps an arcpy.da.SearchCursor and returns SSURGO key fields as SSURGOKeyIndex ids,
+    # the same as SDVSearchCursor does for the in-memory table. 2026-10-17
     #
-    try:
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+    # The records are read when the cursor is opened so that every key already has an id
+    # before the caller sizes any arrays by the number of keys.
+    #
+    def __init__(self, cur, fldList):
+        keyIndexes = [(i, GetKeyIndex(fldList[i])) for i in range(len(fldList)) if fldList[i].upper() in keyFields]
+        self.recList = list()
 
-        # Validate output table name
-        outputTbl = ValidateName(outputTbl)
+        with cur:
+            for rec in cur:
+                rec = list(rec)
 
-        if outputTbl == "":
-            return ""
+                for i, keyIndex in keyIndexes:
+                    if not rec[i] is None:
+                        rec[i] = keyIndex.encode(rec[i])
 
-        # Delete table from prior runs
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+                self.recList.append(tuple(rec))
 
-        # Create the final output table using initialTbl as a template
-        try:
-            arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl), initialTbl)
+    def __enter__(self):
+        return self
 
-        except:
-            raise MyError, "Unable to create table: " + outputTbl
+    def __exit__(self, excType, excValue, tb):
+        return False
 
-        # Drop the last column which should be 'attributecolumname' and replace with 'resultcolumname'
-        #lastFld = dSDV["attributecolumnname"]
-        arcpy.DeleteField_management(outputTbl, dSDV["attributecolumnname"])
-        arcpy.DeleteField_management(outputTbl, "MUSYM")
-        arcpy.DeleteField_management(outputTbl, "COMPNAME")
-        if dSDV["resultcolumnname"].upper() != "MUNAME":
-            arcpy.DeleteField_management(outputTbl, "MUNAME")
+    def __iter__(self):
+        return iter(self.recList)
 
-        # Drop COKEY and CHKEY if present
-        fldList = arcpy.Describe(outputTbl).fields
+## ===================================================================================
+class SDVTable(object):
+    # In-memory, column-ordered copy of the SDV_Data table. 2026-10-17
+    #
+    # Each field is stored as a typed array instead of as rows in the geodatabase.
+    # Text fields (MUKEY, COKEY, AREASYMBOL, rating classes, etc) are integer-encoded
+    # so that sorting on MUKEY or COKEY is done on integer codes. Numeric fields use
+    # NaN as the NULL value. FLOAT fields are stored as single precision so that values
+    # match what would have been read back from the geodatabase table.
+    #
+    # The on-disk SDV_Data table is still created (empty) by CreateInitialTable
+    # because CreateOutputTable uses it as a schema template.
+    #
+    def __init__(self, path, fldList, dFieldInfo):
+        self.path = path
+        self.fields = list()
+        self.dIndex = dict()
+        self.types = list()
+        self.columns = list()
+        self.dCodes = list()     # per text field: value -> integer code
+        self.values = list()     # per text field: integer code -> value
+        self.count = 0
 
         for fld in fldList:
-            if fld.name.upper() in ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R", "COMONTHKEY", "LKEY"]:
-                arcpy.DeleteField_management(outputTbl, fld.name)
+            if fld == "LKEY":
+                continue
 
-        #fieldName = dSDV[resultcolumn]
-        theType = dFieldInfo[dSDV["resultcolumnname"].upper()][0]
-        dataLen = dFieldInfo[dSDV["resultcolumnname"].upper()][1]
-        # arcpy.AddField_management(outputTbl, dSDV["resultcolumnname"].upper(), theType, "", "", dataLen, outputLayer)
-        arcpy.AddField_management(outputTbl, dSDV["resultcolumnname"].upper(), theType, "", "", dataLen)
+            fldType = dFieldInfo[fld][0].upper()
+            self.dIndex[fld.upper()] = len(self.fields)
+            self.fields.append(fld.upper())
+            self.types.append(fldType)
 
-        arcpy.AddIndex_management(outputTbl, "MUKEY", "Indx" + os.path.basename(outputTbl))
+            if fldType == "TEXT":
+                self.columns.append(array.array('l'))
 
-        if arcpy.Exists(outputTbl):
-            return outputTbl
+            elif fldType == "FLOAT":
+                self.columns.append(array.array('f'))
 
-        else:
-            raise MyError, "Failed to create output table"
+            else:
+                # SHORT, LONG, DOUBLE
+                self.columns.append(array.array('d'))
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return ""
+            if fldType == "TEXT" and fld.upper() in keyFields:
+                # 2026-10-17 share the database-wide key ids
+                keyIndex = GetKeyIndex(fld)
+                self.dCodes.append(keyIndex.codes)
+                self.values.append(keyIndex.keys)
 
-    except:
-        errorMsg()
-        return ""
+            else:
+                self.dCodes.append(dict())
+                self.values.append(list())
 
-## ===================================================================================
-def CreateRatingTable1(tblList, sdvTbl, initialTbl, dAreasymbols):
-    # Create level 1 table (mapunit only)
-    #
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+    def insertRow(self, fldIndexes, rec):
+        # Append a single record. Values are coerced the same way an InsertCursor would.
+        #
+        if len(rec) != len(fldIndexes):
+            raise RuntimeError, "Record has " + str(len(rec)) + " values for " + str(len(fldIndexes)) + " fields"
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+        newVals = list()
 
-        # Remove LKEY from allFields - kludge
-        allFields.remove("LKEY")
+        for i in range(len(rec)):
+            iCol = fldIndexes[i]
+            val = rec[i]
+            fldType = self.types[iCol]
 
-        # Read mapunit table and populate initial table
-        #PrintMsg(" \nUsing input fields: " + ", ".join(dFields["MAPUNIT"]), 1)
+            if fldType == "TEXT":
+                if val is None:
+                    newVals.append(-1)
 
-        with arcpy.da.SearchCursor(os.path.join(gdb, "mapunit"), dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+                else:
+                    if not isinstance(val, basestring):
+                        val = unicode(val)
 
-            # MUNAME is rating field
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                if len(dFields["MAPUNIT"]) == 4:
-                    for rec in mCur:
-                        mukey, musym, muname, lkey = rec
+                    try:
+                        newVals.append(self.dCodes[iCol][val])
 
-                        #if lkey in dAreasymbols: # new code
-                        try:
-                            murec = [dAreasymbols[lkey], mukey, musym, muname]
-                            #PrintMsg("\t" + str(murec), 1)
-                            ocur.insertRow(murec)
+                    except KeyError:
+                        code = len(self.values[iCol])
+                        self.dCodes[iCol][val] = code
+                        self.values[iCol].append(val)
+                        newVals.append(code)
 
-                        except:
-                            pass
+            elif val is None:
+                newVals.append(float("nan"))
 
-                elif len(dFields["MAPUNIT"]) == 5:
-                # rating field is not MUNAME
-                    for rec in mCur:
-                        mukey, musym, muname, lkey, rating = rec
+            else:
+                try:
+                    if fldType in ["SHORT", "LONG"]:
+                        newVals.append(float(int(round(float(val)))))
 
-                        try: # new code
-                            murec = [dAreasymbols[lkey], mukey, musym, muname, rating]
-                            #PrintMsg("\t" + str(murec), 1)
-                            ocur.insertRow(murec)
+                    else:
+                        newVals.append(float(val))
 
-                        except:
-                            pass
+                except:
+                    raise RuntimeError, "Invalid value for " + self.fields[iCol] + ": " + str(val)
 
-        return True
+        # Fields not in the insert list are NULL
+        if len(fldIndexes) < len(self.fields):
+            for iCol in range(len(self.fields)):
+                if not iCol in fldIndexes:
+                    self.columns[iCol].append(-1 if self.types[iCol] == "TEXT" else float("nan"))
 
-    except:
-        errorMsg()
-        return False
+        for i in range(len(newVals)):
+            self.columns[fldIndexes[i]].append(newVals[i])
 
-## ===================================================================================
-def CreateRatingTable1S(tblList, sdvTbl, dTbl, initialTbl, dAreasymbols):
-    # Create level 2 table (mapunit, sdvTbl)
-    #
+        self.count += 1
 
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+    def getValue(self, iCol, iRow):
+        # Decode a single stored value back to the type returned by a SearchCursor
+        #
+        val = self.columns[iCol][iRow]
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+        if self.types[iCol] == "TEXT":
+            if val < 0:
+                return None
 
-        #
-        # Read mapunit table
-        allFields.remove("LKEY")
+            return self.values[iCol][val]
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
-                    #PrintMsg("\t" + str(rec), 1)
+        if val != val:
+            # NaN
+            return None
 
-                    try:
-                        sdvrecs = dTbl[mukey]
+        if self.types[iCol] in ["SHORT", "LONG"]:
+            return int(val)
 
-                        for sdvrec in sdvrecs:
+        return val
 
-                            try:
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(sdvrec)
-                                ocur.insertRow(newrec)
+    def sortKey(self, iCol):
+        # Return a list of sortable keys for one column. Text codes are replaced by their
+        # rank in sorted order so that integer keys sort the same as the text values.
+        # NULLs sort first, as they do for an ascending ORDER BY in a file geodatabase.
+        #
+        # Key fields share the session-wide SSURGOKeyIndex list, so only the codes that are
+        # present in this table are ranked.
+        #
+        col = self.columns[iCol]
+
+        if self.types[iCol] == "TEXT":
+            vals = self.values[iCol]
+
+            if not numpy is None:
+                codes = numpy.frombuffer(col, dtype=numpy.dtype(col.typecode))
+                bValid = codes >= 0
+                present = numpy.unique(codes[bValid])
+                ranks = numpy.zeros(len(present), dtype=numpy.int64)
+                ranks[sorted(range(len(present)), key=lambda i: vals[present[i]])] = numpy.arange(len(present))
+                keys = numpy.zeros(len(codes), dtype=numpy.int64) - 1
+                keys[bValid] = ranks[numpy.searchsorted(present, codes[bValid])]
+                return keys
+
+            present = sorted(set([c for c in col if c >= 0]), key=lambda c: (vals[c], c))
+            ranks = dict(zip(present, range(len(present))))
+            return [ranks.get(c, -1) for c in col]
+
+        if not numpy is None:
+            keys = numpy.frombuffer(col, dtype=numpy.dtype(col.typecode)).astype(numpy.float64)
+            keys[numpy.isnan(keys)] = -numpy.inf
+            return keys
+
+        return [(float("-inf") if v != v else v) for v in col]
+
+    def rowOrder(self, orderBy):
+        # Return the list of row indexes sorted by [(iCol, bDescending), ...]
+        #
+        if len(orderBy) == 0 or self.count == 0:
+            return range(self.count)
 
-                            except:
-                                pass
+        if not numpy is None:
+            keyList = list()
 
-                    except:
+            for iCol, bDesc in reversed(orderBy):
+                keys = self.sortKey(iCol)
 
-                        try: # new code
-                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                            newrec.extend(dMissing[sdvTbl])
-                            ocur.insertRow(newrec)
+                if bDesc:
+                    keys = -keys
 
-                        except:
-                            pass
+                keyList.append(keys)
 
-        return True
+            # lexsort uses the last key as the primary key and is stable
+            return numpy.lexsort(keyList).tolist()
 
-    except:
-        errorMsg()
-        return False
+        # Successive stable sorts, starting with the least significant key
+        order = range(self.count)
 
-## ===================================================================================
-def CreateRatingTable3(tblList, sdvTbl, dComponent, dHorizon, initialTbl):
-    # Populate level 3 table (mapunit, component, chorizon)
-    #
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+        for iCol, bDesc in reversed(orderBy):
+            keys = self.sortKey(iCol)
+            order.sort(key=lambda r: keys[r], reverse=bDesc)
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+        return order
 
+    def query(self, conditions, orderBy):
+        # Return the list of sorted row indexes that pass all [(iCol, operator, value), ...]
+        # NULL values fail every comparison, the same as SQL.
         #
-        # Read mapunit table
-        allFields.remove("LKEY")
+        order = self.rowOrder(orderBy)
 
-        #PrintMsg(" \nCreateRatingTable3 using SQL: " + str(dSQL["MAPUNIT"]), 1)
+        if len(conditions) == 0 or self.count == 0:
+            return order
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
+        if not numpy is None:
+            mask = numpy.ones(self.count, dtype=bool)
 
-                    #if lkey in dAreasymbols: # new code
-                    try:
-                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+            for iCol, op, val in conditions:
+                col = self.columns[iCol]
+                data = numpy.frombuffer(col, dtype=numpy.dtype(col.typecode))
 
-                        try:
-                            corecs = dComponent[mukey]
+                if self.types[iCol] == "TEXT":
+                    isNull = (data < 0)
 
-                            for corec in corecs:
-                                try:
-                                    chrecs = dHorizon[corec[0]]
+                    if not val is None:
+                        val = self.dCodes[iCol].get(val, -2)
 
-                                    for chrec in chrecs:
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        newrec.extend(corec)
-                                        newrec.extend(chrec)
-                                        #PrintMsg("\t" + str(newrec), 1)
-                                        ocur.insertRow(newrec)
+                else:
+                    isNull = numpy.isnan(data)
 
-                                except:
-                                    # No chorizon records
-                                    newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                    newrec.extend(corec)
-                                    newrec.extend(dMissing["CHORIZON"])
-                                    #PrintMsg("\t" + str(newrec), 1)
-                                    ocur.insertRow(newrec)
+                if op == "IS NULL":
+                    mask &= isNull
 
-                        except:
-                            try: # new code
-                                # No component records, chorizon records
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(dMissing["COMPONENT"])
-                                newrec.extend(dMissing["CHORIZON"])
-                                #PrintMsg("\t" + str(newrec), 1)
-                                ocur.insertRow(newrec)
+                elif op == "IS NOT NULL":
+                    mask &= ~isNull
 
-                            except:
-                                pass
+                elif op == "=":
+                    mask &= (data == val) & ~isNull
 
-                    except:
-                        pass
+                elif op == "<>":
+                    mask &= (data != val) & ~isNull
 
-        return True
+                elif op == ">=":
+                    mask &= (data >= val)
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return False
+                elif op == "<=":
+                    mask &= (data <= val)
 
-    except:
-        errorMsg()
-        return False
+                elif op == ">":
+                    mask &= (data > val)
 
-## ===================================================================================
-def CreateRatingTable2(tblList, sdvTbl, dComponent, initialTbl):
-    # Create table using (mapunit, component) where rating is in the component table
-    #
-    # This works as of 2016-02-13, incorporating AREASYMBOL
+                elif op == "<":
+                    mask &= (data < val)
 
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+            order = numpy.array(order, dtype=numpy.int64)
+            return order[mask[order]].tolist()
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+        rows = list()
 
-        #
-        # Read mapunit table
-        allFields.remove("LKEY")
+        for iRow in order:
+            bPass = True
 
-        if bVerbose:
-            PrintMsg(" \nUsing mapunit fields: " + ", ".join(dFields["MAPUNIT"]), 1)
-            PrintMsg("Using initial table fields: " + ", ".join(allFields), 1)
-            PrintMsg("Using query: " + str(dSQL["MAPUNIT"]) + " \n", 1)
-            PrintMsg(" \nOutput table: " + os.path.basename(initialTbl), 1)
-            PrintMsg(" \n" + ", ".join(allFields) + " \n ", 1)
-            PrintMsg(80 * "=", 1)
+            for iCol, op, val in conditions:
+                v = self.getValue(iCol, iRow)
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
-                    #if lkey in dAreasymbols: # new code
-                    try:
+                if op == "IS NULL":
+                    bPass = v is None
 
-                        try:
-                            corecs = dComponent[mukey]
+                elif op == "IS NOT NULL":
+                    bPass = not v is None
 
-                            for corec in corecs:
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(corec)
-                                #PrintMsg(str(newrec), 1)
-                                ocur.insertRow(newrec)
+                elif v is None:
+                    bPass = False
 
-                        except:
-                            # No component records
-                            try:
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(dMissing["COMPONENT"])
-                                #PrintMsg(str(newrec), 1)
-                                ocur.insertRow(newrec)
+                elif op == "=":
+                    bPass = v == val
 
-                            except:
-                                pass
+                elif op == "<>":
+                    bPass = v != val
 
-                    except:
-                        pass
+                elif op == ">=":
+                    bPass = v >= val
 
-        return True
+                elif op == "<=":
+                    bPass = v <= val
 
-    except:
-        errorMsg()
-        return False
+                elif op == ">":
+                    bPass = v > val
 
-## ===================================================================================
-def CreateRatingTable2S(tblList, sdvTbl, dComponent, dTbl, initialTbl):
-    # Create level 2 table (mapunit, component, sdvTbl)
-    #
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+                else:
+                    bPass = v < val
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+                if not bPass:
+                    break
 
-        #
-        # Read mapunit table
-        allFields.remove("LKEY")
+            if bPass:
+                rows.append(iRow)
 
-        #PrintMsg(" \nCreateRatingTable2S", 1)
-        sqlClause = (None, "ORDER BY " + dSDV["resultcolumnname"].upper() + " DESC")  # original
+        return rows
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
+    def flush(self):
+        # Write the in-memory records to the on-disk SDV_Data table. Only used as a fallback
+        # when a query cannot be handled in memory.
+        #
+        iCols = range(len(self.fields))
 
-                    try:
+        with arcpy.da.InsertCursor(self.path, self.fields) as ocur:
+            for iRow in range(self.count):
+                ocur.insertRow([self.getValue(iCol, iRow) for iCol in iCols])
 
-                        try:
-                            corecs = dComponent[mukey]
+## ===================================================================================
+class SDVCursor(object):
+    # Minimal stand-in for arcpy.da.SearchCursor and arcpy.da.InsertCursor on an SDVTable
+    # so that it can be used in a 'with' statement the same way. 2026-10-17
+    #
+    def __init__(self, sdvTbl, fldIndexes, rowList=None, bKeyCodes=False):
+        self.sdvTbl = sdvTbl
+        self.fldIndexes = fldIndexes
+        self.rowList = rowList
+        self.bKeyCodes = bKeyCodes
 
-                            for corec in corecs:
+    def __enter__(self):
+        return self
 
-                                try:
-                                    sdvrecs = dTbl[corec[0]]
+    def __exit__(self, excType, excValue, tb):
+        return False
 
-                                    for sdvrec in sdvrecs:
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        newrec.extend(corec)
-                                        newrec.extend(sdvrec)
+    def __iter__(self):
+        getValue = self.sdvTbl.getValue
+        fldIndexes = self.fldIndexes
 
-                                        #if mukey == '2774629':
-                                        #    PrintMsg("\t*" + str(newrec), 1)
+        if self.bKeyCodes:
+            # Return the SSURGOKeyIndex id for key fields instead of the key string
+            columns = self.sdvTbl.columns
+            keyCols = [self.sdvTbl.fields[iCol] in keyFields and self.sdvTbl.types[iCol] == "TEXT" for iCol in fldIndexes]
 
-                                        ocur.insertRow(newrec)
+            for iRow in self.rowList:
+                rec = list()
 
-                                except KeyError:
-                                    # No rating value
-                                    newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                    newrec.extend(corec)
-                                    newrec.extend(dMissing[sdvTbl])
+                for i in range(len(fldIndexes)):
+                    if keyCols[i]:
+                        code = columns[fldIndexes[i]][iRow]
+                        rec.append(None if code < 0 else code)
 
-                                    #if mukey == '2774629':
-                                    #    PrintMsg("\t**" + str(newrec), 1)
+                    else:
+                        rec.append(getValue(fldIndexes[i], iRow))
 
-                                    ocur.insertRow(newrec)
+                yield tuple(rec)
 
-                        except KeyError:
-                            # No component records
-                            try:
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(dMissing["COMPONENT"])
-                                newrec.extend(dMissing[sdvTbl])
+        else:
+            for iRow in self.rowList:
+                yield tuple([getValue(iCol, iRow) for iCol in fldIndexes])
 
-                                #if mukey == '2774629':
-                                #    PrintMsg("\t***" + str(newrec), 1)
+    def insertRow(self, rec):
+        self.sdvTbl.insertRow(self.fldIndexes, rec)
 
-                                ocur.insertRow(newrec)
+## ===================================================================================
+def ParseSDVQuery(sdvTbl, whereClause, sqlClause):
+    # Convert the simple where clauses and ORDER BY clauses used by the Aggregate functions
+    # into [(iCol, operator, value), ...] and [(iCol, bDescending), ...] lists.
+    # Returns None, None if the query is not one that can be handled in memory.
+    # 2026-10-17
+    #
+    conditions = list()
+    orderBy = list()
 
-                            except:
-                                pass
+    if not whereClause is None and whereClause.strip() != "":
+        for part in re.split(r"\s+AND\s+", whereClause.strip(), flags=re.IGNORECASE):
+            part = part.strip()
+            m = re.match(r"^(\w+)\s+IS\s+(NOT\s+)?NULL$", part, re.IGNORECASE)
 
-                    except:
-                        pass
+            if m:
+                fld = m.group(1).upper()
 
-        return True
+                if not fld in sdvTbl.dIndex:
+                    return None, None
 
-    except:
-        errorMsg()
-        return False
+                conditions.append((sdvTbl.dIndex[fld], "IS NOT NULL" if m.group(2) else "IS NULL", None))
+                continue
 
-## ===================================================================================
-def CreateRatingInterps(tblList, sdvTbl, dComponent, dTbl, initialTbl):
-    #
-    # Populate table for standard interp using (mapunit, component, cointerp)
-    #
+            m = re.match(r"^(\w+)\s*(>=|<=|<>|=|>|<)\s*('([^']*)'|-?[0-9.]+)$", part)
 
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+            if not m or not m.group(1).upper() in sdvTbl.dIndex:
+                return None, None
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+            iCol = sdvTbl.dIndex[m.group(1).upper()]
 
-        #
-        # Read all reccords from mapunit table
-        allFields.remove("LKEY")
+            if m.group(4) is None:
+                if sdvTbl.types[iCol] == "TEXT":
+                    return None, None
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+                val = float(m.group(3))
 
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
+            else:
+                if sdvTbl.types[iCol] != "TEXT" or not m.group(2) in ["=", "<>"]:
+                    return None, None
 
-                    try:
-                        corecs = dComponent[mukey]
+                val = m.group(4)
 
-                        for corec in corecs:
+            conditions.append((iCol, m.group(2), val))
 
-                            try:
-                                sdvrecs = dTbl[corec[0]]
+    if not sqlClause is None:
+        prefix, postfix = sqlClause
 
-                                for sdvrec in sdvrecs:
-                                    newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                    newrec.extend(corec)
-                                    newrec.extend(sdvrec)
-                                    #PrintMsg(str(newrec), 0)
-                                    ocur.insertRow(newrec)
+        if not prefix is None and prefix.strip() != "":
+            return None, None
 
-                            except:
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(corec)
-                                newrec.extend(dMissing[sdvTbl])
-                                #PrintMsg(str(newrec), 1)
-                                ocur.insertRow(newrec)
+        if not postfix is None and postfix.strip() != "":
+            m = re.match(r"^ORDER\s+BY\s+(.+)$", postfix.strip(), re.IGNORECASE)
 
-                    except:
-                        # No component record
-                        try:
-                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                            newrec.extend(dMissing["COMPONENT"])
-                            newrec.extend(dMissing[sdvTbl])
-                            #PrintMsg("*" + str(newrec), 1)
-                            ocur.insertRow(newrec)
+            if not m:
+                return None, None
 
-                        except:
-                            pass
+            for part in m.group(1).split(","):
+                words = part.split()
 
-        return True
+                if len(words) == 0 or len(words) > 2 or not words[0].upper() in sdvTbl.dIndex:
+                    return None, None
 
-    except:
-        errorMsg()
-        return False
+                if len(words) == 2 and not words[1].upper() in ["ASC", "DESC"]:
+                    return None, None
+
+                orderBy.append((sdvTbl.dIndex[words[0].upper()], len(words) == 2 and words[1].upper() == "DESC"))
+
+    return conditions, orderBy
 
 ## ===================================================================================
-def CreateRatingTable3S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl, sdvAtt):
-    # Create level 4 table (mapunit, component, chorizon, sdvTbl)
-    # This is set up for surface texture. Is it called by others?
+def SDVInsertCursor(initialTbl, fldList):
+    # Replacement for arcpy.da.InsertCursor on the initial SDV_Data table.
+    # Uses the in-memory table when one has been registered by CreateInitialTable.
     #
-    # At some point may want to look at returning top mineral horizon instead of hzdept_r = 0.
+    if initialTbl in dMemTables:
+        sdvTbl = dMemTables[initialTbl]
+        return SDVCursor(sdvTbl, [sdvTbl.dIndex[fld.upper()] for fld in fldList])
+
+    return arcpy.da.InsertCursor(initialTbl, fldList)
+
+## ===================================================================================
+def SDVSearchCursor(initialTbl, fldList, where_clause=None, sql_clause=(None, None), bKeyCodes=False):
+    # Replacement for arcpy.da.SearchCursor on the initial SDV_Data table.
+    # Filters and sorts the in-memory table. Any query that cannot be handled in memory
+    # causes the records to be written to SDV_Data and the normal SearchCursor is used.
+    # When bKeyCodes is True, the keyFields are returned as SSURGOKeyIndex ids.
     #
-    try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
-        # bVerbose = True
+    if initialTbl in dMemTables:
+        sdvTbl = dMemTables[initialTbl]
+        conditions, orderBy = ParseSDVQuery(sdvTbl, where_clause, sql_clause)
+
+        if not conditions is None:
+            rowList = sdvTbl.query(conditions, orderBy)
+            return SDVCursor(sdvTbl, [sdvTbl.dIndex[fld.upper()] for fld in fldList], rowList, bKeyCodes)
 
         if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+            PrintMsg(" \nUnable to run query in memory, writing " + os.path.basename(initialTbl) + " to disk", 1)
 
-        #
-        # Read mapunit table
-        allFields.remove("LKEY")
+        sdvTbl.flush()
+        del dMemTables[initialTbl]
 
-        #PrintMsg(" \nRunning CreateRatingTable3S for ?Surface Texture?... \n ", 1)
+    if bKeyCodes:
+        return KeyCodeCursor(arcpy.da.SearchCursor(initialTbl, fldList, where_clause=where_clause, sql_clause=sql_clause), fldList)
 
-        #if not sdvAtt in ["AASHTO Group Classification (Surface)", "Surface Texture", "Unified Soil Classification (Surface)"]:
-        #    raise MyError, "CreateRatingTable3S cannot handle " + sdvAtt + " option"
+    return arcpy.da.SearchCursor(initialTbl, fldList, where_clause=where_clause, sql_clause=sql_clause)
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
+## ===================================================================================
+def SDVCount(initialTbl):
+    # Record count for the initial SDV_Data table
+    #
+    if initialTbl in dMemTables:
+        return dMemTables[initialTbl].count
 
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
+    return int(arcpy.GetCount_management(initialTbl).getOutput(0))
 
-                    try:
-                        corecs = dComponent[mukey]
+## ===================================================================================
+def GetRatingCacheKey(gdb, paramList):
+    # Return the rating cache key and the database fingerprint. 2026-10-17
+    #
+    # The fingerprint is a hash of the SACATALOG survey dates (SAVEREST) and the record
+    # counts of the main soil tables, so it changes whenever a survey is updated or added.
+    # The cache key is a hash of the fingerprint and the CreateSoilMap parameters.
+    #
+    try:
+        fpList = list()
 
-                        for corec in corecs:
+        with arcpy.da.SearchCursor(os.path.join(gdb, "sacatalog"), ["AREASYMBOL", "SAVEREST"], sql_clause=(None, "ORDER BY AREASYMBOL")) as cur:
+            for rec in cur:
+                fpList.append(str(rec[0]) + ":" + str(rec[1]))
 
-                            try:
-                                hzrecs = dHorizon[corec[0]]
+        for tbl in ["mapunit", "component", "chorizon", "comonth", "cosoilmoist", "cointerp", "muaggatt", "sdvattribute"]:
+            tblPath = os.path.join(gdb, tbl)
 
-                                for hzrec in hzrecs:
-                                    try:
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        sdvrec = dTbl[hzrec[0]][0]
-                                        newrec.extend(corec)
-                                        newrec.extend(hzrec)
+            if arcpy.Exists(tblPath):
+                fpList.append(tbl + ":" + arcpy.GetCount_management(tblPath).getOutput(0))
 
-                                        # Important note: in this next line I am only retrieving the first
-                                        # horizon value from a list. This would be the rating for the top of the
-                                        # specified depth range.
-                                        #
-                                        newrec.extend(sdvrec)  # save only rating for first horizon
-                                        #PrintMsg("\t" + str(newrec), 0)
-                                        ocur.insertRow(newrec)
+        fingerprint = hashlib.md5("|".join(fpList)).hexdigest()
+        cacheKey = hashlib.md5(json.dumps([ratingCacheVersion, gdb, fingerprint] + paramList, default=str)).hexdigest()
 
-                                    except:
-                                        # missing sdv rating value
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        newrec.extend(corec)
-                                        newrec.extend(hzrec)
-                                        newrec.extend(dMissing[sdvTbl])
-                                        #PrintMsg("\t" + str(newrec) + "******", 1)
-                                        ocur.insertRow(newrec)
+        return cacheKey, fingerprint
 
-                            except:
-                                # missing horizon data
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(corec)
-                                newrec.extend(dMissing["CHORIZON"])
-                                newrec.extend(dMissing[sdvTbl])
-                                #PrintMsg("\t" + str(newrec), 1)
-                                ocur.insertRow(newrec)
+    except:
+        errorMsg()
+        return "", ""
 
-                    except:
-                        # No component, horizon or sdv records
-                        try:
-                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                            newrec.extend(dMissing["COMPONENT"])
-                            newrec.extend(dMissing["CHORIZON"])
-                            newrec.extend(dMissing[sdvTbl])
-                            #PrintMsg("\t" + str(newrec), 1)
-                            ocur.insertRow(newrec)
+## ===================================================================================
+def RatingWorkspace(gdb):
+    # Workspace for SDV_Data and the rating tables. 2026-10-17
+    # The soil geodatabase unless ComputeSoilRatings has set a scratch geodatabase (ratingWS)
+    # for its worker process.
+    #
+    if ratingWS != "":
+        return ratingWS
 
-                        except:
-                            # Skip missing mapunits (outside AOI)
-                            pass
-        return True
+    return gdb
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return False
+## ===================================================================================
+def OpenRatingCache(gdb):
+    # Open (or create) the sidecar SQLite rating cache for this geodatabase. 2026-10-17
+    #
+    cacheFile = os.path.splitext(gdb)[0] + "_RatingCache.sqlite"
+    conn = sqlite3.connect(cacheFile, timeout=300)   # gSSURGO_CreateSoilMaps worker processes read it while the parent writes
+    conn.execute("CREATE TABLE IF NOT EXISTS ratingcache (cachekey TEXT PRIMARY KEY, gdb TEXT, fingerprint TEXT, fieldinfo TEXT, outputvalues TEXT, domaininfo TEXT, reccount INTEGER, datasize INTEGER, lastused REAL, data BLOB)")
+
+    return conn
+
+## ===================================================================================
+def CheckRatingCache(gdb, cacheKey, fingerprint, bPurge=True):
+    # Return True if the rating cache has an entry for cacheKey.
+    # Entries for this geodatabase with a different fingerprint are stale and are deleted,
+    # unless bPurge is False (worker processes only read the cache).
+    #
+    try:
+        conn = OpenRatingCache(gdb)
+
+        if bPurge:
+            conn.execute("DELETE FROM ratingcache WHERE gdb = ? AND fingerprint <> ?", (gdb, fingerprint))
+            conn.commit()
+
+        rec = conn.execute("SELECT COUNT(*) FROM ratingcache WHERE cachekey = ?", (cacheKey,)).fetchone()
+        conn.close()
+
+        return rec[0] > 0
 
     except:
         errorMsg()
         return False
 
 ## ===================================================================================
-def CreateRatingTable4S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl):
-    # Create level 3 table (mapunit, component, horizon)
+def SaveRatingCache(gdb, cacheKey, fingerprint, outputTbl, outputValues):
+    # Save the schema and records of the aggregated output table to the rating cache.
+    #
+    cacheEntry = GetRatingCacheEntry(gdb, cacheKey, fingerprint, outputTbl, outputValues)
+
+    if cacheEntry is None:
+        return False
+
+    return WriteRatingCache(gdb, [cacheEntry])
+
+## ===================================================================================
+def GetRatingCacheEntry(gdb, cacheKey, fingerprint, outputTbl, outputValues):
+    # Return the rating cache record for the aggregated output table, or None. 2026-10-17
+    # dValues and domainValues are saved too because the Aggregate functions add the
+    # ratings they find to them.
     #
     try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+        dFldTypes = {"String":"TEXT", "SmallInteger":"SHORT", "Integer":"LONG", "Single":"FLOAT", "Double":"DOUBLE", "Date":"DATE"}
+        fieldInfo = list()
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+        for fld in arcpy.ListFields(outputTbl):
+            if fld.type in dFldTypes:
+                fieldInfo.append([fld.name, dFldTypes[fld.type], fld.length, fld.aliasName])
 
-        #
-        # Read mapunit table
-        allFields.remove("LKEY")
+        recList = list()
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
+        with arcpy.da.SearchCursor(outputTbl, [fld[0] for fld in fieldInfo]) as cur:
+            for rec in cur:
+                recList.append(rec)
 
-                    try:
-                        corecs = dComponent[mukey]
+        data = zlib.compress(json.dumps(recList, default=str))
+        domainInfo = json.dumps([list(dValues.items()), domainValues], default=str)
 
-                        for corec in corecs:
+        return (cacheKey, gdb, fingerprint, json.dumps(fieldInfo), json.dumps(outputValues, default=str), domainInfo, len(recList), len(data), time.time(), data)
 
-                            try:
-                                #sdvrecs = dTbl[corec[0]]
-                                hzrecs = dHorizon[corec[0]]
+    except:
+        errorMsg()
+        return None
 
-                                for hzrec in hzrecs:
-                                    try:
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        sdvrecs = dTbl[hzrec[0]]
-                                        newrec.extend(corec)
-                                        newrec.extend(hzrec)
-                                        newrec.extend(dTbl[hzrec[0]])
-                                        #PrintMsg("\t" + str(newrec), 1)
-                                        ocur.insertRow(newrec)
+## ===================================================================================
+def WriteRatingCache(gdb, entryList):
+    # Insert rating cache records (GetRatingCacheEntry) into the rating cache. 2026-10-17
+    # gSSURGO_CreateSoilMaps uses this to write the entries returned by its worker processes.
+    # The least recently used entries are dropped when the cache is larger than
+    # ratingCacheLimit bytes.
+    #
+    try:
+        if len(entryList) == 0:
+            return True
 
-                                    except:
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        newrec.extend(corec)
-                                        newrec.extend(hzrec)
-                                        newrec.extend(dMissing[sdvTbl])
-                                        #PrintMsg("\t" + str(newrec), 1)
-                                        ocur.insertRow(newrec)
+        conn = OpenRatingCache(gdb)
 
-                            except:
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend("COMPONENT")
-                                newrec.extend("CHORIZON")
-                                newrec.extend(dMissing[sdvTbl])
-                                #PrintMsg("\t" + str(newrec), 1)
-                                ocur.insertRow(newrec)
+        for cacheEntry in entryList:
+            conn.execute("INSERT OR REPLACE INTO ratingcache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", tuple(cacheEntry[0:9]) + (sqlite3.Binary(cacheEntry[9]),))
 
-                    except:
-                        # No component records
-                        try:
-                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                            newrec.extend(dMissing["COMPONENT"])
-                            newrec.extend(dMissing[sdvTbl])
-                            #PrintMsg("\t" + str(newrec), 1)
-                            ocur.insertRow(newrec)
+        # LRU limit
+        newKeys = [cacheEntry[0] for cacheEntry in entryList]
+        cacheSize = conn.execute("SELECT SUM(datasize) FROM ratingcache").fetchone()[0]
 
-                        except:
-                            pass
+        if cacheSize > ratingCacheLimit:
+            for cKey, dataSize in conn.execute("SELECT cachekey, datasize FROM ratingcache ORDER BY lastused ASC").fetchall():
+                if cKey in newKeys:
+                    continue
+
+                conn.execute("DELETE FROM ratingcache WHERE cachekey = ?", (cKey,))
+                cacheSize -= dataSize
+
+                if cacheSize <= ratingCacheLimit:
+                    break
+
+        conn.commit()
+        conn.close()
 
         return True
 
@@ -4629,691 +5252,1229 @@ def CreateRatingTable4S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl)
         return False
 
 ## ===================================================================================
-def CreateSoilMoistureTable(tblList, sdvTbl, dComponent, dMonth, dTbl, initialTbl, begMo, endMo):
-    # Create level 4 table (mapunit, component, cmonth, cosoilmoist)
+def LoadRatingCache(gdb, cacheKey):
+    # Read and decode the rating cache entry for cacheKey. 2026-10-17
     #
-    # Problem 2017-07-24 Steve Campbell found Yolo County mapunits where dominant component,
-    # Depth to Water Table map is reporting 201cm for 459272 where the correct result should be 91cm.
-    # My guess is that because there are some months in COSOILMOIST table that are Null, this function
-    # is using that value instead of the other months that are 91cm. Try removing NULLs in query that
-    # creates the SDV_Data table.
+    # Returns [fieldInfo, outputValues, cachedValues, cachedDomain, recList], or None if the
+    # entry is missing, corrupt or incomplete. A bad entry is deleted from the cache so that the
+    # ratings are calculated and saved again.
     #
     try:
-        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+        conn = OpenRatingCache(gdb)
+        rec = conn.execute("SELECT fieldinfo, outputvalues, domaininfo, reccount, data FROM ratingcache WHERE cachekey = ?", (cacheKey,)).fetchone()
+        conn.close()
 
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-            PrintMsg
+        if rec is None:
+            return None
 
-        #
-        # Read mapunit table and then populate the initial output table
-        allFields.remove("LKEY")
+        fieldInfo, outputValues, domainInfo, recCnt, data = rec
+        fieldInfo = json.loads(fieldInfo)
+        outputValues = json.loads(outputValues)
+        cachedValues, cachedDomain = json.loads(domainInfo)
+        recList = json.loads(zlib.decompress(str(data)))
 
-        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
-                    mukey, musym, muname, lkey = rec
+        if len(recList) != recCnt or len([r for r in recList if len(r) != len(fieldInfo)]) > 0:
+            raise MyError, "incomplete"
 
-                    try:
-                        newrec = list()
-                        corecs = dComponent[mukey]
+        return [fieldInfo, outputValues, cachedValues, cachedDomain, recList]
 
-                        for corec in corecs:
+    except:
+        PrintMsg("\tUnable to read cached ratings, they will be calculated again", 1)
+        DeleteRatingCache(gdb, cacheKey)
+        return None
 
-                            try:
-                                newrec = list()
-                                morecs = dMonth[corec[0]]
-
-                                for morec in morecs:
-                                    try:
-                                        sdvrecs = dTbl[morec[0]]
-
-                                        for sdvrec in sdvrecs:
-                                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                            newrec.extend(corec)
-                                            newrec.extend(morec)
-                                            newrec.extend(sdvrec)
-                                            #PrintMsg("\t1. " + str(newrec), 1)
-                                            ocur.insertRow(newrec)
-
-                                    except:
-                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                        newrec.extend(corec)
-                                        newrec.extend(morec)
-                                        newrec.extend(dMissing[sdvTbl])
-                                        #PrintMsg("\t2. " + str(newrec), 1)
-                                        ocur.insertRow(newrec)
-
-                            except:
-                                # No comonth records
-                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                                newrec.extend(corec)
-                                newrec.extend(dMissing["COMONTH"])
-                                newrec.extend(dMissing[sdvTbl])
-                                #PrintMsg("\t3. " + str(newrec), 1)
-                                ocur.insertRow(newrec)
-
-                    except:
-                        # No component records or comonth records
-                        try:
-                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
-                            newrec.extend(dMissing["COMPONENT"])
-                            newrec.extend(dMissing["COMONTH"])
-                            newrec.extend(dMissing[sdvTbl])
-                            #PrintMsg("\t4. " + str(newrec), 1)
-                            ocur.insertRow(newrec)
-
-                        except:
-                            pass
-
-        return True
-
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return False
+## ===================================================================================
+def DeleteRatingCache(gdb, cacheKey):
+    # Remove one entry from the rating cache. 2026-10-17
+    #
+    try:
+        conn = OpenRatingCache(gdb)
+        conn.execute("DELETE FROM ratingcache WHERE cachekey = ?", (cacheKey,))
+        conn.commit()
+        conn.close()
 
     except:
         errorMsg()
-        return False
 
 ## ===================================================================================
-def Aggregate1(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    # Aggregate map unit level table
-    # Added Areasymbol to output
+def RestoreRatingCache(gdb, cacheKey, cacheEntry):
+    # Recreate the output table (tblName) from a rating cache entry (LoadRatingCache) and return
+    # the same outputTbl, outputValues that the Aggregate functions would. dValues and domainValues
+    # are updated in place once the table has been rebuilt, so they are unchanged on failure.
+    #
     try:
-        arcpy.SetProgressorLabel("Assembling map unit level data")
-
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-
-        # Read mapunit table and populate final output table
-        # Create final output table with MUKEY and sdvFld
-        #
-        # Really no difference between the two tables, so this
-        # is redundant. Should fix this later after everything
-        # else is working.
-        #
         outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
-        inFlds = ["MUKEY", "AREASYMBOL", dSDV["attributecolumnname"].upper()]
-        outFlds = ["MUKEY", "AREASYMBOL", dSDV["resultcolumnname"].upper()]
-        outputValues = list()
+        fieldInfo, outputValues, cachedValues, cachedDomain, recList = cacheEntry
+
+        conn = OpenRatingCache(gdb)
+        conn.execute("UPDATE ratingcache SET lastused = ? WHERE cachekey = ?", (time.time(), cacheKey))
+        conn.commit()
+        conn.close()
 
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-
-        if outputTbl == "":
-            return outputTbl, outputValues
-
-        fldPrecision = max(0, dSDV["attributeprecision"])
+        arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl))
 
-        if dSDV["effectivelogicaldatatype"].lower() in ["integer", "float"]:
-            # populate sdv_initial table and create list of min-max values
-            iMax = -999999999
-            iMin = 999999999
+        for fldName, fldType, fldLen, fldAlias in fieldInfo:
+            if fldType == "TEXT":
+                arcpy.AddField_management(outputTbl, fldName, fldType, "", "", fldLen, fldAlias)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds) as cur:
-                with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                    for rec in cur:
-                        mukey, areasym, val = rec
+            else:
+                arcpy.AddField_management(outputTbl, fldName, fldType, "", "", "", fldAlias)
 
-                        if not val is None:
-                            val = round(val, fldPrecision)
+        arcpy.AddIndex_management(outputTbl, "MUKEY", "Indx" + os.path.basename(outputTbl))
 
-                        iMax = max(val, iMax)
+        with arcpy.da.InsertCursor(outputTbl, [fld[0] for fld in fieldInfo]) as ocur:
+            for rec in recList:
+                ocur.insertRow(rec)
 
-                        if not val is None:
-                            iMin = min(val, iMin)
+        dValues.clear()
 
-                        rec = [mukey, areasym, val]
-                        ocur.insertRow(rec)
+        for key, val in cachedValues:
+            dValues[key] = val
 
-            # add max and min values to list
-            outputValues = [iMin, iMax]
+        domainValues[:] = cachedDomain
 
-            if iMin == None and iMax == -999999999:
-                # No data
-                #raise MyError, "8. No data for " + sdvAtt
-                raise MyError, ""
+        return outputTbl, outputValues
 
+    except:
+        errorMsg()
+        return "", None
 
-        else:
-            # populate sdv_initial table and create a list of unique values
-            with arcpy.da.SearchCursor(initialTbl, inFlds) as cur:
-                with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                    for rec in cur:
-                        mukey, areasym, val = rec
+## ===================================================================================
+def GetMapunitSymbols(gdb):
+    # Populate dictionary using mukey and musym
+    # This function is for development purposes only and will probably not be
+    # used in the final version.
 
-                        if not val is None and not val in outputValues:
-                            outputValues.append(val)
+    dSymbols = dict()
+    env.workspace = gdb
 
-                        ocur.insertRow(rec)
+    try:
 
-        if len(outputValues) < 20 and bVerbose:
-            PrintMsg(" \nInitial output values: " + str(outputValues), 1)
+        with arcpy.da.SearchCursor("MAPUNIT", ["MUKEY", "MUSYM"]) as mCur:
+            for rec in mCur:
+                dSymbols[rec[0]] = rec[1]
 
-        outputValues.sort()
-        return outputTbl, outputValues
+        return dSymbols
 
     except MyError, e:
         PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+        return dSymbols
 
     except:
         errorMsg()
-        return outputTbl, outputValues
+        return dSymbols
 
 ## ===================================================================================
-def AggregateCo_DCP(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    # Aggregate mapunit-component data to the map unit level using dominant component
-    # Added areasymbol to output
+def CreateOutputTable(initialTbl, outputTbl, dFieldInfo):
+    # Create the initial output table that will contain key fields from all levels plus the input rating field
+    #
     try:
-        #bVerbose = True
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-
-        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
-        outputValues = list()
-
-        inFlds = ["MUKEY", "AREASYMBOL", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper()]
-        outFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["resultcolumnname"].upper()]
-
-        #PrintMsg(" \ntieBreaker in AggregateCo_DCD is: " + tieBreaker, 1)
-        #PrintMsg(str(dSDV["tiebreaklowlabel"]) + "; " + str(dSDV["tiebreakhighlabel"]), 1)
-
-
-        if tieBreaker == dSDV["tiebreaklowlabel"]:
-            sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + " ASC ")
-            #PrintMsg(" \nAscending sort on " + dSDV["attributecolumnname"], 1)
+        # Validate output table name
+        outputTbl = ValidateName(outputTbl)
 
-        else:
-            sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + " DESC ")
-            #PrintMsg(" \nDescending sort on " + dSDV["attributecolumnname"], 1)
+        if outputTbl == "":
+            return ""
 
+        # Delete table from prior runs
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-
-        if outputTbl == "":
-            raise MyError, "No output table"
-            return outputTbl, outputValues
+        # Create the final output table using initialTbl as a template
+        try:
+            arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl), initialTbl)
 
-        lastMukey = "xxxx"
+        except:
+            raise MyError, "Unable to create table: " + outputTbl
 
-        # Reading numeric data from initial table
-        #
-        if dSDV["effectivelogicaldatatype"].lower() in ["integer", "float"]:
-            #PrintMsg(" \nEffectiveLogicalDataType: " + dSDV["effectivelogicaldatatype"].lower(), 1)
-            # populate sdv_initial table and create list of min-max values
-            iMax = -999999999.0
-            iMin = 999999999.0
-            fldPrecision = max(0, dSDV["attributeprecision"])
+        # Drop the last column which should be 'attributecolumname' and replace with 'resultcolumname'
+        #lastFld = dSDV["attributecolumnname"]
+        arcpy.DeleteField_management(outputTbl, dSDV["attributecolumnname"])
+        arcpy.DeleteField_management(outputTbl, "MUSYM")
+        arcpy.DeleteField_management(outputTbl, "COMPNAME")
+        if dSDV["resultcolumnname"].upper() != "MUNAME":
+            arcpy.DeleteField_management(outputTbl, "MUNAME")
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause) as cur:
+        # Drop COKEY and CHKEY if present
+        fldList = arcpy.Describe(outputTbl).fields
 
-                with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                    for rec in cur:
-                        mukey, areasym, cokey, comppct, rating = rec
+        for fld in fldList:
+            if fld.name.upper() in ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R", "COMONTHKEY", "LKEY"]:
+                arcpy.DeleteField_management(outputTbl, fld.name)
 
-                        #if mukey != lastMukey and lastMukey != "xxxx":  # This was dropping first map unit!!!
-                        if mukey != lastMukey:
+        #fieldName = dSDV[resultcolumn]
+        theType = dFieldInfo[dSDV["resultcolumnname"].upper()][0]
+        dataLen = dFieldInfo[dSDV["resultcolumnname"].upper()][1]
+        # arcpy.AddField_management(outputTbl, dSDV["resultcolumnname"].upper(), theType, "", "", dataLen, outputLayer)
+        arcpy.AddField_management(outputTbl, dSDV["resultcolumnname"].upper(), theType, "", "", dataLen)
 
-                            if not rating is None:
-                                #
-                                newrec = mukey, areasym, comppct, round(rating, fldPrecision)
+        arcpy.AddIndex_management(outputTbl, "MUKEY", "Indx" + os.path.basename(outputTbl))
 
-                            else:
-                                newrec = mukey, areasym, comppct, None
+        if arcpy.Exists(outputTbl):
+            return outputTbl
 
-                            ocur.insertRow(newrec)
+        else:
+            raise MyError, "Failed to create output table"
 
-                            if not rating is None:
-                                iMax = max(rating, iMax)
-                                iMin = min(rating, iMin)
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return ""
 
-                        lastMukey = mukey
+    except:
+        errorMsg()
+        return ""
 
-            # add max and min values to list
-            outputValues = [iMin, iMax]
+## ===================================================================================
+def CreateRatingTable1(tblList, sdvTbl, initialTbl, dAreasymbols):
+    # Create level 1 table (mapunit only)
+    #
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
 
-        else:
-            # For text, vtext or choice data types
-            #
-            #PrintMsg(" \ndValues: " + str(dValues), 1)
-            #PrintMsg(" \noutputValues: " + str(outputValues), 1)
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause) as cur:
+        # Remove LKEY from allFields - kludge
+        allFields.remove("LKEY")
 
-                if len(dValues) > 0:
-                    # Text, has domain values or values in the maplegendxml
-                    #
-                    with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                        for rec in cur:
+        # Read mapunit table and populate initial table
+        #PrintMsg(" \nUsing input fields: " + ", ".join(dFields["MAPUNIT"]), 1)
 
-                            mukey, areasym, cokey, comppct, rating = rec
+        with arcpy.da.SearchCursor(os.path.join(gdb, "mapunit"), dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
 
-                            if mukey != lastMukey:
+            # MUNAME is rating field
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                if len(dFields["MAPUNIT"]) == 4:
+                    for rec in mCur:
+                        mukey, musym, muname, lkey = rec
 
-                                #if not rating is None:
-                                if str(rating).upper() in dValues:
-                                    if dValues[rating.upper()][1] != rating: # we have a case problem in the maplegendxml
-                                        # switch the dValue to lowercase to match the data
-                                        dValues[str(rating).upper()][1] = rating
+                        #if lkey in dAreasymbols: # new code
+                        try:
+                            murec = [dAreasymbols[lkey], mukey, musym, muname]
+                            #PrintMsg("\t" + str(murec), 1)
+                            ocur.insertRow(murec)
 
-                                    newrec = [mukey, areasym, comppct, rating]
+                        except:
+                            pass
 
-                                elif not rating is None:
+                elif len(dFields["MAPUNIT"]) == 5:
+                # rating field is not MUNAME
+                    for rec in mCur:
+                        mukey, musym, muname, lkey, rating = rec
 
-                                    dValues[str(rating).upper()] = [None, rating]
-                                    newrec = [mukey, areasym, comppct, rating]
+                        try: # new code
+                            murec = [dAreasymbols[lkey], mukey, musym, muname, rating]
+                            #PrintMsg("\t" + str(murec), 1)
+                            ocur.insertRow(murec)
 
-                                else:
-                                    newrec = [mukey, areasym, None, None]
+                        except:
+                            pass
 
-                                if not rating in outputValues and not rating is None:
-                                    outputValues.append(rating)
+        return True
 
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def CreateRatingTable1S(tblList, sdvTbl, dTbl, initialTbl, dAreasymbols):
+    # Create level 2 table (mapunit, sdvTbl)
+    #
+
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+
+        #
+        # Read mapunit table
+        allFields.remove("LKEY")
+
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
+                    #PrintMsg("\t" + str(rec), 1)
+
+                    try:
+                        sdvrecs = dTbl[mukey]
+
+                        for sdvrec in sdvrecs:
+
+                            try:
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(sdvrec)
                                 ocur.insertRow(newrec)
-                                #PrintMsg(str(rec), 1)
 
-                            lastMukey = mukey
+                            except:
+                                pass
 
-                else:
-                    # Text, without domain values
-                    #
-                    with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                        for rec in cur:
-                            mukey, areasym, cokey, comppct, rating = rec
+                    except:
 
-                            if mukey != lastMukey:
-                                if not rating is None:
-                                    newVal = rating.strip()
+                        try: # new code
+                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                            newrec.extend(dMissing[sdvTbl])
+                            ocur.insertRow(newrec)
 
-                                else:
-                                    newVal = None
+                        except:
+                            pass
+
+        return True
 
-                                ocur.insertRow([mukey, areasym, comppct, newVal])
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def CreateRatingTable3(tblList, sdvTbl, dComponent, dHorizon, initialTbl, dAreasymbols):
+    # Populate level 3 table (mapunit, component, chorizon)
+    #
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+
+        #
+        # Read mapunit table
+        allFields.remove("LKEY")
 
+        #PrintMsg(" \nCreateRatingTable3 using SQL: " + str(dSQL["MAPUNIT"]), 1)
 
-                                if not newVal is None and not newVal in outputValues:
-                                    outputValues.append(newVal)
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
 
-                            #else:
-                            #    PrintMsg("\tSkipping " + str(rec), 1)
+                    #if lkey in dAreasymbols: # new code
+                    try:
+                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
 
-                            lastMukey = mukey
+                        try:
+                            corecs = dComponent[mukey]
 
+                            for corec in corecs:
+                                try:
+                                    chrecs = dHorizon[corec[0]]
 
-        #if None in outputValues:
-        #    outputValues.remove(None)
+                                    for chrec in chrecs:
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        newrec.extend(corec)
+                                        newrec.extend(chrec)
+                                        #PrintMsg("\t" + str(newrec), 1)
+                                        ocur.insertRow(newrec)
 
-        if outputValues[0] == -999999999.0 or outputValues[1] == 999999999.0:
-            # Sometimes no data can skip through the max min test
-            outputValues = [0.0, 0.0]
-            #raise MyError, "No data for " + sdvAtt
-            raise MyError, ""
+                                except:
+                                    # No chorizon records
+                                    newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                    newrec.extend(corec)
+                                    newrec.extend(dMissing["CHORIZON"])
+                                    #PrintMsg("\t" + str(newrec), 1)
+                                    ocur.insertRow(newrec)
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg(" \nNo data for " + sdvAtt, 1)
+                        except:
+                            try: # new code
+                                # No component records, chorizon records
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(dMissing["COMPONENT"])
+                                newrec.extend(dMissing["CHORIZON"])
+                                #PrintMsg("\t" + str(newrec), 1)
+                                ocur.insertRow(newrec)
 
-        # Trying to handle NCCPI for dominant component
-        if dSDV["attributetype"].lower() == "interpretation" and (dSDV["nasisrulename"][0:5] == "NCCPI"):
-            outputValues = [0.0, 1.0]
+                            except:
+                                pass
 
-        if dSDV["effectivelogicaldatatype"].lower() in ("float", "integer"):
-            outputValues.sort()
-            return outputTbl, outputValues
+                    except:
+                        pass
 
-        else:
-            return outputTbl, sorted(outputValues, key=lambda s: s.lower())
+        return True
 
     except MyError, e:
         PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+        return False
 
     except:
         errorMsg()
-        return outputTbl, outputValues
-
+        return False
 
 ## ===================================================================================
-def AggregateCo_Limiting(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    #
-    # Select either the "Least Limiting" or "Most Limiting" rating from all components
-    # Component aggregation to the maximum or minimum value for the mapunit.
-
-    # Based upon AggregateCo_DCD function, but sorted on rating or domain value instead of comppct
+def CreateRatingTable2(tblList, sdvTbl, dComponent, initialTbl, dAreasymbols):
+    # Create table using (mapunit, component) where rating is in the component table
     #
-    # domain: soil_erodibility_factor (text)  range = .02 .. .64
-    # Added Areasymbol to output
-
-    # Note! I have some dead code for 'no domain values'. Need to delete if those sections are never used.
+    # This works as of 2016-02-13, incorporating AREASYMBOL
 
     try:
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
 
-        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-            PrintMsg(" \nEffective Logical data type: " + dSDV["effectivelogicaldatatype"], 1)
-            PrintMsg(" \nAttribute type: " + dSDV["attributetype"] + "; bFuzzy " + str(bFuzzy), 1)
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
+        #
+        # Read mapunit table
+        allFields.remove("LKEY")
 
-        inFlds = ["MUKEY", "AREASYMBOL", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper()]
-        outFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["resultcolumnname"].upper()]
+        if bVerbose:
+            PrintMsg(" \nUsing mapunit fields: " + ", ".join(dFields["MAPUNIT"]), 1)
+            PrintMsg("Using initial table fields: " + ", ".join(allFields), 1)
+            PrintMsg("Using query: " + str(dSQL["MAPUNIT"]) + " \n", 1)
+            PrintMsg(" \nOutput table: " + os.path.basename(initialTbl), 1)
+            PrintMsg(" \n" + ", ".join(allFields) + " \n ", 1)
+            PrintMsg(80 * "=", 1)
 
-        # ignore any null values
-        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
+                    #if lkey in dAreasymbols: # new code
+                    try:
 
-        # initialTbl must be in a file geodatabase to support ORDER_BY
-        #
-        sqlClause =  (None, " ORDER BY MUKEY ASC")
+                        try:
+                            corecs = dComponent[mukey]
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+                            for corec in corecs:
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(corec)
+                                #PrintMsg(str(newrec), 1)
+                                ocur.insertRow(newrec)
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues = list()
+                        except:
+                            # No component records
+                            try:
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(dMissing["COMPONENT"])
+                                #PrintMsg(str(newrec), 1)
+                                ocur.insertRow(newrec)
 
-        if outputTbl == "":
-            return outputTbl, outputValues
+                            except:
+                                pass
 
-        lastCokey = "xxxx"
-        dComp = dict()
-        dCompPct = dict()
-        dMapunit = dict()
-        dAreasym = dict()
+                    except:
+                        pass
 
-        aggMethod = dSDV["algorithmname"]
+        return True
 
-        if not dSDV["notratedphrase"] is None:
-            # This should be for most interpretations
-            notRatedIndex = domainValues.index(dSDV["notratedphrase"])
+    except:
+        errorMsg()
+        return False
 
-        else:
-            # set notRatedIndex for properties that are not interpretations
-            notRatedIndex = -1
+## ===================================================================================
+def CreateRatingTable2S(tblList, sdvTbl, dComponent, dTbl, initialTbl, dAreasymbols):
+    # Create level 2 table (mapunit, component, sdvTbl)
+    #
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
 
-        # 1. For ratings that have domain values, read data from initial table
-        #
-        if len(domainValues) > 0:
-            #PrintMsg(" \ndValues: " + str(dValues), 1)
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-            # Save the rating for each component along with a list of components for each mapunit
-            #
-            try:
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-                    # inFlds: 0 mukey, 1 cokey, 2 comppct, 3 rating
+        #
+        # Read mapunit table
+        allFields.remove("LKEY")
 
-                    for rec in cur:
-                        #PrintMsg(str(rec), 1)
-                        mukey, areasym, cokey, comppct, rating = rec
-                        dAreasym[mukey] = areasym
+        #PrintMsg(" \nCreateRatingTable2S", 1)
+        sqlClause = (None, "ORDER BY " + dSDV["resultcolumnname"].upper() + " DESC")  # original
 
-                        # Save the associated domain index for this rating
-                        dComp[cokey] = dValues[str(rating).upper()][0]
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
 
-                        # save component percent for each component
-                        dCompPct[cokey] = comppct
+                    try:
 
-                        # save list of components for each mapunit using mukey as key
                         try:
-                            dMapunit[mukey].append(cokey)
+                            corecs = dComponent[mukey]
 
-                        except:
-                            dMapunit[mukey] = [cokey]
+                            for corec in corecs:
 
-                        #PrintMsg("Component '" + rec[1] + "' at " + str(rec[2]) + "% has a rating of: " + str(rec[3]), 1)
+                                try:
+                                    sdvrecs = dTbl[corec[0]]
 
-            except:
-                errorMsg()
+                                    for sdvrec in sdvrecs:
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        newrec.extend(corec)
+                                        newrec.extend(sdvrec)
 
-        else:
-            # 2. No Domain Values, read data from initial table. Use alpha sort for tiebreaker
-            #
-            raise MyError, "No Domain values"
+                                        #if mukey == '2774629':
+                                        #    PrintMsg("\t*" + str(newrec), 1)
 
+                                        ocur.insertRow(newrec)
 
-        # Write aggregated data to output table
+                                except KeyError:
+                                    # No rating value
+                                    newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                    newrec.extend(corec)
+                                    newrec.extend(dMissing[sdvTbl])
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-
-            if aggMethod == "Least Limiting":
-                #
-                # Need to take a closer look at how 'Not rated' components are handled in 'Least Limiting'
-                #
-                if domainValues:
-
-                    for mukey, cokeys in dMapunit.items():
-                        dRating = dict()   # save sum of comppct for each rating within a mapunit
-                        muVals = list()    # may not need this for DCD
-                        #maxIndx = 0        # Initialize index as zero ('Not rated')
-                        indexes = list()
-
-                        for cokey in cokeys:
-                            compPct = dCompPct[cokey]
-                            ratingIndx = dComp[cokey]
-                            indexes.append(ratingIndx)
-                            #PrintMsg("\t\t" + mukey + ": " + cokey + " - " + str(ratingIndx) + ",  " + domainValues[ratingIndx], 1)
-
-                            if ratingIndx in dRating:
-                                 dRating[ratingIndx] = dRating[ratingIndx] + compPct
-
-                            else:
-                                dRating[ratingIndx] = compPct
-
-                        # Use the highest index value to assign the map unit rating
-                        indexes = sorted(set(indexes), reverse=True)
-                        maxIndx = indexes[0]  # get the lowest index value
-
-                        if maxIndx == notRatedIndex and len(indexes) > 1:
-                            # if the lowest index is for 'Not rated', try to get the next higher index
-                            maxIndx = indexes[1]
+                                    #if mukey == '2774629':
+                                    #    PrintMsg("\t**" + str(newrec), 1)
 
-                        pct = dRating[maxIndx]
-                        rating = domainValues[maxIndx]
-                        areasym = dAreasym[mukey]
-                        newrec = [mukey, areasym, pct, rating]
-                        ocur.insertRow(newrec)
-                        #PrintMsg("\tMapunit rating: " + str(indexes) + "; " + str(maxIndx) + "; " + rating + " \n ", 1)
+                                    ocur.insertRow(newrec)
 
-                        if not rating is None and not rating in outputValues:
-                            outputValues.append(rating)
+                        except KeyError:
+                            # No component records
+                            try:
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(dMissing["COMPONENT"])
+                                newrec.extend(dMissing[sdvTbl])
 
-                else:
-                    # Least Limiting, no domain values
-                    #
-                    raise MyError, "No domain values"
+                                #if mukey == '2774629':
+                                #    PrintMsg("\t***" + str(newrec), 1)
 
+                                ocur.insertRow(newrec)
 
-            elif aggMethod == "Most Limiting":
-                #
-                # with domain values...
-                #
-                # Need to take a closer look at how 'Not rated' components are handled in 'Most Limiting'
-                #
-                if len(domainValues) > 0:
-                    #
-                    # Most Limiting, has domain values
-                    #
-                    for mukey, cokeys in dMapunit.items():
-                        dRating = dict()   # save sum of comppct for each rating within a mapunit
-                        minIndx = 9999999  # save the lowest index value for each mapunit
-                        indexes = list()
+                            except:
+                                pass
 
-                        for cokey in cokeys:
-                            compPct = dCompPct[cokey]  # get comppct_r for this component
-                            ratingIndx = dComp[cokey]  # get rating index for this component
-                            indexes.append(ratingIndx)
+                    except:
+                        pass
 
-                            # save the sum of comppct_r for each rating index in the dRating dictionary
-                            if ratingIndx in dRating:
-                                dRating[ratingIndx] = dRating[ratingIndx] + compPct
+        return True
 
-                            else:
-                                dRating[ratingIndx] = compPct
+    except:
+        errorMsg()
+        return False
 
-                        indexes = sorted(set(indexes))
-                        minIndx = indexes[0]  # get the lowest index value
+## ===================================================================================
+def CreateRatingInterps(tblList, sdvTbl, dComponent, dTbl, initialTbl, dAreasymbols):
+    #
+    # Populate table for standard interp using (mapunit, component, cointerp)
+    #
 
-                        if minIndx == notRatedIndex and len(indexes) > 1:
-                            # if the lowest index is for 'Not rated', try to get the next higher index
-                            minIndx = indexes[1]
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
 
-                        newrec = [mukey, dAreasym[mukey], dRating[minIndx], domainValues[minIndx]]
-                        #PrintMsg("\t" + mukey + ": " + " - " + str(minIndx) + ",  " + domainValues[minIndx], 1)
-                        ocur.insertRow(newrec)
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-                        if not domainValues[minIndx] is None and not domainValues[minIndx] in outputValues:
-                            outputValues.append(domainValues[minIndx])
+        #
+        # Read all reccords from mapunit table
+        allFields.remove("LKEY")
 
-                else:
-                    #
-                    # Most Limiting, no domain values
-                    raise MyError, "No domain values"
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
 
-                    #PrintMsg(" \nTesting " + aggMethod + ", no domain values!!!", 1)
-                    #
-                    for mukey, cokeys in dMapunit.items():
-                        dRating = dict()  # save sum of comppct for each rating within a mapunit
-                        muVals = list()   # list of rating values for each mapunit
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
 
-                        for cokey in cokeys:
-                            compPct = dCompPct[cokey]  # component percent
-                            ratingIndx = dComp[cokey]  # component rating
+                    try:
+                        corecs = dComponent[mukey]
 
-                            if ratingIndx != 0:
-                                if ratingIndx in dRating:
-                                    dRating[ratingIndx] = dRating[ratingIndx] + compPct
+                        for corec in corecs:
 
-                                else:
-                                    dRating[ratingIndx] = compPct
+                            try:
+                                sdvrecs = dTbl[corec[0]]
 
-                        for rating, compPct in dRating.items():
-                            muVals.append([compPct, rating])
+                                for sdvrec in sdvrecs:
+                                    newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                    newrec.extend(corec)
+                                    newrec.extend(sdvrec)
+                                    #PrintMsg(str(newrec), 0)
+                                    ocur.insertRow(newrec)
 
-                        if len(muVals) > 0:
-                            muVal = SortData(muVals)
+                            except:
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(corec)
+                                newrec.extend(dMissing[sdvTbl])
+                                #PrintMsg(str(newrec), 1)
+                                ocur.insertRow(newrec)
 
-                            newrec = [mukey, dAreasym[mukey], muVal[0], muVal[1]]
+                    except:
+                        # No component record
+                        try:
+                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                            newrec.extend(dMissing["COMPONENT"])
+                            newrec.extend(dMissing[sdvTbl])
+                            #PrintMsg("*" + str(newrec), 1)
                             ocur.insertRow(newrec)
-                            #PrintMsg("\t" + mukey + ": " + ",  " + str(muVals), 1)
-
-                        if not newrec[2] is None and not newrec[2] in outputValues:
-                            outputValues.append(newrec[2])
-
-                # End of Lower
 
-        outputValues.sort()
-
-        return outputTbl, outputValues
+                        except:
+                            pass
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+        return True
 
     except:
         errorMsg()
-        return outputTbl, outputValues
+        return False
 
 ## ===================================================================================
-def AggregateCo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    #
-    # Looks at all components and returns the lowest or highest rating value. This
-    # may be based upon the actual value or the index (for those properties with domains).
-    #
-    # "Minimum or Maximum" method of aggregation uses the tiebreak setting
-    # and returns the highest or lowest rating accordingly.
-
-    # "Least Limiting", "Most Limiting"
-    # Component aggregation to the maximum or minimum value for the mapunit.
-    #
-    # dSDV["tiebreakrule"]: -1, 1 originally in sdvattribute table
-    #
-    # If tieBreak value == "lower" return the minimum value for the mapunit
-    # Else return "Higher" value for the mapunit
+def CreateRatingTable3S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl, sdvAtt, dAreasymbols):
+    # Create level 4 table (mapunit, component, chorizon, sdvTbl)
+    # This is set up for surface texture. Is it called by others?
     #
-    # Based upon AggregateCo_DCD function, but sorted on rating or domain value instead of comppct
+    # At some point may want to look at returning top mineral horizon instead of hzdept_r = 0.
     #
-    # domain: soil_erodibility_factor (text)  range = .02 .. .64
-    # Added Areasymbol to output
-
     try:
-        #bVerbose = True
-
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+        # bVerbose = True
 
-        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-            PrintMsg(" \nEffective Logical data type: " + dSDV["effectivelogicaldatatype"], 1)
-            PrintMsg(" \nAttribute type: " + dSDV["attributetype"] + "; bFuzzy " + str(bFuzzy), 1)
-
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
 
-        inFlds = ["MUKEY", "AREASYMBOL", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper()]
-        outFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["resultcolumnname"].upper()]
-
-        # ignore any null values
-        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-
-        # initialTbl must be in a file geodatabase to support ORDER_BY
-        # Do I really need to sort by attributecolumn when it will be replaced by Domain values later?
         #
-        if tieBreaker == dSDV["tiebreaklowlabel"]:
-            sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + " ASC ")
-
-        else:
-            sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + " DESC ")
+        # Read mapunit table
+        allFields.remove("LKEY")
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+        #PrintMsg(" \nRunning CreateRatingTable3S for ?Surface Texture?... \n ", 1)
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues = list()
+        #if not sdvAtt in ["AASHTO Group Classification (Surface)", "Surface Texture", "Unified Soil Classification (Surface)"]:
+        #    raise MyError, "CreateRatingTable3S cannot handle " + sdvAtt + " option"
 
-        if outputTbl == "":
-            return outputTbl, outputValues
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
 
-        lastCokey = "xxxx"
-        dComp = dict()
-        dCompPct = dict()
-        dMapunit = dict()
-        dAreasym = dict()
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
 
-        if not dSDV["notratedphrase"] is None:
-            # This should work for most interpretations
-            if dSDV["notratedphrase"] in domainValues:
-                notRatedIndex = domainValues.index(dSDV["notratedphrase"])
+                    try:
+                        corecs = dComponent[mukey]
 
-            else:
-                notRatedIndex = -1
+                        for corec in corecs:
 
-        else:
-            # set notRatedIndex for properties that are not interpretations
-            notRatedIndex = -1
+                            try:
+                                hzrecs = dHorizon[corec[0]]
+
+                                for hzrec in hzrecs:
+                                    try:
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        sdvrec = dTbl[hzrec[0]][0]
+                                        newrec.extend(corec)
+                                        newrec.extend(hzrec)
+
+                                        # Important note: in this next line I am only retrieving the first
+                                        # horizon value from a list. This would be the rating for the top of the
+                                        # specified depth range.
+                                        #
+                                        newrec.extend(sdvrec)  # save only rating for first horizon
+                                        #PrintMsg("\t" + str(newrec), 0)
+                                        ocur.insertRow(newrec)
+
+                                    except:
+                                        # missing sdv rating value
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        newrec.extend(corec)
+                                        newrec.extend(hzrec)
+                                        newrec.extend(dMissing[sdvTbl])
+                                        #PrintMsg("\t" + str(newrec) + "******", 1)
+                                        ocur.insertRow(newrec)
+
+                            except:
+                                # missing horizon data
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(corec)
+                                newrec.extend(dMissing["CHORIZON"])
+                                newrec.extend(dMissing[sdvTbl])
+                                #PrintMsg("\t" + str(newrec), 1)
+                                ocur.insertRow(newrec)
+
+                    except:
+                        # No component, horizon or sdv records
+                        try:
+                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                            newrec.extend(dMissing["COMPONENT"])
+                            newrec.extend(dMissing["CHORIZON"])
+                            newrec.extend(dMissing[sdvTbl])
+                            #PrintMsg("\t" + str(newrec), 1)
+                            ocur.insertRow(newrec)
+
+                        except:
+                            # Skip missing mapunits (outside AOI)
+                            pass
+        return True
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def CreateRatingTable4S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl, dAreasymbols):
+    # Create level 3 table (mapunit, component, horizon)
+    #
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+
+        #
+        # Read mapunit table
+        allFields.remove("LKEY")
+
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
+
+                    try:
+                        corecs = dComponent[mukey]
+
+                        for corec in corecs:
+
+                            try:
+                                #sdvrecs = dTbl[corec[0]]
+                                hzrecs = dHorizon[corec[0]]
+
+                                for hzrec in hzrecs:
+                                    try:
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        sdvrecs = dTbl[hzrec[0]]
+                                        newrec.extend(corec)
+                                        newrec.extend(hzrec)
+                                        newrec.extend(dTbl[hzrec[0]])
+                                        #PrintMsg("\t" + str(newrec), 1)
+                                        ocur.insertRow(newrec)
+
+                                    except:
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        newrec.extend(corec)
+                                        newrec.extend(hzrec)
+                                        newrec.extend(dMissing[sdvTbl])
+                                        #PrintMsg("\t" + str(newrec), 1)
+                                        ocur.insertRow(newrec)
+
+                            except:
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend("COMPONENT")
+                                newrec.extend("CHORIZON")
+                                newrec.extend(dMissing[sdvTbl])
+                                #PrintMsg("\t" + str(newrec), 1)
+                                ocur.insertRow(newrec)
+
+                    except:
+                        # No component records
+                        try:
+                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                            newrec.extend(dMissing["COMPONENT"])
+                            newrec.extend(dMissing[sdvTbl])
+                            #PrintMsg("\t" + str(newrec), 1)
+                            ocur.insertRow(newrec)
+
+                        except:
+                            pass
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def CreateSoilMoistureTable(tblList, sdvTbl, dComponent, dMonth, dTbl, initialTbl, begMo, endMo, dAreasymbols):
+    # Create level 4 table (mapunit, component, cmonth, cosoilmoist)
+    #
+    # Problem 2017-07-24 Steve Campbell found Yolo County mapunits where dominant component,
+    # Depth to Water Table map is reporting 201cm for 459272 where the correct result should be 91cm.
+    # My guess is that because there are some months in COSOILMOIST table that are Null, this function
+    # is using that value instead of the other months that are 91cm. Try removing NULLs in query that
+    # creates the SDV_Data table.
+    #
+    try:
+        arcpy.SetProgressorLabel("Saving all relevant data to a single query table")
+
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+            PrintMsg
+
+        #
+        # Read mapunit table and then populate the initial output table
+        allFields.remove("LKEY")
+
+        with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
+            with SDVInsertCursor(initialTbl, allFields) as ocur:
+                for rec in mCur:
+                    mukey, musym, muname, lkey = rec
+
+                    try:
+                        newrec = list()
+                        corecs = dComponent[mukey]
+
+                        for corec in corecs:
+
+                            try:
+                                newrec = list()
+                                morecs = dMonth[corec[0]]
+
+                                for morec in morecs:
+                                    try:
+                                        sdvrecs = dTbl[morec[0]]
+
+                                        for sdvrec in sdvrecs:
+                                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                            newrec.extend(corec)
+                                            newrec.extend(morec)
+                                            newrec.extend(sdvrec)
+                                            #PrintMsg("\t1. " + str(newrec), 1)
+                                            ocur.insertRow(newrec)
+
+                                    except:
+                                        newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                        newrec.extend(corec)
+                                        newrec.extend(morec)
+                                        newrec.extend(dMissing[sdvTbl])
+                                        #PrintMsg("\t2. " + str(newrec), 1)
+                                        ocur.insertRow(newrec)
+
+                            except:
+                                # No comonth records
+                                newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                                newrec.extend(corec)
+                                newrec.extend(dMissing["COMONTH"])
+                                newrec.extend(dMissing[sdvTbl])
+                                #PrintMsg("\t3. " + str(newrec), 1)
+                                ocur.insertRow(newrec)
+
+                    except:
+                        # No component records or comonth records
+                        try:
+                            newrec = [dAreasymbols[lkey], mukey, musym, muname]
+                            newrec.extend(dMissing["COMPONENT"])
+                            newrec.extend(dMissing["COMONTH"])
+                            newrec.extend(dMissing[sdvTbl])
+                            #PrintMsg("\t4. " + str(newrec), 1)
+                            ocur.insertRow(newrec)
+
+                        except:
+                            pass
+
+        return True
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def Aggregate1(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    # Aggregate map unit level table
+    # Added Areasymbol to output
+    try:
+        arcpy.SetProgressorLabel("Assembling map unit level data")
+
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+
+        # Read mapunit table and populate final output table
+        # Create final output table with MUKEY and sdvFld
+        #
+        # Really no difference between the two tables, so this
+        # is redundant. Should fix this later after everything
+        # else is working.
+        #
+        outputTbl = os.path.join(gdb, tblName)
+        #attribcolumn = dSDV["attributecolumnname"].upper()
+        #resultcolumn = dSDV["resultcolumnname"].upper()
+        inFlds = ["MUKEY", "AREASYMBOL", dSDV["attributecolumnname"].upper()]
+        outFlds = ["MUKEY", "AREASYMBOL", dSDV["resultcolumnname"].upper()]
+        outputValues = list()
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
+
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+
+        if outputTbl == "":
+            return outputTbl, outputValues
+
+        fldPrecision = max(0, dSDV["attributeprecision"])
+
+        if dSDV["effectivelogicaldatatype"].lower() in ["integer", "float"]:
+            # populate sdv_initial table and create list of min-max values
+            iMax = -999999999
+            iMin = 999999999
+
+            with SDVSearchCursor(initialTbl, inFlds) as cur:
+                with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                    for rec in cur:
+                        mukey, areasym, val = rec
+
+                        if not val is None:
+                            val = round(val, fldPrecision)
+
+                        iMax = max(val, iMax)
+
+                        if not val is None:
+                            iMin = min(val, iMin)
+
+                        rec = [mukey, areasym, val]
+                        ocur.insertRow(rec)
+
+            # add max and min values to list
+            outputValues = [iMin, iMax]
+
+            if iMin == None and iMax == -999999999:
+                # No data
+                #raise MyError, "8. No data for " + sdvAtt
+                raise MyError, ""
+
+
+        else:
+            # populate sdv_initial table and create a list of unique values
+            with SDVSearchCursor(initialTbl, inFlds) as cur:
+                with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                    for rec in cur:
+                        mukey, areasym, val = rec
+
+                        if not val is None and not val in outputValues:
+                            outputValues.append(val)
+
+                        ocur.insertRow(rec)
+
+        if len(outputValues) < 20 and bVerbose:
+            PrintMsg(" \nInitial output values: " + str(outputValues), 1)
+
+        outputValues.sort()
+        return outputTbl, outputValues
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
+
+    except:
+        errorMsg()
+        return outputTbl, outputValues
+
+## ===================================================================================
+def AggregateCo_Limiting(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    #
+    # Select either the "Least Limiting" or "Most Limiting" rating from all components
+    # Component aggregation to the maximum or minimum value for the mapunit.
+
+    # Based upon AggregateCo_DCD function, but sorted on rating or domain value instead of comppct
+    #
+    # domain: soil_erodibility_factor (text)  range = .02 .. .64
+    # Added Areasymbol to output
+
+    # Note! I have some dead code for 'no domain values'. Need to delete if those sections are never used.
+
+    try:
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+
+        #
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+            PrintMsg(" \nEffective Logical data type: " + dSDV["effectivelogicaldatatype"], 1)
+            PrintMsg(" \nAttribute type: " + dSDV["attributetype"] + "; bFuzzy " + str(bFuzzy), 1)
+
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+
+        inFlds = ["MUKEY", "AREASYMBOL", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper()]
+        outFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["resultcolumnname"].upper()]
+
+        # ignore any null values
+        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+
+        # initialTbl must be in a file geodatabase to support ORDER_BY
+        #
+        sqlClause =  (None, " ORDER BY MUKEY ASC")
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
+
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+        outputValues = list()
+
+        if outputTbl == "":
+            return outputTbl, outputValues
+
+        lastCokey = "xxxx"
+        dComp = dict()
+        dCompPct = dict()
+        dMapunit = dict()
+        dAreasym = dict()
+
+        aggMethod = dSDV["algorithmname"]
+
+        if not dSDV["notratedphrase"] is None:
+            # This should be for most interpretations
+            notRatedIndex = domainValues.index(dSDV["notratedphrase"])
+
+        else:
+            # set notRatedIndex for properties that are not interpretations
+            notRatedIndex = -1
+
+        # 1. For ratings that have domain values, read data from initial table
+        #
+        if len(domainValues) > 0:
+            #PrintMsg(" \ndValues: " + str(dValues), 1)
+
+            # Save the rating for each component along with a list of components for each mapunit
+            #
+            try:
+                with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                    # inFlds: 0 mukey, 1 cokey, 2 comppct, 3 rating
+
+                    for rec in cur:
+                        #PrintMsg(str(rec), 1)
+                        mukey, areasym, cokey, comppct, rating = rec
+                        dAreasym[mukey] = areasym
+
+                        # Save the associated domain index for this rating
+                        dComp[cokey] = dValues[str(rating).upper()][0]
+
+                        # save component percent for each component
+                        dCompPct[cokey] = comppct
+
+                        # save list of components for each mapunit using mukey as key
+                        try:
+                            dMapunit[mukey].append(cokey)
+
+                        except:
+                            dMapunit[mukey] = [cokey]
+
+                        #PrintMsg("Component '" + rec[1] + "' at " + str(rec[2]) + "% has a rating of: " + str(rec[3]), 1)
+
+            except:
+                errorMsg()
+
+        else:
+            # 2. No Domain Values, read data from initial table. Use alpha sort for tiebreaker
+            #
+            raise MyError, "No Domain values"
+
+
+        # Write aggregated data to output table
+
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+
+            if aggMethod == "Least Limiting":
+                #
+                # Need to take a closer look at how 'Not rated' components are handled in 'Least Limiting'
+                #
+                if domainValues:
+
+                    for mukey, cokeys in dMapunit.items():
+                        dRating = dict()   # save sum of comppct for each rating within a mapunit
+                        muVals = list()    # may not need this for DCD
+                        #maxIndx = 0        # Initialize index as zero ('Not rated')
+                        indexes = list()
+
+                        for cokey in cokeys:
+                            compPct = dCompPct[cokey]
+                            ratingIndx = dComp[cokey]
+                            indexes.append(ratingIndx)
+                            #PrintMsg("\t\t" + mukey + ": " + cokey + " - " + str(ratingIndx) + ",  " + domainValues[ratingIndx], 1)
+
+                            if ratingIndx in dRating:
+                                 dRating[ratingIndx] = dRating[ratingIndx] + compPct
+
+                            else:
+                                dRating[ratingIndx] = compPct
+
+                        # Use the highest index value to assign the map unit rating
+                        indexes = sorted(set(indexes), reverse=True)
+                        maxIndx = indexes[0]  # get the lowest index value
+
+                        if maxIndx == notRatedIndex and len(indexes) > 1:
+                            # if the lowest index is for 'Not rated', try to get the next higher index
+                            maxIndx = indexes[1]
+
+                        pct = dRating[maxIndx]
+                        rating = domainValues[maxIndx]
+                        areasym = dAreasym[mukey]
+                        newrec = [mukey, areasym, pct, rating]
+                        ocur.insertRow(newrec)
+                        #PrintMsg("\tMapunit rating: " + str(indexes) + "; " + str(maxIndx) + "; " + rating + " \n ", 1)
+
+                        if not rating is None and not rating in outputValues:
+                            outputValues.append(rating)
+
+                else:
+                    # Least Limiting, no domain values
+                    #
+                    raise MyError, "No domain values"
+
+
+            elif aggMethod == "Most Limiting":
+                #
+                # with domain values...
+                #
+                # Need to take a closer look at how 'Not rated' components are handled in 'Most Limiting'
+                #
+                if len(domainValues) > 0:
+                    #
+                    # Most Limiting, has domain values
+                    #
+                    for mukey, cokeys in dMapunit.items():
+                        dRating = dict()   # save sum of comppct for each rating within a mapunit
+                        minIndx = 9999999  # save the lowest index value for each mapunit
+                        indexes = list()
+
+                        for cokey in cokeys:
+                            compPct = dCompPct[cokey]  # get comppct_r for this component
+                            ratingIndx = dComp[cokey]  # get rating index for this component
+                            indexes.append(ratingIndx)
+
+                            # save the sum of comppct_r for each rating index in the dRating dictionary
+                            if ratingIndx in dRating:
+                                dRating[ratingIndx] = dRating[ratingIndx] + compPct
+
+                            else:
+                                dRating[ratingIndx] = compPct
+
+                        indexes = sorted(set(indexes))
+                        minIndx = indexes[0]  # get the lowest index value
+
+                        if minIndx == notRatedIndex and len(indexes) > 1:
+                            # if the lowest index is for 'Not rated', try to get the next higher index
+                            minIndx = indexes[1]
+
+                        newrec = [mukey, dAreasym[mukey], dRating[minIndx], domainValues[minIndx]]
+                        #PrintMsg("\t" + mukey + ": " + " - " + str(minIndx) + ",  " + domainValues[minIndx], 1)
+                        ocur.insertRow(newrec)
+
+                        if not domainValues[minIndx] is None and not domainValues[minIndx] in outputValues:
+                            outputValues.append(domainValues[minIndx])
+
+                else:
+                    #
+                    # Most Limiting, no domain values
+                    raise MyError, "No domain values"
+
+                    #PrintMsg(" \nTesting " + aggMethod + ", no domain values!!!", 1)
+                    #
+                    for mukey, cokeys in dMapunit.items():
+                        dRating = dict()  # save sum of comppct for each rating within a mapunit
+                        muVals = list()   # list of rating values for each mapunit
+
+                        for cokey in cokeys:
+                            compPct = dCompPct[cokey]  # component percent
+                            ratingIndx = dComp[cokey]  # component rating
+
+                            if ratingIndx != 0:
+                                if ratingIndx in dRating:
+                                    dRating[ratingIndx] = dRating[ratingIndx] + compPct
+
+                                else:
+                                    dRating[ratingIndx] = compPct
+
+                        for rating, compPct in dRating.items():
+                            muVals.append([compPct, rating])
+
+                        if len(muVals) > 0:
+                            muVal = SortData(muVals)
+
+                            newrec = [mukey, dAreasym[mukey], muVal[0], muVal[1]]
+                            ocur.insertRow(newrec)
+                            #PrintMsg("\t" + mukey + ": " + ",  " + str(muVals), 1)
+
+                        if not newrec[2] is None and not newrec[2] in outputValues:
+                            outputValues.append(newrec[2])
+
+                # End of Lower
+
+        outputValues.sort()
+
+        return outputTbl, outputValues
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
+
+    except:
+        errorMsg()
+        return outputTbl, outputValues
+
+## ===================================================================================
+def AggregateCo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    #
+    # Looks at all components and returns the lowest or highest rating value. This
+    # may be based upon the actual value or the index (for those properties with domains).
+    #
+    # "Minimum or Maximum" method of aggregation uses the tiebreak setting
+    # and returns the highest or lowest rating accordingly.
+
+    # "Least Limiting", "Most Limiting"
+    # Component aggregation to the maximum or minimum value for the mapunit.
+    #
+    # dSDV["tiebreakrule"]: -1, 1 originally in sdvattribute table
+    #
+    # If tieBreak value == "lower" return the minimum value for the mapunit
+    # Else return "Higher" value for the mapunit
+    #
+    # Based upon AggregateCo_DCD function, but sorted on rating or domain value instead of comppct
+    #
+    # domain: soil_erodibility_factor (text)  range = .02 .. .64
+    # Added Areasymbol to output
+
+    try:
+        #bVerbose = True
+
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+
+        #
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+            PrintMsg(" \nEffective Logical data type: " + dSDV["effectivelogicaldatatype"], 1)
+            PrintMsg(" \nAttribute type: " + dSDV["attributetype"] + "; bFuzzy " + str(bFuzzy), 1)
+
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+
+        inFlds = ["MUKEY", "AREASYMBOL", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper()]
+        outFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["resultcolumnname"].upper()]
+
+        # ignore any null values
+        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+
+        # initialTbl must be in a file geodatabase to support ORDER_BY
+        # Do I really need to sort by attributecolumn when it will be replaced by Domain values later?
+        #
+        if tieBreaker == dSDV["tiebreaklowlabel"]:
+            sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + " ASC ")
+
+        else:
+            sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + " DESC ")
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
+
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+        outputValues = list()
+
+        if outputTbl == "":
+            return outputTbl, outputValues
+
+        lastCokey = "xxxx"
+        dComp = dict()
+        dCompPct = dict()
+        dMapunit = dict()
+        dAreasym = dict()
+
+        if not dSDV["notratedphrase"] is None:
+            # This should work for most interpretations
+            if dSDV["notratedphrase"] in domainValues:
+                notRatedIndex = domainValues.index(dSDV["notratedphrase"])
+
+            else:
+                notRatedIndex = -1
+
+        else:
+            # set notRatedIndex for properties that are not interpretations
+            notRatedIndex = -1
 
         #
-        # Begin component level processing. Branch according to whether values are members of a domain.
-        #
+        # Begin component level processing. Branch according to whether values are members of a domain.
+        #
         if len(domainValues) > 0:
             # Save the rating for each component along with a list of components for each mapunit
             #
             # PrintMsg(" \ndomainValues for " + sdvAtt + ": " + str(domainValues), 1)
 
             try:
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
                     # inFlds: 0 mukey, 1 cokey, 2 comppct, 3 rating
 
                     for rec in cur:
@@ -5342,7 +6503,7 @@ def AggregateCo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreake
         else:
             # 2. No Domain Values, read data from initial table. Use alpha sort for tiebreaker.
             #
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
                 for rec in cur:
                     mukey, areasym, cokey, comppct, rating = rec
@@ -5640,7 +6801,7 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
 
             # PrintMsg("dValues: " + str(dValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause, bKeyCodes=True) as cur:
                 # Use tiebreak rules and rating index values
 
                 for rec in cur:
@@ -5677,7 +6838,7 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
             # 2 Read initial table (no domain values, must use alpha sort for tiebreaker)
             # Issue noted by ?? that without tiebreaking method, inconsistent results may occur
             #
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause, bKeyCodes=True) as cur:
                 #
                 # numeric values
                 if dSDV["effectivelogicaldatatype"].lower() in ['integer', 'float']:
@@ -5734,6 +6895,9 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
         # the comppct_r written to the SDV_Rating table.
         #
         
+        # 2026-10-17 dMapunit, dComp and dCompPct are keyed by the integer MUKEY and COKEY ids
+        muKeys = GetKeyIndex("MUKEY").keys
+
         with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
             #PrintMsg(" \nTiebreak Rule: " + tieBreaker, 1)
             # Using domain values and tiebreaker is DCD Lower
@@ -5780,7 +6944,7 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
                         muPct = round(100 * (dcpPct / float(totalPct)), 0)
                         muVal = dComp[cokeys[0]]
 
-                    newrec = [mukey, muPct, muVal, areasym]
+                    newrec = [muKeys[mukey], muPct, muVal, areasym]
                     ocur.insertRow(newrec)
 
                     if not newrec[2] is None and not newrec[2] in outputValues:
@@ -5822,65 +6986,279 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
                         if totalPct > 0:
                             muPct = round(100 * (muPct / float(totalPct)), 0)
 
-                        else:
-                            muPct = 0
+                        else:
+                            muPct = 0
+
+                    else:
+                        muPct = round(100 * (dcpPct / float(totalPct)), 0)
+                        muVal = dComp[cokeys[0]]
+                    
+                    newrec = [muKeys[mukey], muPct, muVal, areasym]
+                    ocur.insertRow(newrec)
+
+                    if not newrec[2] is None and not newrec[2] in outputValues:
+                        outputValues.append(newrec[2])
+
+            else:
+                # fails on T Factor, etc. tiebreakruleoptionflag=1, tiebreakrule=-1, no tie labels.
+                # tiebreakrule: 1 (select higher value); -1 (select the lower value)
+                #
+                # tiebreakruleoptionflag controls whether user can change the tiebreakrule option
+                #
+                PrintMsg(" \ntieBreaker value is: " + str(tieBreaker), 1)
+                raise MyError, "Failed to aggregate map unit data"
+
+        outputValues.sort()
+
+        if (bZero and outputValues ==  [0.0, 0.0]):
+            #PrintMsg(" \n1. No data for " + sdvAtt, 1)
+            raise MyError, ""
+
+        # Problem with integer or float data below
+
+        if dSDV["effectivelogicaldatatype"].lower() in ['integer', 'float']:
+
+            for rating in outputValues:
+                #PrintMsg(" \ndValues for " + rating.upper() + ": " + str(dValues[rating.upper()][1]), 1)
+
+                if rating in dValues:
+                    # rating is in dValues but case is wrong
+                    # fix dValues value
+                    #PrintMsg("\tChanging dValue rating to: " + rating, 1)
+                    dValues[rating][1] = rating
+
+        else:
+            for rating in outputValues:
+                #PrintMsg(" \ndValues for " + rating.upper() + ": " + str(dValues[rating.upper()][1]), 1)
+
+                if rating.upper() in dValues and dValues[rating.upper()][1] != rating:
+                    # rating is in dValues but case is wrong
+                    # fix dValues value
+                    #PrintMsg("\tChanging dValue rating to: " + rating, 1)
+                    dValues[rating.upper()][1] = rating
+
+
+        #PrintMsg(" \ndValues (after) in AggregateCo_DCD: " + str(dValues), 1)
+
+        if dSDV["effectivelogicaldatatype"].lower() in ["float", "integer"]:
+            return outputTbl, outputValues
+
+        else:
+            return outputTbl, sorted(outputValues, key=lambda s: s.lower())
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
+
+    except:
+        errorMsg()
+        return outputTbl, outputValues
+
+## ===================================================================================
+def AggregateCo_DCP_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    #
+    # Depth to Water Table, dominant component
+    #
+    # Aggregate mapunit-component data to the map unit level using dominant component
+    # and the tie breaker setting to select the lowest or highest monthly rating.
+    # Use this for COMONTH table. domainValues
+    #
+    # PROBLEMS with picking the correct depth for each component. Use tiebreaker to pick
+    # highest or lowest month and then aggregate to DCP?
+    # Added areasymbol to output
+
+    try:
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+
+        #
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+        #attribcolumn = dSDV["attributecolumnname"].upper()
+        #resultcolumn = dSDV["resultcolumnname"].upper()
+
+        inFlds = ["MUKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute 200
+        sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
+
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+        outputValues = list()
+
+        if outputTbl == "":
+            return outputTbl, outputValues
+
+        dMapunit = dict()
+        dAreasym = dict()
+        dataCnt = SDVCount(initialTbl)
+
+        with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            #cnt = 0
+            #PrintMsg(" \nReading input table " + os.path.basename(initialTbl) + "...", 1)
+            arcpy.SetProgressor("step", "Reading input table " + os.path.basename(initialTbl) + "...", 0, dataCnt, 1 )
+
+            # "MUKEY", "COMPPCT_R", attribcolumn
+            for rec in cur:
+                arcpy.SetProgressorPosition()
+                mukey, compPct, rating, areasym = rec
+                dAreasym[mukey] = areasym
+
+                try:
+                    dMapunit[mukey].append([compPct, rating])
+
+                except:
+                    dMapunit[mukey] = [[compPct, rating]]
+
+        del initialTbl  # Trying to save some memory 2016-06-23
+
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            #PrintMsg(" \nWriting to output table " + outputTbl + "...", 1)
+            arcpy.SetProgressor("step", "Writing to output table (" + os.path.basename(outputTbl) + ")", 0, len(dMapunit), 1 )
+
+            for mukey, coVals in dMapunit.items():
+                arcpy.SetProgressorPosition()
+                # Grab the first pair of values (pct, depth) from the sorted list.
+                # This is the dominant component rating using tie breaker setting
+                #dcpRating = SortData(coVals, 0, 1, True, True)
+                dcpRating = SortData(coVals, 0, 1, True, False)  # For depth to water table, we want the lower value (closer to surface)
+                rec =[mukey, dcpRating[0], dcpRating[1], dAreasym[mukey]]
+                ocur.insertRow(rec)
+
+                if  not rec[2] is None and not rec[2] in outputValues:
+                    outputValues.append(rec[2])
+
+        outputValues.sort()
+        return outputTbl, outputValues
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
+
+    except:
+        errorMsg()
+        return outputTbl, outputValues
+
+## ===================================================================================
+def AggregateCo_DCD_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    #
+    # Not being used???
+    #
+    # Aggregate mapunit-component-comonth data to the map unit level using dominant condition
+    # and the tie breaker setting to select the lowest or highest monthly rating.
+    # Use this for COMONTH table. domainValues
+    # Added areasymbol to output
+    try:
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+
+        #
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+        #attribcolumn = dSDV["attributecolumnname"].upper()
+        #resultcolumn = dSDV["resultcolumnname"].upper()
+
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute 200
+        sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
+
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+        outputValues = list()
+
+        if outputTbl == "":
+            return outputTbl, outputValues
+
+        dMapunit = dict()
+        dComponent = dict()
+        dCoRating = dict()
+        dAreasym = dict()
+
+        with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+
+            # MUKEY,COKEY , COMPPCT_R, attribcolumn
+            for rec in cur:
+                mukey, cokey, compPct, rating, areasym = rec
+
+                if rating is None:
+                    rating = nullRating
+
+                dAreasym[mukey] = areasym
 
-                    else:
-                        muPct = round(100 * (dcpPct / float(totalPct)), 0)
-                        muVal = dComp[cokeys[0]]
-                    
-                    newrec = [mukey, muPct, muVal, areasym]
-                    ocur.insertRow(newrec)
+                # Save list of cokeys for each mukey
+                try:
+                    if not cokey in dMapunit[mukey]:
+                        dMapunit[mukey].append(cokey)
 
-                    if not newrec[2] is None and not newrec[2] in outputValues:
-                        outputValues.append(newrec[2])
+                except:
+                    dMapunit[mukey] = [cokey]
 
-            else:
-                # fails on T Factor, etc. tiebreakruleoptionflag=1, tiebreakrule=-1, no tie labels.
-                # tiebreakrule: 1 (select higher value); -1 (select the lower value)
-                #
-                # tiebreakruleoptionflag controls whether user can change the tiebreakrule option
-                #
-                PrintMsg(" \ntieBreaker value is: " + str(tieBreaker), 1)
-                raise MyError, "Failed to aggregate map unit data"
+                try:
+                    # Save list of rating values along with comppct for each component
+                    dComponent[cokey][1].append(rating)
 
-        outputValues.sort()
+                except:
+                    #  Save list of rating values along with comppct for each component
+                    dComponent[cokey] = [compPct, [rating]]
 
-        if (bZero and outputValues ==  [0.0, 0.0]):
-            #PrintMsg(" \n1. No data for " + sdvAtt, 1)
-            raise MyError, ""
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            for cokey, coVals in dComponent.items():
+                # Find high or low value for each component
+                dCoRating[cokey] = max(coVals[1])
 
-        # Problem with integer or float data below
+        else:
+            for cokey, coVals in dComponent.items():
+                # Find high or low value for each component
+                dCoRating[cokey] = min(coVals[1])
 
-        if dSDV["effectivelogicaldatatype"].lower() in ['integer', 'float']:
 
-            for rating in outputValues:
-                #PrintMsg(" \ndValues for " + rating.upper() + ": " + str(dValues[rating.upper()][1]), 1)
+        dFinalRatings = dict()  # final dominant condition. mukey is key
 
-                if rating in dValues:
-                    # rating is in dValues but case is wrong
-                    # fix dValues value
-                    #PrintMsg("\tChanging dValue rating to: " + rating, 1)
-                    dValues[rating][1] = rating
+        for mukey, cokeys in dMapunit.items():
+            # accumulate ratings for each mapunit by sum of comppct
+            dMuRatings = dict()  # create a dictionary of values for just this map unit
+            domPct = 0
 
-        else:
-            for rating in outputValues:
-                #PrintMsg(" \ndValues for " + rating.upper() + ": " + str(dValues[rating.upper()][1]), 1)
+            for cokey in cokeys:
+                # look at values for each component within the map unit
+                rating = dCoRating[cokey]
+                compPct = dComponent[cokey][0]
 
-                if rating.upper() in dValues and dValues[rating.upper()][1] != rating:
-                    # rating is in dValues but case is wrong
-                    # fix dValues value
-                    #PrintMsg("\tChanging dValue rating to: " + rating, 1)
-                    dValues[rating.upper()][1] = rating
+                try:
+                    dMuRatings[rating] += compPct
 
+                except:
+                    dMuRatings[rating] = compPct
 
-        #PrintMsg(" \ndValues (after) in AggregateCo_DCD: " + str(dValues), 1)
+            for rating, compPct in dMuRatings.items():
+                # Find rating with highest sum of comppct
+                if compPct > domPct:
+                    domPct = compPct
+                    dFinalRatings[mukey] = [compPct, rating]
+                    #PrintMsg("\t" + mukey + ", " + str(compPct) + "%" + ", " + str(rating) + "cm", 1)
 
-        if dSDV["effectivelogicaldatatype"].lower() in ["float", "integer"]:
-            return outputTbl, outputValues
+            del dMuRatings
 
-        else:
-            return outputTbl, sorted(outputValues, key=lambda s: s.lower())
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            # Write final ratings to output table
+            for mukey, vals in dFinalRatings.items():
+                rec = mukey, vals[0], vals[1], dAreasym[mukey]
+                ocur.insertRow(rec)
+
+                if not rec[2] is None and not rec[2] in outputValues:
+                    outputValues.append(rec[2])
+
+        outputValues.sort()
+        return outputTbl, outputValues
 
     except MyError, e:
         PrintMsg(str(e), 2)
@@ -5890,23 +7268,27 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
         errorMsg()
         return outputTbl, outputValues
 
+
 ## ===================================================================================
-def AggregateCo_DCP_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    #
-    # Depth to Water Table, dominant component
+def AggregateCo_Mo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
     #
-    # Aggregate mapunit-component data to the map unit level using dominant component
-    # and the tie breaker setting to select the lowest or highest monthly rating.
-    # Use this for COMONTH table. domainValues
+    # Aggregate mapunit-component data to the map unit level using Minimum or Maximum
+    # based upon the TieBreak rule.
+    # Use this for COMONTH table. Example Depth to Water Table.
     #
-    # PROBLEMS with picking the correct depth for each component. Use tiebreaker to pick
-    # highest or lowest month and then aggregate to DCP?
+    # It appears that WSS includes 0 percent components in the MinMax. This function
+    # is currently set to duplicate this behavior
     # Added areasymbol to output
+    #
+    # Seems to be a problem with TitleCase Values in maplegendxml vs. SentenceCase in the original data. Domain values are SentenceCase.
+    #
 
     try:
+        #
+        #bVerbose = True
+
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
-        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
@@ -5915,9 +7297,10 @@ def AggregateCo_DCP_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
         #attribcolumn = dSDV["attributecolumnname"].upper()
         #resultcolumn = dSDV["resultcolumnname"].upper()
 
-        inFlds = ["MUKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute 200
+        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try later to substitute dSDV["nullratingreplacementvalue"]
+        #whereClause = "COMPPCT_R >=  " + str(cutOff) + " and not " + dSDV["attributecolumnname"].upper() + " is null"
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
         if arcpy.Exists(outputTbl):
@@ -5930,42 +7313,129 @@ def AggregateCo_DCP_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
             return outputTbl, outputValues
 
         dMapunit = dict()
+        dComponent = dict()
+        dCoRating = dict()
         dAreasym = dict()
-        dataCnt = int(arcpy.GetCount_management(initialTbl).getOutput(0))
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-            #cnt = 0
-            #PrintMsg(" \nReading input table " + os.path.basename(initialTbl) + "...", 1)
-            arcpy.SetProgressor("step", "Reading input table " + os.path.basename(initialTbl) + "...", 0, dataCnt, 1 )
+        #PrintMsg(" \nSQL: " + whereClause, 1)
+        #PrintMsg("Fields: " + str(inFlds), 1)
 
-            # "MUKEY", "COMPPCT_R", attribcolumn
+        with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+
+            # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
-                arcpy.SetProgressorPosition()
-                mukey, compPct, rating, areasym = rec
+
+                mukey, cokey, compPct, rating, areasym = rec
                 dAreasym[mukey] = areasym
+                #PrintMsg("\t" + str(rec), 1)
 
+
+                # Save list of cokeys for each mapunit-mukey
                 try:
-                    dMapunit[mukey].append([compPct, rating])
+                    if not cokey in dMapunit[mukey]:
+                        dMapunit[mukey].append(cokey)
 
                 except:
-                    dMapunit[mukey] = [[compPct, rating]]
+                    dMapunit[mukey] = [cokey]
 
-        del initialTbl  # Trying to save some memory 2016-06-23
+                try:
+                    # Save list of rating values along with comppct for each component
+                    if not rating is None:
+                        dComponent[cokey][1].append(rating)
+
+                except:
+                    #  Save list of rating values along with comppct for each component
+                    if not rating is None:
+                        dComponent[cokey] = [compPct, [rating]]
+
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            # This is working correctly for DTWT
+            # Backwards for Ponding
+
+            # Identify highest value for each component
+            for cokey, coVals in dComponent.items():
+                # Find high value for each component
+                #PrintMsg("Higher values for " + cokey + ": " + str(coVals) + " = " + str(max(coVals[1])), 1)
+                dCoRating[cokey] = max(coVals[1])
+
+        else:
+            # This is working correctly for DTWT
+            # Backwards for Ponding
+
+            # Identify lowest value for each component
+            for cokey, coVals in dComponent.items():
+                # Find low rating value for each component
+                #PrintMsg("Lower values for " + cokey + ": " + str(coVals) + " = " + str(min(coVals[1])), 1)
+                dCoRating[cokey] = min(coVals[1])
+
+
+        dFinalRatings = dict()  # final dominant condition. mukey is key
+
+        for mukey, cokeys in dMapunit.items():
+            # accumulate ratings for each mapunit by sum of comppct
+            dMuRatings = dict()  # create a dictionary of values for just this map unit
+            domPct = 0
+
+            for cokey in cokeys:
+                # look at values for each component within the map unit
+                try:
+                    rating = dCoRating[cokey]
+                    compPct = dComponent[cokey][0]
+
+                    try:
+                        dMuRatings[rating] += compPct
+
+                    except:
+                        dMuRatings[rating] = compPct
+
+                except:
+                    pass
+
+            if tieBreaker == dSDV["tiebreakhighlabel"]:
+                # This is working correctly for DTWT
+                # Backwards for Ponding
+                highRating = 0
+
+                for rating, compPct in dMuRatings.items():
+                    # Find the highest
+                    if rating > highRating:
+                        highRating = rating
+                        dFinalRatings[mukey] = [compPct, rating]
+            else:
+                # This is working correctly for DTWT
+                # Backwards for Ponding
+                lowRating = nullRating
+
+                for rating, compPct in dMuRatings.items():
+
+                    if rating < lowRating and rating is not None:
+                        lowRating = rating
+                        dFinalRatings[mukey] = [compPct, rating]
+
+            del dMuRatings
 
         with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-            #PrintMsg(" \nWriting to output table " + outputTbl + "...", 1)
-            arcpy.SetProgressor("step", "Writing to output table (" + os.path.basename(outputTbl) + ")", 0, len(dMapunit), 1 )
+            # Write final ratings to output table
+            for mukey in sorted(dMapunit):
 
-            for mukey, coVals in dMapunit.items():
-                arcpy.SetProgressorPosition()
-                # Grab the first pair of values (pct, depth) from the sorted list.
-                # This is the dominant component rating using tie breaker setting
-                #dcpRating = SortData(coVals, 0, 1, True, True)
-                dcpRating = SortData(coVals, 0, 1, True, False)  # For depth to water table, we want the lower value (closer to surface)
-                rec =[mukey, dcpRating[0], dcpRating[1], dAreasym[mukey]]
+                try:
+                    vals = dFinalRatings[mukey]
+
+                except:
+                    sumPct = 0
+                    for cokey in dMapunit[mukey]:
+                        try:
+                            sumPct += dComponent[cokey][0]
+
+                        except:
+                            pass
+
+                    vals = [sumPct, nullRating]
+
+                rec = mukey, vals[0], vals[1], dAreasym[mukey]
                 ocur.insertRow(rec)
 
-                if  not rec[2] is None and not rec[2] in outputValues:
+                if not rec[2] is None and not rec[2] in outputValues:
                     outputValues.append(rec[2])
 
         outputValues.sort()
@@ -5980,18 +7450,21 @@ def AggregateCo_DCP_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
         return outputTbl, outputValues
 
 ## ===================================================================================
-def AggregateCo_DCD_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+def AggregateCo_Mo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
     #
-    # Not being used???
+    # Aggregate mapunit-component data to the map unit level using the dominant condition
+    # based upon the TieBreak rule.
+    # Use this for COMONTH table. Example Depth to Water Table.
+    #
+    # It appears that WSS includes 0 percent components in the MinMax. This function
+    # is currently set to duplicate this behavior
     #
-    # Aggregate mapunit-component-comonth data to the map unit level using dominant condition
-    # and the tie breaker setting to select the lowest or highest monthly rating.
-    # Use this for COMONTH table. domainValues
-    # Added areasymbol to output
+    # Currently there is a problem with the comppct. It ends up being 12X.
+
     try:
+        #
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
-        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
@@ -6001,8 +7474,9 @@ def AggregateCo_DCD_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
         #resultcolumn = dSDV["resultcolumnname"].upper()
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute 200
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute dSDV["nullratingreplacementvalue"]
+        #whereClause = "COMPPCT_R >=  " + str(cutOff) + " and not " + dSDV["attributecolumnname"].upper() + " is null"
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
         if arcpy.Exists(outputTbl):
@@ -6019,79 +7493,73 @@ def AggregateCo_DCD_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
         dCoRating = dict()
         dAreasym = dict()
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        #PrintMsg(" \nSQL: " + whereClause, 1)
+        #PrintMsg("Fields: " + str(inFlds), 1)
+
+        with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
             # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
+                #mukey = rec[0]; cokey = rec[1]; compPct = rec[2]; rating = rec[3]
                 mukey, cokey, compPct, rating, areasym = rec
-
                 if rating is None:
-                    rating = nullRating
-
-                dAreasym[mukey] = areasym
+                    rating = 201
 
-                # Save list of cokeys for each mukey
+                # Save list of cokeys for each mapunit-mukey
                 try:
                     if not cokey in dMapunit[mukey]:
                         dMapunit[mukey].append(cokey)
 
                 except:
                     dMapunit[mukey] = [cokey]
+                    dAreasym[mukey] = areasym
+                    PrintMsg(" \nCheck dAreasymbols setting", 1)
 
                 try:
-                    # Save list of rating values along with comppct for each component
-                    dComponent[cokey][1].append(rating)
-
-                except:
-                    #  Save list of rating values along with comppct for each component
-                    dComponent[cokey] = [compPct, [rating]]
-
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            for cokey, coVals in dComponent.items():
-                # Find high or low value for each component
-                dCoRating[cokey] = max(coVals[1])
+                    # if the rating value meets the tiebreak rule, save the rating value along with comppct for each component
+                    #if not rating is None:
+                    if tieBreaker == dSDV["tiebreakhighlabel"]:
+                        if rating > dComponent[cokey][1]:
+                            dComponent[cokey][1] = rating
 
-        else:
-            for cokey, coVals in dComponent.items():
-                # Find high or low value for each component
-                dCoRating[cokey] = min(coVals[1])
+                    elif rating < dComponent[cokey][1]:
+                        dComponent[cokey][1] = rating
 
+                except:
+                    #  Save rating value along with comppct for each component
+                    if not rating is None:
+                        dComponent[cokey] = [compPct, rating]
 
         dFinalRatings = dict()  # final dominant condition. mukey is key
 
         for mukey, cokeys in dMapunit.items():
             # accumulate ratings for each mapunit by sum of comppct
-            dMuRatings = dict()  # create a dictionary of values for just this map unit
+            dMuRatings = dict()
+            dMuRatings[mukey] = [None, None]  # create a dictionary of values for just this map unit
             domPct = 0
 
             for cokey in cokeys:
                 # look at values for each component within the map unit
-                rating = dCoRating[cokey]
-                compPct = dComponent[cokey][0]
-
-                try:
-                    dMuRatings[rating] += compPct
+                if cokey in dComponent:
 
-                except:
-                    dMuRatings[rating] = compPct
+                    compPct, rating = dComponent[cokey]
 
-            for rating, compPct in dMuRatings.items():
-                # Find rating with highest sum of comppct
-                if compPct > domPct:
-                    domPct = compPct
-                    dFinalRatings[mukey] = [compPct, rating]
-                    #PrintMsg("\t" + mukey + ", " + str(compPct) + "%" + ", " + str(rating) + "cm", 1)
+                    if compPct > domPct:
+                        domPct = compPct
+                        dMuRatings[mukey] = [compPct, rating]
+                        #PrintMsg("\t" + mukey + ":" + cokey  + ", " + str(compPct) + "%, " + str(rating), 1)
 
-            del dMuRatings
+            dFinalRatings[mukey] = dMuRatings[mukey]
 
         with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
             # Write final ratings to output table
-            for mukey, vals in dFinalRatings.items():
-                rec = mukey, vals[0], vals[1], dAreasym[mukey]
+            for mukey in sorted(dFinalRatings):
+                compPct, rating = dFinalRatings[mukey]
+                rec = mukey, compPct, rating, dAreasym[mukey]
                 ocur.insertRow(rec)
 
-                if not rec[2] is None and not rec[2] in outputValues:
-                    outputValues.append(rec[2])
+                if not rating is None and not rating in outputValues:
+                    outputValues.append(rating)
 
         outputValues.sort()
         return outputTbl, outputValues
@@ -6106,39 +7574,37 @@ def AggregateCo_DCD_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
 
 
 ## ===================================================================================
-def AggregateCo_Mo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+def AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
     #
-    # Aggregate mapunit-component data to the map unit level using Minimum or Maximum
-    # based upon the TieBreak rule.
-    # Use this for COMONTH table. Example Depth to Water Table.
+    # Use this function for Flooding or Ponding Frequency which involves the COMONTH table
     #
-    # It appears that WSS includes 0 percent components in the MinMax. This function
-    # is currently set to duplicate this behavior
-    # Added areasymbol to output
+    # Need to modify this so that COMPPCT_R is summed using just one value per component, not 12X.
     #
-    # Seems to be a problem with TitleCase Values in maplegendxml vs. SentenceCase in the original data. Domain values are SentenceCase.
+    # We have a case problem with Flooding Frequency Class: 'Very frequent'
+    #
+    # My tests on ND035 appear to return results based upon dominant condition, not dominant component!
     #
 
     try:
-        #
-        #bVerbose = True
-
+        # bVerbose = True
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
+        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try later to substitute dSDV["nullratingreplacementvalue"]
-        #whereClause = "COMPPCT_R >=  " + str(cutOff) + " and not " + dSDV["attributecolumnname"].upper() + " is null"
+        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+
+        # initialTbl must be in a file geodatabase to support ORDER_BY
+        # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
+
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
@@ -6148,131 +7614,191 @@ def AggregateCo_Mo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBre
         if outputTbl == "":
             return outputTbl, outputValues
 
+        lastCokey = "xxxx"
+        dComp = dict()
+        dCompPct = dict()
         dMapunit = dict()
-        dComponent = dict()
-        dCoRating = dict()
+        missingDomain = list()
+        dCase = dict()
         dAreasym = dict()
 
-        #PrintMsg(" \nSQL: " + whereClause, 1)
-        #PrintMsg("Fields: " + str(inFlds), 1)
+        # Read initial table for non-numeric data types
+        # 02-03-2016 Try adding 'choice' to this method to see if it handles Cons. Tree/Shrub better
+        # than the next method. Nope, did not work. Still have case problems.
+        #
+        if dSDV["attributelogicaldatatype"].lower() == "string":
+            PrintMsg(" \n*dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-            # MUKEY,COKEY , COMPPCT_R, attribcolumn
-            for rec in cur:
+                for rec in cur:
+                    dAreasym[rec[0]] = rec[4]
+                    rating = rec[3]
 
-                mukey, cokey, compPct, rating, areasym = rec
-                dAreasym[mukey] = areasym
-                #PrintMsg("\t" + str(rec), 1)
+                    try:
+                        # capture component ratings as index numbers instead.
+                        dComp[rec[1]].append(dValues[rating.upper()][0])
 
+                    except:
+                        dComp[rec[1]] = [dValues[rating.upper()][0]]
+                        dCompPct[rec[1]] = rec[2]
+                        dCase[rating.upper()] = rating  # save original value using uppercase key
 
-                # Save list of cokeys for each mapunit-mukey
-                try:
-                    if not cokey in dMapunit[mukey]:
-                        dMapunit[mukey].append(cokey)
 
-                except:
-                    dMapunit[mukey] = [cokey]
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[rec[0]].append(rec[1])
 
-                try:
-                    # Save list of rating values along with comppct for each component
-                    if not rating is None:
-                        dComponent[cokey][1].append(rating)
+                        except:
+                            dMapunit[rec[0]] = [rec[1]]
 
-                except:
-                    #  Save list of rating values along with comppct for each component
-                    if not rating is None:
-                        dComponent[cokey] = [compPct, [rating]]
+        elif dSDV["attributelogicaldatatype"].lower() in ["float", "integer", "choice"]:
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            # This is working correctly for DTWT
-            # Backwards for Ponding
+            PrintMsg(" \n**dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
 
-            # Identify highest value for each component
-            for cokey, coVals in dComponent.items():
-                # Find high value for each component
-                #PrintMsg("Higher values for " + cokey + ": " + str(coVals) + " = " + str(max(coVals[1])), 1)
-                dCoRating[cokey] = max(coVals[1])
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+
+                for rec in cur:
+                    dAreasym[rec[0]] = rec[4]
+                    rating = rec[3]
+
+                    try:
+                        # capture component ratings as index numbers instead
+                        if rating is None:
+                            dComp[rec[1]].append(dValues["<Null>"][0])
+
+                        else:
+                            dComp[rec[1]].append(dValues[rating.upper()][0])
+
+                    except:
+                        #PrintMsg(" \ndomainValues is empty, but legendValues has " + str(legendValues), 1)
+                        dCase[rating.upper()] = rating
+
+                        if rating.upper() in dValues:
+                            dComp[rec[1]] = [dValues[rating.upper()][0]]
+                            dCompPct[rec[1]] = rec[2]
+
+                            # compare actual rating value to domainValues to make sure case is correct
+                            if not rating in domainValues: # this is a case problem
+                                # replace the original dValue item
+                                dValues[rating.upper()][1] = rating
+
+                                # replace the value in domainValues list
+                                for i in range(len(domainValues)):
+                                    if domainValues[i].upper() == rating.upper():
+                                        domainValues[i] = rating
+
+                        else:
+                            # dValues is keyed on uppercase string rating
+                            #
+                            if not rating in missingDomain:
+                                # Try to add missing value to dDomainValues dict and domainValues list
+                                dValues[rating.upper()] = [len(dValues), rating]
+                                #domainValues.append(rating])
+                                #domainValuesUp.append(rating.upper()
+                                #missingDomain.append(rating)
+                                PrintMsg("\tAdding value '" + str(rating) + "' to domainValues", 1)
+
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[rec[0]].append(rec[1])
+
+                        except:
+                            dMapunit[rec[0]] = [rec[1]]
 
         else:
-            # This is working correctly for DTWT
-            # Backwards for Ponding
+            PrintMsg(" \nProblem with handling domain values of type '" + dSDV["attributelogicaldatatype"] + "'", 1)
 
-            # Identify lowest value for each component
-            for cokey, coVals in dComponent.items():
-                # Find low rating value for each component
-                #PrintMsg("Lower values for " + cokey + ": " + str(coVals) + " = " + str(min(coVals[1])), 1)
-                dCoRating[cokey] = min(coVals[1])
 
+        # Aggregate monthly index values to a single value for each component
+        # Sort depending upon tiebreak setting
+        # Update dictionary with a single index value for each component
+        #
+        # Testing on 2017-11-07 shows that I'm ending up with lower ratings when tiebreak is set High
+        #PrintMsg(" \nNot sure about this sorting code for tiebreaker", 1)
 
-        dFinalRatings = dict()  # final dominant condition. mukey is key
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            # "Higher" (default for flooding and ponding frequency)
+            #PrintMsg(" \nTiebreak High: " + dSDV["tiebreakhighlabel"], 1)
+            for cokey, indexes in dComp.items():
+                val = sorted(indexes, reverse=True)[0]  #original that does not work
+                #val = sorted(indexes, reverse=False)[0]  #test 1
+                dComp[cokey] = val
+        else:
+            #PrintMsg(" \nTiebreak low: " + dSDV["tiebreaklowlabel"], 1)
+            for cokey, indexes in dComp.items():
+                val = sorted(indexes)[0]
+                dComp[cokey] = val
 
-        for mukey, cokeys in dMapunit.items():
-            # accumulate ratings for each mapunit by sum of comppct
-            dMuRatings = dict()  # create a dictionary of values for just this map unit
-            domPct = 0
+        # Save list of component data to each mapunit
+        dRatings = dict()
+
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
 
-            for cokey in cokeys:
-                # look at values for each component within the map unit
-                try:
-                    rating = dCoRating[cokey]
-                    compPct = dComponent[cokey][0]
+            if tieBreaker == dSDV["tiebreakhighlabel"]:
+                # Default for flooding and ponding frequency
+                #
+                #PrintMsg(" \ndomainValues: " + str(domainValues), 1)
 
-                    try:
-                        dMuRatings[rating] += compPct
+                for mukey, cokeys in dMapunit.items():
+                    dRating = dict()   # save sum of comppct for each rating within a mapunit
+                    muVals = list()   # may not need this for DCD
 
-                    except:
-                        dMuRatings[rating] = compPct
+                    for cokey in cokeys:
+                        #PrintMsg("\tB ratingIndx: " + str(dComp[cokey]), 1)
+                        compPct = dCompPct[cokey]
+                        ratingIndx = dComp[cokey]
+                        muVals.append([compPct, ratingIndx])
 
-                except:
-                    pass
+                        # I think this section of code is in effect doing a dominant condition
+                        # Fixed 2017-11-07
+                        #if ratingIndx in dRating:
+                        #    sumPct = dRating[ratingIndx] + compPct
+                        #    dRating[ratingIndx] = sumPct  # this part could be compacted
 
-            if tieBreaker == dSDV["tiebreakhighlabel"]:
-                # This is working correctly for DTWT
-                # Backwards for Ponding
-                highRating = 0
+                        #else:
+                        #    dRating[ratingIndx] = compPct
 
-                for rating, compPct in dMuRatings.items():
-                    # Find the highest
-                    if rating > highRating:
-                        highRating = rating
-                        dFinalRatings[mukey] = [compPct, rating]
-            else:
-                # This is working correctly for DTWT
-                # Backwards for Ponding
-                lowRating = nullRating
+                        # End of bad code
 
-                for rating, compPct in dMuRatings.items():
+                    #for rating, compPct in dRating.items():
+                    #    muVals.append([compPct, rating])
 
-                    if rating < lowRating and rating is not None:
-                        lowRating = rating
-                        dFinalRatings[mukey] = [compPct, rating]
+                    #newVals = sorted(muVals, key = lambda x : (-x[0], x[1]))[0]  # Works for maplegendkey=2
+                    #newVals = sorted(sorted(muVals, key = lambda x : x[0], reverse=True), key = lambda x : x[1], reverse=True)[0]
 
-            del dMuRatings
+                    muVal = SortData(muVals, 0, 1, True, True)
+                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
+                    ocur.insertRow(newrec)
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-            # Write final ratings to output table
-            for mukey in sorted(dMapunit):
+                    if  not newrec[2] is None and not newrec[2] in outputValues:
+                        outputValues.append(newrec[2])
 
-                try:
-                    vals = dFinalRatings[mukey]
+            else:
+                # Lower
+                PrintMsg(" \nFinal lower tiebreaker", 1)
 
-                except:
-                    sumPct = 0
-                    for cokey in dMapunit[mukey]:
+                for mukey, cokeys in dMapunit.items():
+                    dRating = dict()  # save sum of comppct for each rating within a mapunit
+                    muVals = list()   # may not need this for DCD
+
+                    for cokey in cokeys:
                         try:
-                            sumPct += dComponent[cokey][0]
+                            #PrintMsg("\tA ratingIndx: " + str(dComp[cokey]), 1)
+                            compPct = dCompPct[cokey]
+                            ratingIndx = dComp[cokey]
+                            muVals.append([compPct, ratingIndx])
 
                         except:
                             pass
 
-                    vals = [sumPct, nullRating]
+                    muVal = SortData(muVals, 0, 1, True, False)
+                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
+                    ocur.insertRow(newrec)
 
-                rec = mukey, vals[0], vals[1], dAreasym[mukey]
-                ocur.insertRow(rec)
+                    if not newrec[2] is None and not newrec[2] in outputValues:
+                        outputValues.append(newrec[2])
 
-                if not rec[2] is None and not rec[2] in outputValues:
-                    outputValues.append(rec[2])
 
         outputValues.sort()
         return outputTbl, outputValues
@@ -6286,33 +7812,40 @@ def AggregateCo_Mo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBre
         return outputTbl, outputValues
 
 ## ===================================================================================
-def AggregateCo_Mo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
     #
-    # Aggregate mapunit-component data to the map unit level using the dominant condition
-    # based upon the TieBreak rule.
-    # Use this for COMONTH table. Example Depth to Water Table.
+    # Flooding or ponding frequency, dominant condition
     #
-    # It appears that WSS includes 0 percent components in the MinMax. This function
-    # is currently set to duplicate this behavior
+    # Aggregate mapunit-component data to the map unit level using dominant condition.
+    # Use domain values to determine sort order for tiebreaker
     #
-    # Currently there is a problem with the comppct. It ends up being 12X.
+    # Need to modify this function to correctly sum the comppct_r for the final output table.
+
+    # Using global dValues[key = uppercase-domain value] value = [sequence, domain value]
 
     try:
-        #
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
+        #
+        #bVerbose = False
+
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-        whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute dSDV["nullratingreplacementvalue"]
-        #whereClause = "COMPPCT_R >=  " + str(cutOff) + " and not " + dSDV["attributecolumnname"].upper() + " is null"
+
+        if bZero:
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+
+        else:
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
+
+        # initialTbl must be in a file geodatabase to support ORDER_BY
+        # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
         if arcpy.Exists(outputTbl):
@@ -6324,318 +7857,355 @@ def AggregateCo_Mo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreake
         if outputTbl == "":
             return outputTbl, outputValues
 
+        dComp = dict()     # Try replacing this and dCompPct with dCompRating
+        dCompPct = dict()
+        dCompRating = dict()  # Dictionary with cokey as key, tuple(compPct, ratingIndx)
+        
         dMapunit = dict()
-        dComponent = dict()
-        dCoRating = dict()
+        missingDomain = list()
         dAreasym = dict()
+        #dCase = dict()
 
-        #PrintMsg(" \nSQL: " + whereClause, 1)
-        #PrintMsg("Fields: " + str(inFlds), 1)
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        # Read initial table for non-numeric soil properties. Capture domain values and all component ratings.
+        #
+        if not dSDV["attributetype"].lower() == "interpretation" and dSDV["attributelogicaldatatype"].lower() in ["string", "vtext"]:  # Changed here 2016-04-28
+            #
+            # No domain values for non-interp string ratings
+            # !!! Probably never using this section of code.
+            #
+            if bVerbose:
+                PrintMsg((40 * '*'), 1)
+                PrintMsg(" \n*dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
+                PrintMsg("domainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
+                PrintMsg((40 * '*'), 1)
 
-            # MUKEY,COKEY , COMPPCT_R, attribcolumn
-            for rec in cur:
-                #mukey = rec[0]; cokey = rec[1]; compPct = rec[2]; rating = rec[3]
-                mukey, cokey, compPct, rating, areasym = rec
-                if rating is None:
-                    rating = 201
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-                # Save list of cokeys for each mapunit-mukey
-                try:
-                    if not cokey in dMapunit[mukey]:
-                        dMapunit[mukey].append(cokey)
+                if bVerbose:
+                    PrintMsg(" \nReading initial data...", 1)
 
-                except:
-                    dMapunit[mukey] = [cokey]
+                for rec in cur:
+                    # "MUKEY", "COKEY", "COMPPCT_R", RATING
+                    mukey, cokey, compPct, rating, areasym = rec
                     dAreasym[mukey] = areasym
-                    PrintMsg(" \nCheck dAreasymbols setting", 1)
-
-                try:
-                    # if the rating value meets the tiebreak rule, save the rating value along with comppct for each component
-                    #if not rating is None:
-                    if tieBreaker == dSDV["tiebreakhighlabel"]:
-                        if rating > dComponent[cokey][1]:
-                            dComponent[cokey][1] = rating
-
-                    elif rating < dComponent[cokey][1]:
-                        dComponent[cokey][1] = rating
-
-                except:
-                    #  Save rating value along with comppct for each component
-                    if not rating is None:
-                        dComponent[cokey] = [compPct, rating]
-
-        dFinalRatings = dict()  # final dominant condition. mukey is key
-
-        for mukey, cokeys in dMapunit.items():
-            # accumulate ratings for each mapunit by sum of comppct
-            dMuRatings = dict()
-            dMuRatings[mukey] = [None, None]  # create a dictionary of values for just this map unit
-            domPct = 0
+                    #dComp[cokey] = rating
+                    #dCompPct[cokey] = compPct
+                    dCompRating[cokey] = [compPct, rating]
+                    #dCase[str(rating).upper()] = rating  # save original value using uppercase key
 
-            for cokey in cokeys:
-                # look at values for each component within the map unit
-                if cokey in dComponent:
+                    # save list of components for each mapunit
+                    try:
+                        dMapunit[mukey].append(cokey)
 
-                    compPct, rating = dComponent[cokey]
+                    except:
+                        dMapunit[mukey] = [cokey]
 
-                    if compPct > domPct:
-                        domPct = compPct
-                        dMuRatings[mukey] = [compPct, rating]
-                        #PrintMsg("\t" + mukey + ":" + cokey  + ", " + str(compPct) + "%, " + str(rating), 1)
+        elif dSDV["attributelogicaldatatype"].lower() in ["string", "float", "integer", "choice"]:
+            # Interp or numeric soil properties
+            # Flooding and Ponding Frequency would fall in the second section below that has a domain
 
-            dFinalRatings[mukey] = dMuRatings[mukey]
+            if len(domainValues) > 1 and not "None" in domainValues:
+                PrintMsg(" \n******************* Immediately adding 'None' to dValues ****************" , 1)
+                #dValues["<NULL>"] = [len(dValues), None]
+                #domainValues.append("None")
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-            # Write final ratings to output table
-            for mukey in sorted(dFinalRatings):
-                compPct, rating = dFinalRatings[mukey]
-                rec = mukey, compPct, rating, dAreasym[mukey]
-                ocur.insertRow(rec)
+            if bVerbose:
+                PrintMsg(" \n**domainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues) + " \n ", 1)
+                PrintMsg(" \n**dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
 
-                if not rating is None and not rating in outputValues:
-                    outputValues.append(rating)
 
-        outputValues.sort()
-        return outputTbl, outputValues
+            if  dSDV["tiebreakdomainname"] is None:
+                # There are no domain values. We must make sure that the legend values are the same as
+                # the output values.
+                # 
+                PrintMsg(" \nNo domain name for this property", 1)
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+                with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-    except:
-        errorMsg()
-        return outputTbl, outputValues
+                    if bVerbose:
+                        PrintMsg(" \nReading initial data...", 1)
 
+                    for rec in cur:
+                        mukey, cokey, compPct, rating, areasym = rec
+                        dAreasym[mukey] = areasym
+                        # "MUKEY", "COKEY", "COMPPCT_R", RATING
+                        #PrintMsg("\t" + str(rec), 1)
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[mukey].append(cokey)
 
-## ===================================================================================
-def AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    #
-    # Use this function for Flooding or Ponding Frequency which involves the COMONTH table
-    #
-    # Need to modify this so that COMPPCT_R is summed using just one value per component, not 12X.
-    #
-    # We have a case problem with Flooding Frequency Class: 'Very frequent'
-    #
-    # My tests on ND035 appear to return results based upon dominant condition, not dominant component!
-    #
+                        except:
+                            dMapunit[mukey] = [cokey]
 
-    try:
-        # bVerbose = True
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+                        # this is a new component record. create a new dictionary item.
+                        #
+                        if not cokey in dComp:
 
-        #
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+                            if not rating is None:
+                                # dCase[str(rating).upper()] = rating
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
+                                if str(rating).upper() in dValues:
+                                    #if mukey == '2780145':
+                                    #    PrintMsg("\t*Target mapunit rating '" + rating + "' assigning index '" + str(dValues[str(rating).upper()][0]) + "' to dComp", 1)
+                                    #dComp[cokey] = rating
+                                    dValues[str(rating).upper()][1] = rating
+                                    #dCompPct[cokey] = compPct
+                                    dCompRating[cokey] = [compPct, dValues[str(rating).upper()][0]]
 
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+                                    # compare actual rating value to domainValues to make sure case is correct
+                                    #
+                                    # This does not make sense. domainValues must be coming from maplegendxml.
+                                    #
+                                    if not rating in domainValues: # this is a case problem
+                                        # replace the original dValue item
+                                        dValues[str(rating).upper()][1] = rating
 
-        # initialTbl must be in a file geodatabase to support ORDER_BY
-        # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
-        sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
+                                        # replace the value in domainValues list
+                                        for i in range(len(domainValues)):
+                                            if str(domainValues[i]).upper() == str(rating).upper():
+                                                domainValues[i] = rating
 
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+                                else:
+                                    # dValues is keyed on uppercase string rating or is Null
+                                    #
+                                    # Conservation Tree Shrub has some values not found in the domain.
+                                    # How can this be? Need to check with George?
+                                    #
+                                    #PrintMsg("\tdValue not found for: " + str(rec), 1)
+                                    if not str(rating) in missingDomain:
+                                        # Try to add missing value to dDomainValues dict and domainValues list
+                                        #dComp[cokey] = len(dValues)
+                                        dValues[str(rating).upper()] = [len(dValues), rating]
+                                        domainValues.append(rating)
+                                        #domainValuesUp.append(str(rating).upper())
+                                        missingDomain.append(str(rating))
+                                        #dCompPct[cokey] = compPct
+                                        dCompRating[cokey] = [compPct, rating]
+                                                          
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues = list()
+                                        #PrintMsg("\tAdding value '" + str(rating) + "' to domainValues", 1)
 
-        if outputTbl == "":
-            return outputTbl, outputValues
+                            else:
+                                # Rating is Null
+                                #dComp[cokey] = dValues["<Null>"][0]
+                                #dComp[cokey] = rating
+                                #dValues[str(rating).upper()][1] = rating
+                                #dCompPct[cokey] = compPct
+                                dCompRating[cokey] = [compPct, None]
 
-        lastCokey = "xxxx"
-        dComp = dict()
-        dCompPct = dict()
-        dMapunit = dict()
-        missingDomain = list()
-        dCase = dict()
-        dAreasym = dict()
+                                #if mukey == '2780145':
+                                #    PrintMsg("\t***Target mapunit rating '" + rating + "' assigning index '" + str(dValues["<Null>"][0]) + "' to dComp", 1)
 
-        # Read initial table for non-numeric data types
-        # 02-03-2016 Try adding 'choice' to this method to see if it handles Cons. Tree/Shrub better
-        # than the next method. Nope, did not work. Still have case problems.
-        #
-        if dSDV["attributelogicaldatatype"].lower() == "string":
-            PrintMsg(" \n*dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-                for rec in cur:
-                    dAreasym[rec[0]] = rec[4]
-                    rating = rec[3]
 
-                    try:
-                        # capture component ratings as index numbers instead.
-                        dComp[rec[1]].append(dValues[rating.upper()][0])
+            else:
+                # New code for Ponding Frequency which has a domain
+                #
+                #PrintMsg(" \nDomain name for this property: '" + dSDV["tiebreakdomainname"] + "'", 1)
+                #PrintMsg(" \ndomainValues: " + str(domainValues) + " \n ", 1)
+                #PrintMsg(" \ndValues: " + str(dValues), 1)
 
-                    except:
-                        dComp[rec[1]] = [dValues[rating.upper()][0]]
-                        dCompPct[rec[1]] = rec[2]
-                        dCase[rating.upper()] = rating  # save original value using uppercase key
+                if tieBreaker == dSDV["tiebreakhighlabel"]:
+                    
+                    with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                        if bVerbose:
+                            PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
 
+                        for rec in cur:
+                            mukey, cokey, compPct, ratingClass, areasym = rec
+                            #mukey = int(mukey)
+                            #cokey = int(cokey)
+                            dAreasym[mukey] = areasym
 
-                        # save list of components for each mapunit
-                        try:
-                            dMapunit[rec[0]].append(rec[1])
+                            if not ratingClass is None:
 
-                        except:
-                            dMapunit[rec[0]] = [rec[1]]
+                                # Get the rating sequence number from the ordered domain
+                                try:
+                                    ratingIndx = dValues[str(ratingClass).upper()][0]
 
-        elif dSDV["attributelogicaldatatype"].lower() in ["float", "integer", "choice"]:
+                                    # this is a new component record. create a new dictionary item.
+                                    #
+                                    if not cokey in dCompRating:
+                                        # save list of components for each mapunit
+                                        dCompRating[cokey] = [compPct, ratingIndx]
+                                        
+                                        try:
+                                            # existing mapunit
+                                            dMapunit[mukey].append(cokey)
 
-            PrintMsg(" \n**dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
+                                        except:
+                                            # new mapunit
+                                            dMapunit[mukey] = [cokey]
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                                    else:
+                                        # other months for this component
+                                        # if this new index is greater than the old one, keep  it
+                                        oldIndx = dCompRating[cokey][1]
+                                        
+                                        if oldIndx < ratingIndx:
+                                            dCompRating[cokey][1] = ratingIndx
 
-                for rec in cur:
-                    dAreasym[rec[0]] = rec[4]
-                    rating = rec[3]
+                                except KeyError:
+                                    # encountered value that is not a member of the domain
+                                    # Example: "Common" is obsolete value in the Ponding Frequency Class
+                                    pass
 
-                    try:
-                        # capture component ratings as index numbers instead
-                        if rating is None:
-                            dComp[rec[1]].append(dValues["<Null>"][0])
+                                    
+                elif tieBreaker == dSDV["tiebreaklowlabel"]:
 
-                        else:
-                            dComp[rec[1]].append(dValues[rating.upper()][0])
+                    with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                        if bVerbose:
+                            PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
 
-                    except:
-                        #PrintMsg(" \ndomainValues is empty, but legendValues has " + str(legendValues), 1)
-                        dCase[rating.upper()] = rating
+                        for rec in cur:
+                            mukey, cokey, compPct, ratingClass, areasym = rec
+                            #mukey = int(mukey)
+                            #cokey = int(cokey)
+                            dAreasym[mukey] = areasym
 
-                        if rating.upper() in dValues:
-                            dComp[rec[1]] = [dValues[rating.upper()][0]]
-                            dCompPct[rec[1]] = rec[2]
+                            if not ratingClass is None:
 
-                            # compare actual rating value to domainValues to make sure case is correct
-                            if not rating in domainValues: # this is a case problem
-                                # replace the original dValue item
-                                dValues[rating.upper()][1] = rating
+                                # Get the rating sequence number from the ordered domain
+                                try:
+                                    ratingIndx = dValues[str(ratingClass).upper()][0]
 
-                                # replace the value in domainValues list
-                                for i in range(len(domainValues)):
-                                    if domainValues[i].upper() == rating.upper():
-                                        domainValues[i] = rating
+                                    # this is a new component record. create a new dictionary item.
+                                    #
+                                    if not cokey in dCompRating:
+                                        # save list of components for each mapunit
+                                        dCompRating[cokey] = [compPct, ratingIndx]
+                                        
+                                        try:
+                                            # existing mapunit
+                                            dMapunit[mukey].append(cokey)
 
-                        else:
-                            # dValues is keyed on uppercase string rating
-                            #
-                            if not rating in missingDomain:
-                                # Try to add missing value to dDomainValues dict and domainValues list
-                                dValues[rating.upper()] = [len(dValues), rating]
-                                #domainValues.append(rating])
-                                #domainValuesUp.append(rating.upper()
-                                #missingDomain.append(rating)
-                                PrintMsg("\tAdding value '" + str(rating) + "' to domainValues", 1)
+                                        except:
+                                            # new mapunit
+                                            dMapunit[mukey] = [cokey]
 
-                        # save list of components for each mapunit
-                        try:
-                            dMapunit[rec[0]].append(rec[1])
+                                    else:
+                                        # other months for this component
+                                        # if this new index is greater than the old one, keep  it
+                                        oldIndx = dCompRating[cokey][1]
+                                        
+                                        if oldIndx > ratingIndx:
+                                            dCompRating[cokey][1] = ratingIndx
 
-                        except:
-                            dMapunit[rec[0]] = [rec[1]]
+                                except KeyError:
+                                    # encountered value that is not a member of the domain
+                                    # Example: "Common" is obsolete value in the Ponding Frequency Class
+                                    pass
+                    
 
         else:
-            PrintMsg(" \nProblem with handling domain values of type '" + dSDV["attributelogicaldatatype"] + "'", 1)
-
+            raise MyError, "Problem with handling domain values of type '" + dSDV["attributelogicaldatatype"]
 
-        # Aggregate monthly index values to a single value for each component
+        # Aggregate monthly index values to a single value for each component??? Would it not be better to
+        # create a new function for COMONTH-DCD? Then I could simplify this function.
+        #
         # Sort depending upon tiebreak setting
         # Update dictionary with a single index value for each component
-        #
-        # Testing on 2017-11-07 shows that I'm ending up with lower ratings when tiebreak is set High
-        #PrintMsg(" \nNot sure about this sorting code for tiebreaker", 1)
+        #if not dSDV["attributelogicaldatatype"].lower() in ["string", "vText"]:
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            # "Higher" (default for flooding and ponding frequency)
-            #PrintMsg(" \nTiebreak High: " + dSDV["tiebreakhighlabel"], 1)
-            for cokey, indexes in dComp.items():
-                val = sorted(indexes, reverse=True)[0]  #original that does not work
-                #val = sorted(indexes, reverse=False)[0]  #test 1
-                dComp[cokey] = val
-        else:
-            #PrintMsg(" \nTiebreak low: " + dSDV["tiebreaklowlabel"], 1)
-            for cokey, indexes in dComp.items():
-                val = sorted(indexes)[0]
-                dComp[cokey] = val
+        if bVerbose:
+            PrintMsg(" \nAggregating to a single value per component which would generally only apply to COMONTH properties?", 1)
 
-        # Save list of component data to each mapunit
-        dRatings = dict()
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+        # Save list of component rating data to each mapunit, sort and write out
+        # a single map unit rating
+        #
+        dRatings = dict()
 
-            if tieBreaker == dSDV["tiebreakhighlabel"]:
-                # Default for flooding and ponding frequency
-                #
-                #PrintMsg(" \ndomainValues: " + str(domainValues), 1)
+        if bVerbose:
+            PrintMsg(" \nWriting map unit rating data to final output table", 1)
+            PrintMsg(" \nUsing tiebreaker '" + tieBreaker + "' (where choices are " + dSDV["tiebreaklowlabel"] + " or " + dSDV["tiebreakhighlabel"] + ")", 1)
+
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
 
                 for mukey, cokeys in dMapunit.items():
-                    dRating = dict()   # save sum of comppct for each rating within a mapunit
+                    # Since this is COMONTH data, each cokey could be listed 12X.
+                    dRating = dict()  # save sum of comppct for each rating within a mapunit
                     muVals = list()   # may not need this for DCD
 
                     for cokey in cokeys:
-                        #PrintMsg("\tB ratingIndx: " + str(dComp[cokey]), 1)
-                        compPct = dCompPct[cokey]
-                        ratingIndx = dComp[cokey]
-                        muVals.append([compPct, ratingIndx])
-
-                        # I think this section of code is in effect doing a dominant condition
-                        # Fixed 2017-11-07
-                        #if ratingIndx in dRating:
-                        #    sumPct = dRating[ratingIndx] + compPct
-                        #    dRating[ratingIndx] = sumPct  # this part could be compacted
 
-                        #else:
-                        #    dRating[ratingIndx] = compPct
+                        compPct, ratingIndx = dCompRating[cokey]
+                            
+                        if ratingIndx in dRating:
+                            dRating[ratingIndx] += compPct
 
-                        # End of bad code
+                        else:
+                            dRating[ratingIndx] = compPct
+                        
+                    for ratingIndx, compPct in dRating.items():
+                        muVals.append([compPct, ratingIndx])
 
-                    #for rating, compPct in dRating.items():
-                    #    muVals.append([compPct, rating])
+                    if len(muVals) > 0:
+                        #This is the final aggregation from component to map unit rating
+                        muVal = SortData(muVals, 0, 1, True, True)  # high
+                        #muVal = SortData(muVals, 0, 1, True, False) # low
+                        del dRating
 
-                    #newVals = sorted(muVals, key = lambda x : (-x[0], x[1]))[0]  # Works for maplegendkey=2
-                    #newVals = sorted(sorted(muVals, key = lambda x : x[0], reverse=True), key = lambda x : x[1], reverse=True)[0]
+                        try:
+                            # Get final rating class value using index
+                            ratingClass = domainValues[muVal[1]]
+                            compPct = muVal[0]
 
-                    muVal = SortData(muVals, 0, 1, True, True)
-                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
-                    ocur.insertRow(newrec)
+                        except:
+                            raise MyError, "Failed to get rating for muVals: " + str(muVals)
+                        
+                        newrec = [mukey, compPct, ratingClass, dAreasym[mukey]]
+                        ocur.insertRow(newrec)
 
-                    if  not newrec[2] is None and not newrec[2] in outputValues:
-                        outputValues.append(newrec[2])
+                        if not ratingClass is None and not ratingClass in outputValues:
+                            outputValues.append(ratingClass)
 
-            else:
-                # Lower
-                PrintMsg(" \nFinal lower tiebreaker", 1)
+        elif tieBreaker == dSDV["tiebreaklowlabel"]:
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
 
                 for mukey, cokeys in dMapunit.items():
+                    # Since this is COMONTH data, each cokey could be listed 12X.
                     dRating = dict()  # save sum of comppct for each rating within a mapunit
                     muVals = list()   # may not need this for DCD
 
                     for cokey in cokeys:
-                        try:
-                            #PrintMsg("\tA ratingIndx: " + str(dComp[cokey]), 1)
-                            compPct = dCompPct[cokey]
-                            ratingIndx = dComp[cokey]
-                            muVals.append([compPct, ratingIndx])
 
-                        except:
-                            pass
+                        compPct, ratingIndx = dCompRating[cokey]
+                            
+                        if ratingIndx in dRating:
+                            dRating[ratingIndx] += compPct
 
-                    muVal = SortData(muVals, 0, 1, True, False)
-                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
-                    ocur.insertRow(newrec)
+                        else:
+                            dRating[ratingIndx] = compPct
+                        
+                    for ratingIndx, compPct in dRating.items():
+                        muVals.append([compPct, ratingIndx])
 
-                    if not newrec[2] is None and not newrec[2] in outputValues:
-                        outputValues.append(newrec[2])
+                    if len(muVals) > 0:
+                        #This is the final aggregation from component to map unit rating
+                        muVal = SortData(muVals, 0, 1, True, False) # low
+                        del dRating
+
+                        try:
+                            # Get final rating class value using index
+                            ratingClass = domainValues[muVal[1]]
+                            compPct = muVal[0]
+
+                        except:
+                            raise MyError, "Failed to get rating for muVals: " + str(muVals)
+                        
+                        newrec = [mukey, compPct, ratingClass, dAreasym[mukey]]
+                        ocur.insertRow(newrec)
 
+                        if not ratingClass is None and not ratingClass in outputValues:
+                            outputValues.append(ratingClass)
 
+        del dComp
+        del dCompPct
+        del dAreasym
         outputValues.sort()
         return outputTbl, outputValues
 
@@ -6648,40 +8218,41 @@ def AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, ti
         return outputTbl, outputValues
 
 ## ===================================================================================
-def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+def AggregateCo_Mo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
     #
-    # Flooding or ponding frequency, dominant condition
+    # Aggregate monthly depth to water table to the map unit level using a special type
+    # of Weighted average.
     #
-    # Aggregate mapunit-component data to the map unit level using dominant condition.
-    # Use domain values to determine sort order for tiebreaker
+    # Web Soil Survey takes only the Lowest or Highest of the monthly values from
+    # each component and calculates the weighted average of those.
     #
-    # Need to modify this function to correctly sum the comppct_r for the final output table.
-
-    # Using global dValues[key = uppercase-domain value] value = [sequence, domain value]
 
     try:
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-
         #
-        #bVerbose = False
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
+        #attribcolumn = dSDV["attributecolumnname"].upper()
+        #resultcolumn = dSDV["resultcolumnname"].upper()
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-        if bZero:
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+        
+        #whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute dSDV["nullratingreplacementvalue"]
 
-        else:
+        if bZero:
+            #PrintMsg(" \nIncluding components with null rating values...", 1)
             whereClause = "COMPPCT_R >=  " + str(cutOff)
 
-        # initialTbl must be in a file geodatabase to support ORDER_BY
-        # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
+        else:
+            #PrintMsg(" \nSkipping components with null rating values...", 1)
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+        
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
         if arcpy.Exists(outputTbl):
@@ -6693,355 +8264,229 @@ def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, ti
         if outputTbl == "":
             return outputTbl, outputValues
 
-        dComp = dict()     # Try replacing this and dCompPct with dCompRating
-        dCompPct = dict()
-        dCompRating = dict()  # Dictionary with cokey as key, tuple(compPct, ratingIndx)
-        
         dMapunit = dict()
-        missingDomain = list()
+        dComponent = dict()
+        dCoRating = dict()
         dAreasym = dict()
-        #dCase = dict()
-
-        # Read initial table for non-numeric soil properties. Capture domain values and all component ratings.
-        #
-        if not dSDV["attributetype"].lower() == "interpretation" and dSDV["attributelogicaldatatype"].lower() in ["string", "vtext"]:  # Changed here 2016-04-28
-            #
-            # No domain values for non-interp string ratings
-            # !!! Probably never using this section of code.
-            #
-            if bVerbose:
-                PrintMsg((40 * '*'), 1)
-                PrintMsg(" \n*dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
-                PrintMsg("domainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
-                PrintMsg((40 * '*'), 1)
-
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-
-                if bVerbose:
-                    PrintMsg(" \nReading initial data...", 1)
-
-                for rec in cur:
-                    # "MUKEY", "COKEY", "COMPPCT_R", RATING
-                    mukey, cokey, compPct, rating, areasym = rec
-                    dAreasym[mukey] = areasym
-                    #dComp[cokey] = rating
-                    #dCompPct[cokey] = compPct
-                    dCompRating[cokey] = [compPct, rating]
-                    #dCase[str(rating).upper()] = rating  # save original value using uppercase key
-
-                    # save list of components for each mapunit
-                    try:
-                        dMapunit[mukey].append(cokey)
-
-                    except:
-                        dMapunit[mukey] = [cokey]
-
-        elif dSDV["attributelogicaldatatype"].lower() in ["string", "float", "integer", "choice"]:
-            # Interp or numeric soil properties
-            # Flooding and Ponding Frequency would fall in the second section below that has a domain
-
-            if len(domainValues) > 1 and not "None" in domainValues:
-                PrintMsg(" \n******************* Immediately adding 'None' to dValues ****************" , 1)
-                #dValues["<NULL>"] = [len(dValues), None]
-                #domainValues.append("None")
-
-            if bVerbose:
-                PrintMsg(" \n**domainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues) + " \n ", 1)
-                PrintMsg(" \n**dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
-
-
-            if  dSDV["tiebreakdomainname"] is None:
-                # There are no domain values. We must make sure that the legend values are the same as
-                # the output values.
-                # 
-                PrintMsg(" \nNo domain name for this property", 1)
-
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-
-                    if bVerbose:
-                        PrintMsg(" \nReading initial data...", 1)
-
-                    for rec in cur:
-                        mukey, cokey, compPct, rating, areasym = rec
-                        dAreasym[mukey] = areasym
-                        # "MUKEY", "COKEY", "COMPPCT_R", RATING
-                        #PrintMsg("\t" + str(rec), 1)
-                        # save list of components for each mapunit
-                        try:
-                            dMapunit[mukey].append(cokey)
-
-                        except:
-                            dMapunit[mukey] = [cokey]
-
-                        # this is a new component record. create a new dictionary item.
-                        #
-                        if not cokey in dComp:
-
-                            if not rating is None:
-                                # dCase[str(rating).upper()] = rating
-
-                                if str(rating).upper() in dValues:
-                                    #if mukey == '2780145':
-                                    #    PrintMsg("\t*Target mapunit rating '" + rating + "' assigning index '" + str(dValues[str(rating).upper()][0]) + "' to dComp", 1)
-                                    #dComp[cokey] = rating
-                                    dValues[str(rating).upper()][1] = rating
-                                    #dCompPct[cokey] = compPct
-                                    dCompRating[cokey] = [compPct, dValues[str(rating).upper()][0]]
-
-                                    # compare actual rating value to domainValues to make sure case is correct
-                                    #
-                                    # This does not make sense. domainValues must be coming from maplegendxml.
-                                    #
-                                    if not rating in domainValues: # this is a case problem
-                                        # replace the original dValue item
-                                        dValues[str(rating).upper()][1] = rating
-
-                                        # replace the value in domainValues list
-                                        for i in range(len(domainValues)):
-                                            if str(domainValues[i]).upper() == str(rating).upper():
-                                                domainValues[i] = rating
-
-
-                                else:
-                                    # dValues is keyed on uppercase string rating or is Null
-                                    #
-                                    # Conservation Tree Shrub has some values not found in the domain.
-                                    # How can this be? Need to check with George?
-                                    #
-                                    #PrintMsg("\tdValue not found for: " + str(rec), 1)
-                                    if not str(rating) in missingDomain:
-                                        # Try to add missing value to dDomainValues dict and domainValues list
-                                        #dComp[cokey] = len(dValues)
-                                        dValues[str(rating).upper()] = [len(dValues), rating]
-                                        domainValues.append(rating)
-                                        #domainValuesUp.append(str(rating).upper())
-                                        missingDomain.append(str(rating))
-                                        #dCompPct[cokey] = compPct
-                                        dCompRating[cokey] = [compPct, rating]
-                                                          
 
-                                        #PrintMsg("\tAdding value '" + str(rating) + "' to domainValues", 1)
+        #PrintMsg(" \nSQL: " + whereClause, 1)
+        #PrintMsg("Fields: " + str(inFlds), 1)
 
-                            else:
-                                # Rating is Null
-                                #dComp[cokey] = dValues["<Null>"][0]
-                                #dComp[cokey] = rating
-                                #dValues[str(rating).upper()][1] = rating
-                                #dCompPct[cokey] = compPct
-                                dCompRating[cokey] = [compPct, None]
+        with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-                                #if mukey == '2780145':
-                                #    PrintMsg("\t***Target mapunit rating '" + rating + "' assigning index '" + str(dValues["<Null>"][0]) + "' to dComp", 1)
+            # MUKEY,COKEY , COMPPCT_R, attribcolumn
+            for rec in cur:
 
+                mukey, cokey, compPct, rating, areasym = rec
+                dAreasym[mukey] = areasym
 
+                # Save list of cokeys for each mapunit
+                try:
+                    if not cokey in dMapunit[mukey]:
+                        dMapunit[mukey].append(cokey)
 
+                except:
+                    dMapunit[mukey] = [cokey]
 
-            else:
-                # New code for Ponding Frequency which has a domain
-                #
-                #PrintMsg(" \nDomain name for this property: '" + dSDV["tiebreakdomainname"] + "'", 1)
-                #PrintMsg(" \ndomainValues: " + str(domainValues) + " \n ", 1)
-                #PrintMsg(" \ndValues: " + str(dValues), 1)
+                try:
+                    # Save list of rating values along with comppct for each component
+                    if not rating is None:
+                        dComponent[cokey][1].append(rating)
 
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    
-                    with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-                        if bVerbose:
-                            PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
+                except:
+                    #  Save list of rating values along with comppct for each component
+                    if not rating is None:
+                        dComponent[cokey] = [compPct, [rating]]
 
-                        for rec in cur:
-                            mukey, cokey, compPct, ratingClass, areasym = rec
-                            #mukey = int(mukey)
-                            #cokey = int(cokey)
-                            dAreasym[mukey] = areasym
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            # This is working correctly for DepthToWaterTable
 
-                            if not ratingClass is None:
+            # Identify highest value for each component
+            for cokey, coVals in dComponent.items():
+                # Find highest monthly value for each component
+                #PrintMsg("Higher values for cokey " + cokey + ": " + str(coVals[1]) + " = " + str(max(coVals[1])), 1)
+                dCoRating[cokey] = max(coVals[1])
 
-                                # Get the rating sequence number from the ordered domain
-                                try:
-                                    ratingIndx = dValues[str(ratingClass).upper()][0]
+        else:
+            # This is working correctly for DepthToWaterTable
 
-                                    # this is a new component record. create a new dictionary item.
-                                    #
-                                    if not cokey in dCompRating:
-                                        # save list of components for each mapunit
-                                        dCompRating[cokey] = [compPct, ratingIndx]
-                                        
-                                        try:
-                                            # existing mapunit
-                                            dMapunit[mukey].append(cokey)
+            # Identify lowest monthly value for each component
+            for cokey, coVals in dComponent.items():
+                # Find low rating value for each component
+                #PrintMsg("Lower values for cokey " + cokey + ": " + str(coVals[1]) + " = " + str(min(coVals[1])), 1)
+                dCoRating[cokey] = min(coVals[1])
 
-                                        except:
-                                            # new mapunit
-                                            dMapunit[mukey] = [cokey]
+        dFinalRatings = dict()  # final dominant condition. mukey is key
 
-                                    else:
-                                        # other months for this component
-                                        # if this new index is greater than the old one, keep  it
-                                        oldIndx = dCompRating[cokey][1]
-                                        
-                                        if oldIndx < ratingIndx:
-                                            dCompRating[cokey][1] = ratingIndx
+        for mukey, cokeys in dMapunit.items():
+            # accumulate ratings for each mapunit by sum of comppct
+            #dMuRatings = dict()  # create a dictionary of values for just this map unit
+            muPct = 0
+            muRating = None
 
-                                except KeyError:
-                                    # encountered value that is not a member of the domain
-                                    # Example: "Common" is obsolete value in the Ponding Frequency Class
-                                    pass
+            for cokey in cokeys:
+                # look at values for each component within the map unit
+                try:
+                    rating = dCoRating[cokey]
+                    compPct = dComponent[cokey][0]
+                    muPct += compPct
 
-                                    
-                elif tieBreaker == dSDV["tiebreaklowlabel"]:
+                    if not rating is None:
+                      # accumulate product of depth and component percent
+                      try:
+                          muRating += (compPct * rating)
 
-                    with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-                        if bVerbose:
-                            PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
+                      except:
+                          muRating = compPct * rating
 
-                        for rec in cur:
-                            mukey, cokey, compPct, ratingClass, areasym = rec
-                            #mukey = int(mukey)
-                            #cokey = int(cokey)
-                            dAreasym[mukey] = areasym
+                except:
+                    pass
 
-                            if not ratingClass is None:
+            # Calculate weighted mapunit value from sum of products
+            if not muRating is None:
+                muRating = muRating / float(muPct)
 
-                                # Get the rating sequence number from the ordered domain
-                                try:
-                                    ratingIndx = dValues[str(ratingClass).upper()][0]
+            dFinalRatings[mukey] = [muPct, muRating]
 
-                                    # this is a new component record. create a new dictionary item.
-                                    #
-                                    if not cokey in dCompRating:
-                                        # save list of components for each mapunit
-                                        dCompRating[cokey] = [compPct, ratingIndx]
-                                        
-                                        try:
-                                            # existing mapunit
-                                            dMapunit[mukey].append(cokey)
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            # Write final ratings to output table
+            for mukey in sorted(dMapunit):
+                compPct, rating = dFinalRatings[mukey]
+                rec = mukey, compPct, rating, dAreasym[mukey]
+                ocur.insertRow(rec)
 
-                                        except:
-                                            # new mapunit
-                                            dMapunit[mukey] = [cokey]
+                if not rating is None and not rating in outputValues:
+                    outputValues.append(rating)
 
-                                    else:
-                                        # other months for this component
-                                        # if this new index is greater than the old one, keep  it
-                                        oldIndx = dCompRating[cokey][1]
-                                        
-                                        if oldIndx > ratingIndx:
-                                            dCompRating[cokey][1] = ratingIndx
+        outputValues.sort()
+        return outputTbl, outputValues
 
-                                except KeyError:
-                                    # encountered value that is not a member of the domain
-                                    # Example: "Common" is obsolete value in the Ponding Frequency Class
-                                    pass
-                    
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
 
-        else:
-            raise MyError, "Problem with handling domain values of type '" + dSDV["attributelogicaldatatype"]
+    except:
+        errorMsg()
+        return outputTbl, outputValues
 
-        # Aggregate monthly index values to a single value for each component??? Would it not be better to
-        # create a new function for COMONTH-DCD? Then I could simplify this function.
+## ===================================================================================
+def AggregateCo_WTA_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    #
+
+    try:
         #
-        # Sort depending upon tiebreak setting
-        # Update dictionary with a single index value for each component
-        #if not dSDV["attributelogicaldatatype"].lower() in ["string", "vText"]:
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+
+        #PrintMsg(" \nTesting nullRating variable: " + str(nullRating), 1)
 
         if bVerbose:
-            PrintMsg(" \nAggregating to a single value per component which would generally only apply to COMONTH properties?", 1)
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-        # Save list of component rating data to each mapunit, sort and write out
-        # a single map unit rating
-        #
-        dRatings = dict()
+        if bZero:
+            #PrintMsg(" \nIncluding components with null rating values...", 1)
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
 
-        if bVerbose:
-            PrintMsg(" \nWriting map unit rating data to final output table", 1)
-            PrintMsg(" \nUsing tiebreaker '" + tieBreaker + "' (where choices are " + dSDV["tiebreaklowlabel"] + " or " + dSDV["tiebreakhighlabel"] + ")", 1)
+        else:
+            #PrintMsg(" \nSkipping components with null rating values...", 1)
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+            
+        sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-                for mukey, cokeys in dMapunit.items():
-                    # Since this is COMONTH data, each cokey could be listed 12X.
-                    dRating = dict()  # save sum of comppct for each rating within a mapunit
-                    muVals = list()   # may not need this for DCD
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+        outputValues = list()
 
-                    for cokey in cokeys:
+        if outputTbl == "":
+            return outputTbl, outputValues
 
-                        compPct, ratingIndx = dCompRating[cokey]
-                            
-                        if ratingIndx in dRating:
-                            dRating[ratingIndx] += compPct
+        dMapunit = dict()
+        dComponent = dict()
+        dCoRating = dict()
+        dAreasym = dict()
 
-                        else:
-                            dRating[ratingIndx] = compPct
-                        
-                    for ratingIndx, compPct in dRating.items():
-                        muVals.append([compPct, ratingIndx])
+        with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-                    if len(muVals) > 0:
-                        #This is the final aggregation from component to map unit rating
-                        muVal = SortData(muVals, 0, 1, True, True)  # high
-                        #muVal = SortData(muVals, 0, 1, True, False) # low
-                        del dRating
+            # MUKEY,COKEY , COMPPCT_R, attribcolumn
+            for rec in cur:
+                #mukey = rec[0]
+                #cokey = rec[1]
+                #compPct = rec[2]
+                #rating = rec[3]
+                mukey, cokey, compPct, rating, areasym = rec
 
-                        try:
-                            # Get final rating class value using index
-                            ratingClass = domainValues[muVal[1]]
-                            compPct = muVal[0]
+                dAreasym[mukey] = areasym
+
+                if rating is None:
+                    rating = nullRating
+
+                # Save list of cokeys for each mukey
+                try:
+                    if not cokey in dMapunit[mukey]:
+                        dMapunit[mukey].append(cokey)
+
+                except:
+                    dMapunit[mukey] = [cokey]
+
+                try:
+                    # Save list of rating values along with comppct for each component
+                    dComponent[cokey][1].append(rating)
 
-                        except:
-                            raise MyError, "Failed to get rating for muVals: " + str(muVals)
-                        
-                        newrec = [mukey, compPct, ratingClass, dAreasym[mukey]]
-                        ocur.insertRow(newrec)
+                except:
+                    #  Save list of rating values along with comppct for each component
+                    dComponent[cokey] = [compPct, [rating]]
 
-                        if not ratingClass is None and not ratingClass in outputValues:
-                            outputValues.append(ratingClass)
 
-        elif tieBreaker == dSDV["tiebreaklowlabel"]:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            for cokey, coVals in dComponent.items():
+                # Find high value for each component
+                dCoRating[cokey] = max(coVals[1])
 
-                for mukey, cokeys in dMapunit.items():
-                    # Since this is COMONTH data, each cokey could be listed 12X.
-                    dRating = dict()  # save sum of comppct for each rating within a mapunit
-                    muVals = list()   # may not need this for DCD
+        else:
+            for cokey, coVals in dComponent.items():
+                # Find low value for each component
+                dCoRating[cokey] = min(coVals[1])
 
-                    for cokey in cokeys:
+        dFinalRatings = dict()  # final dominant condition. mukey is key
 
-                        compPct, ratingIndx = dCompRating[cokey]
-                            
-                        if ratingIndx in dRating:
-                            dRating[ratingIndx] += compPct
+        for mukey, cokeys in dMapunit.items():
+            # accumulate ratings for each mapunit by sum of comppct
+            sumPct = 0
+            muProd = 0
 
-                        else:
-                            dRating[ratingIndx] = compPct
-                        
-                    for ratingIndx, compPct in dRating.items():
-                        muVals.append([compPct, ratingIndx])
+            for cokey in cokeys:
+                # look at values for each component within the map unit
+                rating = dCoRating[cokey]
+                compPct = dComponent[cokey][0]
 
-                    if len(muVals) > 0:
-                        #This is the final aggregation from component to map unit rating
-                        muVal = SortData(muVals, 0, 1, True, False) # low
-                        del dRating
+                #if rating != nullRating:
+                if not rating is None:
+                    # Don't include the 201 (originally null) depths in the WTA calculation
+                    sumPct += compPct            # sum comppct for the mapunit
+                    muProd += (rating * compPct)   # calculate product of component percent and component rating
 
-                        try:
-                            # Get final rating class value using index
-                            ratingClass = domainValues[muVal[1]]
-                            compPct = muVal[0]
+            if sumPct > 0:
+                dFinalRatings[mukey] = [sumPct, round(float(muProd) / sumPct)]
 
-                        except:
-                            raise MyError, "Failed to get rating for muVals: " + str(muVals)
-                        
-                        newrec = [mukey, compPct, ratingClass, dAreasym[mukey]]
-                        ocur.insertRow(newrec)
+            else:
+                # now replace the nulls with 201
+                dFinalRatings[mukey] = [100, nullRating]
 
-                        if not ratingClass is None and not ratingClass in outputValues:
-                            outputValues.append(ratingClass)
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            # Write final ratings to output table
+            for mukey, vals in dFinalRatings.items():
+                rec = mukey, vals[0], vals[1], dAreasym[mukey]
+                ocur.insertRow(rec)
+
+                if not vals[1] is None and not vals[1] in outputValues:
+                    outputValues.append(vals[1])
 
-        del dComp
-        del dCompPct
-        del dAreasym
         outputValues.sort()
         return outputTbl, outputValues
 
@@ -7053,34 +8498,52 @@ def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, ti
         errorMsg()
         return outputTbl, outputValues
 
+
 ## ===================================================================================
-def AggregateCo_Mo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
     #
-    # Aggregate monthly depth to water table to the map unit level using a special type
-    # of Weighted average.
+    # Flooding or ponding frequency, dominant condition
     #
-    # Web Soil Survey takes only the Lowest or Highest of the monthly values from
-    # each component and calculates the weighted average of those.
+    # Aggregate mapunit-component data to the map unit level using dominant condition.
+    # Use domain values to determine sort order for tiebreaker
+    #
+    # Problem with domain values for some indexes which are numeric. Need to accomodate for
+    # domain key values which cannot be 'uppercased'.
+    #
+    # Some domain values are not found in the data and vise versa.
+    #
+    # Bad problem 2016-06-08.
+    # Noticed that my final rating table may contain multiple ratings (tiebreak) for a map unit. This creates
+    # a funky join that may display a different map color than the Identify value shows for the polygon. NIRRCAPCLASS.
+    # Added areasymbol to output
+    #
+    # Conservation Tree and Shrub group are located in the component table
+    # This has domain values and component values which are all lowercase
+    # The maplegendxml is all uppercase
+    #
+    # I think I need to loop through each output value from the table, find the UPPER match and
+    # then alter the legend value and label to match the output value.
+    #
+    # Nov 2017 problem noticed with Irrigated Capability Class where null values are not used
+    # as the dominant condition. Fixed.
     #
 
     try:
-        #
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
+        #
+        #bVerbose = True
+
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-        
-        #whereClause = "COMPPCT_R >=  " + str(cutOff)  # Leave in NULLs and try to substitute dSDV["nullratingreplacementvalue"]
-
+        # Default setting is to include Null values as part of the aggregation process
         if bZero:
             #PrintMsg(" \nIncluding components with null rating values...", 1)
             whereClause = "COMPPCT_R >=  " + str(cutOff)
@@ -7088,7 +8551,9 @@ def AggregateCo_Mo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreake
         else:
             #PrintMsg(" \nSkipping components with null rating values...", 1)
             whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-        
+
+        # initialTbl must be in a file geodatabase to support ORDER_BY
+        # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
         if arcpy.Exists(outputTbl):
@@ -7098,230 +8563,343 @@ def AggregateCo_Mo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreake
         outputValues = list()
 
         if outputTbl == "":
+            #PrintMsg("\nCreateOutputTable returned nothing", 1)
             return outputTbl, outputValues
 
+        lastCokey = "xxxx"
+        dComp = dict()
+        dCompPct = dict()
         dMapunit = dict()
-        dComponent = dict()
-        dCoRating = dict()
+        missingDomain = list()
         dAreasym = dict()
+        dCase = dict()
 
-        #PrintMsg(" \nSQL: " + whereClause, 1)
-        #PrintMsg("Fields: " + str(inFlds), 1)
+        # PrintMsg(" \ntiebreakdomainname: " + str(dSDV["tiebreakdomainname"]), 1)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        # Read initial table for non-numeric data types. Capture domain values and all component ratings.
+        #
+        if bVerbose:
+            PrintMsg(" \nReading initial data...", 1)
+            PrintMsg(whereClause, 1)
+            initCnt = SDVCount(initialTbl)
+            PrintMsg("\nInput table contains " + Number_Format(initCnt, 0, True) + " records", 1)
+            PrintMsg("Data is from " + dSDV["attributecolumnname"].upper() + " column", 1)
+            PrintMsg(dSDV["attributetype"] + " attribute logical data type: " + dSDV["attributelogicaldatatype"].lower(), 1)
 
-            # MUKEY,COKEY , COMPPCT_R, attribcolumn
-            for rec in cur:
+        if not dSDV["attributetype"].lower() == "interpretation" and dSDV["attributelogicaldatatype"].lower() in ["string", "vtext"]:  # Changed here 2016-04-28
+            # No domain values for non-interp string ratings
+            # Probably not using this section of code.
+            #
+            if bVerbose:
+                PrintMsg(" \n" + dSDV["attributetype"] + " values for " + dSDV["attributelogicaldatatype"] + " data type: " + str(dValues), 1)
+                PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
 
-                mukey, cokey, compPct, rating, areasym = rec
-                dAreasym[mukey] = areasym
 
-                # Save list of cokeys for each mapunit
-                try:
-                    if not cokey in dMapunit[mukey]:
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+
+                for rec in cur:
+                    # "MUKEY", "COKEY", "COMPPCT_R", RATING
+                    # PrintMsg("\t" + str(rec), 1)
+                    mukey, cokey, compPct, rating, areasym = rec
+                    dAreasym[mukey] = areasym
+                    dComp[cokey] = rating
+                    dCompPct[cokey] = compPct
+                    dCase[str(rating).upper()] = rating  # save original value using uppercase key
+
+                    # save list of components for each mapunit
+                    try:
                         dMapunit[mukey].append(cokey)
 
-                except:
-                    dMapunit[mukey] = [cokey]
+                    except:
+                        dMapunit[mukey] = [cokey]
 
-                try:
-                    # Save list of rating values along with comppct for each component
-                    if not rating is None:
-                        dComponent[cokey][1].append(rating)
+        elif dSDV["attributelogicaldatatype"].lower() in ["string", "float", "integer", "choice"]:
+            #
+            # if dSDV["tiebreakdomainname"] is not None:  # this is a test to see if there are true domain values
+            # Use this to compare dValues to output values
+            #
 
-                except:
-                    #  Save list of rating values along with comppct for each component
-                    if not rating is None:
-                        dComponent[cokey] = [compPct, [rating]]
+            if len(domainValues) > 1 and not None in domainValues:
+
+                if tieBreaker == dSDV["tiebreakhighlabel"]:
+                    # Put the null value at the beginning of the domain
+                    dValues[None] = [0, None]
+                    #domainValues.insert(0, None)
+
+                else:
+                    # Put the null value at the end of the domain
+                    dValues[None] = [len(dValues), None]
+                    #domainValues.append(None)
+
+            # PrintMsg(" \ntiebreakdomainname: " + str(dSDV["tiebreakdomainname"]), 1)
+
+            if bVerbose:
+                # ********************** GPR Problem here
+                #
+                PrintMsg(" \n" + dSDV["attributetype"] + " values for " + dSDV["attributelogicaldatatype"] + " data type: " + str(dValues), 1)
+                PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues) + " \n ", 1)
+                PrintMsg("tiebreakdomainname: " + str(dSDV["tiebreakdomainname"]), 1)
+
+            if  dSDV["tiebreakdomainname"] is None:
+                # There are no domain values.
+                # We must make sure that the legend values are the same as the output values.
+                #
+                with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+
+                    for rec in cur:
+                        mukey, cokey, compPct, rating, areasym = rec
+                        #PrintMsg("\t" + str(rec), 1)
+                        dAreasym[mukey] = areasym
+
+                        #if bVerbose and mukey == '397784':
+                        #    PrintMsg("\tRECORD:  " + str(rec), 1)
+
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[mukey].append(cokey)
+
+                        except:
+                            dMapunit[mukey] = [cokey]
+
+                        # this is a new component record. create a new dictionary item.
+                        #
+                        if not cokey in dComp:
+                            dCase[str(rating).upper()] = rating
+
+
+                            # I have a Problem here with domain values and 'None' vs None with GPR
+                            # Perhaps I could add a '<Null>' value to the domain at the beginning or end?
+                            #
+                            if str(rating).upper() in dValues or rating is None:
+                                #PrintMsg("\tNew rating '" + rating + "' assigning index '" + str(dValues[str(rating).upper()][0]) + "' to dComp", 1)
+                                if not rating is None:
+                                    # Don't confuse 'None' with None
+                                    # Get the index from dValues for this component rating and save it to dComp by cokey
+                                    dComp[cokey] = dValues[str(rating).upper()][0]  #
+
+                                else:
+                                    # Get the index from dValues for <Null> and save it to dComp by cokey
+                                    #dComp[cokey] = dValues["<Null>"][0]
+                                    dComp[cokey] = dValues["NONE"][0]
+
+
+                                dCompPct[cokey] = compPct
+
+                                # compare actual rating value to domainValues to make sure case is correct
+                                #
+                                # This does not make sense. domainValues must be coming from maplegendxml.
+                                #
+                                if not rating in domainValues: # this is a case problem or perhaps
+                                    # replace the original dValue item
+                                    dValues[str(rating).upper()][1] = rating
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            # This is working correctly for DepthToWaterTable
+                                    # replace the value in domainValues list
+                                    for i in range(len(domainValues)):
+                                        if str(domainValues[i]).upper() == str(rating).upper():
+                                            domainValues[i] = rating
 
-            # Identify highest value for each component
-            for cokey, coVals in dComponent.items():
-                # Find highest monthly value for each component
-                #PrintMsg("Higher values for cokey " + cokey + ": " + str(coVals[1]) + " = " + str(max(coVals[1])), 1)
-                dCoRating[cokey] = max(coVals[1])
 
-        else:
-            # This is working correctly for DepthToWaterTable
+                            else:
+                                # dValues is keyed on uppercase string rating or is Null
+                                #
+                                # Conservation Tree Shrub has some values not found in the domain.
+                                # How can this be? Need to check with George?
+                                #
+                                #PrintMsg("\tdValue not found for: " + str(rec), 1)
+                                if not str(rating) in missingDomain:
+                                    # Try to add missing value to dDomainValues dict and domainValues list
+                                    dComp[cokey] = len(dValues)
+                                    dValues[str(rating).upper()] = [len(dValues), rating]
+                                    domainValues.append(rating)
+                                    domainValuesUp.append(str(rating).upper())
+                                    missingDomain.append(str(rating))
+                                    dCompPct[cokey] = compPct
+                                    #PrintMsg("\t****Adding value '" + str(rating) + "' to domainValues", 1)
 
-            # Identify lowest monthly value for each component
-            for cokey, coVals in dComponent.items():
-                # Find low rating value for each component
-                #PrintMsg("Lower values for cokey " + cokey + ": " + str(coVals[1]) + " = " + str(min(coVals[1])), 1)
-                dCoRating[cokey] = min(coVals[1])
 
-        dFinalRatings = dict()  # final dominant condition. mukey is key
+            else:
+                # New code for property or interps with domain values
 
-        for mukey, cokeys in dMapunit.items():
-            # accumulate ratings for each mapunit by sum of comppct
-            #dMuRatings = dict()  # create a dictionary of values for just this map unit
-            muPct = 0
-            muRating = None
+                with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
-            for cokey in cokeys:
-                # look at values for each component within the map unit
-                try:
-                    rating = dCoRating[cokey]
-                    compPct = dComponent[cokey][0]
-                    muPct += compPct
+                    for rec in cur:
+                        mukey, cokey, compPct, rating, areasym = rec
+                        dAreasym[mukey] = areasym
 
-                    if not rating is None:
-                      # accumulate product of depth and component percent
-                      try:
-                          muRating += (compPct * rating)
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[mukey].append(cokey)
 
-                      except:
-                          muRating = compPct * rating
+                        except:
+                            dMapunit[mukey] = [cokey]
 
-                except:
-                    pass
+                        # this is a new component record. create a new dictionary item.
+                        #
+                        if not cokey in dComp:
+                            dCase[str(rating).upper()] = rating
 
-            # Calculate weighted mapunit value from sum of products
-            if not muRating is None:
-                muRating = muRating / float(muPct)
+                            if str(rating).upper() in dValues:
 
-            dFinalRatings[mukey] = [muPct, muRating]
+                                dComp[cokey] = dValues[str(rating).upper()][0]  # think this is bad
+                                dCompPct[cokey] = compPct
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-            # Write final ratings to output table
-            for mukey in sorted(dMapunit):
-                compPct, rating = dFinalRatings[mukey]
-                rec = mukey, compPct, rating, dAreasym[mukey]
-                ocur.insertRow(rec)
+                                # compare actual rating value to domainValues to make sure case is correct
+                                if not rating in domainValues: # this is a case problem
+                                    # replace the original dValue item
+                                    dValues[str(rating).upper()][1] = rating
 
-                if not rating is None and not rating in outputValues:
-                    outputValues.append(rating)
+                                    # replace the value in domainValues list
+                                    for i in range(len(domainValues)):
+                                        if str(domainValues[i]).upper() == str(rating).upper():
+                                            domainValues[i] = rating
 
-        outputValues.sort()
-        return outputTbl, outputValues
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+                            else:
+                                # dValues is keyed on uppercase string rating or is Null
+                                #
+                                # Conservation Tree Shrub has some values not found in the domain.
+                                # How can this be? Need to check with George?
+                                #
+                                PrintMsg("\tdValue not found for: " + str(rec), 1)
+                                if not str(rating) in missingDomain:
+                                    # Try to add missing value to dDomainValues dict and domainValues list
+                                    dComp[cokey] = len(dValues)
+                                    dValues[str(rating).upper()] = [len(dValues), rating]
+                                    domainValues.append(rating)
+                                    domainValuesUp.append(str(rating).upper())
+                                    missingDomain.append(str(rating))
+                                    dCompPct[cokey] = compPct
+                                    #PrintMsg("\tAdding value '" + str(rating) + "' to domainValues", 1)
 
-    except:
-        errorMsg()
-        return outputTbl, outputValues
 
-## ===================================================================================
-def AggregateCo_WTA_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    #
 
-    try:
+        else:
+            raise MyError, "Problem with handling domain values of type '" + dSDV["attributelogicaldatatype"]
+
+        # Aggregate monthly index values to a single value for each component??? Would it not be better to
+        # create a new function for COMONTH-DCD? Then I could simplify this function.
         #
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+        # Sort depending upon tiebreak setting
+        # Update dictionary with a single index value for each component
 
-        #PrintMsg(" \nTesting nullRating variable: " + str(nullRating), 1)
+        # Save list of component rating data to each mapunit, sort and write out
+        # a single map unit rating
+        #
+        dRatings = dict()
 
         if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+            PrintMsg(" \nWriting map unit rating data to final output table", 1)
+            PrintMsg(" \nUsing tiebreaker '" + tieBreaker + "' (where choices are " + dSDV["tiebreaklowlabel"] + " or " + dSDV["tiebreakhighlabel"] + ")", 1)
 
-        if bZero:
-            #PrintMsg(" \nIncluding components with null rating values...", 1)
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
 
-        else:
-            #PrintMsg(" \nSkipping components with null rating values...", 1)
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-            
-        sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
+                for mukey, cokeys in dMapunit.items():
+                    dRating = dict()  # save sum of comppct for each rating within a mapunit
+                    muVals = list()   # may not need this for DCD
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+                    for cokey in cokeys:
+                        try:
+                            #PrintMsg("\tA ratingIndx: " + str(dComp[cokey]), 1)
+                            compPct = dCompPct[cokey]
+                            ratingIndx = dComp[cokey]
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues = list()
+                            if ratingIndx in dRating:
+                                sumPct = dRating[ratingIndx] + compPct
+                                dRating[ratingIndx] = sumPct  # this part could be compacted
 
-        if outputTbl == "":
-            return outputTbl, outputValues
+                            else:
+                                dRating[ratingIndx] = compPct
 
-        dMapunit = dict()
-        dComponent = dict()
-        dCoRating = dict()
-        dAreasym = dict()
+                        except:
+                            pass
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                    for ratingIndx, compPct in dRating.items():
+                        muVals.append([compPct, ratingIndx])  # This muVal is not being populated
 
-            # MUKEY,COKEY , COMPPCT_R, attribcolumn
-            for rec in cur:
-                #mukey = rec[0]
-                #cokey = rec[1]
-                #compPct = rec[2]
-                #rating = rec[3]
-                mukey, cokey, compPct, rating, areasym = rec
+                    #This is the final aggregation from component to map unit rating
 
-                dAreasym[mukey] = areasym
+                    if len(muVals) > 0:
+                        muVal = SortData(muVals, 0, 1, True, True)
+                        compPct, ratingIndx = muVal
 
-                if rating is None:
-                    rating = nullRating
+                        try:
+                            rating = domainValues[ratingIndx]
+                            #PrintMsg("\tRating: " + str(rating) + "(index=" + str(ratingIndx) + ")", 1)
 
-                # Save list of cokeys for each mukey
-                try:
-                    if not cokey in dMapunit[mukey]:
-                        dMapunit[mukey].append(cokey)
+                        except:
+                            raise MyError, "domainValues missing value for index (" + str(ratingIndx) + "): " + str(domainValues)
 
-                except:
-                    dMapunit[mukey] = [cokey]
+                        #if bVerbose and mukey == '397784':
+                        #    PrintMsg("\tmuVal for mukey: " + mukey + ", " + str(muVal), 1)
+                        #    PrintMsg("\tRating: " + str(rating), 1)
 
-                try:
-                    # Save list of rating values along with comppct for each component
-                    dComponent[cokey][1].append(rating)
+                    else:
+                        rating = None
+                        compPct = None
 
-                except:
-                    #  Save list of rating values along with comppct for each component
-                    dComponent[cokey] = [compPct, [rating]]
+                    #PrintMsg(" \n" + tieBreaker + ". Checking index values for mukey " + mukey + ": " + str(muVal[0]) + ", " + str(domainValues[muVal[1]]), 1)
+                    #PrintMsg("\tGetting mukey " + mukey + " rating: " + str(rating), 1)
+                    newrec = [mukey, compPct, rating, dAreasym[mukey]]
 
+                    ocur.insertRow(newrec)
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            for cokey, coVals in dComponent.items():
-                # Find high value for each component
-                dCoRating[cokey] = max(coVals[1])
+                    if not rating is None and not rating in outputValues:
+                        outputValues.append(rating)
 
         else:
-            for cokey, coVals in dComponent.items():
-                # Find low value for each component
-                dCoRating[cokey] = min(coVals[1])
+            # tieBreaker Lower
+            # Overhauling this tiebreaker lower, need to do the rest once it is working properly
+            #
+            #PrintMsg(" \nActually in Lower tiebreaker code", 1)
+            #PrintMsg("dMapunit has " + str(len(dMapunit)) + " records", 1 )
 
-        dFinalRatings = dict()  # final dominant condition. mukey is key
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
 
-        for mukey, cokeys in dMapunit.items():
-            # accumulate ratings for each mapunit by sum of comppct
-            sumPct = 0
-            muProd = 0
+                # Process all mapunits
+                for mukey, cokeys in dMapunit.items():
+                    dRating = dict()  # save sum of comppct for each rating within a mapunit
+                    muVals = list()   # may not need this for DCD
+                    #PrintMsg("\t" + mukey + ":" + str(cokeys), 1)
+
+                    for cokey in cokeys:
+                        try:
+                            compPct = dCompPct[cokey]
+                            ratingIndx = dComp[cokey]
+                            #PrintMsg("\t" + cokey + " index: " + str(ratingIndx), 1)
+
+                            if ratingIndx in dRating:
+                                sumPct = dRating[ratingIndx] + compPct
+                                dRating[ratingIndx] = sumPct  # this part could be compacted
+
+                            else:
+                                dRating[ratingIndx] = compPct
 
-            for cokey in cokeys:
-                # look at values for each component within the map unit
-                rating = dCoRating[cokey]
-                compPct = dComponent[cokey][0]
+                        except:
+                            errorMsg()
 
-                #if rating != nullRating:
-                if not rating is None:
-                    # Don't include the 201 (originally null) depths in the WTA calculation
-                    sumPct += compPct            # sum comppct for the mapunit
-                    muProd += (rating * compPct)   # calculate product of component percent and component rating
+                    for ratingIndx, compPct in dRating.items():
+                        muVals.append([compPct, ratingIndx])  # This muVal is not being populated
 
-            if sumPct > 0:
-                dFinalRatings[mukey] = [sumPct, round(float(muProd) / sumPct)]
+                    #PrintMsg("\t" + str(dRating), 1)
+                    if len(muVals) > 0:
+                        muVal = SortData(muVals, 0, 1, True, False)
+                        #PrintMsg("\tmuVal for mukey: " + mukey + ", " + str(muVal), 1)
+                        compPct, ratingIndx = muVal
+                        rating = domainValues[ratingIndx]
 
-            else:
-                # now replace the nulls with 201
-                dFinalRatings[mukey] = [100, nullRating]
+                    else:
+                        rating = None
+                        compPct = None
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-            # Write final ratings to output table
-            for mukey, vals in dFinalRatings.items():
-                rec = mukey, vals[0], vals[1], dAreasym[mukey]
-                ocur.insertRow(rec)
+                    #PrintMsg(" \n" + tieBreaker + ". Checking index values for mukey " + mukey + ": " + str(muVal[0]) + ", " + str(domainValues[muVal[1]]), 1)
+                    #PrintMsg("\tGetting mukey " + mukey + " rating: " + str(rating), 1)
+                    newrec = [mukey, compPct, rating, dAreasym[mukey]]
 
-                if not vals[1] is None and not vals[1] in outputValues:
-                    outputValues.append(vals[1])
+                    ocur.insertRow(newrec)
+
+                    if not rating is None and not rating in outputValues:
+                        outputValues.append(rating)
 
         outputValues.sort()
         return outputTbl, outputValues
@@ -7334,42 +8912,25 @@ def AggregateCo_WTA_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBrea
         errorMsg()
         return outputTbl, outputValues
 
-
 ## ===================================================================================
-def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+def AggregateCo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
+    # Not being use.
     #
-    # Flooding or ponding frequency, dominant condition
+    # I may not use this function. Trying to handle ratings with domain values using the
+    # standard AggregateCo_DCP function
+    #
+    # Flooding or ponding frequency, dominant component with domain values
     #
-    # Aggregate mapunit-component data to the map unit level using dominant condition.
     # Use domain values to determine sort order for tiebreaker
     #
     # Problem with domain values for some indexes which are numeric. Need to accomodate for
     # domain key values which cannot be 'uppercased'.
-    #
-    # Some domain values are not found in the data and vise versa.
-    #
-    # Bad problem 2016-06-08.
-    # Noticed that my final rating table may contain multiple ratings (tiebreak) for a map unit. This creates
-    # a funky join that may display a different map color than the Identify value shows for the polygon. NIRRCAPCLASS.
     # Added areasymbol to output
-    #
-    # Conservation Tree and Shrub group are located in the component table
-    # This has domain values and component values which are all lowercase
-    # The maplegendxml is all uppercase
-    #
-    # I think I need to loop through each output value from the table, find the UPPER match and
-    # then alter the legend value and label to match the output value.
-    #
-    # Nov 2017 problem noticed with Irrigated Capability Class where null values are not used
-    # as the dominant condition. Fixed.
-    #
 
     try:
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
         #
-        #bVerbose = True
-
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
@@ -7378,20 +8939,13 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBr
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-
-        # Default setting is to include Null values as part of the aggregation process
-        if bZero:
-            #PrintMsg(" \nIncluding components with null rating values...", 1)
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
-
-        else:
-            #PrintMsg(" \nSkipping components with null rating values...", 1)
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
         # initialTbl must be in a file geodatabase to support ORDER_BY
         # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
         sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
+
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
@@ -7399,7 +8953,6 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBr
         outputValues = list()
 
         if outputTbl == "":
-            #PrintMsg("\nCreateOutputTable returned nothing", 1)
             return outputTbl, outputValues
 
         lastCokey = "xxxx"
@@ -7407,362 +8960,506 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBr
         dCompPct = dict()
         dMapunit = dict()
         missingDomain = list()
-        dAreasym = dict()
         dCase = dict()
+        dAreasym = dict()
 
-        # PrintMsg(" \ntiebreakdomainname: " + str(dSDV["tiebreakdomainname"]), 1)
-
-        # Read initial table for non-numeric data types. Capture domain values and all component ratings.
+        # Read initial table for non-numeric data types
+        # 02-03-2016 Try adding 'choice' to this method to see if it handles Cons. Tree/Shrub better
+        # than the next method. Nope, did not work. Still have case problems.
         #
-        if bVerbose:
-            PrintMsg(" \nReading initial data...", 1)
-            PrintMsg(whereClause, 1)
-            initCnt = int(arcpy.GetCount_management(initialTbl).getOutput(0))
-            PrintMsg("\nInput table contains " + Number_Format(initCnt, 0, True) + " records", 1)
-            PrintMsg("Data is from " + dSDV["attributecolumnname"].upper() + " column", 1)
-            PrintMsg(dSDV["attributetype"] + " attribute logical data type: " + dSDV["attributelogicaldatatype"].lower(), 1)
+        if dSDV["attributelogicaldatatype"].lower() == "string":
+            # PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"].lower() + "-type values : " + str(domainValues), 1)
 
-        if not dSDV["attributetype"].lower() == "interpretation" and dSDV["attributelogicaldatatype"].lower() in ["string", "vtext"]:  # Changed here 2016-04-28
-            # No domain values for non-interp string ratings
-            # Probably not using this section of code.
-            #
-            if bVerbose:
-                PrintMsg(" \n" + dSDV["attributetype"] + " values for " + dSDV["attributelogicaldatatype"] + " data type: " + str(dValues), 1)
-                PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
+                for rec in cur:
+                    dAreasym[rec[0]] = rec[4]
+                    try:
+                        # capture component ratings as index numbers instead.
+                        dComp[rec[1]].append(dValues[str(rec[3]).upper()][0])
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                    except:
+                        dComp[rec[1]] = [dValues[str(rec[3]).upper()][0]]
+                        dCompPct[rec[1]] = rec[2]
+                        dCase[str(rec[3]).upper()] = rec[3]  # save original value using uppercase key
 
-                for rec in cur:
-                    # "MUKEY", "COKEY", "COMPPCT_R", RATING
-                    # PrintMsg("\t" + str(rec), 1)
-                    mukey, cokey, compPct, rating, areasym = rec
-                    dAreasym[mukey] = areasym
-                    dComp[cokey] = rating
-                    dCompPct[cokey] = compPct
-                    dCase[str(rating).upper()] = rating  # save original value using uppercase key
 
-                    # save list of components for each mapunit
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[rec[0]].append(rec[1])
+
+                        except:
+                            dMapunit[rec[0]] = [rec[1]]
+
+        elif dSDV["attributelogicaldatatype"].lower() in ["float", "integer", "choice"]:
+            # PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
+
+            with SDVSearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+
+                for rec in cur:
+                    dAreasym[rec[0]] = rec[4]
                     try:
-                        dMapunit[mukey].append(cokey)
+                        # capture component ratings as index numbers instead
+                        dComp[rec[1]].append(dValues[str(rec[3]).upper()][0])
 
                     except:
-                        dMapunit[mukey] = [cokey]
+                        #PrintMsg(" \ndomainValues is empty, but legendValues has " + str(legendValues), 1)
+                        dCase[str(rec[3]).upper()] = rec[3]
 
-        elif dSDV["attributelogicaldatatype"].lower() in ["string", "float", "integer", "choice"]:
-            #
-            # if dSDV["tiebreakdomainname"] is not None:  # this is a test to see if there are true domain values
-            # Use this to compare dValues to output values
-            #
+                        if str(rec[3]).upper() in dValues:
+                            dComp[rec[1]] = [dValues[str(rec[3]).upper()][0]]
+                            dCompPct[rec[1]] = rec[2]
+
+                            # compare actual rating value to domainValues to make sure case is correct
+                            if not rec[3] in domainValues: # this is a case problem
+                                # replace the original dValue item
+                                dValues[str(rec[3]).upper()][1] = rec[3]
+                                # replace the value in domainValues list
+                                for i in range(len(domainValues)):
+                                    if domainValues[i].upper() == rec[3].upper():
+                                        domainValues[i] = rec[3]
+
+                        else:
+                            # dValues is keyed on uppercase string rating
+                            #
+                            if not str(rec[3]) in missingDomain:
+                                # Try to add missing value to dDomainValues dict and domainValues list
+                                dValues[str(rec[3]).upper()] = [len(dValues), rec[3]]
+                                domainValues.append(rec[3])
+                                domainValuesUp.append(rec[3].upper())
+                                missingDomain.append(str(rec[3]))
+                                #PrintMsg("\tAdding value '" + str(rec[3]) + "' to domainValues", 1)
+
+                        # save list of components for each mapunit
+                        try:
+                            dMapunit[rec[0]].append(rec[1])
+
+                        except:
+                            dMapunit[rec[0]] = [rec[1]]
+
+        else:
+            PrintMsg(" \nProblem with handling domain values of type '" + dSDV["attributelogicaldatatype"] + "'", 1)
+
+        # Aggregate monthly index values to a single value for each component
+        # Sort depending upon tiebreak setting
+        # Update dictionary with a single index value for each component
+        PrintMsg(" \nNot sure about this sorting code for tiebreaker", 1)
+
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            # "Higher" (default for flooding and ponding frequency)
+            for cokey, indexes in dComp.items():
+                val = sorted(indexes, reverse=True)[0]
+                dComp[cokey] = val
+        else:
+            for cokey, indexes in dComp.items():
+                val = sorted(indexes)[0]
+                dComp[cokey] = val
+
+        # Save list of component data to each mapunit
+        dRatings = dict()
+
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+
+            if tieBreaker == dSDV["tiebreakhighlabel"]:
+                # Default for flooding and ponding frequency
+                #
+                #PrintMsg(" \ndomainValues: " + str(domainValues), 1)
+
+                for mukey, cokeys in dMapunit.items():
+                    dRating = dict()   # save sum of comppct for each rating within a mapunit
+                    muVals = list()   # may not need this for DCD
+
+                    for cokey in cokeys:
+                        #PrintMsg("\tB ratingIndx: " + str(dComp[cokey]), 1)
+                        compPct = dCompPct[cokey]
+                        ratingIndx = dComp[cokey]
+
+                        if ratingIndx in dRating:
+                            sumPct = dRating[ratingIndx] + compPct
+                            dRating[ratingIndx] = sumPct  # this part could be compacted
+
+                        else:
+                            dRating[ratingIndx] = compPct
+
+                    for rating, compPct in dRating.items():
+                        muVals.append([compPct, rating])
+
+                    #newVals = sorted(muVals, key = lambda x : (-x[0], x[1]))[0]  # Works for maplegendkey=2
+                    #newVals = sorted(sorted(muVals, key = lambda x : x[0], reverse=True), key = lambda x : x[1], reverse=True)[0]
+                    muVal = SortData(muVals, 0, 1, True, True)
+                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
+                    ocur.insertRow(newrec)
+
+                    if not newrec[2] is None and not newrec[2] in outputValues:
+                        outputValues.append(newrec[2])
+
+            else:
+                # Lower
+                PrintMsg(" \nFinal lower tiebreaker", 1)
+
+                for mukey, cokeys in dMapunit.items():
+                    dRating = dict()  # save sum of comppct for each rating within a mapunit
+                    muVals = list()   # may not need this for DCD
+
+                    for cokey in cokeys:
+                        try:
+                            #PrintMsg("\tA ratingIndx: " + str(dComp[cokey]), 1)
+                            compPct = dCompPct[cokey]
+                            ratingIndx = dComp[cokey]
+
+                            if ratingIndx in dRating:
+                                sumPct = dRating[ratingIndx] + compPct
+                                dRating[ratingIndx] = sumPct  # this part could be compacted
+
+                            else:
+                                dRating[ratingIndx] = compPct
 
-            if len(domainValues) > 1 and not None in domainValues:
+                        except:
+                            pass
 
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    # Put the null value at the beginning of the domain
-                    dValues[None] = [0, None]
-                    #domainValues.insert(0, None)
+                    for rating, compPct in dRating.items():
+                        muVals.append([compPct, rating])
 
-                else:
-                    # Put the null value at the end of the domain
-                    dValues[None] = [len(dValues), None]
-                    #domainValues.append(None)
+                    #newVals = sorted(muVals, key = lambda x : (-x[0], -x[1]))[0] # Works for maplegendkey=2
+                    #newVals = sorted(sorted(muVals, key = lambda x : x[0], reverse=True), key = lambda x : x[1], reverse=False)[0]
+                    muVal = SortData(muVals, 0, 1, True, False)
+                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
+                    ocur.insertRow(newrec)
 
-            # PrintMsg(" \ntiebreakdomainname: " + str(dSDV["tiebreakdomainname"]), 1)
+                    if not newrec[2] is None and not newrec[2] in outputValues:
+                        outputValues.append(newrec[2])
 
-            if bVerbose:
-                # ********************** GPR Problem here
-                #
-                PrintMsg(" \n" + dSDV["attributetype"] + " values for " + dSDV["attributelogicaldatatype"] + " data type: " + str(dValues), 1)
-                PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues) + " \n ", 1)
-                PrintMsg("tiebreakdomainname: " + str(dSDV["tiebreakdomainname"]), 1)
 
-            if  dSDV["tiebreakdomainname"] is None:
-                # There are no domain values.
-                # We must make sure that the legend values are the same as the output values.
-                #
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        outputValues.sort()
+        return outputTbl, outputValues
 
-                    for rec in cur:
-                        mukey, cokey, compPct, rating, areasym = rec
-                        #PrintMsg("\t" + str(rec), 1)
-                        dAreasym[mukey] = areasym
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
 
-                        #if bVerbose and mukey == '397784':
-                        #    PrintMsg("\tRECORD:  " + str(rec), 1)
+    except:
+        errorMsg()
+        return outputTbl, outputValues
 
-                        # save list of components for each mapunit
-                        try:
-                            dMapunit[mukey].append(cokey)
+## ===================================================================================
+def HorizonComponentSums(initialTbl, whereClause, sqlClause, top, bot, bZero, bDepths, bPctWeight):
+    # Vectorized version of the horizon loop used by AggregateHz_WTA_SUM, AggregateHz_WTA_WTA
+    # and AggregateHz_MaxMin_WTA. 2026-10-17
+    #
+    # Clipped horizon thickness is calculated for every row in the in-memory SDV_Data table as
+    # min(hzdepb, bot) - max(hzdept, top) and only horizons with a positive thickness and a
+    # rating value are kept (NULL ratings become zero when bZero is True). Thickness and
+    # thickness * rating (* comppct_r when bPctWeight is True) are then summed for each
+    # component using numpy.bincount, which adds the horizons in cursor order the same way
+    # the original dictionary updates did.
+    #
+    # bDepths requires both horizon depths to be populated, as the WTA_WTA and MaxMin_WTA
+    # functions do. Without it a NULL hzdept falls back to the top of the range, which is what
+    # min()/max() did with None in the original WTA_SUM loop.
+    #
+    # Returns None if numpy or the in-memory table is not available so that the caller can
+    # use the original row-by-row code. Otherwise returns a dictionary of numpy arrays with
+    # one element per component:
+    #   mukey, areasym (integer codes for the in-memory table), comppct, hzT, rating and
+    #   muIndex (group number of the map unit)
+    # plus muFirst (first component for each map unit), muCount and sdvTbl.
+    #
+    try:
+        if numpy is None or not initialTbl in dMemTables or bot is None:
+            return None
 
-                        except:
-                            dMapunit[mukey] = [cokey]
+        sdvTbl = dMemTables[initialTbl]
+        conditions, orderBy = ParseSDVQuery(sdvTbl, whereClause, sqlClause)
 
-                        # this is a new component record. create a new dictionary item.
-                        #
-                        if not cokey in dComp:
-                            dCase[str(rating).upper()] = rating
+        if conditions is None:
+            return None
 
+        rows = numpy.array(sdvTbl.query(conditions, orderBy), dtype=numpy.int64)
 
-                            # I have a Problem here with domain values and 'None' vs None with GPR
-                            # Perhaps I could add a '<Null>' value to the domain at the beginning or end?
-                            #
-                            if str(rating).upper() in dValues or rating is None:
-                                #PrintMsg("\tNew rating '" + rating + "' assigning index '" + str(dValues[str(rating).upper()][0]) + "' to dComp", 1)
-                                if not rating is None:
-                                    # Don't confuse 'None' with None
-                                    # Get the index from dValues for this component rating and save it to dComp by cokey
-                                    dComp[cokey] = dValues[str(rating).upper()][0]  #
+        def GetColumn(fld, rowList):
+            col = sdvTbl.columns[sdvTbl.dIndex[fld]]
+            return numpy.frombuffer(col, dtype=numpy.dtype(col.typecode))[rowList]
 
-                                else:
-                                    # Get the index from dValues for <Null> and save it to dComp by cokey
-                                    #dComp[cokey] = dValues["<Null>"][0]
-                                    dComp[cokey] = dValues["NONE"][0]
+        hzdept = GetColumn("HZDEPT_R", rows).astype(numpy.float64)
+        hzdepb = GetColumn("HZDEPB_R", rows).astype(numpy.float64)
+        vals = GetColumn(dSDV["attributecolumnname"].upper(), rows).astype(numpy.float64)
+        comppct = GetColumn("COMPPCT_R", rows).astype(numpy.float64)
 
+        if bZero:
+            vals[numpy.isnan(vals)] = 0.0
 
-                                dCompPct[cokey] = compPct
+        if top is None:
+            hzT = numpy.minimum(hzdepb, bot) - hzdept
 
-                                # compare actual rating value to domainValues to make sure case is correct
-                                #
-                                # This does not make sense. domainValues must be coming from maplegendxml.
-                                #
-                                if not rating in domainValues: # this is a case problem or perhaps
-                                    # replace the original dValue item
-                                    dValues[str(rating).upper()][1] = rating
+        else:
+            hzT = numpy.minimum(hzdepb, bot) - numpy.fmax(hzdept, top)
 
-                                    # replace the value in domainValues list
-                                    for i in range(len(domainValues)):
-                                        if str(domainValues[i]).upper() == str(rating).upper():
-                                            domainValues[i] = rating
+        bKeep = (hzT > 0) & ~numpy.isnan(vals)
 
+        if bDepths:
+            bKeep &= ~numpy.isnan(hzdept)
 
-                            else:
-                                # dValues is keyed on uppercase string rating or is Null
-                                #
-                                # Conservation Tree Shrub has some values not found in the domain.
-                                # How can this be? Need to check with George?
-                                #
-                                #PrintMsg("\tdValue not found for: " + str(rec), 1)
-                                if not str(rating) in missingDomain:
-                                    # Try to add missing value to dDomainValues dict and domainValues list
-                                    dComp[cokey] = len(dValues)
-                                    dValues[str(rating).upper()] = [len(dValues), rating]
-                                    domainValues.append(rating)
-                                    domainValuesUp.append(str(rating).upper())
-                                    missingDomain.append(str(rating))
-                                    dCompPct[cokey] = compPct
-                                    #PrintMsg("\t****Adding value '" + str(rating) + "' to domainValues", 1)
+        rows = rows[bKeep]
+        hzT = hzT[bKeep]
+        rating = hzT * vals[bKeep]
 
+        if bPctWeight:
+            rating = rating * comppct[bKeep]
 
-            else:
-                # New code for property or interps with domain values
+        # Group the horizons by component. bincount adds the values for each component in
+        # row order, so the sums match the original loop.
+        cokeys = GetColumn("COKEY", rows)
+        uniqueKeys, firstRow, compIndex = numpy.unique(cokeys, return_index=True, return_inverse=True)
+        compIndex = compIndex.ravel()
 
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        dComp = dict()
+        dComp["sdvTbl"] = sdvTbl
+        dComp["hzT"] = numpy.bincount(compIndex, weights=hzT, minlength=len(firstRow))
+        dComp["rating"] = numpy.bincount(compIndex, weights=rating, minlength=len(firstRow))
 
-                    for rec in cur:
-                        mukey, cokey, compPct, rating, areasym = rec
-                        dAreasym[mukey] = areasym
+        firstRow = rows[firstRow]
+        dComp["mukey"] = GetColumn("MUKEY", firstRow).astype(numpy.int64)
+        dComp["areasym"] = GetColumn("AREASYMBOL", firstRow).astype(numpy.int64)
+        dComp["comppct"] = GetColumn("COMPPCT_R", firstRow).astype(numpy.float64)
 
-                        # save list of components for each mapunit
-                        try:
-                            dMapunit[mukey].append(cokey)
+        # Group the components by map unit
+        uniqueKeys, muFirst, muIndex = numpy.unique(dComp["mukey"], return_index=True, return_inverse=True)
+        dComp["muIndex"] = muIndex.ravel()
+        dComp["muFirst"] = muFirst
+        dComp["muCount"] = len(muFirst)
 
-                        except:
-                            dMapunit[mukey] = [cokey]
+        return dComp
 
-                        # this is a new component record. create a new dictionary item.
-                        #
-                        if not cokey in dComp:
-                            dCase[str(rating).upper()] = rating
+    except:
+        errorMsg()
+        return None
 
-                            if str(rating).upper() in dValues:
+## ===================================================================================
+def WriteHorizonRollup(outputTbl, outFlds, dCompSums, muPct, muVal, bMu, fldPrecision):
+    # Write the map unit values calculated from HorizonComponentSums to the output table
+    # and return the [min, max] of the rounded ratings. 2026-10-17
+    #
+    sdvTbl = dCompSums["sdvTbl"]
+    iMukey = sdvTbl.dIndex["MUKEY"]
+    iAreasym = sdvTbl.dIndex["AREASYMBOL"]
+    mukeys = dCompSums["mukey"][dCompSums["muFirst"]].tolist()
+    areasyms = dCompSums["areasym"][dCompSums["muFirst"]].tolist()
+    muPct = muPct.tolist()
+    muVal = muVal.tolist()
+    bMu = bMu.tolist()
+    outputValues = [999999999, -999999999]
+
+    with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+        for i in range(dCompSums["muCount"]):
+            if bMu[i]:
+                rating = round(muVal[i], fldPrecision)
+                murec = [sdvTbl.values[iMukey][mukeys[i]], int(muPct[i]), rating, sdvTbl.values[iAreasym][areasyms[i]]]
+                ocur.insertRow(murec)
+                outputValues[0] = min(rating, outputValues[0])
+                outputValues[1] = max(rating, outputValues[1])
+
+    return outputValues
 
-                                dComp[cokey] = dValues[str(rating).upper()][0]  # think this is bad
-                                dCompPct[cokey] = compPct
+## ===================================================================================
+def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    # Aggregate mapunit-component-horizon data to the map unit level using a weighted average
+    #
+    # This version uses SUM for horizon data as in AWS
+    # Added areasymbol to output
+    #
+    try:
+        import decimal
 
-                                # compare actual rating value to domainValues to make sure case is correct
-                                if not rating in domainValues: # this is a case problem
-                                    # replace the original dValue item
-                                    dValues[str(rating).upper()][1] = rating
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+        #
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-                                    # replace the value in domainValues list
-                                    for i in range(len(domainValues)):
-                                        if str(domainValues[i]).upper() == str(rating).upper():
-                                            domainValues[i] = rating
+        outputTbl = os.path.join(gdb, tblName)
+        #attribcolumn = dSDV["attributecolumnname"].upper()
+        #resultcolumn = dSDV["resultcolumnname"].upper()
+        fldPrecision = max(0, dSDV["attributeprecision"])
 
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-                            else:
-                                # dValues is keyed on uppercase string rating or is Null
-                                #
-                                # Conservation Tree Shrub has some values not found in the domain.
-                                # How can this be? Need to check with George?
-                                #
-                                PrintMsg("\tdValue not found for: " + str(rec), 1)
-                                if not str(rating) in missingDomain:
-                                    # Try to add missing value to dDomainValues dict and domainValues list
-                                    dComp[cokey] = len(dValues)
-                                    dValues[str(rating).upper()] = [len(dValues), rating]
-                                    domainValues.append(rating)
-                                    domainValuesUp.append(str(rating).upper())
-                                    missingDomain.append(str(rating))
-                                    dCompPct[cokey] = compPct
-                                    #PrintMsg("\tAdding value '" + str(rating) + "' to domainValues", 1)
+        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
+        if bZero:
+            whereClause = "COMPPCT_R >=  " + str(cutOff)  # this will treat Nulls as zero which for example will lower pH values beyond the range when a lower horizon has no data
+            
+        else:
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-        else:
-            raise MyError, "Problem with handling domain values of type '" + dSDV["attributelogicaldatatype"]
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
 
-        # Aggregate monthly index values to a single value for each component??? Would it not be better to
-        # create a new function for COMONTH-DCD? Then I could simplify this function.
-        #
-        # Sort depending upon tiebreak setting
-        # Update dictionary with a single index value for each component
+        if outputTbl == "":
+            return outputTbl, outputValues
 
-        # Save list of component rating data to each mapunit, sort and write out
-        # a single map unit rating
-        #
-        dRatings = dict()
+        # 2026-10-17 Use the vectorized horizon kernel when SDV_Data is in memory
+        dCompSums = HorizonComponentSums(initialTbl, whereClause, sqlClause, top, bot, bZero, False, False)
+
+        if not dCompSums is None:
+            muIndex = dCompSums["muIndex"]
+            muCount = dCompSums["muCount"]
+            comppct = dCompSums["comppct"]
+            sumCompPct = numpy.bincount(muIndex, weights=comppct, minlength=muCount)[muIndex]
+            bComp = sumCompPct > 0
+            adjCompPct = numpy.zeros(len(comppct))
+            adjCompPct[bComp] = comppct[bComp] / sumCompPct[bComp]
+            muAWS = numpy.bincount(muIndex[bComp], weights=(adjCompPct * dCompSums["rating"])[bComp], minlength=muCount)
+            muPct = numpy.bincount(muIndex[bComp], weights=comppct[bComp], minlength=muCount)
+            bMu = numpy.bincount(muIndex[bComp], minlength=muCount) > 0
+            outputValues = WriteHorizonRollup(outputTbl, outFlds, dCompSums, muPct, muAWS, bMu, fldPrecision)
+            outputValues.sort()
+            return outputTbl, outputValues
 
-        if bVerbose:
-            PrintMsg(" \nWriting map unit rating data to final output table", 1)
-            PrintMsg(" \nUsing tiebreaker '" + tieBreaker + "' (where choices are " + dSDV["tiebreaklowlabel"] + " or " + dSDV["tiebreakhighlabel"] + ")", 1)
+        dPct = dict()  # sum of comppct_r for each map unit
+        dComp = dict() # component level information
+        dMu = dict()
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
+        # reset variables for cursor
+        sumPct = 0
+        sumProd = 0
+        meanVal = 0
+        #prec = dSDV["attributeprecision"]
+        roundOff = 2
+
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
-                for mukey, cokeys in dMapunit.items():
-                    dRating = dict()  # save sum of comppct for each rating within a mapunit
-                    muVals = list()   # may not need this for DCD
+                for rec in cur:
+                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
+                    # top = hzdept
+                    # bot = hzdepb
+                    # td = top of range
+                    # bd = bottom of range
+                    if val is None and bZero:
+                        val = 0
 
-                    for cokey in cokeys:
+                    if val is not None:
+
+                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
                         try:
-                            #PrintMsg("\tA ratingIndx: " + str(dComp[cokey]), 1)
-                            compPct = dCompPct[cokey]
-                            ratingIndx = dComp[cokey]
+                            hzT = min(hzdepb, bot) - max(hzdept, top)   # Getting a None error here.usable thickness from this horizon
 
-                            if ratingIndx in dRating:
-                                sumPct = dRating[ratingIndx] + compPct
-                                dRating[ratingIndx] = sumPct  # this part could be compacted
+                        except:
+                            hzT = 0
 
-                            else:
-                                dRating[ratingIndx] = compPct
+                        if hzT > 0:
+                            aws = float(hzT) * val
+                            #PrintMsg("\t" + str(aws), 1)
 
-                        except:
-                            pass
+                            if not cokey in dComp:
+                                # Create initial entry for this component using the first horiozon CHK
+                                dComp[cokey] = [mukey, comppct, hzT, aws, areasym]
 
-                    for ratingIndx, compPct in dRating.items():
-                        muVals.append([compPct, ratingIndx])  # This muVal is not being populated
+                                try:
+                                    dPct[mukey] = dPct[mukey] + comppct
 
-                    #This is the final aggregation from component to map unit rating
+                                except:
+                                    dPct[mukey] = comppct
 
-                    if len(muVals) > 0:
-                        muVal = SortData(muVals, 0, 1, True, True)
-                        compPct, ratingIndx = muVal
+                            else:
+                                # accumulate total thickness and total rating value by adding to existing component values  CHK
+                                mukey, comppct, dHzT, dAWS, areasym = dComp[cokey]
+                                dAWS = dAWS + aws
+                                dHzT = dHzT + hzT
+                                dComp[cokey] = [mukey, comppct, dHzT, dAWS, areasym]
 
-                        try:
-                            rating = domainValues[ratingIndx]
-                            #PrintMsg("\tRating: " + str(rating) + "(index=" + str(ratingIndx) + ")", 1)
+                        #arcpy.SetProgressorPosition()
 
-                        except:
-                            raise MyError, "domainValues missing value for index (" + str(ratingIndx) + "): " + str(domainValues)
+                # get the total number of major components from the dictionary count
+                iComp = len(dComp)
 
-                        #if bVerbose and mukey == '397784':
-                        #    PrintMsg("\tmuVal for mukey: " + mukey + ", " + str(muVal), 1)
-                        #    PrintMsg("\tRating: " + str(rating), 1)
+                # Read through the component-level data and summarize to the mapunit level
 
-                    else:
-                        rating = None
-                        compPct = None
+                if iComp > 0:
+                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
 
-                    #PrintMsg(" \n" + tieBreaker + ". Checking index values for mukey " + mukey + ": " + str(muVal[0]) + ", " + str(domainValues[muVal[1]]), 1)
-                    #PrintMsg("\tGetting mukey " + mukey + " rating: " + str(rating), 1)
-                    newrec = [mukey, compPct, rating, dAreasym[mukey]]
+                    for cokey, dRec in dComp.items():
+                        # get component level data  CHK
+                        mukey, comppct, hzT, val, areasym = dRec
 
-                    ocur.insertRow(newrec)
+                        # get sum of component percent for the mapunit  CHK
+                        try:
+                            sumCompPct = float(dPct[mukey])
 
-                    if not rating is None and not rating in outputValues:
-                        outputValues.append(rating)
+                        except:
+                            # set the component percent to zero if it is not found in the
+                            # dictionary. This is probably a 'Miscellaneous area' not included in the  CHK
+                            # data or it has no horizon information.
+                            sumCompPct = 0
 
-        else:
-            # tieBreaker Lower
-            # Overhauling this tiebreaker lower, need to do the rest once it is working properly
-            #
-            #PrintMsg(" \nActually in Lower tiebreaker code", 1)
-            #PrintMsg("dMapunit has " + str(len(dMapunit)) + " records", 1 )
+                        #PrintMsg(areasym + ", " + mukey + ", " + cokey + ", " + str(comppct) + ", " + str(sumCompPct) + ", " + str(hzT) + ", " + str(val), 1)  # These look good
 
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
 
-                # Process all mapunits
-                for mukey, cokeys in dMapunit.items():
-                    dRating = dict()  # save sum of comppct for each rating within a mapunit
-                    muVals = list()   # may not need this for DCD
-                    #PrintMsg("\t" + mukey + ":" + str(cokeys), 1)
+                        # calculate component percentage adjustment
 
-                    for cokey in cokeys:
-                        try:
-                            compPct = dCompPct[cokey]
-                            ratingIndx = dComp[cokey]
-                            #PrintMsg("\t" + cokey + " index: " + str(ratingIndx), 1)
+                        if sumCompPct > 0:
+                            # If there is no data for any of the component horizons, could end up with 0 for
+                            # sum of comppct_r
+                            adjCompPct = float(comppct) / sumCompPct   # WSS method
 
-                            if ratingIndx in dRating:
-                                sumPct = dRating[ratingIndx] + compPct
-                                dRating[ratingIndx] = sumPct  # this part could be compacted
+                            # adjust the rating value down by the component percentage and by the sum of the
+                            # usable horizon thickness for this component
+                            aws = adjCompPct * val
+                            hzT = hzT * adjCompPct    # Adjust component share of horizon thickness by comppct
 
-                            else:
-                                dRating[ratingIndx] = compPct
+                            # Update component values in component dictionary
+                            dComp[cokey] = mukey, comppct, hzT, aws, areasym
 
-                        except:
-                            errorMsg()
+                            # Populate dMu dictionary
+                            if mukey in dMu:
+                                val1, val3, areasym = dMu[mukey]
+                                comppct = comppct + val1
+                                aws = aws + val3
 
-                    for ratingIndx, compPct in dRating.items():
-                        muVals.append([compPct, ratingIndx])  # This muVal is not being populated
+                            dMu[mukey] = [comppct, aws, areasym]
 
-                    #PrintMsg("\t" + str(dRating), 1)
-                    if len(muVals) > 0:
-                        muVal = SortData(muVals, 0, 1, True, False)
-                        #PrintMsg("\tmuVal for mukey: " + mukey + ", " + str(muVal), 1)
-                        compPct, ratingIndx = muVal
-                        rating = domainValues[ratingIndx]
+                # Write out map unit aggregated AWS
+                #
+                murec = list()
+                outputValues= [999999999, -999999999]
 
-                    else:
-                        rating = None
-                        compPct = None
+                for mukey, val in dMu.items():
+                    compPct, aws, areasym = val
+                    aws = round(aws, fldPrecision) # Test temporary removal of rounding
+                    #aws = decimal.Decimal(str(aws)).quantize(decimal.Decimal("0.01"), decimal.ROUND_HALF_UP)
+                    murec = [mukey, compPct, aws, areasym]
+                    ocur.insertRow(murec)
 
-                    #PrintMsg(" \n" + tieBreaker + ". Checking index values for mukey " + mukey + ": " + str(muVal[0]) + ", " + str(domainValues[muVal[1]]), 1)
-                    #PrintMsg("\tGetting mukey " + mukey + " rating: " + str(rating), 1)
-                    newrec = [mukey, compPct, rating, dAreasym[mukey]]
+                    # save max-min values
+                    if not aws is None:
+                        outputValues[0] = min(aws, outputValues[0])
+                        outputValues[1] = max(aws, outputValues[1])
 
-                    ocur.insertRow(newrec)
+        outputValues.sort()
 
-                    if not rating is None and not rating in outputValues:
-                        outputValues.append(rating)
+        #if (bZero and outputValues ==  [0.0, 0.0]):
+            #PrintMsg(" \n2. No data for " + sdvAtt, 1)
 
-        outputValues.sort()
         return outputTbl, outputValues
 
     except MyError, e:
         PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+        return outputTbl, []
 
     except:
         errorMsg()
-        return outputTbl, outputValues
+        return outputTbl, []
 
 ## ===================================================================================
-def AggregateCo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    # Not being use.
-    #
-    # I may not use this function. Trying to handle ratings with domain values using the
-    # standard AggregateCo_DCP function
-    #
-    # Flooding or ponding frequency, dominant component with domain values
-    #
-    # Use domain values to determine sort order for tiebreaker
+def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    # Aggregate mapunit-component-horizon data to the map unit level using a weighted average
     #
-    # Problem with domain values for some indexes which are numeric. Need to accomodate for
-    # domain key values which cannot be 'uppercased'.
+    # This version uses weighted average for horizon data as in AWC and most others
     # Added areasymbol to output
-
     try:
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
@@ -7772,557 +9469,432 @@ def AggregateCo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBr
 
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
-
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        fldPrecision = max(0, dSDV["attributeprecision"])
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-        whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
-        # initialTbl must be in a file geodatabase to support ORDER_BY
-        # Do I really need to sort by attribucolumn when it will be replaced by Domain values later?
-        sqlClause =  (None, " ORDER BY MUKEY ASC, COMPPCT_R DESC")
+        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
+        if bZero:
+            whereClause = "COMPPCT_R >=  " + str(cutOff)  # this will treat Nulls as zero which for example will lower pH values beyond the range when a lower horizon has no data
+            
+        else:
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
         outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues = list()
 
         if outputTbl == "":
-            return outputTbl, outputValues
-
-        lastCokey = "xxxx"
-        dComp = dict()
-        dCompPct = dict()
-        dMapunit = dict()
-        missingDomain = list()
-        dCase = dict()
-        dAreasym = dict()
-
-        # Read initial table for non-numeric data types
-        # 02-03-2016 Try adding 'choice' to this method to see if it handles Cons. Tree/Shrub better
-        # than the next method. Nope, did not work. Still have case problems.
-        #
-        if dSDV["attributelogicaldatatype"].lower() == "string":
-            # PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"].lower() + "-type values : " + str(domainValues), 1)
-
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
-
-                for rec in cur:
-                    dAreasym[rec[0]] = rec[4]
-                    try:
-                        # capture component ratings as index numbers instead.
-                        dComp[rec[1]].append(dValues[str(rec[3]).upper()][0])
-
-                    except:
-                        dComp[rec[1]] = [dValues[str(rec[3]).upper()][0]]
-                        dCompPct[rec[1]] = rec[2]
-                        dCase[str(rec[3]).upper()] = rec[3]  # save original value using uppercase key
-
+            return outputTbl,[]
 
-                        # save list of components for each mapunit
-                        try:
-                            dMapunit[rec[0]].append(rec[1])
+        # 2026-10-17 Use the vectorized horizon kernel when SDV_Data is in memory
+        dCompSums = HorizonComponentSums(initialTbl, whereClause, sqlClause, top, bot, bZero, True, True)
+
+        if not dCompSums is None:
+            muIndex = dCompSums["muIndex"]
+            muCount = dCompSums["muCount"]
+            muPct = numpy.bincount(muIndex, weights=dCompSums["comppct"], minlength=muCount)
+            divisor = muPct[muIndex] * dCompSums["hzT"]
+            newvals = numpy.zeros(len(divisor))
+            newvals[divisor > 0] = dCompSums["rating"][divisor > 0] / divisor[divisor > 0]
+            muVal = numpy.bincount(muIndex, weights=newvals, minlength=muCount)
+            bMu = numpy.ones(muCount, dtype=bool)
+            outputValues = WriteHorizonRollup(outputTbl, outFlds, dCompSums, muPct, muVal, bMu, fldPrecision)
+            outputValues.sort()
+            return outputTbl, outputValues
 
-                        except:
-                            dMapunit[rec[0]] = [rec[1]]
+        dPct = dict()  # sum of comppct_r for each map unit
+        dComp = dict() # component level information
+        dMu = dict()
 
-        elif dSDV["attributelogicaldatatype"].lower() in ["float", "integer", "choice"]:
-            # PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
+        # reset variables for cursor
+        sumPct = 0
+        sumProd = 0
+        meanVal = 0
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
                 for rec in cur:
-                    dAreasym[rec[0]] = rec[4]
-                    try:
-                        # capture component ratings as index numbers instead
-                        dComp[rec[1]].append(dValues[str(rec[3]).upper()][0])
-
-                    except:
-                        #PrintMsg(" \ndomainValues is empty, but legendValues has " + str(legendValues), 1)
-                        dCase[str(rec[3]).upper()] = rec[3]
-
-                        if str(rec[3]).upper() in dValues:
-                            dComp[rec[1]] = [dValues[str(rec[3]).upper()][0]]
-                            dCompPct[rec[1]] = rec[2]
-
-                            # compare actual rating value to domainValues to make sure case is correct
-                            if not rec[3] in domainValues: # this is a case problem
-                                # replace the original dValue item
-                                dValues[str(rec[3]).upper()][1] = rec[3]
-                                # replace the value in domainValues list
-                                for i in range(len(domainValues)):
-                                    if domainValues[i].upper() == rec[3].upper():
-                                        domainValues[i] = rec[3]
+                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
+                    # top = hzdept
+                    # bot = hzdepb
+                    # td = top of range
+                    # bd = bottom of range
+                    if val is None and bZero:
+                        val = 0
 
-                        else:
-                            # dValues is keyed on uppercase string rating
-                            #
-                            if not str(rec[3]) in missingDomain:
-                                # Try to add missing value to dDomainValues dict and domainValues list
-                                dValues[str(rec[3]).upper()] = [len(dValues), rec[3]]
-                                domainValues.append(rec[3])
-                                domainValuesUp.append(rec[3].upper())
-                                missingDomain.append(str(rec[3]))
-                                #PrintMsg("\tAdding value '" + str(rec[3]) + "' to domainValues", 1)
+                    if val is not None and hzdept is not None and hzdepb is not None:
 
-                        # save list of components for each mapunit
+                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
                         try:
-                            dMapunit[rec[0]].append(rec[1])
+                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
 
                         except:
-                            dMapunit[rec[0]] = [rec[1]]
-
-        else:
-            PrintMsg(" \nProblem with handling domain values of type '" + dSDV["attributelogicaldatatype"] + "'", 1)
+                            hzT = 0
 
-        # Aggregate monthly index values to a single value for each component
-        # Sort depending upon tiebreak setting
-        # Update dictionary with a single index value for each component
-        PrintMsg(" \nNot sure about this sorting code for tiebreaker", 1)
+                        if hzT > 0:
+                            aws = float(hzT) * val * comppct
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            # "Higher" (default for flooding and ponding frequency)
-            for cokey, indexes in dComp.items():
-                val = sorted(indexes, reverse=True)[0]
-                dComp[cokey] = val
-        else:
-            for cokey, indexes in dComp.items():
-                val = sorted(indexes)[0]
-                dComp[cokey] = val
+                            if not cokey in dComp:
+                                # Create initial entry for this component using the first horiozon CHK
+                                dComp[cokey] = [mukey, comppct, hzT, aws, areasym]
+                                try:
+                                    dPct[mukey] = dPct[mukey] + comppct
 
-        # Save list of component data to each mapunit
-        dRatings = dict()
+                                except:
+                                    dPct[mukey] = comppct
 
-        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                            else:
+                                # accumulate total thickness and total rating value by adding to existing component values  CHK
+                                mukey, comppct, dHzT, dAWS, areasym = dComp[cokey]
+                                dAWS = dAWS + aws
+                                dHzT = dHzT + hzT
+                                dComp[cokey] = [mukey, comppct, dHzT, dAWS, areasym]
 
-            if tieBreaker == dSDV["tiebreakhighlabel"]:
-                # Default for flooding and ponding frequency
-                #
-                #PrintMsg(" \ndomainValues: " + str(domainValues), 1)
+                        #else:
+                        #    PrintMsg("\tFound horizon for mapunit (" + mukey + ":" + cokey + " with hzthickness of " + str(hzT), 1)
 
-                for mukey, cokeys in dMapunit.items():
-                    dRating = dict()   # save sum of comppct for each rating within a mapunit
-                    muVals = list()   # may not need this for DCD
+                    #else:
+                    #    PrintMsg("\tFound horizon with no data for mapunit (" + mukey + ":" + cokey + " with hzthickness of " + str(hzT), 1)
 
-                    for cokey in cokeys:
-                        #PrintMsg("\tB ratingIndx: " + str(dComp[cokey]), 1)
-                        compPct = dCompPct[cokey]
-                        ratingIndx = dComp[cokey]
+                # get the total number of major components from the dictionary count
+                iComp = len(dComp)
 
-                        if ratingIndx in dRating:
-                            sumPct = dRating[ratingIndx] + compPct
-                            dRating[ratingIndx] = sumPct  # this part could be compacted
+                # Read through the component-level data and summarize to the mapunit level
 
-                        else:
-                            dRating[ratingIndx] = compPct
+                if iComp > 0:
+                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+                    #arcpy.SetProgressor("step", "Saving map unit and component AWS data...",  0, iComp, 1)
 
-                    for rating, compPct in dRating.items():
-                        muVals.append([compPct, rating])
+                    for cokey, vals in dComp.items():
 
-                    #newVals = sorted(muVals, key = lambda x : (-x[0], x[1]))[0]  # Works for maplegendkey=2
-                    #newVals = sorted(sorted(muVals, key = lambda x : x[0], reverse=True), key = lambda x : x[1], reverse=True)[0]
-                    muVal = SortData(muVals, 0, 1, True, True)
-                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
-                    ocur.insertRow(newrec)
+                        # get component level data
+                        mukey, comppct, hzT, cval, areasym = vals
 
-                    if not newrec[2] is None and not newrec[2] in outputValues:
-                        outputValues.append(newrec[2])
+                        # get sum of comppct for mapunit
+                        sumPct = dPct[mukey]
 
-            else:
-                # Lower
-                PrintMsg(" \nFinal lower tiebreaker", 1)
+                        # calculate component weighted values
+                        # get weighted layer thickness
+                        divisor = sumPct * hzT
 
-                for mukey, cokeys in dMapunit.items():
-                    dRating = dict()  # save sum of comppct for each rating within a mapunit
-                    muVals = list()   # may not need this for DCD
+                        if divisor > 0:
+                            newval = float(cval) / divisor
 
-                    for cokey in cokeys:
-                        try:
-                            #PrintMsg("\tA ratingIndx: " + str(dComp[cokey]), 1)
-                            compPct = dCompPct[cokey]
-                            ratingIndx = dComp[cokey]
+                        else:
+                            newval = 0.0
 
-                            if ratingIndx in dRating:
-                                sumPct = dRating[ratingIndx] + compPct
-                                dRating[ratingIndx] = sumPct  # this part could be compacted
+                        if mukey in dMu:
+                            pct, mval, areasym = dMu[mukey]
+                            newval = newval + mval
 
-                            else:
-                                dRating[ratingIndx] = compPct
+                        dMu[mukey] = [sumPct, newval, areasym]
 
-                        except:
-                            pass
+                # Write out map unit aggregated AWS
+                #
+                murec = list()
+                outputValues= [999999999, -999999999]
 
-                    for rating, compPct in dRating.items():
-                        muVals.append([compPct, rating])
+                for mukey, vals in dMu.items():
+                    sumPct, val, areasym = vals
+                    aws = round(val, fldPrecision)
+                    murec = [mukey, sumPct, aws, areasym]
+                    ocur.insertRow(murec)
+                    # save max-min values
+                    if not aws is None:
+                        outputValues[0] = min(aws, outputValues[0])
+                        outputValues[1] = max(aws, outputValues[1])
 
-                    #newVals = sorted(muVals, key = lambda x : (-x[0], -x[1]))[0] # Works for maplegendkey=2
-                    #newVals = sorted(sorted(muVals, key = lambda x : x[0], reverse=True), key = lambda x : x[1], reverse=False)[0]
-                    muVal = SortData(muVals, 0, 1, True, False)
-                    newrec = [mukey, muVal[0], domainValues[muVal[1]], dAreasym[mukey]]
-                    ocur.insertRow(newrec)
+        outputValues.sort()
 
-                    if not newrec[2] is None and not newrec[2] in outputValues:
-                        outputValues.append(newrec[2])
+        #if (bZero and outputValues ==  [0.0, 0.0]):
+        #    PrintMsg(" \nNo data for " + sdvAtt, 1)
 
 
-        outputValues.sort()
         return outputTbl, outputValues
 
     except MyError, e:
         PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+        return outputTbl, []
 
     except:
         errorMsg()
-        return outputTbl, outputValues
+        return outputTbl, []
 
 ## ===================================================================================
-def AggregateCo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    # Aggregate mapunit-component data to the map unit level using a weighted average
+def AggregateHz_DCP_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    #
+    # Dominant component for mapunit-component-horizon data to the map unit level
+    #
+    # This version uses weighted average for horizon data
+    # Added areasymbol to output
     #
-    # Possible problem with Depth to Restriction and the null replacement values of 201. nullRating
-    # Should be calculating 'BrD' mapunit using [ (66/(66 + 15) X 38cm) + (15/(66 + 15) X 0cm) ]
+    # Problem: Need to fix bZero logic related to pH (per Chad)
 
-    # Another question. For depth to any restriction, there could be multiple restrictions per
-    # component. Do I need to sort on depth according to tieBreaker setting?
-    
     try:
-        #bVerbose = True
-
-        # TEST CODE FOR nullRating handling
-        if bVerbose:
-            PrintMsg(" \nnullRating: " + str(nullRating), 1)
-
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        #bVerbose = True
+
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
         outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
         fldPrecision = max(0, dSDV["attributeprecision"])
-
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-        # sort order of value is important
-        if tieBreaker == "Lower":
-            sOrder = " DESC"
-
-        else:
-            sOrder = " ASC"
-
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, " + dSDV["attributecolumnname"].upper() + sOrder)
-
-##        if bZero == False and nullRating is None:
-##            # ignore any null values
-##            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-##
-##        else:
-##            # ignore values = null replacement value. Trying to fix Depth to Restriction WTA problem.
-##            #
-##            if not nullRating is None:
-##                whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-##
-##            else:
-##                # retrieve null values and convert to zeros during the iteration process
-##                whereClause = "COMPPCT_R >=  " + str(cutOff)
+        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, COKEY ASC, HZDEPT_R ASC")  # 2020-01-23 added cokey to sort
 
-        # Added this replacement logic on 2020-09-18 in response to pH problem and general lack of consistency in applying null-handling settings
         if bZero:
             whereClause = "COMPPCT_R >=  " + str(cutOff)  # this will treat Nulls as zero which for example will lower pH values beyond the range when a lower horizon has no data
             
         else:
             whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-            
+
+
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
-        if bVerbose:
-            PrintMsg(" \nSQL: " + whereClause, 1)
-            PrintMsg("Input table (" + initialTbl + ") has " + str(int(arcpy.GetCount_management(initialTbl).getOutput(0))) + " records", 1)
-
         outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues = list()
+        outputValues= [999999999, -999999999]
 
         if outputTbl == "":
-            return outputTbl, outputValues
+            raise MyError,""
+
+        dPct = dict()  # sum of comppct_r for each map unit
+        dHorizon = dict()
+        dComp = dict() # component level information
+        dMu = dict()
+        dCompList = dict()
 
-        lastMukey = "xxxx"
-        dRating = dict()
         # reset variables for cursor
         sumPct = 0
         sumProd = 0
         meanVal = 0
-        #prec = dSDV["attributeprecision"]
-        outputValues = [999999999, -999999999]
-        recCnt = 0
-        areasym = ""
-        dPct = dict()  # sum of comppct_r for each map unit
-        dMapunit = dict()
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                for rec in cur:
-                    recCnt += 1
-                    mukey, cokey, comppct, val, areasym = rec
-                    #PrintMsg(str(recCnt) + ". " + str(rec), 1)
-
-                    # Capture component list for each mapunit
-                    try:
-                        if not cokey in dMapunit[mukey]:
-                            dMapunit[mukey].append(cokey)
-                            
-                            if not val == nullRating:
-                                dPct[mukey] += comppct
-
-                    except:
-                        dMapunit[mukey] = [cokey]
-
-                        if not val == nullRating:
-                            dPct[mukey] = comppct
+        #testMu = '676909'  # STATSGO mapunit with inconsistencies in horizon calculations for dominant component
 
-                    if val is None and bZero:
-                        # convert null values to zero
-                        val = 0.0
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
-                    if val == nullRating:
-                        # 
-                        val = None
-                        
-                        
+                for rec in cur:
+                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
+                    # top = hzdept
+                    # bot = hzdepb
+                    # td = top of range
+                    # bd = bottom of range
 
-                    #if bVerbose and mukey in ['374414', '374451']:
-                    #    PrintMsg("\t\tMukey " + mukey + ":" + cokey + ";  " + str(comppct) + "%;  " + str(val), 1)
+                    #if mukey == testMu:
+                    #    PrintMsg("\tRaw: " + str(rec), 1)
 
-                    if mukey != lastMukey and lastMukey != "xxxx":
-                        # I'm losing an output value when there is only one rated component and bZeros == True
-                        # This is because only the non-Null ratings are being processed for things like Range Production (Normal Year) in Batch Mode.
-                        #
-                        try:
-                            sumPct = dPct[lastMukey]
+                    if not cokey in dHorizon:
+                        if not mukey in dPct:
+                            # Problem:
+                            # This statement above is only getting the first component and ignoring any ties based upon component percent
+                            # It also may be skipping the dominant component when the value is Null. Is this what I really want?
+                            #
+                            dCompList[mukey] = [cokey]  # initialize list of components for this mapunit
 
-                        except:
-                            dPct[lastMukey] = 0
-                            sumPct = 0
-                        
-                        if (sumPct > 0 and sumProd is not None):
-                            # write out record for previous mapunit
+                            dPct[mukey] = comppct  # cursor is sorted on comppct_r descending, so this should be dominant component percent.
 
-                            meanVal = round(float(sumProd) / sumPct, fldPrecision)
-                            newrec = [lastMukey, sumPct, meanVal, areasym]
-                            ocur.insertRow(newrec)
+                            if val is not None and hzdept is not None and hzdepb is not None:
+                                # Normal component with horizon data
+                                hzT = min(hzdepb, bot) - max(hzdept, top)
+                                aws = float(hzT) * val
+                                newrec = [mukey, comppct, hzT, aws, areasym]
+                                dHorizon[cokey] = newrec
+                                
+                                #if mukey == testMu:
+                                #    PrintMsg("\t1. " + str(newrec), 1)
 
-                            #if bVerbose and lastMukey in ['374414', '374451']:
-                            #    PrintMsg("\tTest mapunit1 " + lastMukey + ": " + str(meanVal) + ";  " + str(sumPct) + "%", 1)
+                            elif hzdept is not None and hzdepb is not None:
+                                # new code to capture components where the rating value is Null
+                                hzT = min(hzdepb, bot) - max(hzdept, top)
+                                aws = None
+                                newrec = [mukey, comppct, hzT, aws, areasym]
+                                dHorizon[cokey] = newrec
+                                
+                                #if mukey == testMu:
+                                #    PrintMsg("\t1 For NULL. " + str(newrec), 1)
+                                
 
-                            # reset variables for the next mapunit record
-                            sumPct = 0
-                            sumProd = None
+                        elif comppct >= dPct[mukey]:
+                            # This should be a mapunit that has more than one dominant component
+                            dCompList[mukey].append(cokey)
 
-                            # save max-min values
-                            if not meanVal is None:
-                                outputValues[0] = min(meanVal, outputValues[0])
-                                outputValues[1] = max(meanVal, outputValues[1])
+                            if val is not None and hzdept is not None and hzdepb is not None:
+                                # Normal component with horizon data
+                                hzT = min(hzdepb, bot) - max(hzdept, top)
+                                aws = float(hzT) * val
+                                newrec = [mukey, comppct, hzT, aws, areasym]
+                                dHorizon[cokey] = newrec
+                                
+                                #if mukey == testMu:
+                                #    PrintMsg("\t2. " + str(newrec), 1)
 
-                        else:
-                        #    Tried to bring back null rating replacement value (201), but that didn't work because those
-                        #    are being excluded from the entire process by the sql_clause.
-                        #
-                            newrec = [lastMukey, sumPct, nullRating, areasym]
-                            #if bVerbose and lastMukey in ['374414', '374451']:
-                            #    PrintMsg("\tTest mapunit2 " + lastMukey + ": " + str(nullRating) + ";  " + str(sumPct) + "%", 1)
+                            elif hzdept is not None and hzdepb is not None:
+                                # new code to capture components where the rating value is Null
+                                hzT = min(hzdepb, bot) - max(hzdept, top)
+                                aws = None
+                                newrec = [mukey, comppct, hzT, aws, areasym]
+                                dHorizon[cokey] = newrec
                                 
-                            ocur.insertRow(newrec)
-                            # reset variables for the next mapunit record
-                            sumPct = 0
-                            sumProd = None
-                            dPct[lastMukey] = 0
+                                #if mukey == testMu:
+                                #    PrintMsg("\t2 For NULL. " + str(newrec), 1)
 
-                    # accumulate data for this mapunit
-                    #PrintMsg("\tFollowup summary", 1)
-                    #sumPct += comppct
+                            else:
+                                # Component with no data for this horizon
+                                newrec = [mukey, comppct, None, None, areasym]
+                                dHorizon[cokey] = newrec
 
-                    if val is not None:
-                        prod = comppct * float(val)
-                        try:
-                            sumProd += prod
+                                #if mukey == testMu:
+                                #    PrintMsg("\t3. " + str(newrec), 1)
 
-                        except:
-                            sumProd = prod
 
-                    # set new mapunit flag
-                    lastMukey = mukey
+                    else:
+                        try:
+                            # For dominant component:
+                            # accumulate total thickness and total rating value by adding to existing component values  CHK
 
-                # Add final record
-                try:
-                    sumPct = dPct[lastMukey]
+                            mukey, comppct, dHzT, dAWS, areasym = dHorizon[cokey]
 
-                except:
-                    dPct[lastMukey] = 0
-                
-                if areasym != "" and sumPct != 0:  # 
-                    if sumProd is None:
-                        meanVal = nullRating
+                            if val is not None and hzdept is not None and hzdepb is not None:
+                                hzT = min(hzdepb, bot) - max(hzdept, top)
+                                aws = float(hzT) * val
+                                dAWS = max(0, dAWS) + aws
+                                dHzT = max(0, dHzT) + hzT
+                                newrec = [mukey, comppct, dHzT, dAWS, areasym]
+                                dHorizon[cokey] = newrec
 
-                    else:
-                        meanVal = round(float(sumProd) / sumPct, fldPrecision)
-                        
-                    newrec = [lastMukey, sumPct, meanVal, areasym]  # if there is no data, this will error
-                    ocur.insertRow(newrec)
+                                #if mukey == testMu:
+                                #    PrintMsg("\t4. " + str(newrec), 1)
+                                
+                            elif hzdept is not None and hzdepb is not None:
+                                hzT = min(hzdepb, bot) - max(hzdept, top)
+                                aws = 0
+                                dAWS = max(0, dAWS) + aws
+                                dHzT = max(0, dHzT) + hzT
+                                newrec = [mukey, comppct, dHzT, dAWS, areasym]
+                                dHorizon[cokey] = newrec
 
-                    if dSDV["resultcolumnname"].upper().startswith("NCCPI"):
-                        # For NCCPI, hardcode the range of values from 0.0 to 1.0 for a consistent map legend
-                        outputValues = [0.0, 1.0]
+                                #if mukey == testMu:
+                                #    PrintMsg("\t4 For Null. " + str(newrec), 1)
+                                    
+                        except KeyError:
+                            # Hopefully this is a component other than dominant
+                            #if mukey == testMu:
+                            #    PrintMsg("\t5. Skipped because of dHorizon KeyError for cokey: " + cokey, 1)
+                            pass
 
-                    elif not meanVal is None:
-                        outputValues[0] = min(meanVal, outputValues[0])
-                        outputValues[1] = max(meanVal, outputValues[1])
+                        except:
+                            errorMsg()
 
-        outputValues.sort()
-        del sumPct
-        del sumProd
-        del meanVal
 
-        if outputValues[0] == -999999999 or outputValues[1] == 999999999:
-            # Sometimes no data can skip through the max min test
-            outputValues = [0.0, 0.0]
+                # get the total number of major components from the dictionary count
+                iComp = len(dHorizon)
 
-        return outputTbl, outputValues
+                # Read through the component-level data and summarize to the mapunit level
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        outputTbl, outputValues
+                if iComp > 0:
 
-    except:
-        errorMsg()
-        return outputTbl, outputValues
+                    for cokey, vals in dHorizon.items():
 
-## ===================================================================================
-def AggregateCo_PP_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker):
-    #
-    # Aggregate data to the map unit level using a sum (Hydric)
-    # This is Percent Present
-    # Soil Data Viewer reports zero for non-Hydric map units. This function is
-    # currently not creating a record for those because they are not included in the
-    # sdv_initial table.
-    #
-    # Will try removing sql whereclause from cursor and apply it to each record instead.
-    #
-    # Added Areasymbol to output
+                        # get component level data
+                        mukey, pct, hzT, cval, areasym = vals
 
-    try:
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+                        # calculate mean value for entire depth range
+                        if not cval is None and hzT > 0:
+                            newval = float(cval) / hzT
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+                        else:
+                            newval = None
 
-        outputTbl = os.path.join(gdb, tblName)
-        fldPrecision = max(0, dSDV["attributeprecision"])
-        inFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]  # not sure why I have AREASYMBOL on the end..
-        outFlds = ["MUKEY", "AREASYMBOL", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+                        if cokey in dComp:
+                            pct, mval, areasym = dComp[cokey]
+                            newval = newval + mval
 
-        inFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["attributecolumnname"].upper()]  # not sure why I have AREASYMBOL on the end..
-        outFlds = ["MUKEY", "AREASYMBOL", dSDV["resultcolumnname"].upper()]
+                        dComp[cokey] = [pct, newval, areasym]
 
-        sqlClause =  (None, "ORDER BY MUKEY ASC")
+                # Test iteration through dCompList?? and replace dMu
+                if tieBreaker == dSDV["tiebreakhighlabel"]:
+                    bRev = True
 
-        # For Percent Present, do not apply the whereclause to the cursor. Wait
-        # and use it against each record so that all map units are rated.
-        #whereClause = dSDV["sqlwhereclause"]
-        whereClause = ""
-        
-        hydric = dSDV["sqlwhereclause"].split("=")[1].encode('ascii').strip().replace("'","")
-        #PrintMsg(" \n" + attribcolumn + " = " + hydric, 1)
+                else:
+                    bRev = False
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+                for mukey, cokeys in dCompList.items():
+                    if len(cokeys) > 0:
+                        # find component with value according to tiebreaker rule
+                        # assign that set of values to dMu
+                        valList = list()
 
-        # Create outputTbl based upon initialTbl schema
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+                        for cokey in cokeys:
+                            try:
+                                pct, newval, areasym = dComp[cokey]
 
-        if outputTbl == "":
-            return outputTbl, outputValues
+                                if not newval is None:
+                                    valList.append(newval)
 
-        lastMukey = "xxxx"
-        dRating = dict()
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-        iMax = -999999999
-        iMin = 999999999
+                            except:
+                                #PrintMsg("\tNo data for cokey: " + cokey, 1)
+                                pass
 
-        if bVerbose:
-            PrintMsg(" \nReading " + initialTbl + " and writing to " + outputTbl, 1)
+                        if len(valList):
+                            valList.sort(reverse=bRev)
+                            val = valList[0]
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                for rec in cur:
-                    mukey, areasym, comppct, val= rec
+                            if not val is None:
+                                val = round(val, fldPrecision)
 
-                    if comppct is None:
-                        comppct = 0
+                            outputValues[0] = min(valList[0], outputValues[0])
+                            outputValues[1] = max(valList[0], outputValues[1])
 
-                    if mukey != lastMukey and lastMukey != "xxxx":
-                        #if sumPct > 0:
-                        # write out record for previous mapunit
-                        newrec = [lastMukey, areasym, sumPct]
-                        ocur.insertRow(newrec)
-                        iMax = max(sumPct, iMax)
+                        else:
+                            val = None
 
-                        if not sumPct is None:
-                            iMin = min(sumPct, iMin)
 
-                        # reset variables for the next mapunit record
-                        sumPct = 0
+                        murec =  mukey, pct, val, areasym
+                        #dMu[mukey] = newrec
+                        ocur.insertRow(murec)
+                        #PrintMsg("\tMapunit: " + mukey + "; " + str(pct) + "%; " + str(val), 1)
 
-                    # set new mapunit flag
-                    lastMukey = mukey
 
-                    # accumulate data for this mapunit
-                    if str(val).upper() == hydric.upper():
-                        # using the sqlwhereclause on each record so that
-                        # the 'NULL' hydric map units are assigned zero instead of NULL.
-                        sumPct += comppct
+        outputValues.sort()
 
-                # Add final record
-                newrec = [lastMukey, areasym, sumPct]
-                ocur.insertRow(newrec)
+        #if (bZero and outputValues ==  [0.0, 0.0]):
+        #    PrintMsg("No data for " + sdvAtt, 1)
 
-        return outputTbl, [iMin, iMax]
+        return outputTbl, outputValues
 
     except MyError, e:
         PrintMsg(str(e), 2)
-        return outputTbl, []
+        return outputTbl, outputValues
 
     except:
         errorMsg()
-        return outputTbl, []
+        return outputTbl, outputValues
 
 ## ===================================================================================
-def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
-    # Aggregate mapunit-component-horizon data to the map unit level using a weighted average
-    #
-    # This version uses SUM for horizon data as in AWS
+def AggregateHz_MaxMin_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    # Aggregate mapunit-component-horizon data to the map unit level using weighted average
+    # for horizon data, but the assigns either the minimum or maximum component rating to
+    # the map unit, depending upon the Tiebreaker setting.
     # Added areasymbol to output
-    #
     try:
-        import decimal
-
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
         #
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
         fldPrecision = max(0, dSDV["attributeprecision"])
 
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
@@ -8330,18 +9902,43 @@ def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
 
         sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
-        if bZero:
-            whereClause = "COMPPCT_R >=  " + str(cutOff)  # this will treat Nulls as zero which for example will lower pH values beyond the range when a lower horizon has no data
-            
-        else:
+        if bZero == False:
+            # ignore any null values
             whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
+        else:
+            # retrieve null values and convert to zeros during the iteration process
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
+
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
         outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
 
         if outputTbl == "":
+            return outputTbl,[]
+
+        # 2026-10-17 Use the vectorized horizon kernel when SDV_Data is in memory
+        dCompSums = HorizonComponentSums(initialTbl, whereClause, sqlClause, top, bot, bZero, True, False)
+
+        if not dCompSums is None:
+            # Component weighted average, then pick the highest (or lowest) component rating for
+            # each map unit with the larger comppct_r breaking ties, the same as SortData.
+            muIndex = dCompSums["muIndex"]
+            muCount = dCompSums["muCount"]
+            ratings = dCompSums["rating"] / dCompSums["hzT"]
+
+            if tieBreaker == dSDV["tiebreakhighlabel"]:
+                compOrder = numpy.lexsort((-dCompSums["comppct"], -ratings, muIndex))
+
+            else:
+                compOrder = numpy.lexsort((-dCompSums["comppct"], ratings, muIndex))
+
+            bFirst = numpy.ones(len(compOrder), dtype=bool)
+            bFirst[1:] = muIndex[compOrder][1:] != muIndex[compOrder][:-1]
+            muComp = compOrder[bFirst]
+            bMu = numpy.ones(muCount, dtype=bool)
+            outputValues = WriteHorizonRollup(outputTbl, outFlds, dCompSums, dCompSums["comppct"][muComp], ratings[muComp], bMu, fldPrecision)
             return outputTbl, outputValues
 
         dPct = dict()  # sum of comppct_r for each map unit
@@ -8352,12 +9949,9 @@ def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
         sumPct = 0
         sumProd = 0
         meanVal = 0
-        #prec = dSDV["attributeprecision"]
-        roundOff = 2
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
                 for rec in cur:
                     mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
@@ -8368,37 +9962,31 @@ def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
                     if val is None and bZero:
                         val = 0
 
-                    if val is not None:
+                    if val is not None and hzdept is not None and hzdepb is not None:
 
                         # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
                         try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # Getting a None error here.usable thickness from this horizon
+                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
 
                         except:
                             hzT = 0
 
                         if hzT > 0:
-                            aws = float(hzT) * val
+                            rating = float(hzT) * val   # Not working for KFactor WTA
+                            #rating = float(hzT) * float(val)   # Try floating the KFactor to see if that will work. Won't it still have to be rounded to standard KFactor index value?
+
                             #PrintMsg("\t" + str(aws), 1)
 
                             if not cokey in dComp:
                                 # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = [mukey, comppct, hzT, aws, areasym]
-
-                                try:
-                                    dPct[mukey] = dPct[mukey] + comppct
-
-                                except:
-                                    dPct[mukey] = comppct
+                                dComp[cokey] = [mukey, comppct, hzT, rating, areasym]
 
                             else:
                                 # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, dHzT, dAWS, areasym = dComp[cokey]
-                                dAWS = dAWS + aws
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = [mukey, comppct, dHzT, dAWS, areasym]
-
-                        #arcpy.SetProgressorPosition()
+                                mukey, comppct, dHzT, dRating, areasym = dComp[cokey]
+                                dRating += rating
+                                dHzT += hzT
+                                dComp[cokey] = [mukey, comppct, dHzT, dRating, areasym]
 
                 # get the total number of major components from the dictionary count
                 iComp = len(dComp)
@@ -8408,67 +9996,60 @@ def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
                 if iComp > 0:
                     #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
 
-                    for cokey, dRec in dComp.items():
-                        # get component level data  CHK
-                        mukey, comppct, hzT, val, areasym = dRec
-
-                        # get sum of component percent for the mapunit  CHK
-                        try:
-                            sumCompPct = float(dPct[mukey])
-
-                        except:
-                            # set the component percent to zero if it is not found in the
-                            # dictionary. This is probably a 'Miscellaneous area' not included in the  CHK
-                            # data or it has no horizon information.
-                            sumCompPct = 0
-
-                        #PrintMsg(areasym + ", " + mukey + ", " + cokey + ", " + str(comppct) + ", " + str(sumCompPct) + ", " + str(hzT) + ", " + str(val), 1)  # These look good
-
-
-                        # calculate component percentage adjustment
+                    for cokey, vals in dComp.items():
 
-                        if sumCompPct > 0:
-                            # If there is no data for any of the component horizons, could end up with 0 for
-                            # sum of comppct_r
-                            adjCompPct = float(comppct) / sumCompPct   # WSS method
+                        # get component level data
+                        mukey, comppct, hzT, cval, areasym = vals
+                        if not cval is None and hzT > 0:
+                            rating = cval / hzT  # final horizon weighted average for this component
 
-                            # adjust the rating value down by the component percentage and by the sum of the
-                            # usable horizon thickness for this component
-                            aws = adjCompPct * val
-                            hzT = hzT * adjCompPct    # Adjust component share of horizon thickness by comppct
+                        else:
+                            rating = None
 
-                            # Update component values in component dictionary
-                            dComp[cokey] = mukey, comppct, hzT, aws, areasym
+                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
 
-                            # Populate dMu dictionary
-                            if mukey in dMu:
-                                val1, val3, areasym = dMu[mukey]
-                                comppct = comppct + val1
-                                aws = aws + val3
+                        try:
+                            # append component weighted average rating to the mapunit dictionary
+                            dMu[mukey].append([comppct, rating, areasym])
 
-                            dMu[mukey] = [comppct, aws, areasym]
+                        except:
+                            # create a new mapunit record in the dictionary
+                            dMu[mukey] = [[comppct, rating, areasym]]
 
-                # Write out map unit aggregated AWS
+                # Write out map unit aggregated rating
                 #
-                murec = list()
-                outputValues= [999999999, -999999999]
+                #murec = list()
+                outputValues = [999999999, -999999999]
 
-                for mukey, val in dMu.items():
-                    compPct, aws, areasym = val
-                    aws = round(aws, fldPrecision) # Test temporary removal of rounding
-                    #aws = decimal.Decimal(str(aws)).quantize(decimal.Decimal("0.01"), decimal.ROUND_HALF_UP)
-                    murec = [mukey, comppct, aws, areasym]
-                    ocur.insertRow(murec)
+                if tieBreaker == dSDV["tiebreakhighlabel"]:
+                    for mukey, muVals in dMu.items():
+                        muVal = SortData(muVals, 1, 0, True, True)
+                        pct, val, areasym = muVal
+                        rating = round(val, fldPrecision)
+                        murec = [mukey, pct, rating, areasym]
+                        ocur.insertRow(murec)
 
-                    # save max-min values
-                    if not aws is None:
-                        outputValues[0] = min(aws, outputValues[0])
-                        outputValues[1] = max(aws, outputValues[1])
+                        if not rating is None:
+                            # save overall max-min values
+                            outputValues[0] = min(rating, outputValues[0])
+                            outputValues[1] = max(rating, outputValues[1])
 
-        outputValues.sort()
+                else:
+                    # Lower
+                    for mukey, muVals in dMu.items():
+                        muVal = SortData(muVals, 1, 0, False, True)
+                        pct, val, areasym = muVal
+                        rating = round(val, fldPrecision)
+                        murec = [mukey, pct, rating, areasym]
+                        ocur.insertRow(murec)
+
+                        if not rating is None:
+                            # save overall max-min values
+                            outputValues[0] = min(rating, outputValues[0])
+                            outputValues[1] = max(rating, outputValues[1])
 
         #if (bZero and outputValues ==  [0.0, 0.0]):
-            #PrintMsg(" \n2. No data for " + sdvAtt, 1)
+        #    PrintMsg(" \n7. No data for " + sdvAtt, 1)
 
         return outputTbl, outputValues
 
@@ -8481,14 +10062,12 @@ def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
         return outputTbl, []
 
 ## ===================================================================================
-def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
-    # Aggregate mapunit-component-horizon data to the map unit level using a weighted average
-    #
-    # This version uses weighted average for horizon data as in AWC and most others
-    # Added areasymbol to output
+def AggregateHz_MaxMin_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    # Aggregate mapunit-component-horizon data to the map unit level using the highest rating
+    # from all horizons. Currently this would only apply to K Factor and dominant condition.
+
     try:
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-
         #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
@@ -8496,17 +10075,20 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
         # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
         fldPrecision = max(0, dSDV["attributeprecision"])
+
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
         sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
-        if bZero:
-            whereClause = "COMPPCT_R >=  " + str(cutOff)  # this will treat Nulls as zero which for example will lower pH values beyond the range when a lower horizon has no data
-            
-        else:
+        if bZero == False:
+            # ignore any null values
             whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
+        else:
+            # retrieve null values and convert to zeros during the iteration process
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
+
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
@@ -8524,9 +10106,8 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
         sumProd = 0
         meanVal = 0
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
                 for rec in cur:
                     mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
@@ -8534,8 +10115,6 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
                     # bot = hzdepb
                     # td = top of range
                     # bd = bottom of range
-                    if val is None and bZero:
-                        val = 0
 
                     if val is not None and hzdept is not None and hzdepb is not None:
 
@@ -8547,29 +10126,22 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
                             hzT = 0
 
                         if hzT > 0:
-                            aws = float(hzT) * val * comppct
+                            ratingIndx = domainValues.index(val)   # Change KFactor to an index based upon domain order
+
+                            #PrintMsg("\t" + str(aws), 1)
 
                             if not cokey in dComp:
                                 # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = [mukey, comppct, hzT, aws, areasym]
-                                try:
-                                    dPct[mukey] = dPct[mukey] + comppct
-
-                                except:
-                                    dPct[mukey] = comppct
+                                ratingList = [ratingIndx]
+                                dComp[cokey] = [mukey, comppct, ratingList, areasym]
 
                             else:
                                 # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, dHzT, dAWS, areasym = dComp[cokey]
-                                dAWS = dAWS + aws
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = [mukey, comppct, dHzT, dAWS, areasym]
-
-                        #else:
-                        #    PrintMsg("\tFound horizon for mapunit (" + mukey + ":" + cokey + " with hzthickness of " + str(hzT), 1)
-
-                    #else:
-                    #    PrintMsg("\tFound horizon with no data for mapunit (" + mukey + ":" + cokey + " with hzthickness of " + str(hzT), 1)
+                                mukey, comppct, ratingList, areasym = dComp[cokey]
+                                
+                                if not ratingIndx in ratingList:
+                                    ratingList.append(ratingIndx)
+                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
 
                 # get the total number of major components from the dictionary count
                 iComp = len(dComp)
@@ -8578,52 +10150,54 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
 
                 if iComp > 0:
                     #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
-                    #arcpy.SetProgressor("step", "Saving map unit and component AWS data...",  0, iComp, 1)
 
                     for cokey, vals in dComp.items():
 
                         # get component level data
-                        mukey, comppct, hzT, cval, areasym = vals
-
-                        # get sum of comppct for mapunit
-                        sumPct = dPct[mukey]
-
-                        # calculate component weighted values
-                        # get weighted layer thickness
-                        divisor = sumPct * hzT
-
-                        if divisor > 0:
-                            newval = float(cval) / divisor
-
-                        else:
-                            newval = 0.0
+                        mukey, comppct, ratingList, areasym = vals
+                        
+                        ratingIndx = max(ratingList)  # get highest K Factor from all horizons for this component
+                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
 
-                        if mukey in dMu:
-                            pct, mval, areasym = dMu[mukey]
-                            newval = newval + mval
+                        try:
+                            # append component weighted average rating to the mapunit dictionary
+                            dMu[mukey].append([comppct, ratingIndx, areasym])
 
-                        dMu[mukey] = [sumPct, newval, areasym]
+                        except:
+                            # create a new mapunit record in the dictionary
+                            dMu[mukey] = [[comppct, ratingIndx, areasym]]
 
-                # Write out map unit aggregated AWS
+                # Write out map unit aggregated rating
                 #
-                murec = list()
-                outputValues= [999999999, -999999999]
-
-                for mukey, vals in dMu.items():
-                    sumPct, val, areasym = vals
-                    aws = round(val, fldPrecision)
-                    murec = [mukey, sumPct, aws, areasym]
-                    ocur.insertRow(murec)
-                    # save max-min values
-                    if not aws is None:
-                        outputValues[0] = min(aws, outputValues[0])
-                        outputValues[1] = max(aws, outputValues[1])
+                outputValues = [domainValues[0], domainValues[-1]]
 
-        outputValues.sort()
+                #if tieBreaker == dSDV["tiebreakhighlabel"]:
+                oid = 0
+                
+                for mukey, muVals in dMu.items():
+                    oid += 1
+                    #muVal = SortData(muVals, 1, 0, True, True)
+                    muVal = SortData(muVals, 0, 0, True, True)
+                    pct, ratingIndx, areasym = muVal
+                    rating = domainValues[ratingIndx]
+                    murec = [mukey, pct, rating, areasym]
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg(" \nNo data for " + sdvAtt, 1)
+                    
+                    #if mukey == "1427104":
+                    #if mukey == "1380525":
+                    #    PrintMsg(" \nOutput Table: " + outputTbl, 1)
+                    #    PrintMsg("\t" + str(muVals), 1)
+                    #    PrintMsg("\t" + str(muVal), 1)
+                    #    PrintMsg("\t" + rating, 1)
+                    #    PrintMsg("\t" + str(oid) + ", " + str(murec), 1)
+                        
+                    
+                    ocur.insertRow(murec)
 
+                    if not rating is None:
+                    #    # save overall max-min values
+                        outputValues[0] = min(rating, outputValues[0])
+                        outputValues[1] = max(rating, outputValues[1])
 
         return outputTbl, outputValues
 
@@ -8635,64 +10209,54 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
         errorMsg()
         return outputTbl, []
 
-## ===================================================================================
-def AggregateHz_DCP_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
-    #
-    # Dominant component for mapunit-component-horizon data to the map unit level
-    #
-    # This version uses weighted average for horizon data
-    # Added areasymbol to output
-    #
-    # Problem: Need to fix bZero logic related to pH (per Chad)
 
+## ===================================================================================
+def AggregateHz_MaxMin_DCP(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    # Aggregate mapunit-component-horizon data to the map unit level using the highest rating
+    # from all horizons. Currently this would only apply to K Factor and dominant component
+    
     try:
         arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        #bVerbose = True
-
+        #
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
         outputTbl = os.path.join(gdb, tblName)
         fldPrecision = max(0, dSDV["attributeprecision"])
+
         inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
         outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, COKEY ASC, HZDEPT_R ASC")  # 2020-01-23 added cokey to sort
+        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
-        if bZero:
-            whereClause = "COMPPCT_R >=  " + str(cutOff)  # this will treat Nulls as zero which for example will lower pH values beyond the range when a lower horizon has no data
-            
-        else:
+        if bZero == False:
+            # ignore any null values
             whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
+        else:
+            # retrieve null values and convert to zeros during the iteration process
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
 
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
         outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-        outputValues= [999999999, -999999999]
 
         if outputTbl == "":
-            raise MyError,""
+            return outputTbl,[]
 
         dPct = dict()  # sum of comppct_r for each map unit
-        dHorizon = dict()
         dComp = dict() # component level information
         dMu = dict()
-        dCompList = dict()
 
         # reset variables for cursor
         sumPct = 0
         sumProd = 0
         meanVal = 0
 
-        #testMu = '676909'  # STATSGO mapunit with inconsistencies in horizon calculations for dominant component
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
                 for rec in cur:
                     mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
@@ -8701,1390 +10265,1528 @@ def AggregateHz_DCP_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreak
                     # td = top of range
                     # bd = bottom of range
 
-                    #if mukey == testMu:
-                    #    PrintMsg("\tRaw: " + str(rec), 1)
+                    if val is not None and hzdept is not None and hzdepb is not None:
+
+                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
+                        try:
+                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
+
+                        except:
+                            hzT = 0
+
+                        if hzT > 0:
+                            ratingIndx = domainValues.index(val)   # Change KFactor to an index based upon domain order
+
+                            #PrintMsg("\t" + str(aws), 1)
+
+                            if not cokey in dComp:
+                                if not mukey in dMu:
+                                    dMu[mukey] = cokey
+
+                                    # Create initial entry for this component using the first horiozon CHK
+                                    ratingList = [ratingIndx]
+                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
+
+                            elif cokey == dMu[mukey]:
+                                # accumulate total thickness and total rating value by adding to existing component values  CHK
+                                mukey, comppct, ratingList, areasym = dComp[cokey]
+                                
+                                if not ratingIndx in ratingList:
+                                    ratingList.append(ratingIndx)
+                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
+
+                # get the total number of major components from the dictionary count
+                iComp = len(dComp)
+
+                # Read through the component-level data and summarize to the mapunit level
+
+                if iComp > 0:
+                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+
+                    for cokey, vals in dComp.items():
+
+                        # get component level data
+                        mukey, comppct, ratingList, areasym = vals
+                        
+                        ratingIndx = max(ratingList)  # get highest K Factor from all horizons for this component
+                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
+
+                        try:
+                            # append component weighted average rating to the mapunit dictionary
+                            dMu[mukey].append([comppct, ratingIndx, areasym])
+
+                        except:
+                            # create a new mapunit record in the dictionary
+                            dMu[mukey] = [[comppct, ratingIndx, areasym]]
+
+                # Write out map unit aggregated rating
+                #
+                outputValues = [domainValues[0], domainValues[-1]]
+
+                #if tieBreaker == dSDV["tiebreakhighlabel"]:
+                oid = 0
+                
+                for mukey, muVals in dMu.items():
+                    oid += 1
+                    muVal = SortData(muVals, 1, 0, True, True)              
+                    pct, ratingIndx, areasym = muVal
+                    rating = domainValues[ratingIndx]
+                    murec = [mukey, pct, rating, areasym]
+                    #if mukey == "1427104":
+                    #    PrintMsg(" \nOutput Table: " + outputTbl, 1)
+                    #    PrintMsg("\t" + str(muVals), 1)
+                    #    PrintMsg("\t" + str(muVal), 1)
+                    #    PrintMsg("\t" + rating, 1)
+                    #    PrintMsg("\t" + str(oid) + ", " + str(murec), 1)
+                    ocur.insertRow(murec)
+
+                    if not rating is None:
+                    #    # save overall max-min values
+                        outputValues[0] = min(rating, outputValues[0])
+                        outputValues[1] = max(rating, outputValues[1])
+
+        return outputTbl, outputValues
 
-                    if not cokey in dHorizon:
-                        if not mukey in dPct:
-                            # Problem:
-                            # This statement above is only getting the first component and ignoring any ties based upon component percent
-                            # It also may be skipping the dominant component when the value is Null. Is this what I really want?
-                            #
-                            dCompList[mukey] = [cokey]  # initialize list of components for this mapunit
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, []
 
-                            dPct[mukey] = comppct  # cursor is sorted on comppct_r descending, so this should be dominant component percent.
+    except:
+        errorMsg()
+        return outputTbl, []
 
-                            if val is not None and hzdept is not None and hzdepb is not None:
-                                # Normal component with horizon data
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = float(hzT) * val
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t1. " + str(newrec), 1)
 
-                            elif hzdept is not None and hzdepb is not None:
-                                # new code to capture components where the rating value is Null
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = None
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t1 For NULL. " + str(newrec), 1)
-                                
 
-                        elif comppct >= dPct[mukey]:
-                            # This should be a mapunit that has more than one dominant component
-                            dCompList[mukey].append(cokey)
+## ===================================================================================
+def UpdateMetadata(outputWS, target, parameterString, creditsString, aggMethod, sdvAtt, toDay):
+    # Update metadata for target object (VALU1 table)
+    #
+    try:
 
-                            if val is not None and hzdept is not None and hzdepb is not None:
-                                # Normal component with horizon data
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = float(hzT) * val
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t2. " + str(newrec), 1)
+        # Clear process steps from the VALU1 table. Mostly AddField statements.
+        #
+        # NOTE: The geoprocessing metadata conversion tools to not work in the 64 bit background processing
+        #
+        """
+        Any script or script tools you run while inside Desktop honors the background processing setting.
+        If background processing is turned on, the scripts will execute in the 64-bit space.
 
-                            elif hzdept is not None and hzdepb is not None:
-                                # new code to capture components where the rating value is Null
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = None
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t2 For NULL. " + str(newrec), 1)
+        When you execute a stand-alone Python script outside the application, you need to ensure
+        you're running against the 64-bit Python installation to make use of 64-bit geoprocessing.
+        Double-clicking a Python file from Windows Explorer will launch the file using whatever
+        association Windows has set for the .py file. Typically, this is the last version of Python installed,
+        which should be 64 bit. If you want to be absolutely sure which version of Python you're
+        running against (32 or 64), it is best to fully qualify the Python executable when running
+        your script at command line. For example, the following command will ensure the script is
+        run as 64 bit:
+                      c:\Python27\ArcGISx6410.2\python.exe c:\gisData\scripts\intersect.py.
 
-                            else:
-                                # Component with no data for this horizon
-                                newrec = [mukey, comppct, None, None, areasym]
-                                dHorizon[cokey] = newrec
+        """
+        # Function parameters: bMetadata = UpdateMetadata(gdb, outputTbl, parameterString, creditsString, aggMethod, sdvAtt, toDay)
+        #   outputWS - input gSSURGO database
+        #   target   - SDV rating table that was just created
+        #   parameterString - string containing all user settings from the menu
+        #   creditsString   - user login and name of this script
+        #   aggMethod - method used to summarize the data to the map unit level.
+        #   sdvAtt - short description of this map layer
+        #   toDay - date stamp string
+        #
+        #bVerbose = True
 
-                                #if mukey == testMu:
-                                #    PrintMsg("\t3. " + str(newrec), 1)
+        # Determine whether this script is running in 32 or 64 bit mode
+        arcpy.SetProgressorLabel("Updating metadata for " + os.path.basename(target))
+        pythonVersion = sys.version
+        #fy = "2018"
 
+        if pythonVersion.find("32 bit") == -1:
+            # Print a non-fatal warning to the user that the metadata will not be updated in 64 bit mode
+            PrintMsg(" \nWarning! Unable to update metadata when running under 64-bit background-mode", 1)
+            return False
 
-                    else:
-                        try:
-                            # For dominant component:
-                            # accumulate total thickness and total rating value by adding to existing component values  CHK
+        env.workspace = outputWS
+        
+        if not arcpy.Exists(target):
+            target = os.path.join(outputWS, target)
 
-                            mukey, comppct, dHzT, dAWS, areasym = dHorizon[cokey]
+        # Remove geoprocessing history
 
-                            if val is not None and hzdept is not None and hzdepb is not None:
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = float(hzT) * val
-                                dAWS = max(0, dAWS) + aws
-                                dHzT = max(0, dHzT) + hzT
-                                newrec = [mukey, comppct, dHzT, dAWS, areasym]
-                                dHorizon[cokey] = newrec
+        remove_gp_history_xslt = os.path.join(os.path.dirname(sys.argv[0]), "remove geoprocessing history.xslt")
+        out_xml = os.path.join(env.scratchFolder, "xxClean.xml")
 
-                                #if mukey == testMu:
-                                #    PrintMsg("\t4. " + str(newrec), 1)
-                                
-                            elif hzdept is not None and hzdepb is not None:
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = 0
-                                dAWS = max(0, dAWS) + aws
-                                dHzT = max(0, dHzT) + hzT
-                                newrec = [mukey, comppct, dHzT, dAWS, areasym]
-                                dHorizon[cokey] = newrec
+        if not arcpy.Exists(remove_gp_history_xslt):
+            raise MyError, "Missing file: " + remove_gp_history_xslt
 
-                                #if mukey == testMu:
-                                #    PrintMsg("\t4 For Null. " + str(newrec), 1)
-                                    
-                        except KeyError:
-                            # Hopefully this is a component other than dominant
-                            #if mukey == testMu:
-                            #    PrintMsg("\t5. Skipped because of dHorizon KeyError for cokey: " + cokey, 1)
-                            pass
+        if arcpy.Exists(out_xml):
+            arcpy.Delete_management(out_xml)
 
-                        except:
-                            errorMsg()
+        # Using the stylesheet, write 'clean' metadata to out_xml file and then import back in
+        # It appears that the metadata tools do not work within 64 bit background processing for 10.4.
+        # The failure does not even generate an error message.
+        try:
+            if bVerbose:
+                PrintMsg("\tClearing geoprocessing history for " + target, 1)
+                         
+            arcpy.XSLTransform_conversion(target, remove_gp_history_xslt, out_xml, "")
 
+            if bVerbose:
+                PrintMsg("\tImporting metadata from " + target, 1)
+                
+            arcpy.MetadataImporter_conversion(out_xml, os.path.join(outputWS, target))
 
-                # get the total number of major components from the dictionary count
-                iComp = len(dHorizon)
+        except:
+            PrintMsg(" \nFailed to clean up metadata", 0)
 
-                # Read through the component-level data and summarize to the mapunit level
+        # Set metadata translator file
+        dInstall = arcpy.GetInstallInfo()
+        installPath = dInstall["InstallDir"]
+        prod = r"Metadata/Translator/ARCGIS2FGDC.xml"
+        mdTranslator = os.path.join(installPath, prod)
 
-                if iComp > 0:
+        if not arcpy.Exists(mdTranslator):
+            raise MyError, "Missing metadata translator: " + mdTranslator
 
-                    for cokey, vals in dHorizon.items():
+        # Define input and output XML files
+        xmlPath = os.path.dirname(sys.argv[0])
 
-                        # get component level data
-                        mukey, pct, hzT, cval, areasym = vals
+        mdExport = os.path.join(xmlPath, "SDV_Metadata2.xml")  # template metadata stored in ArcTool folder
 
-                        # calculate mean value for entire depth range
-                        if not cval is None and hzT > 0:
-                            newval = float(cval) / hzT
+        mdImport = os.path.join(env.scratchFolder, "xxImport.xml")  # the metadata xml that will provide the updated info
 
-                        else:
-                            newval = None
+        # Cleanup XML files from previous runs
+        if os.path.isfile(mdImport):
+            os.remove(mdImport)
 
-                        if cokey in dComp:
-                            pct, mval, areasym = dComp[cokey]
-                            newval = newval + mval
+        mdState = ""
+        ratingFld = dSDV["resultcolumnname"]
 
-                        dComp[cokey] = [pct, newval, areasym]
+        # Currently in this script, only the metadata title, summary, description, credits and the new rating field description are updated.
+        #
+        dMetadata = dict()  # dictionary key is the search term that exists in the template metadata. Dictionary value is the replacement.
+        dMetadata["SDV_Title"] = dSDV["attributename"] + " - " + aggMethod
+        dMetadata["SDV_Description"] = "Map unit rating table for '" + dSDV["attributename"] +"'" + "\r" + dSDV["attributedescription"] + "\r" + parameterString
+        dMetadata["SDV_Credits"] = "USDA-Natural Resources Conservation Service; " + creditsString
+        dMetadata["SDV_Summary"] = "Map the '" + sdvAtt + "' soil " + dSDV["attributetype"].lower() + " by joining this rating table to the soil layer (polygon or raster) using the mukey field."
 
-                # Test iteration through dCompList?? and replace dMu
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    bRev = True
+        dFields = dict()
+        dFields["MUKEY"] = "Soil map unit primary key"
+        dFields["AREASYMBOL"] = "Soil Survey ID"
+        dFields["COMPPCT_R"] = "Component percent of the map unit"
+        dFields["OBJECTID"] = "Internal feature number"
+        dFields[ratingFld] = "Map unit rating for " + sdvAtt
 
-                else:
-                    bRev = False
+        # Convert XML from template metadata to tree format
+        if bVerbose:
+            PrintMsg("\tParsing metadata...", 1)
+                         
+        tree = ET.parse(mdExport)
+        root = tree.getroot()
 
-                for mukey, cokeys in dCompList.items():
-                    if len(cokeys) > 0:
-                        # find component with value according to tiebreaker rule
-                        # assign that set of values to dMu
-                        valList = list()
+        elemList = tree.getiterator()
 
-                        for cokey in cokeys:
-                            try:
-                                pct, newval, areasym = dComp[cokey]
+        for elem in elemList:
+            #print elem.tag
+            for child in elem:
+                if str(child.text) in dMetadata:
+                    child.text = dMetadata[child.text]
 
-                                if not newval is None:
-                                    valList.append(newval)
+                if child.tag == "attrlabl":
+                    # This is a field name
+                    fldName = child.text
 
-                            except:
-                                #PrintMsg("\tNo data for cokey: " + cokey, 1)
-                                pass
+                    if fldName in dFields:
+                        fldDesc = dFields[fldName]
 
-                        if len(valList):
-                            valList.sort(reverse=bRev)
-                            val = valList[0]
+                    elif fldName == "SDV_RATING":
+                        child.text = ratingFld
+                        fldName = ratingFld
 
-                            if not val is None:
-                                val = round(val, fldPrecision)
+                        if fldName in dFields:
+                            fldDesc = dFields[fldName]
+
+                elif child.tag == "attrdef":
+                    child.text = fldDesc
 
-                            outputValues[0] = min(valList[0], outputValues[0])
-                            outputValues[1] = max(valList[0], outputValues[1])
 
-                        else:
-                            val = None
+        #  create new xml file with the updated information
+        tree.write(mdImport, encoding="utf-8", xml_declaration=None, default_namespace=None, method="xml")
 
+        # import updated metadata to the geodatabase table
+        # Convert XML from template metadata to tree format
+        if bVerbose:
+            PrintMsg("\tImporting " + mdExport + "...", 1)
+            
+        arcpy.MetadataImporter_conversion(mdExport, target)
 
-                        murec =  mukey, pct, val, areasym
-                        #dMu[mukey] = newrec
-                        ocur.insertRow(murec)
-                        #PrintMsg("\tMapunit: " + mukey + "; " + str(pct) + "%; " + str(val), 1)
+        if not arcpy.Exists(mdImport):
+            raise MyError, "Missing metadata file: " + mdImport
 
+        if bVerbose:
+            PrintMsg("\tImporting " + mdImport + " to " + target + "...", 1)
 
-        outputValues.sort()
+        # Error here. Running Drainage Class map. Unable to get lock after processing several successfully.
+        time.sleep(1)
+        arcpy.ImportMetadata_conversion(mdImport, "FROM_FGDC", target, "DISABLED")
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg("No data for " + sdvAtt, 1)
+        # delete the temporary xml metadata files
+        if os.path.isfile(mdImport):
+            #os.remove(mdImport)
+            pass
 
-        return outputTbl, outputValues
+        #if os.path.isfile(mdExport):
+        #    os.remove(mdExport)
+        arcpy.SetProgressorLabel("Finished updating metadata for " + os.path.basename(target))
+        return True
 
     except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, outputValues
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return False
 
     except:
         errorMsg()
-        return outputTbl, outputValues
+        return False
 
 ## ===================================================================================
-def AggregateHz_MaxMin_WTA(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
-    # Aggregate mapunit-component-horizon data to the map unit level using weighted average
-    # for horizon data, but the assigns either the minimum or maximum component rating to
-    # the map unit, depending upon the Tiebreaker setting.
-    # Added areasymbol to output
+def CreateGroupLayer(grpLayerName, mxd, df):
     try:
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+        # Use template lyr file stored in current script directory to create new Group Layer
+        # This SDVGroupLayer.lyr file must be part of the install package along with
+        # any used for symbology. The name property will be changed later.
         #
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
-        fldPrecision = max(0, dSDV["attributeprecision"])
+        # arcpy.mapping.AddLayerToGroup(df, grpLayer, dInterpLayers[sdvAtt], "BOTTOM")
+        #
+        grpLayerFile = os.path.join(os.path.dirname(sys.argv[0]), "SDV_GroupLayer.lyr")
 
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+        if not arcpy.Exists(grpLayerFile):
+            raise MyError, "Missing group layer file (" + grpLayerFile + ")"
 
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
+        testLayers = arcpy.mapping.ListLayers(mxd, grpLayerName, df)
 
-        if bZero == False:
-            # ignore any null values
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+        if len(testLayers) > 0:
+            # Using existing group layer
+            grpLayer = testLayers[0]
 
         else:
-            # retrieve null values and convert to zeros during the iteration process
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
+            # Group layer does not exist, make a new one
+            grpLayer = arcpy.mapping.Layer(grpLayerFile)  # template group layer file
+            grpLayer.visible = False
+            grpLayer.name = grpLayerName
+            grpLayer.description = "Group layer containing raster conversions from gSSURGO vector soil maps"
+            grpLayer.visible = False
+            arcpy.mapping.AddLayer(df, grpLayer, "TOP")
+            PrintMsg(" \nAdding new group layer to ArcMap TOC: " + str(grpLayer.name), 0)
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+        return grpLayer
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+    except MyError, e:
+        # Example: raise MyError, "This is an error message"
+        PrintMsg(str(e), 2)
+        return None
 
-        if outputTbl == "":
-            return outputTbl,[]
+    except:
+        errorMsg()
+        return None
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
+## ===================================================================================
+def RegisterAggregation(aggName, aggFunction, level, bDepths, valueRule, outputRange=None, kernel=None, tieBreak=None, nulls="keep"):
+    # Add an aggregation method to the dAggMethods dispatch table. 2026-10-17
+    #
+    # aggName:     name used by SelectAggregation
+    # aggFunction: function with the Aggregate* parameters (gdb, sdvAtt, sdvFld, initialTbl, bZero,
+    #              cutOff, tieBreaker) plus top, bot when bDepths is True. Returns outputTbl, outputValues.
+    #              None for the methods run by AggregateComponents.
+    # level:       lowest table read by the method: mapunit, component, comonth or horizon (run log)
+    # valueRule:   outputValues for numeric ratings: 'minmax' ([min, max]) or 'distinct' (each rating),
+    #              used when the ratings are saved to the rating cache
+    # outputRange: fixed [min, max] for the legend (fuzzy interps), otherwise None
+    #
+    # Component-level methods run by AggregateComponents:
+    # kernel:      function returning [comppct, rating] for the components of one map unit (Mapunit*)
+    # tieBreak:    sort order of the ratings within COMPPCT_R. 'label' sorts ascending for the
+    #              tiebreaklowlabel, 'lower' sorts descending for 'Lower', None does not sort the ratings
+    # nulls:       'keep' reads every SDV_Data record, NULL ratings included. 'zero' drops components
+    #              below cutOff and the NULL ratings unless bZero is set, and map units without a rating
+    #              get nullRating (nullratingreplacementvalue)
+    #
+    dAggMethods[aggName] = {"function":aggFunction, "level":level, "depths":bDepths, "values":valueRule, "range":outputRange, \
+                            "kernel":kernel, "tiebreak":tieBreak, "nulls":nulls}
+
+    return True
 
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
+## ===================================================================================
+def RegisterAggregations():
+    # Register the standard SDV aggregation methods. 2026-10-17
+    #
+    RegisterAggregation("Aggregate1", Aggregate1, "mapunit", False, "minmax")
+    RegisterAggregation("AggregateCo_DCP", None, "component", False, "minmax", None, MapunitDCP, "label", "keep")
+    RegisterAggregation("AggregateCo_DCP_Domain", AggregateCo_DCP_Domain, "component", False, "distinct")
+    RegisterAggregation("AggregateCo_DCD", AggregateCo_DCD, "component", False, "distinct")
+    RegisterAggregation("AggregateCo_DCD_Domain", AggregateCo_DCD_Domain, "component", False, "distinct")
+    RegisterAggregation("AggregateCo_Limiting", AggregateCo_Limiting, "component", False, "distinct")
+    RegisterAggregation("AggregateCo_MaxMin", AggregateCo_MaxMin, "component", False, "distinct")
+    RegisterAggregation("AggregateCo_WTA", None, "component", False, "minmax", None, MapunitWTA, "lower", "zero")
+    RegisterAggregation("AggregateCo_WTA_Fuzzy", None, "component", False, "minmax", [0.0, 1.0], MapunitWTA, "lower", "zero")
+    RegisterAggregation("AggregateCo_PP_SUM", None, "component", False, "minmax", None, MapunitPP, None, "keep")
+    RegisterAggregation("AggregateCo_DCP_DTWT", AggregateCo_DCP_DTWT, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_DCD_DTWT", AggregateCo_DCD_DTWT, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_WTA_DTWT", AggregateCo_WTA_DTWT, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_Mo_DCD", AggregateCo_Mo_DCD, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_Mo_DCP_Domain", AggregateCo_Mo_DCP_Domain, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_Mo_DCD_Domain", AggregateCo_Mo_DCD_Domain, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_Mo_MaxMin", AggregateCo_Mo_MaxMin, "comonth", False, "distinct")
+    RegisterAggregation("AggregateCo_Mo_WTA", AggregateCo_Mo_WTA, "comonth", False, "distinct")
+    RegisterAggregation("AggregateHz_WTA_SUM", AggregateHz_WTA_SUM, "horizon", True, "minmax")
+    RegisterAggregation("AggregateHz_WTA_WTA", AggregateHz_WTA_WTA, "horizon", True, "minmax")
+    RegisterAggregation("AggregateHz_DCP_WTA", AggregateHz_DCP_WTA, "horizon", True, "minmax")
+    RegisterAggregation("AggregateHz_MaxMin_WTA", AggregateHz_MaxMin_WTA, "horizon", True, "minmax")
+    RegisterAggregation("AggregateHz_MaxMin_DCD", AggregateHz_MaxMin_DCD, "horizon", True, "minmax")
+    RegisterAggregation("AggregateHz_MaxMin_DCP", AggregateHz_MaxMin_DCP, "horizon", True, "minmax")
+
+    return True
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+## ===================================================================================
+def SelectAggregation(sdvAtt, aggMethod, bFuzzy):
+    # Return the name of the aggregation method in dAggMethods for this attribute,
+    # based upon the sdvattribute settings in dSDV. 2026-10-17
+    #
+    # This is the decision tree that used to call the Aggregate functions directly from CreateSoilMap.
+    #
+    try:
+        if dSDV["attributetype"] == "Property":
+            # These are all Soil Properties
+            # Added addtional logic for Minnesota Crop Index. It has a problem in that mapunitlevelattribflag is set to zero.
 
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-                    if val is None and bZero:
-                        val = 0
+            if (dSDV["mapunitlevelattribflag"] == 1 and \
+                    (dSDV["complevelattribflag"] == 0 and \
+                    dSDV["cmonthlevelattribflag"] == 0 and \
+                    dSDV["horzlevelattribflag"] == 0 )) or \
+                (dSDV["mapunitlevelattribflag"] == 0 \
+                and dSDV["complevelattribflag"] == 0 \
+                and dSDV["cmonthlevelattribflag"] == 0 \
+                and dSDV["horzlevelattribflag"] == 0 ):
+                # This is a Map unit Level Soil Property or it is Minnesota Crop Index in the MUTEXT table
+                #PrintMsg("Map unit level, no aggregation neccessary", 1)
+                return "Aggregate1"
 
-                    if val is not None and hzdept is not None and hzdepb is not None:
+            elif dSDV["complevelattribflag"] == 1:
 
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
+                if dSDV["horzlevelattribflag"] == 0:
+                    # These are Component Level-Only Soil Properties
 
-                        except:
-                            hzT = 0
+                    if dSDV["cmonthlevelattribflag"] == 0:
+                        #
+                        #  These are Component Level Soil Properties
 
-                        if hzT > 0:
-                            rating = float(hzT) * val   # Not working for KFactor WTA
-                            #rating = float(hzT) * float(val)   # Try floating the KFactor to see if that will work. Won't it still have to be rounded to standard KFactor index value?
+                        if aggMethod == "Dominant Component":
+                            #PrintMsg(" \n1. domainValues: " + ", ".join(domainValues), 1)
+                            return "AggregateCo_DCP"
 
-                            #PrintMsg("\t" + str(aws), 1)
+                        elif aggMethod == "Minimum or Maximum":
+                            return "AggregateCo_MaxMin"
 
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = [mukey, comppct, hzT, rating, areasym]
+                        elif aggMethod == "Dominant Condition":
+                            if bVerbose:
+                                PrintMsg(" \nDomain Values are now: " + str(domainValues), 1)
 
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, dHzT, dRating, areasym = dComp[cokey]
-                                dRating += rating
-                                dHzT += hzT
-                                dComp[cokey] = [mukey, comppct, dHzT, dRating, areasym]
+                            if len(domainValues) > 0 and dSDV["tiebreakdomainname"] is not None :  # Problem with NonIrr CapSubCls
+                                if bVerbose:
+                                    PrintMsg(" \n1. aggMethod = " + aggMethod + " and domainValues = " + str(domainValues), 1)
 
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
+                                return "AggregateCo_DCD_Domain"
 
-                # Read through the component-level data and summarize to the mapunit level
+                            else:
+                                if bVerbose:
+                                    PrintMsg(" \n2. aggMethod = " + aggMethod + " and no domainValues", 1)
 
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+                                return "AggregateCo_DCD"
 
-                    for cokey, vals in dComp.items():
+                        elif aggMethod == "Minimum or Maximum":
+                            #
+                            return "AggregateCo_MaxMin"
 
-                        # get component level data
-                        mukey, comppct, hzT, cval, areasym = vals
-                        if not cval is None and hzT > 0:
-                            rating = cval / hzT  # final horizon weighted average for this component
+                        elif aggMethod == "Weighted Average" and dSDV["attributetype"].lower() == "property":
+                            # Using NCCPI for any numeric component level value?
+                            # This doesn't seem to be working for Range Prod 2016-01-28
+                            #
+                            return "AggregateCo_WTA"
+
+                        elif aggMethod == "Percent Present":
+                            # This is Hydric?
+                            return "AggregateCo_PP_SUM"
 
                         else:
-                            rating = None
+                            # Don't know what kind of interp this is
+                            raise MyError, "5. Component aggregation method has not yet been developed ruledesign 3 (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
 
-                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
 
-                        try:
-                            # append component weighted average rating to the mapunit dictionary
-                            dMu[mukey].append([comppct, rating, areasym])
+                    elif dSDV["cmonthlevelattribflag"] == 1:
+                        #
+                        # These are Component-Month Level Soil Properties
+                        #
+                        if dSDV["resultcolumnname"].startswith("Dep2WatTbl"):
+                            #PrintMsg(" \nThis is Depth to Water Table (" + dSDV["resultcolumnname"] + ")", 1)
 
-                        except:
-                            # create a new mapunit record in the dictionary
-                            dMu[mukey] = [[comppct, rating, areasym]]
+                            if aggMethod == "Dominant Component":
+                                return "AggregateCo_DCP_DTWT"
 
-                # Write out map unit aggregated rating
-                #
-                #murec = list()
-                outputValues = [999999999, -999999999]
+                            elif aggMethod == "Dominant Condition":
+                                return "AggregateCo_Mo_DCD"
+                                #raise MyError, "EARLY OUT"
 
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    for mukey, muVals in dMu.items():
-                        muVal = SortData(muVals, 1, 0, True, True)
-                        pct, val, areasym = muVal
-                        rating = round(val, fldPrecision)
-                        murec = [mukey, pct, rating, areasym]
-                        ocur.insertRow(murec)
+                            elif aggMethod == "Weighted Average":
+                                return "AggregateCo_WTA_DTWT"
 
-                        if not rating is None:
-                            # save overall max-min values
-                            outputValues[0] = min(rating, outputValues[0])
-                            outputValues[1] = max(rating, outputValues[1])
+                            else:
+                                # Component-Month such as depth to water table - Minimum or Maximum
+                                return "AggregateCo_Mo_MaxMin"
+                                #raise MyError, "5. Component-comonth aggregation method has not yet been developed "
 
-                else:
-                    # Lower
-                    for mukey, muVals in dMu.items():
-                        muVal = SortData(muVals, 1, 0, False, True)
-                        pct, val, areasym = muVal
-                        rating = round(val, fldPrecision)
-                        murec = [mukey, pct, rating, areasym]
-                        ocur.insertRow(murec)
+                        else:
+                            # This will be flooding or ponding frequency. In theory these should be the same value
+                            # for each month because these are normally annual ratings
+                            #
+                            # PrintMsg(" \nThis is Flooding or Ponding (" + dSDV["resultcolumnname"] + ")", 1 )
+                            #
+                            if aggMethod == "Dominant Component":
+                                # Problem with this aggregation method (AggregateCo_DCP). The CompPct sum is 12X because of the months.
+                                return "AggregateCo_Mo_DCP_Domain"
 
-                        if not rating is None:
-                            # save overall max-min values
-                            outputValues[0] = min(rating, outputValues[0])
-                            outputValues[1] = max(rating, outputValues[1])
+                            elif aggMethod == "Dominant Condition":
+                                # Problem with this aggregation method (AggregateCo_DCP_Domain). The CompPct sum is 12X because of the months.
+                                return "AggregateCo_Mo_DCD_Domain" # Orig
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg(" \n7. No data for " + sdvAtt, 1)
+                            elif aggMethod == "Minimum or Maximum":
+                                return "AggregateCo_Mo_MaxMin"
 
-        return outputTbl, outputValues
+                            elif aggMethod == "Weighted Average":
+                              return "AggregateCo_Mo_WTA"
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, []
+                            else:
+                                raise MyError, "Aggregation method: " + aggMethod + "; attibute " + dSDV["attributecolumnname"].upper()
 
-    except:
-        errorMsg()
-        return outputTbl, []
+                    else:
+                        raise MyError, "Attribute level flag problem"
 
-## ===================================================================================
-def AggregateHz_MaxMin_DCD(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
-    # Aggregate mapunit-component-horizon data to the map unit level using the highest rating
-    # from all horizons. Currently this would only apply to K Factor and dominant condition.
+                elif dSDV["horzlevelattribflag"] == 1:
+                    # These are all Horizon Level Soil Properties
 
-    try:
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-        #
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
+                    if sdvAtt.startswith("K Factor"):
+                        # Need to figure out aggregation method for horizon level  max-min
+                        if aggMethod == "Dominant Condition":
+                            return "AggregateHz_MaxMin_DCD"
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
-        fldPrecision = max(0, dSDV["attributeprecision"])
+                        elif aggMethod == "Dominant Component":
+                            return "AggregateHz_MaxMin_DCP"
 
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+                    elif aggMethod == "Weighted Average":
+                        # component aggregation is weighted average
 
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
+                        if dSDV["attributelogicaldatatype"].lower() in ["integer", "float"]:
+                            # Just making sure that these are numeric values, not indexes
+                            if dSDV["horzaggmeth"] == "Weighted Average":
+                                # Use weighted average for horizon data (works for AWC)
+                                return "AggregateHz_WTA_WTA"
 
-        if bZero == False:
-            # ignore any null values
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+                            elif dSDV["horzaggmeth"] == "Weighted Sum":
+                                # Calculate sum for horizon data (egs. AWS)
+                                return "AggregateHz_WTA_SUM"
 
-        else:
-            # retrieve null values and convert to zeros during the iteration process
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
+                        else:
+                            raise MyError, "12. Weighted Average not appropriate for " + dataType
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
+                    elif aggMethod == "Dominant Component":
+                        # Need to find or build this function
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+                        if sdvAtt.startswith("Surface") or sdvAtt.endswith("(Surface)"):
+                            #
+                            # I just added this on Monday to fix problem with Surface Texture DCP
+                            # Need to test
+                            return "AggregateCo_DCP"
 
-        if outputTbl == "":
-            return outputTbl,[]
+                        elif dSDV["effectivelogicaldatatype"].lower() == "choice":
+                            # Indexed value such as kFactor, cannot use weighted average
+                            # for horizon properties.
+                            return "AggregateCo_DCP"
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
+                        elif dSDV["horzaggmeth"] == "Weighted Average":
+                            #PrintMsg(" \nHorizon aggregation method = WTA and attributelogical datatype = " + dSDV["attributelogicaldatatype"].lower(), 1)
+                            return "AggregateHz_DCP_WTA"
 
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
+                        else:
+                            raise MyError, "9. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                    elif aggMethod == "Dominant Condition":
+                        arcpy.AddMessage("in DCD: " + sdvAtt)
+                        arcpy.AddMessage("Choice: " + dSDV["effectivelogicaldatatype"])
+                        if "Surface" in sdvAtt:
+                            if dSDV["effectivelogicaldatatype"].lower() == "choice":
+                                if bVerbose:
+                                    PrintMsg(" \nDominant condition for surface-level attribute", 1)
+                                return "AggregateCo_DCD_Domain"
 
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
+                            else:
+                                return "AggregateCo_DCD"
 
-                    if val is not None and hzdept is not None and hzdepb is not None:
 
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
+                        elif dSDV["effectivelogicaldatatype"].lower() in ("float", "integer"):
+                            # Dominant condition for a horizon level numeric value is probably not a good idea
+                            return "AggregateCo_DCD"
 
-                        except:
-                            hzT = 0
+                        elif dSDV["effectivelogicaldatatype"].lower() == "choice" and dSDV["tiebreakdomainname"] is not None:
+                            # KFactor (Indexed values)
+                            #PrintMsg(" \nDominant condition for choice type", 1)
+                            return "AggregateCo_DCD_Domain"
 
-                        if hzT > 0:
-                            ratingIndx = domainValues.index(val)   # Change KFactor to an index based upon domain order
+                        else:
+                            raise MyError, "No aggregation calculation selected for DCD"
 
-                            #PrintMsg("\t" + str(aws), 1)
+                    elif aggMethod == "Minimum or Maximum":
+                        # Need to figure out aggregation method for horizon level  max-min
+                        if dSDV["effectivelogicaldatatype"].lower() == "choice":
+                            # PrintMsg("\tRunning AggregateCo_MaxMin for " + sdvAtt, 1)
+                            return "AggregateCo_MaxMin"
 
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                ratingList = [ratingIndx]
-                                dComp[cokey] = [mukey, comppct, ratingList, areasym]
+                        else:  # These should be numeric, probably need to test here.
+                            return "AggregateHz_MaxMin_WTA"
 
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, ratingList, areasym = dComp[cokey]
-                                
-                                if not ratingIndx in ratingList:
-                                    ratingList.append(ratingIndx)
-                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
+                    else:
+                        raise MyError, "'" + aggMethod + "' aggregation method for " + sdvAtt + " has not been developed"
 
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
+                else:
+                    raise MyError, "Horizon-level '" + aggMethod + "' aggregation method for " + sdvAtt + " has not been developed"
 
-                # Read through the component-level data and summarize to the mapunit level
+            else:
+                # Should never hit this
+                raise MyError, "Unable to handle assigned aggregation method (" + aggMethod + ") for " + sdvAtt
 
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+        elif dSDV["attributetype"].lower() == "interpretation":
 
-                    for cokey, vals in dComp.items():
+            if dSDV["ruledesign"] == 1:
+                #
+                # This is a Soil Interpretation for Limitations or Risk
 
-                        # get component level data
-                        mukey, comppct, ratingList, areasym = vals
-                        
-                        ratingIndx = max(ratingList)  # get highest K Factor from all horizons for this component
-                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
+                if aggMethod == "Dominant Component":
+                    return "AggregateCo_DCP"
 
-                        try:
-                            # append component weighted average rating to the mapunit dictionary
-                            dMu[mukey].append([comppct, ratingIndx, areasym])
+                elif aggMethod == "Dominant Condition":
+                    #PrintMsg(" \nInterpretation; aggMethod = " + aggMethod, 1)
+                    return "AggregateCo_DCD_Domain"
 
-                        except:
-                            # create a new mapunit record in the dictionary
-                            dMu[mukey] = [[comppct, ratingIndx, areasym]]
+                elif aggMethod in ['Least Limiting', 'Most Limiting']:
+                    return "AggregateCo_Limiting"
 
-                # Write out map unit aggregated rating
-                #
-                outputValues = [domainValues[0], domainValues[-1]]
+                elif aggMethod == "Weighted Average":
+                    # This is an interp that has been set to use fuzzy values
+                    return "AggregateCo_WTA_Fuzzy"
 
-                #if tieBreaker == dSDV["tiebreakhighlabel"]:
-                oid = 0
-                
-                for mukey, muVals in dMu.items():
-                    oid += 1
-                    #muVal = SortData(muVals, 1, 0, True, True)
-                    muVal = SortData(muVals, 0, 0, True, True)
-                    pct, ratingIndx, areasym = muVal
-                    rating = domainValues[ratingIndx]
-                    murec = [mukey, pct, rating, areasym]
+                else:
+                    # Don't know what kind of interp this is
+                    #PrintMsg(" \nmapunitlevelattribflag: " + str(dSDV["mapunitlevelattribflag"]) + ", complevelattribflag: " + str(dSDV["complevelattribflag"]) + ", cmonthlevelattribflag: " + str(dSDV["cmonthlevelattribflag"]) + ", horzlevelattribflag: " + str(dSDV["horzlevelattribflag"]) + ", effectivelogicaldatatype: " + dSDV["effectivelogicaldatatype"], 1)
+                    #PrintMsg(aggMethod + "; " + dSDV["effectivelogicaldatatype"], 1)
+                    raise MyError, "5. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
 
-                    
-                    #if mukey == "1427104":
-                    #if mukey == "1380525":
-                    #    PrintMsg(" \nOutput Table: " + outputTbl, 1)
-                    #    PrintMsg("\t" + str(muVals), 1)
-                    #    PrintMsg("\t" + str(muVal), 1)
-                    #    PrintMsg("\t" + rating, 1)
-                    #    PrintMsg("\t" + str(oid) + ", " + str(murec), 1)
-                        
-                    
-                    ocur.insertRow(murec)
+            elif dSDV["ruledesign"] == 2:
+                # This is a Soil Interpretation for Suitability
 
-                    if not rating is None:
-                    #    # save overall max-min values
-                        outputValues[0] = min(rating, outputValues[0])
-                        outputValues[1] = max(rating, outputValues[1])
+                if aggMethod == "Dominant Component":
+                    return "AggregateCo_DCP"
 
-        return outputTbl, outputValues
+                elif aggMethod == "Dominant Condition":
+                    return "AggregateCo_DCD_Domain"  # changed this for Sand Suitability
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, []
+                elif bFuzzy or (aggMethod == "Weighted Average" and dSDV["effectivelogicaldatatype"].lower() == 'float'):
+                    # This is NCCPI
+                    #PrintMsg(" \nA Aggregate2_NCCPI", 1)
+                    #return "Aggregate2_NCCPI"
+                    # PrintMsg(" \nNCCPI 3", 1)
+                    return "AggregateCo_WTA_Fuzzy"
 
-    except:
-        errorMsg()
-        return outputTbl, []
+                elif aggMethod in ['Least Limiting', 'Most Limiting']:
+                    # Least Limiting or Most Limiting Interp
+                    return "AggregateCo_Limiting"
 
+                else:
+                    # Don't know what kind of interp this is
+                    # Friday problem here for NCCPI
+                    #PrintMsg(" \n" + str(dSDV["mapunitlevelattribflag"]) + ", " + str(dSDV["complevelattribflag"]) + ", " + str(dSDV["cmonthlevelattribflag"]) + ", " + str(dSDV["horzlevelattribflag"]) + " -NA2", 1)
+                    #PrintMsg(aggMethod + "; " + dSDV["effectivelogicaldatatype"], 1)
+                    raise MyError, "5. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
 
-## ===================================================================================
-def AggregateHz_MaxMin_DCP(gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot):
-    # Aggregate mapunit-component-horizon data to the map unit level using the highest rating
-    # from all horizons. Currently this would only apply to K Factor and dominant component
-    
-    try:
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-        #
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
-        fldPrecision = max(0, dSDV["attributeprecision"])
+            elif dSDV["ruledesign"] == 3:
+                # This is a Soil Interpretation for Class. Only a very few interps in the nation use this.
+                # Such as MO- Pasture hayland; MT-Conservation Tree Shrub Groups; CA- Revised Storie Index
 
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
+                if aggMethod == "Dominant Component":
+                    return "AggregateCo_DCP"
 
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
+                elif aggMethod == "Dominant Condition":
+                    return "AggregateCo_DCD"
 
-        if bZero == False:
-            # ignore any null values
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
+                elif aggMethod in ['Least Limiting', 'Most Limiting']:
+                    #PrintMsg(" \nNot sure about aggregation method for ruledesign = 3", 1)
+                    # Least Limiting or Most Limiting Interp
+                    return "AggregateCo_Limiting"
 
-        else:
-            # retrieve null values and convert to zeros during the iteration process
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
+                else:
+                    # Don't know what kind of interp this is
+                    PrintMsg(" \nRuledesign 3: " + str(dSDV["mapunitlevelattribflag"]) + ", " + str(dSDV["complevelattribflag"]) + ", " + str(dSDV["cmonthlevelattribflag"]) + ", " + str(dSDV["horzlevelattribflag"]) + " -NA2", 1)
+                    PrintMsg(aggMethod + "; " + dSDV["effectivelogicaldatatype"], 1)
+                    raise MyError, "5. Interp aggregation method has not yet been developed ruledesign 3 (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
 
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
 
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
+            elif dSDV["ruledesign"] is None:
+                # This is a Soil Interpretation???
+                raise MyError, "Soil Interp with no RuleDesign setting"
 
-        if outputTbl == "":
-            return outputTbl,[]
+            else:
+                raise MyError, "No aggregation calculation selected 10"
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
+        else:
+            raise MyError, "Invalid SDV AttributeType: " + str(dSDV["attributetype"])
+
+        raise MyError, "'" + aggMethod + "' aggregation method for " + sdvAtt + " has not been developed"
 
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return ""
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+    except:
+        errorMsg()
+        return ""
 
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
+## ===================================================================================
+def RunAggregation(aggName, gdb, sdvAtt, initialTbl, bZero, cutOff, tieBreaker, top, bot):
+    # Run an aggregation method from dAggMethods and return outputTbl, outputValues. 2026-10-17
+    #
+    try:
+        dMethod = dAggMethods[aggName]
+        sdvFld = dSDV["attributecolumnname"].upper()
+        start = time.time()
 
-                    if val is not None and hzdept is not None and hzdepb is not None:
+        # For the run log, the number of SDV_Data records aggregated. Only known without
+        # another table read when SDV_Data is in memory.
+        if initialTbl in dMemTables:
+            recCnt = dMemTables[initialTbl].count
 
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
+        else:
+            recCnt = None
 
-                        except:
-                            hzT = 0
+        if not dMethod["kernel"] is None:
+            outputTbl, outputValues = AggregateComponents(dMethod, gdb, sdvAtt, initialTbl, bZero, cutOff, tieBreaker)
 
-                        if hzT > 0:
-                            ratingIndx = domainValues.index(val)   # Change KFactor to an index based upon domain order
+        elif dMethod["depths"]:
+            outputTbl, outputValues = dMethod["function"](gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker, top, bot)
 
-                            #PrintMsg("\t" + str(aws), 1)
+        else:
+            outputTbl, outputValues = dMethod["function"](gdb, sdvAtt, sdvFld, initialTbl, bZero, cutOff, tieBreaker)
 
-                            if not cokey in dComp:
-                                if not mukey in dMu:
-                                    dMu[mukey] = cokey
+        if not dMethod["range"] is None:
+            outputValues = list(dMethod["range"])
 
-                                    # Create initial entry for this component using the first horiozon CHK
-                                    ratingList = [ratingIndx]
-                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
+        if bVerbose:
+            PrintMsg(" \n" + aggName + " (" + dMethod["level"] + " level) processed " + sdvAtt + " in " + elapsedTime(start), 1)
 
-                            elif cokey == dMu[mukey]:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, ratingList, areasym = dComp[cokey]
-                                
-                                if not ratingIndx in ratingList:
-                                    ratingList.append(ratingIndx)
-                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
+        LogStage(aggName, start, recCnt, dMethod["level"])
 
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
+        return outputTbl, outputValues
 
-                # Read through the component-level data and summarize to the mapunit level
+    except:
+        errorMsg()
+        return "", None
 
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+## ===================================================================================
+def AggregateComponents(dMethod, gdb, sdvAtt, initialTbl, bZero, cutOff, tieBreaker):
+    # Shared driver for the component-level methods registered with a map unit kernel
+    # (AggregateCo_DCP, AggregateCo_WTA and AggregateCo_PP_SUM). 2026-10-17
+    #
+    # The SDV_Data cursor is set up from the tie-break and NULL rules in dMethod (see
+    # RegisterAggregation). The records are grouped by map unit and the kernel returns the
+    # comppct_r and rating written to the output table. outputValues is [min, max] for numeric
+    # ratings and the distinct ratings otherwise. NULL ratings and nullRating are left out.
+    #
+    try:
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
 
-                    for cokey, vals in dComp.items():
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-                        # get component level data
-                        mukey, comppct, ratingList, areasym = vals
-                        
-                        ratingIndx = max(ratingList)  # get highest K Factor from all horizons for this component
-                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+        outputValues = list()
+        attFld = dSDV["attributecolumnname"].upper()
+        bNumeric = dSDV["effectivelogicaldatatype"].lower() in ["integer", "float"]
 
-                        try:
-                            # append component weighted average rating to the mapunit dictionary
-                            dMu[mukey].append([comppct, ratingIndx, areasym])
+        inFlds = ["MUKEY", "AREASYMBOL", "COKEY", "COMPPCT_R", attFld]
+        outFlds = ["MUKEY", "AREASYMBOL", "COMPPCT_R", dSDV["resultcolumnname"].upper()]
 
-                        except:
-                            # create a new mapunit record in the dictionary
-                            dMu[mukey] = [[comppct, ratingIndx, areasym]]
+        if dMethod["tiebreak"] == "label":
+            if tieBreaker == dSDV["tiebreaklowlabel"]:
+                sqlClause = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, " + attFld + " ASC")
 
-                # Write out map unit aggregated rating
-                #
-                outputValues = [domainValues[0], domainValues[-1]]
+            else:
+                sqlClause = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, " + attFld + " DESC")
 
-                #if tieBreaker == dSDV["tiebreakhighlabel"]:
-                oid = 0
-                
-                for mukey, muVals in dMu.items():
-                    oid += 1
-                    muVal = SortData(muVals, 1, 0, True, True)              
-                    pct, ratingIndx, areasym = muVal
-                    rating = domainValues[ratingIndx]
-                    murec = [mukey, pct, rating, areasym]
-                    #if mukey == "1427104":
-                    #    PrintMsg(" \nOutput Table: " + outputTbl, 1)
-                    #    PrintMsg("\t" + str(muVals), 1)
-                    #    PrintMsg("\t" + str(muVal), 1)
-                    #    PrintMsg("\t" + rating, 1)
-                    #    PrintMsg("\t" + str(oid) + ", " + str(murec), 1)
-                    ocur.insertRow(murec)
+        elif dMethod["tiebreak"] == "lower":
+            if tieBreaker == "Lower":
+                sqlClause = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, " + attFld + " DESC")
 
-                    if not rating is None:
-                    #    # save overall max-min values
-                        outputValues[0] = min(rating, outputValues[0])
-                        outputValues[1] = max(rating, outputValues[1])
+            else:
+                sqlClause = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, " + attFld + " ASC")
 
-        return outputTbl, outputValues
+        else:
+            sqlClause = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC")
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return outputTbl, []
+        if dMethod["nulls"] == "zero":
+            # Added this replacement logic on 2020-09-18 in response to pH problem and general lack of consistency in applying null-handling settings
+            if bZero:
+                whereClause = "COMPPCT_R >=  " + str(cutOff)
 
-    except:
-        errorMsg()
-        return outputTbl, []
+            else:
+                whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + attFld + " IS NOT NULL"
 
+            muNull = nullRating
 
+        else:
+            whereClause = None
+            muNull = None
+
+        # Settings passed to the kernel
+        dArgs = dict()
+        dArgs["precision"] = max(0, dSDV["attributeprecision"])
+        dArgs["numeric"] = bNumeric
+        dArgs["strip"] = len(dValues) == 0
+        dArgs["zero"] = bZero
+        dArgs["nullrating"] = muNull
+        dArgs["present"] = None
+
+        if not dSDV["sqlwhereclause"] is None and "=" in dSDV["sqlwhereclause"]:
+            # Percent present rating value (hydricrating = 'Yes')
+            dArgs["present"] = dSDV["sqlwhereclause"].split("=")[1].strip().replace("'", "").upper()
 
-## ===================================================================================
-def UpdateMetadata(outputWS, target, parameterString, creditsString, aggMethod, sdvAtt, toDay):
-    # Update metadata for target object (VALU1 table)
-    #
-    try:
+        if bVerbose:
+            PrintMsg(" \nwhereClause: " + str(whereClause) + "; sqlClause: " + str(sqlClause), 1)
 
-        # Clear process steps from the VALU1 table. Mostly AddField statements.
-        #
-        # NOTE: The geoprocessing metadata conversion tools to not work in the 64 bit background processing
-        #
-        """
-        Any script or script tools you run while inside Desktop honors the background processing setting.
-        If background processing is turned on, the scripts will execute in the 64-bit space.
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-        When you execute a stand-alone Python script outside the application, you need to ensure
-        you're running against the 64-bit Python installation to make use of 64-bit geoprocessing.
-        Double-clicking a Python file from Windows Explorer will launch the file using whatever
-        association Windows has set for the .py file. Typically, this is the last version of Python installed,
-        which should be 64 bit. If you want to be absolutely sure which version of Python you're
-        running against (32 or 64), it is best to fully qualify the Python executable when running
-        your script at command line. For example, the following command will ensure the script is
-        run as 64 bit:
-                      c:\Python27\ArcGISx6410.2\python.exe c:\gisData\scripts\intersect.py.
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
 
-        """
-        # Function parameters: bMetadata = UpdateMetadata(gdb, outputTbl, parameterString, creditsString, aggMethod, sdvAtt, toDay)
-        #   outputWS - input gSSURGO database
-        #   target   - SDV rating table that was just created
-        #   parameterString - string containing all user settings from the menu
-        #   creditsString   - user login and name of this script
-        #   aggMethod - method used to summarize the data to the map unit level.
-        #   sdvAtt - short description of this map layer
-        #   toDay - date stamp string
-        #
-        #bVerbose = True
+        if outputTbl == "":
+            raise MyError, "No output table"
 
-        # Determine whether this script is running in 32 or 64 bit mode
-        arcpy.SetProgressorLabel("Updating metadata for " + os.path.basename(target))
-        pythonVersion = sys.version
-        #fy = "2018"
+        kernel = dMethod["kernel"]
+        muKeys = GetKeyIndex("MUKEY").keys
+        iMax = -999999999.0
+        iMin = 999999999.0
 
-        if pythonVersion.find("32 bit") == -1:
-            # Print a non-fatal warning to the user that the metadata will not be updated in 64 bit mode
-            PrintMsg(" \nWarning! Unable to update metadata when running under 64-bit background-mode", 1)
-            return False
+        with SDVSearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause, bKeyCodes=True) as cur:
+            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+                for mukey, areasym, compList in MapunitGroups(cur):
+                    comppct, rating = kernel(compList, dArgs)
 
-        env.workspace = outputWS
-        
-        if not arcpy.Exists(target):
-            target = os.path.join(outputWS, target)
+                    if rating is None or rating == muNull:
+                        if rating is None and not bNumeric and len(dValues) > 0:
+                            comppct = None
 
-        # Remove geoprocessing history
+                    elif bNumeric:
+                        iMax = max(rating, iMax)
+                        iMin = min(rating, iMin)
 
-        remove_gp_history_xslt = os.path.join(os.path.dirname(sys.argv[0]), "remove geoprocessing history.xslt")
-        out_xml = os.path.join(env.scratchFolder, "xxClean.xml")
+                    else:
+                        if str(rating).upper() in dValues:
+                            if dValues[rating.upper()][1] != rating:
+                                # we have a case problem in the maplegendxml, switch the dValue to match the data
+                                dValues[rating.upper()][1] = rating
 
-        if not arcpy.Exists(remove_gp_history_xslt):
-            raise MyError, "Missing file: " + remove_gp_history_xslt
+                        elif len(dValues) > 0:
+                            dValues[str(rating).upper()] = [None, rating]
 
-        if arcpy.Exists(out_xml):
-            arcpy.Delete_management(out_xml)
+                        if not rating in outputValues:
+                            outputValues.append(rating)
 
-        # Using the stylesheet, write 'clean' metadata to out_xml file and then import back in
-        # It appears that the metadata tools do not work within 64 bit background processing for 10.4.
-        # The failure does not even generate an error message.
-        try:
-            if bVerbose:
-                PrintMsg("\tClearing geoprocessing history for " + target, 1)
-                         
-            arcpy.XSLTransform_conversion(target, remove_gp_history_xslt, out_xml, "")
+                    ocur.insertRow([muKeys[mukey], areasym, comppct, rating])
 
-            if bVerbose:
-                PrintMsg("\tImporting metadata from " + target, 1)
-                
-            arcpy.MetadataImporter_conversion(out_xml, os.path.join(outputWS, target))
+        if bNumeric:
+            if iMin == 999999999.0:
+                # No data
+                outputValues = [0.0, 0.0]
 
-        except:
-            PrintMsg(" \nFailed to clean up metadata", 0)
+            else:
+                outputValues = [iMin, iMax]
 
-        # Set metadata translator file
-        dInstall = arcpy.GetInstallInfo()
-        installPath = dInstall["InstallDir"]
-        prod = r"Metadata/Translator/ARCGIS2FGDC.xml"
-        mdTranslator = os.path.join(installPath, prod)
+        else:
+            outputValues.sort(key=lambda s: s.lower())
 
-        if not arcpy.Exists(mdTranslator):
-            raise MyError, "Missing metadata translator: " + mdTranslator
+        # For NCCPI, hardcode the range of values from 0.0 to 1.0 for a consistent map legend
+        if dSDV["resultcolumnname"].upper().startswith("NCCPI") or \
+           (dSDV["attributetype"].lower() == "interpretation" and str(dSDV["nasisrulename"])[0:5] == "NCCPI"):
+            outputValues = [0.0, 1.0]
 
-        # Define input and output XML files
-        xmlPath = os.path.dirname(sys.argv[0])
+        return outputTbl, outputValues
 
-        mdExport = os.path.join(xmlPath, "SDV_Metadata2.xml")  # template metadata stored in ArcTool folder
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return outputTbl, outputValues
 
-        mdImport = os.path.join(env.scratchFolder, "xxImport.xml")  # the metadata xml that will provide the updated info
+    except:
+        errorMsg()
+        return outputTbl, outputValues
 
-        # Cleanup XML files from previous runs
-        if os.path.isfile(mdImport):
-            os.remove(mdImport)
+## ===================================================================================
+def MapunitGroups(recList):
+    # Group records sorted by MUKEY. 2026-10-17
+    # recList is a cursor or list of (mukey, areasymbol, cokey, comppct, rating). Yields mukey,
+    # areasymbol and the list of (cokey, comppct, rating) for each map unit, in cursor order.
+    #
+    lastMukey = None
+    lastAreasym = None
+    compList = list()
 
-        mdState = ""
-        ratingFld = dSDV["resultcolumnname"]
+    for mukey, areasym, cokey, comppct, rating in recList:
+        if mukey != lastMukey:
+            if len(compList) > 0:
+                yield lastMukey, lastAreasym, compList
 
-        # Currently in this script, only the metadata title, summary, description, credits and the new rating field description are updated.
-        #
-        dMetadata = dict()  # dictionary key is the search term that exists in the template metadata. Dictionary value is the replacement.
-        dMetadata["SDV_Title"] = dSDV["attributename"] + " - " + aggMethod
-        dMetadata["SDV_Description"] = "Map unit rating table for '" + dSDV["attributename"] +"'" + "\r" + dSDV["attributedescription"] + "\r" + parameterString
-        dMetadata["SDV_Credits"] = "USDA-Natural Resources Conservation Service; " + creditsString
-        dMetadata["SDV_Summary"] = "Map the '" + sdvAtt + "' soil " + dSDV["attributetype"].lower() + " by joining this rating table to the soil layer (polygon or raster) using the mukey field."
+            compList = list()
+            lastMukey = mukey
+            lastAreasym = areasym
 
-        dFields = dict()
-        dFields["MUKEY"] = "Soil map unit primary key"
-        dFields["AREASYMBOL"] = "Soil Survey ID"
-        dFields["COMPPCT_R"] = "Component percent of the map unit"
-        dFields["OBJECTID"] = "Internal feature number"
-        dFields[ratingFld] = "Map unit rating for " + sdvAtt
+        compList.append((cokey, comppct, rating))
 
-        # Convert XML from template metadata to tree format
-        if bVerbose:
-            PrintMsg("\tParsing metadata...", 1)
-                         
-        tree = ET.parse(mdExport)
-        root = tree.getroot()
+    if len(compList) > 0:
+        yield lastMukey, lastAreasym, compList
 
-        elemList = tree.getiterator()
+## ===================================================================================
+def MapunitDCP(compList, dArgs):
+    # Dominant component kernel. 2026-10-17
+    # The first component is the dominant one; the cursor sorts the ratings in tiebreak order.
+    #
+    cokey, comppct, rating = compList[0]
 
-        for elem in elemList:
-            #print elem.tag
-            for child in elem:
-                if str(child.text) in dMetadata:
-                    child.text = dMetadata[child.text]
+    if rating is None:
+        return [comppct, None]
 
-                if child.tag == "attrlabl":
-                    # This is a field name
-                    fldName = child.text
+    if dArgs["numeric"]:
+        return [comppct, round(rating, dArgs["precision"])]
 
-                    if fldName in dFields:
-                        fldDesc = dFields[fldName]
+    if dArgs["strip"]:
+        return [comppct, rating.strip()]
 
-                    elif fldName == "SDV_RATING":
-                        child.text = ratingFld
-                        fldName = ratingFld
+    return [comppct, rating]
 
-                        if fldName in dFields:
-                            fldDesc = dFields[fldName]
+## ===================================================================================
+def MapunitWTA(compList, dArgs):
+    # Component-percent weighted average kernel. 2026-10-17
+    #
+    # Each component's comppct_r is counted once (components can have more than one SDV_Data
+    # record), and not at all when it is rated with nullRating. NULL ratings count as zero when
+    # bZero is set. Map units with nothing rated get nullRating.
+    #
+    nullRating = dArgs["nullrating"]
+    sumPct = 0
+    sumProd = None
+    coSeen = set()
 
-                elif child.tag == "attrdef":
-                    child.text = fldDesc
+    for cokey, comppct, rating in compList:
+        if cokey is None or not cokey in coSeen:
+            coSeen.add(cokey)
 
+            if not rating == nullRating:
+                sumPct += comppct
 
-        #  create new xml file with the updated information
-        tree.write(mdImport, encoding="utf-8", xml_declaration=None, default_namespace=None, method="xml")
+        if rating is None and dArgs["zero"]:
+            rating = 0.0
 
-        # import updated metadata to the geodatabase table
-        # Convert XML from template metadata to tree format
-        if bVerbose:
-            PrintMsg("\tImporting " + mdExport + "...", 1)
-            
-        arcpy.MetadataImporter_conversion(mdExport, target)
+        if rating == nullRating:
+            rating = None
 
-        if not arcpy.Exists(mdImport):
-            raise MyError, "Missing metadata file: " + mdImport
+        if not rating is None:
+            if sumProd is None:
+                sumProd = comppct * float(rating)
 
-        if bVerbose:
-            PrintMsg("\tImporting " + mdImport + " to " + target + "...", 1)
+            else:
+                sumProd += comppct * float(rating)
 
-        # Error here. Running Drainage Class map. Unable to get lock after processing several successfully.
-        time.sleep(1)
-        arcpy.ImportMetadata_conversion(mdImport, "FROM_FGDC", target, "DISABLED")
+    if sumPct > 0 and not sumProd is None:
+        return [sumPct, round(float(sumProd) / sumPct, dArgs["precision"])]
 
-        # delete the temporary xml metadata files
-        if os.path.isfile(mdImport):
-            #os.remove(mdImport)
-            pass
+    return [sumPct, nullRating]
 
-        #if os.path.isfile(mdExport):
-        #    os.remove(mdExport)
-        arcpy.SetProgressorLabel("Finished updating metadata for " + os.path.basename(target))
-        return True
+## ===================================================================================
+def MapunitPP(compList, dArgs):
+    # Percent present kernel (Hydric). 2026-10-17
+    # Sum of comppct_r for the components with the sqlwhereclause rating. Map units without
+    # any get zero instead of NULL. No comppct_r is written.
+    #
+    sumPct = 0
 
-    except MyError, e:
-        # Example: raise MyError("this is an error message")
-        PrintMsg(str(e) + " \n", 2)
-        return False
+    for cokey, comppct, rating in compList:
+        if str(rating).upper() == dArgs["present"] and not comppct is None:
+            sumPct += comppct
 
-    except:
-        errorMsg()
-        return False
+    return [None, sumPct]
 
 ## ===================================================================================
-def CreateGroupLayer(grpLayerName, mxd, df):
-    try:
-        # Use template lyr file stored in current script directory to create new Group Layer
-        # This SDVGroupLayer.lyr file must be part of the install package along with
-        # any used for symbology. The name property will be changed later.
-        #
-        # arcpy.mapping.AddLayerToGroup(df, grpLayer, dInterpLayers[sdvAtt], "BOTTOM")
-        #
-        grpLayerFile = os.path.join(os.path.dirname(sys.argv[0]), "SDV_GroupLayer.lyr")
+def GetNullRating(dAtt):
+    # Null rating replacement value for an attribute according to the SDV rules
+    # (nullratingreplacementvalue converted to the attribute data type). 2026-10-17
 
-        if not arcpy.Exists(grpLayerFile):
-            raise MyError, "Missing group layer file (" + grpLayerFile + ")"
+    if dAtt["nullratingreplacementvalue"] is None:
+        return None
 
-        testLayers = arcpy.mapping.ListLayers(mxd, grpLayerName, df)
+    if dAtt["attributelogicaldatatype"].lower() == "integer":
+        return int(dAtt["nullratingreplacementvalue"])
 
-        if len(testLayers) > 0:
-            # Using existing group layer
-            grpLayer = testLayers[0]
+    elif dAtt["attributelogicaldatatype"].lower() == "float":
+        return float(dAtt["nullratingreplacementvalue"])
 
-        else:
-            # Group layer does not exist, make a new one
-            grpLayer = arcpy.mapping.Layer(grpLayerFile)  # template group layer file
-            grpLayer.visible = False
-            grpLayer.name = grpLayerName
-            grpLayer.description = "Group layer containing raster conversions from gSSURGO vector soil maps"
-            grpLayer.visible = False
-            arcpy.mapping.AddLayer(df, grpLayer, "TOP")
-            PrintMsg(" \nAdding new group layer to ArcMap TOC: " + str(grpLayer.name), 0)
+    elif dAtt["attributelogicaldatatype"].lower() in ["string", "choice"]:
+        return dAtt["nullratingreplacementvalue"]
 
-        return grpLayer
+    return None
 
-    except MyError, e:
-        # Example: raise MyError, "This is an error message"
-        PrintMsg(str(e), 2)
-        return None
+## ===================================================================================
+def WideDCP(recList, fldPrecision, bNumeric):
+    # Dominant component rating for each map unit (MapunitDCP). 2026-10-17
+    # recList is [(mukey, areasymbol, cokey, comppct, rating), ...] sorted by MUKEY, COMPPCT_R DESC
+    # and rating in tiebreak order, the same as the AggregateCo_DCP cursor.
+    #
+    dArgs = {"precision":fldPrecision, "numeric":bNumeric, "strip":True}
+    dMuRating = dict()
 
-    except:
-        errorMsg()
-        return None
+    for mukey, areasym, compList in MapunitGroups(recList):
+        dMuRating[mukey] = MapunitDCP(compList, dArgs)[1]
+
+    return dMuRating
 
 ## ===================================================================================
-def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, grpLayerName, mxd, dfName):
-    #
-    # function that can be called by other scripts
+def WideDCD(recList, bNumeric, bHigh, domainValues):
+    # Dominant condition rating for each map unit, using the AggregateCo_DCD rules. 2026-10-17
+    # When the dominant component is 50 percent or more it is the dominant condition.
+    # Otherwise comppct_r is summed for each rating and ties go to the higher or lower
+    # rating (bHigh), or to the higher or lower position in domainValues when there is a
+    # tiebreak domain.
     #
-    try:
+    dMapunit = dict()
+    muList = list()
 
-        global bVerbose
+    for mukey, areasym, cokey, comppct, rating in recList:
+        if not rating is None and not bNumeric:
+            rating = rating.strip()
 
-        bVerbose = False   # hard-coded boolean to print diagnostic messages
-        # bVerbose = True
+        try:
+            dMapunit[mukey].append((comppct, rating))
 
-        # Value cache is a global variable used for fact function which is called by ColorRamp
-        global fact_cache
-        fact_cache = {}
+        except KeyError:
+            dMapunit[mukey] = [(comppct, rating)]
+            muList.append(mukey)
 
-        # Check the ArcGIS Desktop version number
-        installInfo = arcpy.GetInstallInfo()
-        version = installInfo["Version"][0:4]
+    dDomain = dict()
 
-        import datetime
+    for i, val in enumerate(domainValues):
+        dDomain[str(val).upper()] = i
 
-        if not version[0:4] in ["10.3", "10.4", "10.5", "10.6", "10.7", "10.8"]:
-            PrintMsg(" \nArcGIS Desktop version " + version + " does not support the map symbology functions in this tool", 1)
+    if len(dDomain) > 0 and not "NONE" in dDomain:
+        # NULL ratings (bZero) lose the tiebreak, as in AggregateCo_DCD_Domain: they go at the
+        # start of the domain for the higher tiebreak and at the end for the lower one
+        dDomain["NONE"] = -1 if bHigh else len(dDomain)
 
-        # Get target gSSURGO database
-        global fc, gdb, muDesc, dataType
-        muDesc = arcpy.Describe(inputLayer)
-        fc = muDesc.catalogPath                         # full path for input mapunit polygon layer
-        gdb = os.path.dirname(fc)                       # need to expand to handle featuredatasets
-        dataType = muDesc.dataType.lower()
+    dMuRating = dict()
 
-        # Set current workspace to the geodatabase
-        env.workspace = gdb
-        env.overwriteOutput = True
+    for mukey in muList:
+        compList = dMapunit[mukey]
 
-        # get scratchGDB
-        scratchGDB = env.scratchGDB
+        if compList[0][0] >= 50:
+            dMuRating[mukey] = compList[0][1]
+            continue
 
-        # Get dictionary of MUSYM values (optional function for use during development)
-        # dSymbols = GetMapunitSymbols(gdb)
+        dRating = dict()
 
+        for comppct, rating in compList:
+            try:
+                dRating[rating] += comppct
 
-        # If neccessary, create SDV_Symbology table for use by Convert Soil Map to Raster tool
-        symTbl = os.path.join(gdb, "SDV_Symbology")
-        maxLegend = 20480
+            except KeyError:
+                dRating[rating] = comppct
 
-        if not arcpy.Exists(symTbl):
-            # Create new table here and then write to it
-            
-            #PrintMsg(" \ndLayerDefinition: " + str( dLayerDefinition), 1)
-            arcpy.CreateTable_management(os.path.dirname(symTbl), os.path.basename(symTbl))
-            arcpy.AddField_management(symTbl, "layername", "TEXT", "", "", 96)
-            arcpy.AddField_management(symTbl, "maplegend", "TEXT", "", "", maxLegend)
-            
-        # Create list of months for use in some queries
-        moList = ListMonths()
+        if len(dDomain) > 0:
+            muVals = [[sumPct, dDomain.get(str(rating).upper(), -1), rating] for rating, sumPct in dRating.items()]
 
-        arcpy.RefreshTOC()
-        #PrintMsg(" \nGetting dataframe named: " + dfName, 1)
-        dfList = arcpy.mapping.ListDataFrames(mxd, dfName)
+        else:
+            muVals = [[sumPct, rating, rating] for rating, sumPct in dRating.items()]
 
-        if len(dfList) > 0:
-            df = dfList[0]              
-            #PrintMsg(" \nData frame description: " + df.description + "  " + str(df.type), 1)
+        dMuRating[mukey] = SortData(muVals, 0, 1, True, bHigh)[2]
 
-        else:
-            raise MyError, "Problem with data frame or mxd"
+    return dMuRating
 
-        # Create a dictionary based upon domainValues or legendValues.
-        # This dictionary will use an uppercase-string version of the original value as the key
-        #
-        global dValues
-        dValues = dict()  # Try creating a new dictionary. Key is uppercase-string value. Value = [order, original value]
+## ===================================================================================
+def WideWTA(recList, fldPrecision, bZero, nullRating):
+    # Component-percent weighted average for each map unit (MapunitWTA), the same as
+    # AggregateCo_WTA. 2026-10-17
+    # NULL ratings have already been removed by the where clause when bZero is False.
+    #
+    dArgs = {"precision":fldPrecision, "zero":bZero, "nullrating":nullRating}
+    dMuRating = dict()
 
-        # Dictionary for aggregation method abbreviations
-        #
-        global dAgg
-        dAgg = dict()
-        dAgg["Dominant Component"] = "DCP"
-        dAgg["Dominant Condition"] = "DCD"
-        dAgg["No Aggregation Necessary"] = ""
-        dAgg["Percent Present"] = "PP"
-        dAgg["Weighted Average"] = "WTA"
-        dAgg["Most Limiting"] = "ML"
-        dAgg["Least Limiting"] = "LL"
-        dAgg[""] = ""
+    for mukey, areasym, compList in MapunitGroups(recList):
+        dMuRating[mukey] = MapunitWTA(compList, dArgs)[1]
 
+    return dMuRating
 
-        # Open sdvattribute table and query for [attributename] = sdvAtt
-        # if aggMethod is not already set, get the default method from the sdvattribute table
-        global dSDV
+## ===================================================================================
+def CreateWideRatingTable(inputLayer, attList, outputTbl, cutOff, bZero):
+    # Create a single mapunit-level table for a list of component-level soil properties,
+    # reading the COMPONENT table only once. 2026-10-17
+    #
+    # attList is a list of [sdvAtt, aggMethod] where aggMethod is "Dominant Component",
+    # "Dominant Condition", "Weighted Average" or "" for the sdvattribute default.
+    # The output table has MUKEY, AREASYMBOL, MUSYM and MUNAME for every map unit plus one
+    # rating column per attribute, named by resultcolumnname as in the SDV_ tables. This is
+    # the table gSSURGO_MergeRatingTables would build from the individual soil maps.
+    #
+    # Attributes that are not component-level properties, or that use a where clause that
+    # cannot be run in memory, are skipped. Returns the list of attributes that were added.
+    #
+    try:
+        global gdb, dSDV, dAgg, bVerbose
 
-        dSDV = GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV)  # In batch mode, bFuzzy is set to False. This does not work for interps like NCCPI.
+        bVerbose = False   # used by GetSDVAtts, normally set by CreateSoilMap
+        desc = arcpy.Describe(inputLayer)
 
-        if aggMethod == "":
-            aggMethod = dSDV["algorithmname"]
+        if desc.dataType.lower() == "featurelayer":
+            gdb = os.path.dirname(desc.featureclass.catalogPath)
 
+        else:
+            gdb = os.path.dirname(desc.catalogPath)
 
+        env.workspace = gdb
+        dAgg = {"Dominant Component":"DCP", "Dominant Condition":"DCD", "No Aggregation Necessary":"", "Percent Present":"PP", "Weighted Average":"WTA", "Most Limiting":"ML", "Least Limiting":"LL", "":""}
+        dMethods = {"Dominant Component":"DCP", "Dominant Condition":"DCD", "Weighted Average":"WTA"}
+        dFldTypes = {"String":"TEXT", "SmallInteger":"SHORT", "Integer":"LONG", "Single":"FLOAT", "Double":"DOUBLE"}
 
+        compTbl = os.path.join(gdb, "component")
+        dCompFields = dict()
 
-        if (sdvAtt in ["Surface Texture"] or sdvAtt.endswith("(Surface)")) and not (top == 0 and bot == 1):
+        for fld in arcpy.ListFields(compTbl):
+            if fld.type in dFldTypes:
+                dCompFields[fld.name.upper()] = (dFldTypes[fld.type], fld.length)
 
-            if __name__ == "__main__":
-                #PrintMsg(" \nRenaming layer...", 1)
+        # Get the sdvattribute settings for each attribute and the component fields they need
+        wideAtts = list()
+        compFlds = ["MUKEY", "COKEY", "COMPPCT_R"]
 
-                if sdvAtt == "Surface Texture":
-                    outputLayer = "Texture"
-                    dSDV["resultcolumnname"] = "TEXTURE"
+        for sdvAtt, aggMethod in attList:
+            dAtt = GetSDVAtts(gdb, sdvAtt, aggMethod, "", False, "Representative")
 
-                elif sdvAtt.endswith("(Surface)"):
-                    outputLayer = sdvAtt.replace("(Surface)", ", ")
+            if len(dAtt) == 0:
+                continue
 
-            else:
-                #PrintMsg(" \nKeeping this as a surface layer...", 1)
-                outputLayer = sdvAtt
-                top = 0
-                bot = 1
+            if aggMethod == "":
+                aggMethod = dAtt["algorithmname"]
 
-        else:
-            #PrintMsg(" \nKeeping this as the original layer...", 1)
-            outputLayer = sdvAtt
+            ratingFld = dAtt["attributecolumnname"].upper()
+            bNumeric = dAtt["effectivelogicaldatatype"].lower() in ["integer", "float"]
 
+            if dAtt["attributetype"] != "Property" or dAtt["attributetablename"].upper() != "COMPONENT" or dAtt["cmonthlevelattribflag"] == 1 \
+               or dAtt["horzlevelattribflag"] == 1 or not aggMethod in dMethods or not ratingFld in dCompFields or (aggMethod == "Weighted Average" and not bNumeric):
+                PrintMsg("\tSkipping '" + sdvAtt + "' (" + aggMethod + "), not a component-level property for the wide table", 1)
+                continue
 
+            if dAtt["tiebreakrule"] == -1:
+                tieBreaker = dAtt["tiebreaklowlabel"] if not dAtt["tiebreaklowlabel"] in [None, ""] else "Lower"
+                bHigh = False
 
+            else:
+                tieBreaker = dAtt["tiebreakhighlabel"] if not dAtt["tiebreakhighlabel"] is None else "Higher"
+                bHigh = True
 
+            whereList = list()
 
-        #PrintMsg(" \n\txxx Testing aggregation method: " + aggMethod, 1)
+            # Same NULL rules as CreateSoilMap: interpnullsaszerooptionflag turns on bZero and
+            # nullratingreplacementvalue is used by the weighted average
+            bAttZero = bZero or bool(dAtt["interpnullsaszerooptionflag"])
+            nullRating = GetNullRating(dAtt)
 
-        if dSDV["attributetype"].lower() == "interpretation" and dSDV["effectivelogicaldatatype"] == "float":
-            # For batch mode processing, override default bFuzzy setting to true. This applies to NCCPI interps.
-            bFuzzy == True
+            if not dAtt["sqlwhereclause"] is None and dAtt["sqlwhereclause"].strip() != "":
+                whereList.append(dAtt["sqlwhereclause"])
 
-        if tieBreaker == "":
-            if dSDV["tiebreakrule"] == -1:
-                tieBreaker = dSDV["tiebreaklowlabel"]
+                for word in re.findall(r"[A-Za-z_]\w*", dAtt["sqlwhereclause"]):
+                    if word.upper() in dCompFields and not word.upper() in compFlds:
+                        compFlds.append(word.upper())
 
-                if tieBreaker is None or tieBreaker == "":
-                    tieBreaker = "Lower"
+            if not bAttZero and aggMethod in ["Dominant Condition", "Weighted Average"]:
+                # AggregateCo_DCP keeps NULL ratings, the dominant component is reported even when it is not rated
+                whereList.append(ratingFld + " IS NOT NULL")
 
-            else:
-                tieBreaker = dSDV["tiebreakhighlabel"]
+            if not ratingFld in compFlds:
+                compFlds.append(ratingFld)
 
-                if tieBreaker is None:
-                    tieBreaker = "Higher"
+            dSDV = dAtt
 
+            if dAtt["tiebreakdomainname"] is not None:
+                domainValues = GetRatingDomain(gdb)
 
-        # Set null replacement values according to SDV rules
-        global nullRating
+            else:
+                domainValues = list()
 
-        if not dSDV["nullratingreplacementvalue"] is None:
-            if dSDV["attributelogicaldatatype"].lower() == "integer":
-                nullRating = int(dSDV["nullratingreplacementvalue"])
+            wideAtts.append([sdvAtt, aggMethod, dAtt, ratingFld, bNumeric, bHigh, " AND ".join(whereList), domainValues, bAttZero, nullRating])
 
-            elif dSDV["attributelogicaldatatype"].lower() == "float":
-                nullRating = float(dSDV["nullratingreplacementvalue"])
+        if len(wideAtts) == 0:
+            raise MyError, "No component-level soil properties for the wide table"
 
-            elif dSDV["attributelogicaldatatype"].lower() in ["string", "choice"]:
-                nullRating = dSDV["nullratingreplacementvalue"]
+        # Read the component table once
+        arcpy.SetProgressorLabel("Reading component table")
+        start = time.time()
+        sdvTbl = SDVTable(compTbl, compFlds, dCompFields)
+        fldIndexes = range(len(compFlds))
+        compSQL = "COMPPCT_R >= " + str(cutOff) + " AND COMPNAME <> 'NOTCOM'"
 
-            else:
-                nullRating = None
+        with arcpy.da.SearchCursor(compTbl, compFlds, where_clause=compSQL) as cur:
+            for rec in cur:
+                sdvTbl.insertRow(fldIndexes, rec)
 
-        else:
-            nullRating = None
+        if bVerbose:
+            PrintMsg(" \nRead " + Number_Format(sdvTbl.count, 0, True) + " component records in " + elapsedTime(start), 1)
 
-        if dSDV["interpnullsaszerooptionflag"]:
-            bZero = True
+        # Aggregate each attribute from the in-memory component records
+        iMukey = sdvTbl.dIndex["MUKEY"]
+        iPct = sdvTbl.dIndex["COMPPCT_R"]
+        dResults = dict()
+        outFields = list()
 
-        if len(dSDV) == 0:
-            raise MyError, "dSDV is not populated"
+        for sdvAtt, aggMethod, dAtt, ratingFld, bNumeric, bHigh, whereClause, domainValues, bAttZero, nullRating in wideAtts:
+            arcpy.SetProgressorLabel("Aggregating " + sdvAtt)
+            iRating = sdvTbl.dIndex[ratingFld]
+            sOrder = " DESC" if bHigh else " ASC"
+            conditions, orderBy = ParseSDVQuery(sdvTbl, whereClause, (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, " + ratingFld + sOrder))
 
-        # 'Big' 3 tables
-        big3Tbls = ["MAPUNIT", "COMPONENT", "CHORIZON"]
+            if conditions is None:
+                PrintMsg("\tSkipping '" + sdvAtt + "', unable to apply the where clause: " + whereClause, 1)
+                continue
 
-        #  Create a dictionary to define minimum field list for the tables being used
-        #
-        global dFields
-        dFields = dict()
-        dFields["MAPUNIT"] = ["MUKEY", "MUSYM", "MUNAME", "LKEY"]
-        dFields["COMPONENT"] = ["MUKEY", "COKEY", "COMPNAME", "COMPPCT_R"]
-        dFields["CHORIZON"] = ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R"]
-        dFields["COMONTH"] = ["COKEY", "COMONTHKEY"]
-        #dFields["COMONTH"] = ["COMONTHKEY", "MONTH"]
+            getValue = sdvTbl.getValue
+            recList = [(getValue(iMukey, iRow), None, None, getValue(iPct, iRow), getValue(iRating, iRow)) for iRow in sdvTbl.query(conditions, orderBy)]
+            fldPrecision = max(0, dAtt["attributeprecision"])
 
-        # Create dictionary containing substitute values for missing data
-        global dMissing
-        dMissing = dict()
-        dMissing[dSDV["attributetablename"].upper()] = [nullRating]  
-        dMissing["MAPUNIT"] = [None] * len(dFields["MAPUNIT"])
-        dMissing["COMPONENT"] = [None] * (len(dFields["COMPONENT"]) - 1)  # adjusted number down because of mukey
-        dMissing["CHORIZON"] = [None] * (len(dFields["CHORIZON"]) - 1)
-        dMissing["COMONTH"] = [None] * (len(dFields["COMONTH"]) - 1)
-        #dMissing["COSOILMOIST"] = [nullRating]
-              # This ends up setting NOTCOM to 'None' for Flooding Frequency. What can I do?
-        #PrintMsg(" \ndInitial dMissing values: " + str(dMissing), 0)
+            if aggMethod == "Dominant Component":
+                dMuRating = WideDCP(recList, fldPrecision, bNumeric)
 
-        # Dictionary containing sql_clauses for the Big 3
-        #
-        global dSQL
-        dSQL = dict()
-        dSQL["MAPUNIT"] = (None, "ORDER BY MUKEY ASC")
-        dSQL["COMPONENT"] = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC")
-        dSQL["CHORIZON"] = (None, "ORDER BY COKEY ASC, HZDEPT_R ASC")
+            elif aggMethod == "Dominant Condition":
+                dMuRating = WideDCD(recList, bNumeric, bHigh, domainValues)
 
-        # Get information about the SDV output result field
-        resultcolumn = dSDV["resultcolumnname"].upper()
-        primaryconcolname = dSDV["primaryconcolname"]
-        secondaryconcolname = dSDV["secondaryconcolname"]
-        
-        if primaryconcolname is not None:
-            primaryconcolname = primaryconcolname.upper()
+            else:
+                dMuRating = WideWTA(recList, fldPrecision, bAttZero, nullRating)
 
-        if secondaryconcolname is not None:
-            secondaryconcolname = secondaryconcolname.upper()
+            # Output field uses the same name and type as the rating field in the SDV_ table
+            fldName = arcpy.ValidateFieldName(dAtt["resultcolumnname"], gdb)
 
-        # Create dictionary to contain key field definitions
-        # AddField_management (in_table, field_name, field_type, {field_precision}, {field_scale}, {field_length}, {field_alias}, {field_is_nullable}, {field_is_required}, {field_domain})
-        # TEXT, FLOAT, DOUBLE, SHORT, LONG, DATE, BLOB, RASTER, GUID
-        # field_type, field_length (text only),
-        #
-        global dFieldInfo
-        dFieldInfo = dict()
+            if aggMethod == "Weighted Average":
+                fldType, fldLen = ("DOUBLE", 0)
 
-        # Convert original sdvattribute field settings to ArcGIS data types
-        if dSDV["effectivelogicaldatatype"].lower() in ['choice', 'string']:
-            #
-            dFieldInfo[resultcolumn] = ["TEXT", 254]
+            else:
+                fldType, fldLen = dCompFields[ratingFld]
 
-        elif dSDV["effectivelogicaldatatype"].lower() == 'vtext':
-            #
-            dFieldInfo[resultcolumn] = ["TEXT", 1024]  # guess
+            dResults[fldName] = dMuRating
+            outFields.append([fldName, fldType, fldLen, sdvAtt])
 
-        elif dSDV["effectivelogicaldatatype"].lower() == 'float':
-            #dFieldInfo[resultcolumn] = ["DOUBLE", ""]
-            dFieldInfo[resultcolumn] = ["FLOAT", ""]  # trying to match muaggatt table data type
+        # Write one record for each map unit
+        arcpy.SetProgressorLabel("Writing " + os.path.basename(outputTbl))
+        dLegend = dict()
+
+        with arcpy.da.SearchCursor(os.path.join(gdb, "legend"), ["LKEY", "AREASYMBOL"]) as cur:
+            for rec in cur:
+                dLegend[rec[0]] = rec[1]
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-        elif dSDV["effectivelogicaldatatype"].lower() == 'integer':
-            dFieldInfo[resultcolumn] = ["SHORT", ""]
+        arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl))
+        arcpy.AddField_management(outputTbl, "MUKEY", "TEXT", "", "", 30)
+        arcpy.AddField_management(outputTbl, "AREASYMBOL", "TEXT", "", "", 20)
+        arcpy.AddField_management(outputTbl, "MUSYM", "TEXT", "", "", 6)
+        arcpy.AddField_management(outputTbl, "MUNAME", "TEXT", "", "", 240)
 
-        elif dSDV["effectivelogicaldatatype"].lower() == 'narrative text':
-            dFieldInfo[resultcolumn] = ["TEXT", 1024]  # need to find out where this new data type came from
+        for fldName, fldType, fldLen, sdvAtt in outFields:
+            if fldType == "TEXT":
+                arcpy.AddField_management(outputTbl, fldName, fldType, "", "", fldLen, sdvAtt)
 
-        else:
-            raise MyError, "Failed to set dFieldInfo for " + resultcolumn + ", " + dSDV["effectivelogicaldatatype"]
+            else:
+                arcpy.AddField_management(outputTbl, fldName, fldType, "", "", "", sdvAtt)
 
-        dFieldInfo["AREASYMBOL"] = ["TEXT", 20]
-        dFieldInfo["LKEY"] = ["TEXT", 30]
-        dFieldInfo["MUKEY"] = ["TEXT", 30]
-        dFieldInfo["MUSYM"] = ["TEXT", 6]
-        dFieldInfo["MUNAME"] = ["TEXT", 175]
-        dFieldInfo["COKEY"] = ["TEXT", 30]
-        dFieldInfo["COMPNAME"] = ["TEXT", 60]
-        dFieldInfo["CHKEY"] = ["TEXT", 30]
-        dFieldInfo["COMPPCT_R"] = ["SHORT", ""]
-        dFieldInfo["HZDEPT_R"] = ["SHORT", ""]
-        dFieldInfo["HZDEPB_R"] = ["SHORT", ""]
-        dFieldInfo["INTERPHR"] = ["FLOAT", ""]  # trying to match muaggatt data type
+        with arcpy.da.SearchCursor(os.path.join(gdb, "mapunit"), ["MUKEY", "LKEY", "MUSYM", "MUNAME"], sql_clause=(None, "ORDER BY MUKEY")) as cur:
+            with arcpy.da.InsertCursor(outputTbl, ["MUKEY", "AREASYMBOL", "MUSYM", "MUNAME"] + [fld[0] for fld in outFields]) as ocur:
+                for mukey, lkey, musym, muname in cur:
+                    ocur.insertRow([mukey, dLegend.get(lkey, None), musym, muname] + [dResults[fld[0]].get(mukey, None) for fld in outFields])
 
-        # I don't remember why I did this
-        if dSDV["attributetype"].lower() == "interpretation" and (bFuzzy == True or dSDV["effectivelogicaldatatype"].lower() == "float"):
-            # For NCCPI?
-            dFieldInfo["INTERPHRC"] = ["FLOAT", ""]
+        arcpy.AddIndex_management(outputTbl, "MUKEY", "Indx" + os.path.basename(outputTbl))
 
-        else:
-            dFieldInfo["INTERPHRC"] = ["TEXT", 254]
+        return [fld[3] for fld in outFields]
 
-        dFieldInfo["MONTH"] = ["TEXT", 10]
-        dFieldInfo["MONTHSEQ"] = ["SHORT", ""]
-        dFieldInfo["COMONTHKEY"] = ["TEXT", 30]
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return []
 
-        # Get possible result domain values from mdstattabcols and mdstatdomdet tables
-        # There is a problem because the XML for the legend does not always match case
-        # Create a dictionary as backup, but uppercase and use that to store the original values
-        #
-        # Assume that data types of string and vtext do not have domains
+    except:
+        errorMsg()
+        return []
 
-        #PrintMsg(" \nCreating global variables for domainValues and domainValuesUp", 1)
-        global domainValues, domainValuesUp
+## ===================================================================================
+def CheckWideRatingTable(wideTbl, sdvAtt, ratingTbl):
+    # Parity check for CreateWideRatingTable. 2026-10-17
+    # Compares the wide table column for sdvAtt (the field alias) with the rating column of the
+    # SDV_ table CreateSoilMap created for the same attribute and aggregation method. Map units
+    # without a record in the SDV_ table are compared as NULL, the same as the joined map layer.
+    #
+    # Returns a list of the MUKEYs with different ratings, or None if the tables can't be compared.
 
-        if not dSDV["attributelogicaldatatype"].lower() in ["string", "vtext"]:
-            domainValues = GetRatingDomain(gdb)
-            #PrintMsg( "\ndomainValues: " + str(domainValues), 1)
-            domainValuesUp = [x.upper() for x in domainValues]    # Is this variable being used?
+    try:
+        wideFld = ""
 
-        else:
-            domainValues = list()
-            domainValuesUp = list()
+        for fld in arcpy.ListFields(wideTbl):
+            if fld.aliasName == sdvAtt:
+                wideFld = fld.name
 
+        ratingFlds = [fld.name for fld in arcpy.ListFields(ratingTbl) if not fld.name.upper() in ["OBJECTID", "MUKEY", "COMPPCT_R", "AREASYMBOL"]]
 
-        # Get map legend information from the maplegendxml string
-        # For some interps, there are case mismatches with the actual rating values. This
-        # problem originates in the Rule Manager. This affects dLegend, legendValues, domainValues, dValues and dLabels.
-        # At some point I need to use outputValues to fix these.
-        #
-        global dLegend
+        if wideFld == "" or len(ratingFlds) == 0:
+            raise MyError, "No '" + sdvAtt + "' rating column to compare in " + os.path.basename(wideTbl) + " and " + os.path.basename(ratingTbl)
 
-        dLegend = GetMapLegend(dSDV, bFuzzy)    # dictionary containing all maplegendxml properties
-        #PrintMsg(" \nChecking dLegend values to see if rgb is text:  " + str(dLegend), 1)
+        dRatings = dict()
 
-        global dLabels
-        dLabels = dict()
+        with arcpy.da.SearchCursor(ratingTbl, ["MUKEY", ratingFlds[0]]) as cur:
+            for mukey, rating in cur:
+                dRatings[mukey] = rating
 
-        #PrintMsg(" \nAttributelogicaldatatype: " + dSDV["attributelogicaldatatype"].lower(), 1)
+        diffList = list()
 
-        if len(dLegend) > 0:
-            if not dSDV["effectivelogicaldatatype"].lower() in ["integer", "float"]:
-                #
-                legendValues = GetValuesFromLegend(dLegend)
-                dLabels = dLegend["labels"] # dictionary containing just the label properties such as value and labeltext
+        with arcpy.da.SearchCursor(wideTbl, ["MUKEY", wideFld]) as cur:
+            for mukey, rating in cur:
+                sdvRating = dRatings.get(mukey, None)
 
-                if len(domainValues) == 0:
-                    for i in range(1, (len(dLabels) + 1)):
-                        domainValues.append(dLabels[i]["value"])
+                if rating is None or sdvRating is None:
+                    bSame = rating is None and sdvRating is None
 
-                    #PrintMsg(" \nAdding <Null> to domainValues in CreateSoilMap function", 1)
+                elif isinstance(rating, (int, long, float)):
+                    bSame = abs(float(rating) - float(sdvRating)) < 0.0001
 
-            else:
-                #PrintMsg(" \n", 1)
-                legendValues = GetValuesFromLegend(dLegend)
+                else:
+                    bSame = rating.strip() == sdvRating.strip()
 
-        else:
-            # No map legend information in xml. Must be Progressive or using fuzzy values instead of original classes.
-            #
-            # This causes a problem for NCCPI.
-            legendValues = list()  # empty list, no legend
-            dLegend["type"] = "1"
+                if not bSame:
+                    diffList.append(mukey)
 
-        # If there are no domain values, try using the legend values instead.
-        # May want to reconsider this move
-        #
-        if len(legendValues) > 0:
-            if len(domainValues) == 0:
-                PrintMsg(" \nUsing map legend values to populate domainValues", 1)
-                domainValues = legendValues
+        return diffList
 
-        # Some problems with the 'Not rated' data value, legend value and sdvattribute setting ("notratedphrase")
-        # No perfect solution.
-        #
-        # Start by cleaning up the not rated value as best possible
-        if dSDV["attributetype"].lower() == "interpretation" and bFuzzy == False:
-            if not dSDV["notratedphrase"] is None:
-                # see if the lowercase value is equivalent to 'not rated'
-                if dSDV["notratedphrase"].upper() == 'NOT RATED':
-                    dSDV["notratedphrase"] = 'Not rated'
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return None
 
-                else:
-                    dSDV["notratedphrase"] == dSDV["notratedphrase"][0:1].upper() + dSDV["notratedphrase"][1:].lower()
+    except:
+        errorMsg()
+        return None
 
-            else:
-                dSDV["notratedphrase"] = 'Not rated' # no way to know if this is correct until all of the data has been processed
+## ===================================================================================
+def ComputeSoilRatings(params):
+    # Worker process function for gSSURGO_CreateSoilMaps. 2026-10-17
+    #
+    # Runs CreateSoilMap in headless mode (mxd = None) for one attribute and each of its
+    # depth ranges. SDV_Data and the rating tables are written to a scratch geodatabase
+    # for this process, so nothing is written to the soil geodatabase. The rating cache is
+    # only read here; the new cache entries are returned and the parent writes them, so the
+    # serial map phase in gSSURGO_CreateSoilMaps only has to rebuild the tables from the
+    # cache and add the map layers.
+    #
+    # params = (inputPath, sdvAtt, depthRanges, aggMethod, primCst, secCst, begMo, endMo,
+    #           tieBreaker, bZero, cutOff, bFuzzy, sRV)
+    #
+    # Returns sdvAtt, a list of depth ranges that failed and a list of rating cache entries
+    # for WriteRatingCache.
+    #
+    global hzCacheRange, bTableCache, ratingWS, ratingCacheEntries, bRunLogTable
 
-            #
-            # Next see if the not rated value exists in the domain from mdstatdomdet or map legend values
-            bNotRated = False
+    inputPath, sdvAtt, depthRanges, aggMethod, primCst, secCst, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV = params
+    failedRanges = list()
+    scratchFolder = ""
+    bLogTable = bRunLogTable
 
-            for d in domainValues:
-                if not dSDV["notratedphrase"] is None and not d is None:
-                    if d.upper() == dSDV["notratedphrase"].upper():
-                        bNotRated = True
+    try:
+        bTableCache = True
+        bRunLogTable = False     # SDV_RunLog is in the soil geodatabase, the JSON run log is still written
+        ratingCacheEntries = list()
 
-            if bNotRated == False:
-                domainValues.insert(0, dSDV["notratedphrase"])
+        scratchFolder = tempfile.mkdtemp(prefix="gSSURGO_")
+        arcpy.CreateFileGDB_management(scratchFolder, "Ratings.gdb")
+        ratingWS = os.path.join(scratchFolder, "Ratings.gdb")
 
+        if len(depthRanges) > 1:
+            hzCacheRange = (min([d[0] for d in depthRanges]), max([d[1] for d in depthRanges]))
 
-        if dSDV["ruledesign"] == 2:
-            # Flip legend (including Not rated) for suitability interps
-            domainValues.reverse()
-            
-        if not None in domainValues and len(domainValues) > 0:
-            # Insert None at beginning or end of domainValues
-            #PrintMsg(" \nAdding None to domainValues in CreateSoilMap function", 1)
+        for top, bot in depthRanges:
+            outputTbl = CreateSoilMap(inputPath, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, "", None, "")
 
-            if tieBreaker == dSDV["tiebreakhighlabel"]:
-                # Put the null value at the beginning of the domain
-                #dValues["NONE"] = [0, None]
-                domainValues.insert(0, None)
-                #pass
+            if outputTbl is None:
+                failedRanges.append((top, bot))
 
-            else:
-                # Put the null value at the end of the domain
-                #dValues["NONE"] = [len(dValues), None]
-                domainValues.append(None)
-                #pass
+        return sdvAtt, failedRanges, ratingCacheEntries
 
-            # Update dValues dictionary
-            i = 0
-            
-            for val in domainValues:
-                dValues[str(val).upper()] = [i, val]
-                i += 1
+    except:
+        errorMsg()
+        return sdvAtt, depthRanges, list()
 
-        #PrintMsg(" \ndValues: " + str(dValues), 1)
+    finally:
+        try:
+            if ratingWS != "" and arcpy.Exists(ratingWS):
+                arcpy.Delete_management(ratingWS)
 
-        # For the result column we need to translate the sdvattribute value to an ArcGIS field data type
-        #  'Choice' 'Float' 'Integer' 'string' 'String' 'VText'
-        if dSDV["attributelogicaldatatype"].lower() in ['string', 'choice']:
-            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["TEXT", dSDV["attributefieldsize"]]
+            if scratchFolder != "" and os.path.isdir(scratchFolder):
+                shutil.rmtree(scratchFolder, True)
 
-        elif dSDV["attributelogicaldatatype"].lower() == "vtext":
-            # Not sure if 254 is adequate
-            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["TEXT", 254]
+        except:
+            pass
 
-        elif dSDV["attributelogicaldatatype"].lower() == "integer":
-            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["SHORT", ""]
+        ratingWS = ""
+        ratingCacheEntries = None
+        bRunLogTable = bLogTable
+        hzCacheRange = None
+        bTableCache = False
+        dMemTables.clear()
+        dHorizonCache.clear()
+        dTableCache.clear()
 
-        elif dSDV["attributelogicaldatatype"].lower() == "float":
-            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["FLOAT", dSDV["attributeprecision"]]
+## ===================================================================================
+def CreateStreamRatingTable(gdb, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, hzQuery, chunkList, aggName):
+    # Streaming mode for CONUS-scale databases. 2026-10-17
+    #
+    # Runs CreateRatingData and the aggregation (RunAggregation) once for each chunk of legends
+    # from GetStreamChunks. Within a chunk, ReadTable only keeps the records for those survey
+    # areas and the rating table functions only write their map units, so each chunk's ratings
+    # are the same as in a full run. Each chunk's output table is appended to the final table
+    # (tblName). The settings made by CreateSoilMap (dSDV, dAreasymbols, dLegend, tblName) are
+    # not changed.
+    #
+    # Only the output values ([min, max] or the distinct ratings, see dAggMethods) and the
+    # legend values (dValues, domainValues) are kept from one chunk to the next.
+    #
+    # Returns outputTbl, outputValues like RunAggregation.
+    #
+    global streamLkeys
 
-        elif dSDV["attributelogicaldatatype"].lower() == "narrative text":
-            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["TEXT", 1024]
-            
-        else:
-            raise MyError, "Failed to set dFieldInfo for " + dSDV["attributecolumnname"].upper()
+    try:
+        outputTbl = os.path.join(RatingWorkspace(gdb), tblName)
+        streamTbl = outputTbl + "_Stream"
+        bMinMax = dSDV["effectivelogicaldatatype"].lower() in ["float", "integer"] and dAggMethods[aggName]["values"] == "minmax"
+        outputValues = list()
+        chunkCnt = 0
 
-        # Identify related tables using mdstatrshipdet and add to tblList
-        #
-        mdTable = os.path.join(gdb, "mdstatrshipdet")
-        mdFlds = ["LTABPHYNAME", "RTABPHYNAME", "LTABCOLPHYNAME", "RTABCOLPHYNAME"]
-        level = 0  # table depth
-        tblList = list()
+        if arcpy.Exists(streamTbl):
+            arcpy.Delete_management(streamTbl)
 
-        # Make sure mdstatrshipdet table is populated.
-        if int(arcpy.GetCount_management(mdTable).getOutput(0)) == 0:
-            raise MyError, "Required table (" + mdTable + ") is not populated"
+        for lkeyList in chunkList:
+            chunkCnt += 1
+            start = time.time()
 
-        if dAgg[aggMethod] != "":
-            outputLayer = outputLayer + " " + dAgg[aggMethod]
+            streamLkeys = lkeyList
+            dStreamKeys.clear()  # key sets for the previous chunk
+            dKeyIndex.clear()    # SDV_Data is created again for each chunk
+            dChunkAreasymbols = dict([(lkey, dAreasymbols[lkey]) for lkey in lkeyList if lkey in dAreasymbols])
 
-        if dSDV["horzlevelattribflag"] == 1:
-            if (sdvAtt in ["Surface Texture"] or sdvAtt.endswith("(Surface)")) and not (top == 0 and bot == 1):
-                outputLayer = outputLayer + " at " + str(top)  + "cm"
+            if arcpy.Exists(outputTbl):
+                arcpy.Delete_management(outputTbl)
 
-            else:
-                outputLayer = outputLayer + ", " + str(top) + " to " + str(bot) + "cm"
+            initialTbl = CreateRatingData(gdb, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, cutOff, hzQuery, dChunkAreasymbols, list(), None)
 
-            tf = "HZDEPT_R"
-            bf = "HZDEPB_R"
+            if initialTbl is None:
+                # No ratings for these survey areas
+                continue
 
-            if (bot - top) == 1:
-                hzQuery = "((" + tf + " = " + str(top) + " or " + bf + " = " + str(bot) + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+            chunkTbl, chunkValues = RunAggregation(aggName, RatingWorkspace(gdb), sdvAtt, initialTbl, bZero, cutOff, tieBreaker, top, bot)
+
+            if chunkValues is None or len(chunkValues) == 0 or not arcpy.Exists(outputTbl):
+                continue
+
+            if arcpy.Exists(streamTbl):
+                arcpy.Append_management(outputTbl, streamTbl, "NO_TEST")
 
             else:
-                #rng = str(tuple(range(top, (bot + 1))))
-                rng = str(tuple(range(top, bot)))
-                hzQuery = "((" + tf + " in " + rng + " or " + bf + " in " + rng + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+                arcpy.Copy_management(outputTbl, streamTbl)
 
+            if bMinMax:
+                if chunkValues != [0.0, 0.0]:
+                    if len(outputValues) == 0:
+                        outputValues = [chunkValues[0], chunkValues[-1]]
 
-        elif dSDV["cmonthlevelattribflag"] == 1:
-            outputLayer = outputLayer + ", " + str(begMo) + " - " + str(endMo)
+                    else:
+                        outputValues = [min(outputValues[0], chunkValues[0]), max(outputValues[1], chunkValues[-1])]
 
+            else:
+                for val in chunkValues:
+                    if not val in outputValues:
+                        outputValues.append(val)
 
-        elif secCst != "":
-            #PrintMsg(" \nAdding primary and secondary constraint to layer name (" + primCst + " " + secCst + ")", 1)
-            outputLayer = outputLayer + ", " + primCst + ", " + secCst
+            if bVerbose:
+                PrintMsg("\tChunk " + str(chunkCnt) + " of " + str(len(chunkList)) + " (" + Number_Format(len(lkeyList), 0, True) + " survey areas) processed in " + elapsedTime(start), 1)
 
-        elif primCst != "":
-            #PrintMsg(" \nAdding primaryconstraint to layer name (" + primCst + ")", 1)
-            outputLayer = outputLayer + ", " + primCst
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-        # Remove any forward slashes from outputLayer name
-        outputLayer = outputLayer.replace("/", "-")
+        if not arcpy.Exists(streamTbl):
+            return outputTbl, list()
 
-        # Print status
-        # Need to modify message when type is Interp and bFuzzy is True
-        #
-        if __name__ == "__main__":
-            if aggMethod == "Minimum or Maximum":
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
+        arcpy.Rename_management(streamTbl, outputTbl)
 
-                else:
-                    PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
+        if not bMinMax:
+            outputValues.sort()
 
-            elif dSDV["attributetype"].lower() == "interpretation" and bFuzzy == True:
-                PrintMsg(" \nCreating map for '" + outputLayer + "' using " + os.path.basename(gdb), 0)
+        return outputTbl, outputValues
 
-            else:
-                PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return "", None
 
-        # Check to see if the layer already exists and delete if necessary
-        layers = arcpy.mapping.ListLayers(mxd, outputLayer, df)
+    except:
+        errorMsg()
+        return "", None
 
-        if len(layers) == 1:
-            arcpy.mapping.RemoveLayer(df, layers[0])
+    finally:
+        streamLkeys = None
+        dStreamKeys.clear()
 
-        # See if a group layer is being used
-        if grpLayerName != "":
-            grpLayers = arcpy.mapping.ListLayers(mxd, grpLayerName, df)
-             
-            if grpLayers is None or len(grpLayers) == 0:
-                grpLayer = CreateGroupLayer(grpLayerName, mxd, df)
+## ===================================================================================
+def CreateRatingData(gdb, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, cutOff, hzQuery, dAreasymbols, tableViews, df):
+    # Read the soil tables for sdvAtt and create the initial table (SDV_Data). 2026-10-17
+    #
+    # This is the table read part of CreateSoilMap. It uses the settings CreateSoilMap has
+    # already put in dSDV, dFields, dMissing, dSQL and dFieldInfo, so streaming mode
+    # (CreateStreamRatingTable) can run it once for each chunk of survey areas. Only the
+    # map units for the legends in dAreasymbols are written to SDV_Data.
+    #
+    # Returns initialTbl, or None if there is no data.
+    #
+    try:
+        # Identify related tables using mdstatrshipdet and add to tblList
+        #
+        mdTable = os.path.join(gdb, "mdstatrshipdet")
+        mdFlds = ["LTABPHYNAME", "RTABPHYNAME", "LTABCOLPHYNAME", "RTABCOLPHYNAME"]
+        level = 0  # table depth
+        tblList = list()
 
-            else:
-                grpLayer = grpLayers[0]
+        # 'Big' 3 tables
+        big3Tbls = ["MAPUNIT", "COMPONENT", "CHORIZON"]
 
-        else:
-            #PrintMsg("\tNo group layer being used", 1)
-            grpLayer = None
+        # Create list of months for use in some queries
+        moList = ListMonths()
 
-        # Create list of tables in the ArcMap TOC. Later check to see if a table
-        # involved in queries needs to be removed from the TOC.
-        tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)
-        mainTables = ['mapunit', 'component', 'chorizon']
+        primaryconcolname = dSDV["primaryconcolname"]
+        secondaryconcolname = dSDV["secondaryconcolname"]
+
+        if primaryconcolname is not None:
+            primaryconcolname = primaryconcolname.upper()
+
+        if secondaryconcolname is not None:
+            secondaryconcolname = secondaryconcolname.upper()
 
-        for tv in tableViews:
-            if tv.datasetName.lower() in mainTables:
-                # Remove this table view from ArcMap that might cause a conflict with queries
-                arcpy.mapping.RemoveTableView(df, tv)
 
-        tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)   # any other table views...
         rtabphyname = "XXXXX"
         mdSQL = "RTABPHYNAME = '" + dSDV["attributetablename"].lower() + "'"  # initial whereclause for mdstatrshipdet
    
@@ -10303,7 +12005,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             elif rtabphyname == "CHORIZON":
                                 #primSQL = "(CHORIZON.HZDEPT_R between " + str(top) + " and " + str(bot) + " or CHORIZON.HZDEPB_R between " + str(top) + " and " + str(bot + 1) + ")"
                                 #PrintMsg(" \nCHORIZON hzQuery: " + hzQuery, 1)
-                                dHorizon = ReadTable(rtabphyname, flds, hzQuery, level, sql)
+                                dHorizon = ReadHorizonTable(rtabphyname, flds, hzQuery, level, sql, top, bot)
 
                                 if len(dHorizon) == 0:
                                     raise MyError, "No horizon data for " + sdvAtt
@@ -10343,584 +12045,887 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             if rtabphyname == "MAPUNIT":
                                 dMapunit = ReadTable(rtabphyname, flds, primSQL, level, sql)
 
-                                if len(dMapunit) == 0:
-                                    raise MyError, "Length of dMapunit is zero"
+                                if len(dMapunit) == 0:
+                                    raise MyError, "Length of dMapunit is zero"
+
+                            elif rtabphyname == "COMPONENT":
+                                primSQL = "COMPPCT_R >= " + str(cutOff)
+
+                                #PrintMsg(" \nPopulating dictionary from component table", 1)
+
+                                dComponent = ReadTable(rtabphyname, flds, primSQL, level, sql)
+
+                                if len(dComponent) == 0:
+                                    raise MyError, "Length of dComponent is zero"
+
+                            elif rtabphyname == "CHORIZON":
+                                #primSQL = "(CHORIZON.HZDEPT_R between " + str(top) + " and " + str(bot) + " or CHORIZON.HZDEPB_R between " + str(top) + " and " + str(bot + 1) + ")"
+                                tf = "HZDEPT_R"
+                                bf = "HZDEPB_R"
+                                #primSQL = "( ( " + tf + " between " + str(top) + " and " + str(bot - 1) + " or " + bf + " between " + str(top) + " and " + str(bot) + " ) or " + \
+                                #"( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+                                if (bot - top) == 1:
+                                    #rng = str(tuple(range(top, (bot + 1))))
+                                    hzQuery = "((" + tf + " = " + str(top) + " or " + bf + " = " + str(bot) + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+
+                                else:
+                                    rng = str(tuple(range(top, bot)))
+                                    hzQuery = "((" + tf + " in " + rng + " or " + bf + " in " + rng + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+
+                                #PrintMsg(" \nSetting primSQL for when rtabphyname = 'CHORIZON' to: " + hzQuery, 1)
+                                dHorizon = ReadHorizonTable(rtabphyname, flds, hzQuery, level, sql, top, bot)
+
+                                if len(dHorizon) == 0:
+                                    raise MyError, "Length of dHorizon is zero"
+
+                            elif rtabphyname == "COMONTH":
+
+                                # Need to look at the SQL for the other tables as well...
+                                if begMo == endMo:
+                                    # query for single month
+                                    primSQL = "(MONTHSEQ = " + str(moList.index(begMo)) + ")"
+
+                                else:
+                                    primSQL = "(MONTHSEQ IN " + str(tuple(range(moList.index(begMo), (moList.index(endMo) + 1 )))) + ")"
+
+                                #PrintMsg(" \nIntermediate SQL: " + primSQL, 1)
+                                dMonth = ReadTable(rtabphyname, flds, primSQL, level, sql)
+
+                                if len(dMonth) == 0:
+                                    raise MyError, "No comonth data for " + sdvAtt + " \n "
+                                #else:
+                                #    PrintMsg(" \nFound " + str(len(dMonth)) + " records in COMONTH", 1)
+
+                            else:
+                                PrintMsg(" \n\tUnable to read data from: " + rtabphyname, 1)
+
+
+            if level > 6:
+                raise MyError, "Failed to get table relationships"
+
+
+        # Create a list of all fields needed for the initial output table. This
+        # one will include primary keys that won't be in the final output table.
+        #
+        if len(tblList) == 0:
+            # No Aggregation Necessary, append field to mapunit list
+            tblList = ["MAPUNIT"]
+
+            if dSDV["attributecolumnname"].upper() in dFields["MAPUNIT"]:
+                PrintMsg(" \nSkipping addition of field "  + dSDV["attributecolumnname"].upper(), 1)
+
+            else:
+                dFields["MAPUNIT"].append(dSDV["attributecolumnname"].upper())
+
+        tblList.reverse()  # Set order of the tables so that mapunit is on top
+
+        if bVerbose:
+            PrintMsg(" \nUsing these tables: " + ", ".join(tblList), 1)
+
+        # Create a list of all fields to be used
+        global allFields
+        allFields = ["AREASYMBOL"]
+        allFields.extend(dFields["MAPUNIT"])  # always include the selected set of fields from mapunit table
+        #PrintMsg(" \nallFields 1: " + ", ".join(allFields), 1)
+
+        # Substitute resultcolumname for last field in allFields
+        for tbl in tblList:
+            tFields = dFields[tbl]
+            for fld in tFields:
+                if not fld.upper() in allFields:
+                    #PrintMsg("\tAdding " + tbl + "." + fld.upper(), 1)
+                    allFields.append(fld.upper())
+
+        if not dSDV["attributecolumnname"].upper() in allFields:
+            allFields.append(dSDV["attributecolumnname"].upper())
+
+        #PrintMsg(" \nallFields 3: " + ", ".join(allFields), 1)
+
+        # Create initial output table (one-to-many)
+        # Now created with resultcolumnname
+        #
+        start = time.time()
+        initialTbl = CreateInitialTable(RatingWorkspace(gdb), allFields, dFieldInfo)
+        LogStage("CreateInitialTable", start)
+
+        if initialTbl is None:
+            raise MyError, "Failed to create initial query table"
+
+        # Made changes in the table relates code that creates tblList. List now has MAPUNIT in first position
+        #
+        start = time.time()
+
+        if tblList == ['MAPUNIT']:
+            # No aggregation needed
+            if CreateRatingTable1(tblList, dSDV["attributetablename"].upper(), initialTbl, dAreasymbols) == False:
+                raise MyError, "xxx CreateRatingTable failed"
+
+        elif tblList == ['MAPUNIT', 'COMPONENT']:
+            if CreateRatingTable2(tblList, dSDV["attributetablename"].upper(), dComponent, initialTbl, dAreasymbols) == False:
+                raise MyError, "xxx CreateRatingTable failed"
+            del dComponent
+
+        elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON']:
+            if CreateRatingTable3(tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, initialTbl, dAreasymbols) == False:
+                raise MyError, "xxx CreateRatingTable failed"
+            del dComponent, dHorizon
+
+        elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON', dSDV["attributetablename"].upper()]:
+            # COMPONENT, CHORIZON, CHTEXTUREGRP
+            if CreateRatingTable3S(tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, dTbl, initialTbl, sdvAtt, dAreasymbols) == False:
+                raise MyError, "xxx CreateRatingTable failed"
+            del dComponent, dHorizon
+
+        elif tblList in [['MAPUNIT', "MUAGGATT"], ['MAPUNIT', "MUCROPYLD"], ['MAPUNIT', 'MUTEXT']]:
+            if CreateRatingTable1S(tblList, dSDV["attributetablename"].upper(), dTbl, initialTbl, dAreasymbols) == False:
+                raise MyError, "xxx CreateRatingTable failed"
+
+        elif tblList == ['MAPUNIT', 'COMPONENT', dSDV["attributetablename"].upper()]:
+            if dSDV["attributetablename"].upper() == "COINTERP":
+                if CreateRatingInterps(tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl, dAreasymbols) == False:
+                    raise MyError, "xxx CreateRatingTable failed"
+                del dComponent
+
+            else:
+                if CreateRatingTable2S(tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl, dAreasymbols) == False:
+                    raise MyError, "xxx CreateRatingTable failed"
+
+        elif tblList == ['MAPUNIT', 'COMPONENT', 'COMONTH', 'COSOILMOIST']:
+            if dSDV["attributetablename"].upper() == "COSOILMOIST":
+
+                #PrintMsg(" \ndMissing values before CreateSoilMoistureTable: " + str(dMissing))
+
+                if CreateSoilMoistureTable(tblList, dSDV["attributetablename"].upper(), dComponent, dMonth, dTbl, initialTbl, begMo, endMo, dAreasymbols) == False:
+                    raise MyError, "xxx CreateRatingTable failed"
+                del dMonth, dComponent # trying to lower memory usage
+
+            else:
+                PrintMsg(" \nCannot handle table:" + dSDV["attributetablename"].upper(), 1)
+                raise MyError, "Tables Bad Combo: " + str(tblList)
+
+        else:
+            # Need to add ['COMPONENT', 'COMONTH', 'COSOILMOIST']
+            raise MyError, "Problem with list of input tables: " + str(tblList)
+
+        # **************************************************************************
+        # Look at attribflags and apply the appropriate aggregation function
+
+        if not arcpy.Exists(initialTbl):
+            # Output table was not created. Exit program.
+            raise MyError, "xxx Failed to create output table"
+
+        #PrintMsg(" \ninitialTbl has " + arcpy.GetCount_management(initialTbl).getOutput(0) + " records", 1)
+
+        sdvCnt = SDVCount(initialTbl)
+        LogStage("CreateRatingTable", start, sdvCnt, ", ".join(tblList))
+
+        if sdvCnt == 0:
+            #
+            raise MyError, "Failed to populate query table"
+
+        # Proceed with aggregation if the intermediate table has data.
+        # Add result column to fields list
+        iFlds = len(allFields)
+        newField = dSDV["resultcolumnname"].upper()
+
+        #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
+        allFields[len(allFields) - 1] = newField
+        rmFields = ["MUSYM", "COMPNAME", "LKEY"]
+
+        for fld in rmFields:
+            if fld in allFields:
+                allFields.remove(fld)
+
+        if newField == "MUNAME":
+            allFields.remove("MUNAME")
+
+        return initialTbl
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return None
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, grpLayerName, mxd, dfName):
+    #
+    # function that can be called by other scripts
+    #
+    bRunLogOwner = False
+
+    try:
+
+        global bVerbose
+
+        bVerbose = False   # hard-coded boolean to print diagnostic messages
+        # bVerbose = True
+
+        # Value cache is a global variable used for fact function which is called by ColorRamp
+        global fact_cache
+        fact_cache = {}
+
+        # Check the ArcGIS Desktop version number
+        installInfo = arcpy.GetInstallInfo()
+        version = installInfo["Version"][0:4]
+
+        import datetime
+
+        if not version[0:4] in ["10.3", "10.4", "10.5", "10.6", "10.7", "10.8"]:
+            PrintMsg(" \nArcGIS Desktop version " + version + " does not support the map symbology functions in this tool", 1)
+
+        # Get target gSSURGO database
+        global fc, gdb, muDesc, dataType
+        muDesc = arcpy.Describe(inputLayer)
+        fc = muDesc.catalogPath                         # full path for input mapunit polygon layer
+        gdb = os.path.dirname(fc)                       # need to expand to handle featuredatasets
+        dataType = muDesc.dataType.lower()
+
+        # 2026-10-17 Record stage timings, record counts and peak memory for this map (see WriteRunLog)
+        bRunLogOwner = StartRunLog(gdb, sdvAtt, aggMethod, top, bot)
+
+        # Set current workspace to the geodatabase
+        env.workspace = gdb
+        env.overwriteOutput = True
+
+        # get scratchGDB
+        scratchGDB = env.scratchGDB
+
+        # Get dictionary of MUSYM values (optional function for use during development)
+        # dSymbols = GetMapunitSymbols(gdb)
 
-                            elif rtabphyname == "COMPONENT":
-                                primSQL = "COMPPCT_R >= " + str(cutOff)
 
-                                #PrintMsg(" \nPopulating dictionary from component table", 1)
+        # If neccessary, create SDV_Symbology table for use by Convert Soil Map to Raster tool
+        symTbl = os.path.join(gdb, "SDV_Symbology")
+        maxLegend = 20480
 
-                                dComponent = ReadTable(rtabphyname, flds, primSQL, level, sql)
+        if not mxd is None and not arcpy.Exists(symTbl):
+            # Create new table here and then write to it
+            
+            #PrintMsg(" \ndLayerDefinition: " + str( dLayerDefinition), 1)
+            arcpy.CreateTable_management(os.path.dirname(symTbl), os.path.basename(symTbl))
+            arcpy.AddField_management(symTbl, "layername", "TEXT", "", "", 96)
+            arcpy.AddField_management(symTbl, "maplegend", "TEXT", "", "", maxLegend)
+            
+        if mxd is None:
+            # 2026-10-17 Headless mode used by the gSSURGO_CreateSoilMaps worker processes.
+            # Only the rating table is created (and saved to the rating cache).
+            df = None
 
-                                if len(dComponent) == 0:
-                                    raise MyError, "Length of dComponent is zero"
+        else:
+            arcpy.RefreshTOC()
+            #PrintMsg(" \nGetting dataframe named: " + dfName, 1)
+            dfList = arcpy.mapping.ListDataFrames(mxd, dfName)
 
-                            elif rtabphyname == "CHORIZON":
-                                #primSQL = "(CHORIZON.HZDEPT_R between " + str(top) + " and " + str(bot) + " or CHORIZON.HZDEPB_R between " + str(top) + " and " + str(bot + 1) + ")"
-                                tf = "HZDEPT_R"
-                                bf = "HZDEPB_R"
-                                #primSQL = "( ( " + tf + " between " + str(top) + " and " + str(bot - 1) + " or " + bf + " between " + str(top) + " and " + str(bot) + " ) or " + \
-                                #"( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
-                                if (bot - top) == 1:
-                                    #rng = str(tuple(range(top, (bot + 1))))
-                                    hzQuery = "((" + tf + " = " + str(top) + " or " + bf + " = " + str(bot) + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+            if len(dfList) > 0:
+                df = dfList[0]              
+                #PrintMsg(" \nData frame description: " + df.description + "  " + str(df.type), 1)
 
-                                else:
-                                    rng = str(tuple(range(top, bot)))
-                                    hzQuery = "((" + tf + " in " + rng + " or " + bf + " in " + rng + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
+            else:
+                raise MyError, "Problem with data frame or mxd"
 
-                                #PrintMsg(" \nSetting primSQL for when rtabphyname = 'CHORIZON' to: " + hzQuery, 1)
-                                dHorizon = ReadTable(rtabphyname, flds, hzQuery, level, sql)
+        # Create a dictionary based upon domainValues or legendValues.
+        # This dictionary will use an uppercase-string version of the original value as the key
+        #
+        global dValues
+        dValues = dict()  # Try creating a new dictionary. Key is uppercase-string value. Value = [order, original value]
 
-                                if len(dHorizon) == 0:
-                                    raise MyError, "Length of dHorizon is zero"
+        # Dictionary for aggregation method abbreviations
+        #
+        global dAgg
+        dAgg = dict()
+        dAgg["Dominant Component"] = "DCP"
+        dAgg["Dominant Condition"] = "DCD"
+        dAgg["No Aggregation Necessary"] = ""
+        dAgg["Percent Present"] = "PP"
+        dAgg["Weighted Average"] = "WTA"
+        dAgg["Most Limiting"] = "ML"
+        dAgg["Least Limiting"] = "LL"
+        dAgg[""] = ""
 
-                            elif rtabphyname == "COMONTH":
 
-                                # Need to look at the SQL for the other tables as well...
-                                if begMo == endMo:
-                                    # query for single month
-                                    primSQL = "(MONTHSEQ = " + str(moList.index(begMo)) + ")"
+        # Open sdvattribute table and query for [attributename] = sdvAtt
+        # if aggMethod is not already set, get the default method from the sdvattribute table
+        global dSDV
 
-                                else:
-                                    primSQL = "(MONTHSEQ IN " + str(tuple(range(moList.index(begMo), (moList.index(endMo) + 1 )))) + ")"
+        start = time.time()
+        dSDV = GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV)  # In batch mode, bFuzzy is set to False. This does not work for interps like NCCPI.
+        LogStage("GetSDVAtts", start)
 
-                                #PrintMsg(" \nIntermediate SQL: " + primSQL, 1)
-                                dMonth = ReadTable(rtabphyname, flds, primSQL, level, sql)
+        if aggMethod == "":
+            aggMethod = dSDV["algorithmname"]
 
-                                if len(dMonth) == 0:
-                                    raise MyError, "No comonth data for " + sdvAtt + " \n "
-                                #else:
-                                #    PrintMsg(" \nFound " + str(len(dMonth)) + " records in COMONTH", 1)
 
-                            else:
-                                PrintMsg(" \n\tUnable to read data from: " + rtabphyname, 1)
 
 
-            if level > 6:
-                raise MyError, "Failed to get table relationships"
+        if (sdvAtt in ["Surface Texture"] or sdvAtt.endswith("(Surface)")) and not (top == 0 and bot == 1):
 
+            if __name__ == "__main__":
+                #PrintMsg(" \nRenaming layer...", 1)
 
-        # Create a list of all fields needed for the initial output table. This
-        # one will include primary keys that won't be in the final output table.
-        #
-        if len(tblList) == 0:
-            # No Aggregation Necessary, append field to mapunit list
-            tblList = ["MAPUNIT"]
+                if sdvAtt == "Surface Texture":
+                    outputLayer = "Texture"
+                    dSDV["resultcolumnname"] = "TEXTURE"
 
-            if dSDV["attributecolumnname"].upper() in dFields["MAPUNIT"]:
-                PrintMsg(" \nSkipping addition of field "  + dSDV["attributecolumnname"].upper(), 1)
+                elif sdvAtt.endswith("(Surface)"):
+                    outputLayer = sdvAtt.replace("(Surface)", ", ")
 
             else:
-                dFields["MAPUNIT"].append(dSDV["attributecolumnname"].upper())
+                #PrintMsg(" \nKeeping this as a surface layer...", 1)
+                outputLayer = sdvAtt
+                top = 0
+                bot = 1
 
-        tblList.reverse()  # Set order of the tables so that mapunit is on top
+        else:
+            #PrintMsg(" \nKeeping this as the original layer...", 1)
+            outputLayer = sdvAtt
 
-        if bVerbose:
-            PrintMsg(" \nUsing these tables: " + ", ".join(tblList), 1)
 
-        # Create a list of all fields to be used
-        global allFields
-        allFields = ["AREASYMBOL"]
-        allFields.extend(dFields["MAPUNIT"])  # always include the selected set of fields from mapunit table
-        #PrintMsg(" \nallFields 1: " + ", ".join(allFields), 1)
 
-        # Substitute resultcolumname for last field in allFields
-        for tbl in tblList:
-            tFields = dFields[tbl]
-            for fld in tFields:
-                if not fld.upper() in allFields:
-                    #PrintMsg("\tAdding " + tbl + "." + fld.upper(), 1)
-                    allFields.append(fld.upper())
 
-        if not dSDV["attributecolumnname"].upper() in allFields:
-            allFields.append(dSDV["attributecolumnname"].upper())
 
-        #PrintMsg(" \nallFields 3: " + ", ".join(allFields), 1)
+        #PrintMsg(" \n\txxx Testing aggregation method: " + aggMethod, 1)
 
-        # Create initial output table (one-to-many)
-        # Now created with resultcolumnname
-        #
-        initialTbl = CreateInitialTable(gdb, allFields, dFieldInfo)
+        if dSDV["attributetype"].lower() == "interpretation" and dSDV["effectivelogicaldatatype"] == "float":
+            # For batch mode processing, override default bFuzzy setting to true. This applies to NCCPI interps.
+            bFuzzy == True
 
-        if initialTbl is None:
-            raise MyError, "Failed to create initial query table"
+        if tieBreaker == "":
+            if dSDV["tiebreakrule"] == -1:
+                tieBreaker = dSDV["tiebreaklowlabel"]
 
-        # Create dictionary for areasymbol
-        #PrintMsg(" \nGetting polygon count...", 1)
-        global polyCnt, fcCnt
-        polyCnt = int(arcpy.GetCount_management(inputLayer).getOutput(0))  # featurelayer polygon count
-        fcCnt = int(arcpy.GetCount_management(fc).getOutput(0))            # featureclass polygon count
-        #PrintMsg(" \nGot polygon count of " + Number_Format(polyCnt, 0, True), 1)
+                if tieBreaker is None or tieBreaker == "":
+                    tieBreaker = "Lower"
 
-        # Getting Areasymbols and legendkeys is a bottleneck (Thursday Aug 18). Any room for improvement?
-        #
-        #PrintMsg(" \nGetting areasymbols...", 1)
-        global dAreasymbols
-        dAreasymbols = GetAreasymbols(gdb)
+            else:
+                tieBreaker = dSDV["tiebreakhighlabel"]
 
-        if len(dAreasymbols) == 0:
-            raise MyError, "xxx dAreasymbols is not populated"
+                if tieBreaker is None:
+                    tieBreaker = "Higher"
 
-        # Made changes in the table relates code that creates tblList. List now has MAPUNIT in first position
-        #
 
-        if tblList == ['MAPUNIT']:
-            # No aggregation needed
-            if CreateRatingTable1(tblList, dSDV["attributetablename"].upper(), initialTbl, dAreasymbols) == False:
-                raise MyError, "xxx CreateRatingTable failed"
+        # Set null replacement values according to SDV rules
+        global nullRating
 
-        elif tblList == ['MAPUNIT', 'COMPONENT']:
-            if CreateRatingTable2(tblList, dSDV["attributetablename"].upper(), dComponent, initialTbl) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-            del dComponent
+        nullRating = GetNullRating(dSDV)
 
-        elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON']:
-            if CreateRatingTable3(tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, initialTbl) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-            del dComponent, dHorizon
+        if dSDV["interpnullsaszerooptionflag"]:
+            bZero = True
 
-        elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON', dSDV["attributetablename"].upper()]:
-            # COMPONENT, CHORIZON, CHTEXTUREGRP
-            if CreateRatingTable3S(tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, dTbl, initialTbl, sdvAtt) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-            del dComponent, dHorizon
+        if len(dSDV) == 0:
+            raise MyError, "dSDV is not populated"
 
-        elif tblList in [['MAPUNIT', "MUAGGATT"], ['MAPUNIT', "MUCROPYLD"], ['MAPUNIT', 'MUTEXT']]:
-            if CreateRatingTable1S(tblList, dSDV["attributetablename"].upper(), dTbl, initialTbl, dAreasymbols) == False:
-                raise MyError, "xxx CreateRatingTable failed"
+        #  Create a dictionary to define minimum field list for the tables being used
+        #
+        global dFields
+        dFields = dict()
+        dFields["MAPUNIT"] = ["MUKEY", "MUSYM", "MUNAME", "LKEY"]
+        dFields["COMPONENT"] = ["MUKEY", "COKEY", "COMPNAME", "COMPPCT_R"]
+        dFields["CHORIZON"] = ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R"]
+        dFields["COMONTH"] = ["COKEY", "COMONTHKEY"]
+        #dFields["COMONTH"] = ["COMONTHKEY", "MONTH"]
 
-        elif tblList == ['MAPUNIT', 'COMPONENT', dSDV["attributetablename"].upper()]:
-            if dSDV["attributetablename"].upper() == "COINTERP":
-                if CreateRatingInterps(tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl) == False:
-                    raise MyError, "xxx CreateRatingTable failed"
-                del dComponent
+        # Create dictionary containing substitute values for missing data
+        global dMissing
+        dMissing = dict()
+        dMissing[dSDV["attributetablename"].upper()] = [nullRating]  
+        dMissing["MAPUNIT"] = [None] * len(dFields["MAPUNIT"])
+        dMissing["COMPONENT"] = [None] * (len(dFields["COMPONENT"]) - 1)  # adjusted number down because of mukey
+        dMissing["CHORIZON"] = [None] * (len(dFields["CHORIZON"]) - 1)
+        dMissing["COMONTH"] = [None] * (len(dFields["COMONTH"]) - 1)
+        #dMissing["COSOILMOIST"] = [nullRating]
+              # This ends up setting NOTCOM to 'None' for Flooding Frequency. What can I do?
+        #PrintMsg(" \ndInitial dMissing values: " + str(dMissing), 0)
 
-            else:
-                if CreateRatingTable2S(tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl) == False:
-                    raise MyError, "xxx CreateRatingTable failed"
+        # Dictionary containing sql_clauses for the Big 3
+        #
+        global dSQL
+        dSQL = dict()
+        dSQL["MAPUNIT"] = (None, "ORDER BY MUKEY ASC")
+        dSQL["COMPONENT"] = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC")
+        dSQL["CHORIZON"] = (None, "ORDER BY COKEY ASC, HZDEPT_R ASC")
 
-        elif tblList == ['MAPUNIT', 'COMPONENT', 'COMONTH', 'COSOILMOIST']:
-            if dSDV["attributetablename"].upper() == "COSOILMOIST":
+        # Get information about the SDV output result field
+        resultcolumn = dSDV["resultcolumnname"].upper()
 
-                #PrintMsg(" \ndMissing values before CreateSoilMoistureTable: " + str(dMissing))
+        # Create dictionary to contain key field definitions
+        # AddField_management (in_table, field_name, field_type, {field_precision}, {field_scale}, {field_length}, {field_alias}, {field_is_nullable}, {field_is_required}, {field_domain})
+        # TEXT, FLOAT, DOUBLE, SHORT, LONG, DATE, BLOB, RASTER, GUID
+        # field_type, field_length (text only),
+        #
+        global dFieldInfo
+        dFieldInfo = dict()
 
-                if CreateSoilMoistureTable(tblList, dSDV["attributetablename"].upper(), dComponent, dMonth, dTbl, initialTbl, begMo, endMo) == False:
-                    raise MyError, "xxx CreateRatingTable failed"
-                del dMonth, dComponent # trying to lower memory usage
+        # Convert original sdvattribute field settings to ArcGIS data types
+        if dSDV["effectivelogicaldatatype"].lower() in ['choice', 'string']:
+            #
+            dFieldInfo[resultcolumn] = ["TEXT", 254]
 
-            else:
-                PrintMsg(" \nCannot handle table:" + dSDV["attributetablename"].upper(), 1)
-                raise MyError, "Tables Bad Combo: " + str(tblList)
+        elif dSDV["effectivelogicaldatatype"].lower() == 'vtext':
+            #
+            dFieldInfo[resultcolumn] = ["TEXT", 1024]  # guess
+
+        elif dSDV["effectivelogicaldatatype"].lower() == 'float':
+            #dFieldInfo[resultcolumn] = ["DOUBLE", ""]
+            dFieldInfo[resultcolumn] = ["FLOAT", ""]  # trying to match muaggatt table data type
+
+        elif dSDV["effectivelogicaldatatype"].lower() == 'integer':
+            dFieldInfo[resultcolumn] = ["SHORT", ""]
+
+        elif dSDV["effectivelogicaldatatype"].lower() == 'narrative text':
+            dFieldInfo[resultcolumn] = ["TEXT", 1024]  # need to find out where this new data type came from
 
         else:
-            # Need to add ['COMPONENT', 'COMONTH', 'COSOILMOIST']
-            raise MyError, "Problem with list of input tables: " + str(tblList)
+            raise MyError, "Failed to set dFieldInfo for " + resultcolumn + ", " + dSDV["effectivelogicaldatatype"]
 
-        # **************************************************************************
-        # Look at attribflags and apply the appropriate aggregation function
+        dFieldInfo["AREASYMBOL"] = ["TEXT", 20]
+        dFieldInfo["LKEY"] = ["TEXT", 30]
+        dFieldInfo["MUKEY"] = ["TEXT", 30]
+        dFieldInfo["MUSYM"] = ["TEXT", 6]
+        dFieldInfo["MUNAME"] = ["TEXT", 175]
+        dFieldInfo["COKEY"] = ["TEXT", 30]
+        dFieldInfo["COMPNAME"] = ["TEXT", 60]
+        dFieldInfo["CHKEY"] = ["TEXT", 30]
+        dFieldInfo["COMPPCT_R"] = ["SHORT", ""]
+        dFieldInfo["HZDEPT_R"] = ["SHORT", ""]
+        dFieldInfo["HZDEPB_R"] = ["SHORT", ""]
+        dFieldInfo["INTERPHR"] = ["FLOAT", ""]  # trying to match muaggatt data type
 
-        if not arcpy.Exists(initialTbl):
-            # Output table was not created. Exit program.
-            raise MyError, "xxx Failed to create output table"
+        # I don't remember why I did this
+        if dSDV["attributetype"].lower() == "interpretation" and (bFuzzy == True or dSDV["effectivelogicaldatatype"].lower() == "float"):
+            # For NCCPI?
+            dFieldInfo["INTERPHRC"] = ["FLOAT", ""]
 
-        #PrintMsg(" \ninitialTbl has " + arcpy.GetCount_management(initialTbl).getOutput(0) + " records", 1)
+        else:
+            dFieldInfo["INTERPHRC"] = ["TEXT", 254]
 
-        if int(arcpy.GetCount_management(initialTbl).getOutput(0)) == 0:
-            #
-            raise MyError, "Failed to populate query table"
+        dFieldInfo["MONTH"] = ["TEXT", 10]
+        dFieldInfo["MONTHSEQ"] = ["SHORT", ""]
+        dFieldInfo["COMONTHKEY"] = ["TEXT", 30]
 
-        # Proceed with aggregation if the intermediate table has data.
-        # Add result column to fields list
-        iFlds = len(allFields)
-        newField = dSDV["resultcolumnname"].upper()
+        # Get possible result domain values from mdstattabcols and mdstatdomdet tables
+        # There is a problem because the XML for the legend does not always match case
+        # Create a dictionary as backup, but uppercase and use that to store the original values
+        #
+        # Assume that data types of string and vtext do not have domains
 
-        #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
-        allFields[len(allFields) - 1] = newField
-        rmFields = ["MUSYM", "COMPNAME", "LKEY"]
+        #PrintMsg(" \nCreating global variables for domainValues and domainValuesUp", 1)
+        global domainValues, domainValuesUp
 
-        for fld in rmFields:
-            if fld in allFields:
-                allFields.remove(fld)
+        if not dSDV["attributelogicaldatatype"].lower() in ["string", "vtext"]:
+            domainValues = GetRatingDomain(gdb)
+            #PrintMsg( "\ndomainValues: " + str(domainValues), 1)
+            domainValuesUp = [x.upper() for x in domainValues]    # Is this variable being used?
 
-        if newField == "MUNAME":
-            allFields.remove("MUNAME")
+        else:
+            domainValues = list()
+            domainValuesUp = list()
 
-        #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
 
-        # Create name for final output table that will be saved to the input gSSURGO database
+        # Get map legend information from the maplegendxml string
+        # For some interps, there are case mismatches with the actual rating values. This
+        # problem originates in the Rule Manager. This affects dLegend, legendValues, domainValues, dValues and dLabels.
+        # At some point I need to use outputValues to fix these.
         #
-        global tblName
-        #PrintMsg("\taggMethod: '" + dAgg[aggMethod] + "'", 1)
+        global dLegend
 
-        
+        dLegend = GetMapLegend(dSDV, bFuzzy)    # dictionary containing all maplegendxml properties
+        #PrintMsg(" \nChecking dLegend values to see if rgb is text:  " + str(dLegend), 1)
 
-        if dAgg[aggMethod] == "":
-            # No aggregation method necessary
-            tblName = "SDV_" + dSDV["resultcolumnname"]
+        global dLabels
+        dLabels = dict()
 
-        else:
-            if secCst != "":
-                # Problem with primary and secondary constraint values. These can produce
-                # illegal table names
-                #
-                tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + primCst.replace(" ", "_") + "_" + secCst.replace(" ", "_")
+        #PrintMsg(" \nAttributelogicaldatatype: " + dSDV["attributelogicaldatatype"].lower(), 1)
 
+        if len(dLegend) > 0:
+            if not dSDV["effectivelogicaldatatype"].lower() in ["integer", "float"]:
+                #
+                legendValues = GetValuesFromLegend(dLegend)
+                dLabels = dLegend["labels"] # dictionary containing just the label properties such as value and labeltext
 
-            elif primCst != "":
-                #tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + dAgg[aggMethod] + "_" + primCst.replace(" ", "_")
-                tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + primCst.replace(" ", "_")
+                if len(domainValues) == 0:
+                    for i in range(1, (len(dLabels) + 1)):
+                        domainValues.append(dLabels[i]["value"])
 
-            elif dSDV["horzlevelattribflag"]:
-                #tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + dAgg[aggMethod] + "_" + str(top) + "to" + str(bot)
-                tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + str(top) + "to" + str(bot)
+                    #PrintMsg(" \nAdding <Null> to domainValues in CreateSoilMap function", 1)
 
             else:
-                #tblName = "SDV_" + dSDV["resultcolumnname"]+ "_" + dAgg[aggMethod]
-                tblName = "SDV_" + dSDV["resultcolumnname"]
-
-        tblName = arcpy.ValidateTableName(tblName, gdb)
-
-        # Cleanup any duplicate underscores in the table name
-        newName = ""
-        lastChar = "_"
+                #PrintMsg(" \n", 1)
+                legendValues = GetValuesFromLegend(dLegend)
 
-        for c in tblName:
-            if c == lastChar and c == "_":
-                # Don't use this character because it is another underscore
-                lastChar = c
+        else:
+            # No map legend information in xml. Must be Progressive or using fuzzy values instead of original classes.
+            #
+            # This causes a problem for NCCPI.
+            legendValues = list()  # empty list, no legend
+            dLegend["type"] = "1"
 
-            else:
-                newName += c
-                lastChar = c
+        # If there are no domain values, try using the legend values instead.
+        # May want to reconsider this move
+        #
+        if len(legendValues) > 0:
+            if len(domainValues) == 0:
+                PrintMsg(" \nUsing map legend values to populate domainValues", 1)
+                domainValues = legendValues
 
-        if newName[-1] == "_":
-            newName = newName[:-1]
+        # Some problems with the 'Not rated' data value, legend value and sdvattribute setting ("notratedphrase")
+        # No perfect solution.
+        #
+        # Start by cleaning up the not rated value as best possible
+        if dSDV["attributetype"].lower() == "interpretation" and bFuzzy == False:
+            if not dSDV["notratedphrase"] is None:
+                # see if the lowercase value is equivalent to 'not rated'
+                if dSDV["notratedphrase"].upper() == 'NOT RATED':
+                    dSDV["notratedphrase"] = 'Not rated'
 
-        tblName = newName
+                else:
+                    dSDV["notratedphrase"] == dSDV["notratedphrase"][0:1].upper() + dSDV["notratedphrase"][1:].lower()
 
-        #PrintMsg(" \nOutput table name = " + tblName, 1)
+            else:
+                dSDV["notratedphrase"] = 'Not rated' # no way to know if this is correct until all of the data has been processed
 
-        # **************************************************************************
-        #
-        # Aggregation Logic to determine which functions will be used to process the
-        # intermediate table and produce the final output table.
-        #
-        # This is where outputValues is set
-        #
-        if dSDV["attributetype"] == "Property":
-            # These are all Soil Properties
-            # Added addtional logic for Minnesota Crop Index. It has a problem in that mapunitlevelattribflag is set to zero.
+            #
+            # Next see if the not rated value exists in the domain from mdstatdomdet or map legend values
+            bNotRated = False
 
-            if (dSDV["mapunitlevelattribflag"] == 1 and \
-                    (dSDV["complevelattribflag"] == 0 and \
-                    dSDV["cmonthlevelattribflag"] == 0 and \
-                    dSDV["horzlevelattribflag"] == 0 )) or \
-                (dSDV["mapunitlevelattribflag"] == 0 \
-                and dSDV["complevelattribflag"] == 0 \
-                and dSDV["cmonthlevelattribflag"] == 0 \
-                and dSDV["horzlevelattribflag"] == 0 ):
-                # This is a Map unit Level Soil Property or it is Minnesota Crop Index in the MUTEXT table
-                #PrintMsg("Map unit level, no aggregation neccessary", 1)
-                outputTbl, outputValues = Aggregate1(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            for d in domainValues:
+                if not dSDV["notratedphrase"] is None and not d is None:
+                    if d.upper() == dSDV["notratedphrase"].upper():
+                        bNotRated = True
 
-            elif dSDV["complevelattribflag"] == 1:
+            if bNotRated == False:
+                domainValues.insert(0, dSDV["notratedphrase"])
 
-                if dSDV["horzlevelattribflag"] == 0:
-                    # These are Component Level-Only Soil Properties
 
-                    if dSDV["cmonthlevelattribflag"] == 0:
-                        #
-                        #  These are Component Level Soil Properties
+        if dSDV["ruledesign"] == 2:
+            # Flip legend (including Not rated) for suitability interps
+            domainValues.reverse()
+            
+        if not None in domainValues and len(domainValues) > 0:
+            # Insert None at beginning or end of domainValues
+            #PrintMsg(" \nAdding None to domainValues in CreateSoilMap function", 1)
 
-                        if aggMethod == "Dominant Component":
-                            #PrintMsg(" \n1. domainValues: " + ", ".join(domainValues), 1)
-                            outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            if tieBreaker == dSDV["tiebreakhighlabel"]:
+                # Put the null value at the beginning of the domain
+                #dValues["NONE"] = [0, None]
+                domainValues.insert(0, None)
+                #pass
 
-                        elif aggMethod == "Minimum or Maximum":
-                            outputTbl, outputValues = AggregateCo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            else:
+                # Put the null value at the end of the domain
+                #dValues["NONE"] = [len(dValues), None]
+                domainValues.append(None)
+                #pass
 
-                        elif aggMethod == "Dominant Condition":
-                            if bVerbose:
-                                PrintMsg(" \nDomain Values are now: " + str(domainValues), 1)
+            # Update dValues dictionary
+            i = 0
+            
+            for val in domainValues:
+                dValues[str(val).upper()] = [i, val]
+                i += 1
 
-                            if len(domainValues) > 0 and dSDV["tiebreakdomainname"] is not None :  # Problem with NonIrr CapSubCls
-                                if bVerbose:
-                                    PrintMsg(" \n1. aggMethod = " + aggMethod + " and domainValues = " + str(domainValues), 1)
+        #PrintMsg(" \ndValues: " + str(dValues), 1)
 
-                                outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        # For the result column we need to translate the sdvattribute value to an ArcGIS field data type
+        #  'Choice' 'Float' 'Integer' 'string' 'String' 'VText'
+        if dSDV["attributelogicaldatatype"].lower() in ['string', 'choice']:
+            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["TEXT", dSDV["attributefieldsize"]]
 
-                                if bVerbose:
-                                    PrintMsg(" \nOuputValues: " + str(outputValues), 1)
+        elif dSDV["attributelogicaldatatype"].lower() == "vtext":
+            # Not sure if 254 is adequate
+            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["TEXT", 254]
 
-                            else:
-                                if bVerbose:
-                                    PrintMsg(" \n2. aggMethod = " + aggMethod + " and no domainValues", 1)
+        elif dSDV["attributelogicaldatatype"].lower() == "integer":
+            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["SHORT", ""]
 
-                                outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        elif dSDV["attributelogicaldatatype"].lower() == "float":
+            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["FLOAT", dSDV["attributeprecision"]]
 
-                        elif aggMethod == "Minimum or Maximum":
-                            #
-                            outputTbl, outputValues = AggregateCo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        elif dSDV["attributelogicaldatatype"].lower() == "narrative text":
+            dFieldInfo[dSDV["attributecolumnname"].upper()] = ["TEXT", 1024]
+            
+        else:
+            raise MyError, "Failed to set dFieldInfo for " + dSDV["attributecolumnname"].upper()
 
-                        elif aggMethod == "Weighted Average" and dSDV["attributetype"].lower() == "property":
-                            # Using NCCPI for any numeric component level value?
-                            # This doesn't seem to be working for Range Prod 2016-01-28
-                            #
-                            outputTbl, outputValues = AggregateCo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bZero, cutOff, tieBreaker)
+        # Table relationships in mdstatrshipdet are used by CreateRatingData
+        #
+        mdTable = os.path.join(gdb, "mdstatrshipdet")
+        hzQuery = ""   # horizon depth query, set below for horizon-level attributes
 
-                        elif aggMethod == "Percent Present":
-                            # This is Hydric?
-                            outputTbl, outputValues = AggregateCo_PP_SUM(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        # Make sure mdstatrshipdet table is populated.
+        if int(arcpy.GetCount_management(mdTable).getOutput(0)) == 0:
+            raise MyError, "Required table (" + mdTable + ") is not populated"
 
-                        else:
-                            # Don't know what kind of interp this is
-                            raise MyError, "5. Component aggregation method has not yet been developed ruledesign 3 (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
+        if dAgg[aggMethod] != "":
+            outputLayer = outputLayer + " " + dAgg[aggMethod]
 
+        if dSDV["horzlevelattribflag"] == 1:
+            if (sdvAtt in ["Surface Texture"] or sdvAtt.endswith("(Surface)")) and not (top == 0 and bot == 1):
+                outputLayer = outputLayer + " at " + str(top)  + "cm"
 
-                    elif dSDV["cmonthlevelattribflag"] == 1:
-                        #
-                        # These are Component-Month Level Soil Properties
-                        #
-                        if dSDV["resultcolumnname"].startswith("Dep2WatTbl"):
-                            #PrintMsg(" \nThis is Depth to Water Table (" + dSDV["resultcolumnname"] + ")", 1)
+            else:
+                outputLayer = outputLayer + ", " + str(top) + " to " + str(bot) + "cm"
 
-                            if aggMethod == "Dominant Component":
-                                outputTbl, outputValues = AggregateCo_DCP_DTWT(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            tf = "HZDEPT_R"
+            bf = "HZDEPB_R"
 
-                            elif aggMethod == "Dominant Condition":
-                                outputTbl, outputValues = AggregateCo_Mo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
-                                #raise MyError, "EARLY OUT"
+            if (bot - top) == 1:
+                hzQuery = "((" + tf + " = " + str(top) + " or " + bf + " = " + str(bot) + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
 
-                            elif aggMethod == "Weighted Average":
-                                outputTbl, outputValues = AggregateCo_WTA_DTWT(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            else:
+                #rng = str(tuple(range(top, (bot + 1))))
+                rng = str(tuple(range(top, bot)))
+                hzQuery = "((" + tf + " in " + rng + " or " + bf + " in " + rng + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
 
-                            else:
-                                # Component-Month such as depth to water table - Minimum or Maximum
-                                outputTbl, outputValues = AggregateCo_Mo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
-                                #raise MyError, "5. Component-comonth aggregation method has not yet been developed "
 
-                        else:
-                            # This will be flooding or ponding frequency. In theory these should be the same value
-                            # for each month because these are normally annual ratings
-                            #
-                            # PrintMsg(" \nThis is Flooding or Ponding (" + dSDV["resultcolumnname"] + ")", 1 )
-                            #
-                            if aggMethod == "Dominant Component":
-                                # Problem with this aggregation method (AggregateCo_DCP). The CompPct sum is 12X because of the months.
-                                outputTbl, outputValues = AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        elif dSDV["cmonthlevelattribflag"] == 1:
+            outputLayer = outputLayer + ", " + str(begMo) + " - " + str(endMo)
 
-                            elif aggMethod == "Dominant Condition":
-                                # Problem with this aggregation method (AggregateCo_DCP_Domain). The CompPct sum is 12X because of the months.
-                                outputTbl, outputValues = AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker) # Orig
-                                #PrintMsg(" \noutputValues: " + ", ".join(outputValues), 1)
 
-                            elif aggMethod == "Minimum or Maximum":
-                                outputTbl, outputValues = AggregateCo_Mo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        elif secCst != "":
+            #PrintMsg(" \nAdding primary and secondary constraint to layer name (" + primCst + " " + secCst + ")", 1)
+            outputLayer = outputLayer + ", " + primCst + ", " + secCst
 
-                            elif aggMethod == "Weighted Average":
-                              outputTbl, outputValues = AggregateCo_Mo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        elif primCst != "":
+            #PrintMsg(" \nAdding primaryconstraint to layer name (" + primCst + ")", 1)
+            outputLayer = outputLayer + ", " + primCst
 
-                            else:
-                                raise MyError, "Aggregation method: " + aggMethod + "; attibute " + dSDV["attributecolumnname"].upper()
+        # Remove any forward slashes from outputLayer name
+        outputLayer = outputLayer.replace("/", "-")
 
-                    else:
-                        raise MyError, "Attribute level flag problem"
+        # Print status
+        # Need to modify message when type is Interp and bFuzzy is True
+        #
+        if __name__ == "__main__":
+            if aggMethod == "Minimum or Maximum":
+                if tieBreaker == dSDV["tiebreakhighlabel"]:
+                    PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
 
-                elif dSDV["horzlevelattribflag"] == 1:
-                    # These are all Horizon Level Soil Properties
+                else:
+                    PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
 
-                    if sdvAtt.startswith("K Factor"):
-                        # Need to figure out aggregation method for horizon level  max-min
-                        if aggMethod == "Dominant Condition":
-                            outputTbl, outputValues = AggregateHz_MaxMin_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bZero, cutOff, tieBreaker, top, bot)
+            elif dSDV["attributetype"].lower() == "interpretation" and bFuzzy == True:
+                PrintMsg(" \nCreating map for '" + outputLayer + "' using " + os.path.basename(gdb), 0)
 
-                        elif aggMethod == "Dominant Component":
-                            outputTbl, outputValues = AggregateHz_MaxMin_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bZero, cutOff, tieBreaker, top, bot)
+            else:
+                PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
 
-                    elif aggMethod == "Weighted Average":
-                        # component aggregation is weighted average
+        # Check to see if the layer already exists and delete if necessary
+        if mxd is None:
+            layers = list()
 
-                        if dSDV["attributelogicaldatatype"].lower() in ["integer", "float"]:
-                            # Just making sure that these are numeric values, not indexes
-                            if dSDV["horzaggmeth"] == "Weighted Average":
-                                # Use weighted average for horizon data (works for AWC)
-                                outputTbl, outputValues = AggregateHz_WTA_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker, top, bot)
+        else:
+            layers = arcpy.mapping.ListLayers(mxd, outputLayer, df)
 
-                            elif dSDV["horzaggmeth"] == "Weighted Sum":
-                                # Calculate sum for horizon data (egs. AWS)
-                                outputTbl, outputValues = AggregateHz_WTA_SUM(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker, top, bot)
+        if len(layers) == 1:
+            arcpy.mapping.RemoveLayer(df, layers[0])
 
-                        else:
-                            raise MyError, "12. Weighted Average not appropriate for " + dataType
+        # See if a group layer is being used
+        if grpLayerName != "" and not mxd is None:
+            grpLayers = arcpy.mapping.ListLayers(mxd, grpLayerName, df)
+             
+            if grpLayers is None or len(grpLayers) == 0:
+                grpLayer = CreateGroupLayer(grpLayerName, mxd, df)
 
-                    elif aggMethod == "Dominant Component":
-                        # Need to find or build this function
+            else:
+                grpLayer = grpLayers[0]
 
-                        if sdvAtt.startswith("Surface") or sdvAtt.endswith("(Surface)"):
-                            #
-                            # I just added this on Monday to fix problem with Surface Texture DCP
-                            # Need to test
-                            outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        else:
+            #PrintMsg("\tNo group layer being used", 1)
+            grpLayer = None
 
-                        elif dSDV["effectivelogicaldatatype"].lower() == "choice":
-                            # Indexed value such as kFactor, cannot use weighted average
-                            # for horizon properties.
-                            outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt,dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        # Create list of tables in the ArcMap TOC. Later check to see if a table
+        # involved in queries needs to be removed from the TOC.
+        if mxd is None:
+            tableViews = list()
 
-                        elif dSDV["horzaggmeth"] == "Weighted Average":
-                            #PrintMsg(" \nHorizon aggregation method = WTA and attributelogical datatype = " + dSDV["attributelogicaldatatype"].lower(), 1)
-                            outputTbl, outputValues = AggregateHz_DCP_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker, top, bot)
+        else:
+            tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)
 
-                        else:
-                            raise MyError, "9. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
+        mainTables = ['mapunit', 'component', 'chorizon']
 
-                    elif aggMethod == "Dominant Condition":
-                        arcpy.AddMessage("in DCD: " + sdvAtt)
-                        arcpy.AddMessage("Choice: " + dSDV["effectivelogicaldatatype"])
-                        if "Surface" in sdvAtt:
-                            if dSDV["effectivelogicaldatatype"].lower() == "choice":
-                                if bVerbose:
-                                    PrintMsg(" \nDominant condition for surface-level attribute", 1)
-                                outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        for tv in tableViews:
+            if tv.datasetName.lower() in mainTables:
+                # Remove this table view from ArcMap that might cause a conflict with queries
+                arcpy.mapping.RemoveTableView(df, tv)
 
-                            else:
-                                outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        # Create dictionary for areasymbol
+        #PrintMsg(" \nGetting polygon count...", 1)
+        global polyCnt, fcCnt
+        polyCnt = int(arcpy.GetCount_management(inputLayer).getOutput(0))  # featurelayer polygon count
+        fcCnt = int(arcpy.GetCount_management(fc).getOutput(0))            # featureclass polygon count
+        #PrintMsg(" \nGot polygon count of " + Number_Format(polyCnt, 0, True), 1)
 
+        # Getting Areasymbols and legendkeys is a bottleneck (Thursday Aug 18). Any room for improvement?
+        #
+        #PrintMsg(" \nGetting areasymbols...", 1)
+        global dAreasymbols
+        dAreasymbols = GetAreasymbols(gdb)
 
-                        elif dSDV["effectivelogicaldatatype"].lower() in ("float", "integer"):
-                            # Dominant condition for a horizon level numeric value is probably not a good idea
-                            outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        if len(dAreasymbols) == 0:
+            raise MyError, "xxx dAreasymbols is not populated"
 
-                        elif dSDV["effectivelogicaldatatype"].lower() == "choice" and dSDV["tiebreakdomainname"] is not None:
-                            # KFactor (Indexed values)
-                            #PrintMsg(" \nDominant condition for choice type", 1)
-                            outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        # 2026-10-17 Check the rating cache. On a cache hit the soil tables are not read and
+        # the output table is rebuilt from the cache in place of the aggregation step.
+        bCacheHit = False
+        cacheKey = ""
+        fingerprint = ""
+        cacheEntry = None
 
-                        else:
-                            raise MyError, "No aggregation calculation selected for DCD"
+        if bRatingCache:
+            paramList = [sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, sorted(set(dAreasymbols.values()))]
+            cacheKey, fingerprint = GetRatingCacheKey(gdb, paramList)
 
-                    elif aggMethod == "Minimum or Maximum":
-                        # Need to figure out aggregation method for horizon level  max-min
-                        if dSDV["effectivelogicaldatatype"].lower() == "choice":
-                            # PrintMsg("\tRunning AggregateCo_MaxMin for " + sdvAtt, 1)
-                            outputTbl, outputValues = AggregateCo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bZero, cutOff, tieBreaker)
+            if cacheKey != "":
+                bCacheHit = CheckRatingCache(gdb, cacheKey, fingerprint, ratingCacheEntries is None)
 
-                        else:  # These should be numeric, probably need to test here.
-                            outputTbl, outputValues = AggregateHz_MaxMin_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker, top, bot)
+                if bCacheHit and not ratingCacheEntries is None:
+                    # Worker process (ComputeSoilRatings). The map phase will restore these
+                    # ratings from the cache, so there is nothing to compute.
+                    if bRunLogOwner:
+                        dRunLog["status"] = "cached"
 
-                    else:
-                        raise MyError, "'" + aggMethod + "' aggregation method for " + sdvAtt + " has not been developed"
+                    return ""
 
-                else:
-                    raise MyError, "Horizon-level '" + aggMethod + "' aggregation method for " + sdvAtt + " has not been developed"
+                if bCacheHit:
+                    # A corrupt or incomplete entry is treated as a cache miss
+                    cacheEntry = LoadRatingCache(gdb, cacheKey)
+                    bCacheHit = not cacheEntry is None
 
-            else:
-                # Should never hit this
-                raise MyError, "Unable to handle assigned aggregation method (" + aggMethod + ") for " + sdvAtt
+                if bCacheHit and bVerbose:
+                    PrintMsg(" \nUsing cached ratings for " + outputLayer, 1)
 
-        elif dSDV["attributetype"].lower() == "interpretation":
+        if not mxd is None:
+            tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)   # any other table views...
 
-            #PrintMsg(" \nDo I need to populate interp rating class values here, before aggregation?", 1)
-            #PrintMsg(" \ndomainValues:" + str(domainValues), 1)
+        #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
 
-            if len(domainValues) == 0 and "label" in dLegend:
-                # create fake domain using map legend labels and hope they are correct
-                labelValues = dLegend["labels"]
+        # Create name for final output table that will be saved to the input gSSURGO database
+        #
+        global tblName
+        #PrintMsg("\taggMethod: '" + dAgg[aggMethod] + "'", 1)
 
-                for i in range(1, (len(labelValues) + 1)):
-                    domainValues.append(labelValues[i])
+        
 
-            if not 'Not rated' in domainValues and len(domainValues) > 0:
-                # These are all Soil Interpretations
-                domainValues.insert(0, "Not rated")
+        if dAgg[aggMethod] == "":
+            # No aggregation method necessary
+            tblName = "SDV_" + dSDV["resultcolumnname"]
 
-            if dSDV["ruledesign"] == 1:
+        else:
+            if secCst != "":
+                # Problem with primary and secondary constraint values. These can produce
+                # illegal table names
                 #
-                # This is a Soil Interpretation for Limitations or Risk
-
-                if aggMethod == "Dominant Component":
-                    outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+                tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + primCst.replace(" ", "_") + "_" + secCst.replace(" ", "_")
 
-                elif aggMethod == "Dominant Condition":
-                    #PrintMsg(" \nInterpretation; aggMethod = " + aggMethod, 1)
-                    outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
 
-                elif aggMethod in ['Least Limiting', 'Most Limiting']:
-                    outputTbl, outputValues = AggregateCo_Limiting(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            elif primCst != "":
+                #tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + dAgg[aggMethod] + "_" + primCst.replace(" ", "_")
+                tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + primCst.replace(" ", "_")
 
-                elif aggMethod == "Weighted Average":
-                    # This is an interp that has been set to use fuzzy values
-                    outputTbl, outputValues = AggregateCo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
-                    outputValues = [0.0, 1.0]
+            elif dSDV["horzlevelattribflag"]:
+                #tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + dAgg[aggMethod] + "_" + str(top) + "to" + str(bot)
+                tblName = "SDV_" + dSDV["resultcolumnname"] + "_" + str(top) + "to" + str(bot)
 
-                else:
-                    # Don't know what kind of interp this is
-                    #PrintMsg(" \nmapunitlevelattribflag: " + str(dSDV["mapunitlevelattribflag"]) + ", complevelattribflag: " + str(dSDV["complevelattribflag"]) + ", cmonthlevelattribflag: " + str(dSDV["cmonthlevelattribflag"]) + ", horzlevelattribflag: " + str(dSDV["horzlevelattribflag"]) + ", effectivelogicaldatatype: " + dSDV["effectivelogicaldatatype"], 1)
-                    #PrintMsg(aggMethod + "; " + dSDV["effectivelogicaldatatype"], 1)
-                    raise MyError, "5. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
+            else:
+                #tblName = "SDV_" + dSDV["resultcolumnname"]+ "_" + dAgg[aggMethod]
+                tblName = "SDV_" + dSDV["resultcolumnname"]
 
-            elif dSDV["ruledesign"] == 2:
-                # This is a Soil Interpretation for Suitability
+        tblName = arcpy.ValidateTableName(tblName, gdb)
 
-                if aggMethod == "Dominant Component":
-                    outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        # Cleanup any duplicate underscores in the table name
+        newName = ""
+        lastChar = "_"
 
-                elif aggMethod == "Dominant Condition":
-                    outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)  # changed this for Sand Suitability
+        for c in tblName:
+            if c == lastChar and c == "_":
+                # Don't use this character because it is another underscore
+                lastChar = c
 
-                elif bFuzzy or (aggMethod == "Weighted Average" and dSDV["effectivelogicaldatatype"].lower() == 'float'):
-                    # This is NCCPI
-                    #PrintMsg(" \nA Aggregate2_NCCPI", 1)
-                    #outputTbl, outputValues = Aggregate2_NCCPI(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
-                    # PrintMsg(" \nNCCPI 3", 1)
-                    outputTbl, outputValues = AggregateCo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
-                    outputValues = [0.0, 1.0]
+            else:
+                newName += c
+                lastChar = c
 
-                elif aggMethod in ['Least Limiting', 'Most Limiting']:
-                    # Least Limiting or Most Limiting Interp
-                    outputTbl, outputValues = AggregateCo_Limiting(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+        if newName[-1] == "_":
+            newName = newName[:-1]
 
-                else:
-                    # Don't know what kind of interp this is
-                    # Friday problem here for NCCPI
-                    #PrintMsg(" \n" + str(dSDV["mapunitlevelattribflag"]) + ", " + str(dSDV["complevelattribflag"]) + ", " + str(dSDV["cmonthlevelattribflag"]) + ", " + str(dSDV["horzlevelattribflag"]) + " -NA2", 1)
-                    #PrintMsg(aggMethod + "; " + dSDV["effectivelogicaldatatype"], 1)
-                    raise MyError, "5. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
+        tblName = newName
 
+        #PrintMsg(" \nOutput table name = " + tblName, 1)
 
-            elif dSDV["ruledesign"] == 3:
-                # This is a Soil Interpretation for Class. Only a very few interps in the nation use this.
-                # Such as MO- Pasture hayland; MT-Conservation Tree Shrub Groups; CA- Revised Storie Index
+        # **************************************************************************
+        #
+        # Aggregation Logic to determine which functions will be used to process the
+        # intermediate table and produce the final output table.
+        #
+        # This is where outputValues is set
+        #
+        if bCacheHit:
+            # 2026-10-17 Rebuild the output table from the rating cache
+            start = time.time()
+            outputTbl, outputValues = RestoreRatingCache(gdb, cacheKey, cacheEntry)
+            LogStage("RestoreRatingCache", start)
+            del cacheEntry
+
+            if outputValues is None:
+                # The table could not be rebuilt from the cache. Drop the entry and calculate
+                # the ratings again (the cache check will miss this time).
+                PrintMsg("\tUnable to restore cached ratings, they will be calculated again", 1)
+                DeleteRatingCache(gdb, cacheKey)
+                bCacheHit = False
+
+        # 2026-10-17 Streaming mode. When the soil table records will not fit in streamMemory,
+        # the survey areas are processed in chunks by CreateStreamRatingTable in place of the
+        # table reads and aggregation below.
+        chunkList = list()
+
+        if streamMemory > 0 and not bCacheHit:
+            chunkList = GetStreamChunks(gdb, dAreasymbols)
+
+        bStream = len(chunkList) > 1
+
+        if len(dRunLog) > 0:
+            dRunLog["cachehit"] = bCacheHit
+            dRunLog["chunks"] = max(len(chunkList), 1)
+
+        if not bCacheHit:
+            if not bStream:
+                # Read the soil tables and create the initial output table (SDV_Data)
+                initialTbl = CreateRatingData(gdb, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, cutOff, hzQuery, dAreasymbols, tableViews, df)
+
+                if initialTbl is None:
+                    return None
 
-                if aggMethod == "Dominant Component":
-                    outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+            # 2026-10-17 The aggregation method is chosen by SelectAggregation and run from dAggMethods
+            if dSDV["attributetype"].lower() == "interpretation":
+                if len(domainValues) == 0 and "label" in dLegend:
+                    # create fake domain using map legend labels and hope they are correct
+                    labelValues = dLegend["labels"]
 
-                elif aggMethod == "Dominant Condition":
-                    outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+                    for i in range(1, (len(labelValues) + 1)):
+                        domainValues.append(labelValues[i])
 
-                elif aggMethod in ['Least Limiting', 'Most Limiting']:
-                    #PrintMsg(" \nNot sure about aggregation method for ruledesign = 3", 1)
-                    # Least Limiting or Most Limiting Interp
-                    outputTbl, outputValues = AggregateCo_Limiting(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bZero, cutOff, tieBreaker)
+                if not 'Not rated' in domainValues and len(domainValues) > 0:
+                    # These are all Soil Interpretations
+                    domainValues.insert(0, "Not rated")
 
-                else:
-                    # Don't know what kind of interp this is
-                    PrintMsg(" \nRuledesign 3: " + str(dSDV["mapunitlevelattribflag"]) + ", " + str(dSDV["complevelattribflag"]) + ", " + str(dSDV["cmonthlevelattribflag"]) + ", " + str(dSDV["horzlevelattribflag"]) + " -NA2", 1)
-                    PrintMsg(aggMethod + "; " + dSDV["effectivelogicaldatatype"], 1)
-                    raise MyError, "5. Interp aggregation method has not yet been developed ruledesign 3 (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
+            aggName = SelectAggregation(sdvAtt, aggMethod, bFuzzy)
 
+            if aggName == "":
+                return None
 
-            elif dSDV["ruledesign"] is None:
-                # This is a Soil Interpretation???
-                raise MyError, "Soil Interp with no RuleDesign setting"
+            if bStream:
+                start = time.time()
+                outputTbl, outputValues = CreateStreamRatingTable(gdb, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, hzQuery, chunkList, aggName)
+                LogStage("CreateStreamRatingTable", start, None, aggName)
 
             else:
-                raise MyError, "No aggregation calculation selected 10"
+                outputTbl, outputValues = RunAggregation(aggName, RatingWorkspace(gdb), sdvAtt, initialTbl, bZero, cutOff, tieBreaker, top, bot)
 
-        else:
-            raise MyError, "Invalid SDV AttributeType: " + str(dSDV["attributetype"])
+        if bRunLogOwner:
+            dRunLog["outputtable"] = outputTbl
 
         # quit if no data is available for selected property or interp
         if outputValues is None:
@@ -10934,7 +12939,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
             else:
                 PrintMsg("\tNo data available for '" + sdvAtt + "'", 1)
-                
+
+            if bRunLogOwner:
+                dRunLog["status"] = "no data"
+
             return None
             #raise MyError, "No data available for '" + sdvAtt + "'"
             #PrintMsg("No data available for '" + sdvAtt + "'", 1)
@@ -10947,7 +12955,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
             else:
                 PrintMsg("\tNo data available for '" + sdvAtt + "'", 1)
-                
+
+            if bRunLogOwner:
+                dRunLog["status"] = "no data"
+
             return None
 
         # Check numeric output values for max-min and number of decimal places
@@ -10955,6 +12966,26 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         if dSDV["effectivelogicaldatatype"] == 'float' and len(outputValues) == 2:
             outputValues = [round(outputValues[0], dSDV["attributeprecision"]), round(outputValues[1], dSDV["attributeprecision"])]
 
+        # 2026-10-17 Save the aggregated ratings so the same map can be recreated without
+        # reading the soil tables again
+        if bRatingCache and not bCacheHit and cacheKey != "":
+            if ratingCacheEntries is None:
+                SaveRatingCache(gdb, cacheKey, fingerprint, outputTbl, outputValues)
+
+            else:
+                # Worker process, the parent writes the entry to the cache
+                cacheEntry = GetRatingCacheEntry(gdb, cacheKey, fingerprint, outputTbl, outputValues)
+
+                if not cacheEntry is None:
+                    ratingCacheEntries.append(cacheEntry)
+
+        if mxd is None:
+            # Headless mode. No map layer.
+            if bRunLogOwner:
+                dRunLog["status"] = "ok"
+
+            return outputTbl
+
         #
         # End of Aggregation Logic and Data Processing
         # **************************************************************************
@@ -11199,11 +13230,15 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                     arcpy.Delete_management(outputLayerFile)
 
                 surveyInfo = ["This is dummy survey data"]
+                start = time.time()
                 bMetadata = UpdateMetadata(gdb, outputTbl, parameterString, creditsString, aggMethod, sdvAtt, toDay)
+                LogStage("UpdateMetadata", start)
 
                 if bMetadata == False:
                     PrintMsg(" \nFailed to update layer and table metadata", 1)
 
+                start = time.time()
+
                 if muDesc.dataType.lower() == "featurelayer":
                     #PrintMsg(" \ndLayerDefinition has " + str(len(dLayerDefinition)) + " items", 1)
                     bMapLayer = CreateMapLayer(inputLayer, outputTbl, outputLayer, outputLayerFile, outputValues, parameterString, creditsString, dLayerDefinition, bFuzzy, grpLayer, mxd, df)  # missing dLayerDefinition
@@ -11218,6 +13253,8 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                     #dLayerDefinition = DefinedBreaksJSON(legendList, minValue, outputTbl, ratingField)
                     bMapLayer = CreateRasterMapLayer(inputLayer, outputTbl, outputLayer, outputLayerFile, outputValues, parameterString, creditsString, dLayerDefinition, grpLayer, mxd, df)
 
+                LogStage("CreateMapLayer", start, polyCnt, muDesc.dataType.lower())
+
                 #if bMapLayer == False:
                 if bMapLayer is None:
                     PrintMsg("\tFailed to create soil map layer", 0)
@@ -11281,6 +13318,9 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
                     # Success!
                     #PrintMsg(" \nSuccess returning: " + str(bMapLayer), 1)
+                    if bRunLogOwner:
+                        dRunLog["status"] = "ok"
+
                     return bMapLayer
 
             else:
@@ -11293,6 +13333,9 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
 
         #PrintMsg(" \nThis is really the end", 1)
+        if bRunLogOwner and not bMapLayer is None:
+            dRunLog["status"] = "ok"
+
         return bMapLayer
 
 
@@ -11309,6 +13352,15 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         #return 0
         return None
 
+    finally:
+        if bRunLogOwner:
+            WriteRunLog()
+
+        if not bTableCache:
+            # Standalone map. The key ids are only needed while this map's SDV_Data table
+            # exists; a batch (gSSURGO_CreateSoilMaps) keeps them and clears them at the end.
+            dKeyIndex.clear()
+
 ##    finally:
 ##        try:
 ##            del mxd, df
@@ -11321,10 +13373,41 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 ## ===================================================================================
 
 # Import system modules
-import arcpy, sys, string, os, traceback, locale,  operator, json, math, random, time
+import arcpy, sys, string, os, traceback, locale,  operator, json, math, random, time, array, re, sqlite3, zlib, hashlib, collections, tempfile, shutil
 import xml.etree.cElementTree as ET
 #from datetime import datetime
 
+try:
+    # numpy is installed with ArcGIS. Used to sort and filter the in-memory SDV_Data table.
+    import numpy
+
+except:
+    numpy = None
+
+bMemoryTable = True    # 2026-10-17 keep SDV_Data records in memory instead of the geodatabase
+dMemTables = dict()    # in-memory SDV_Data tables, keyed by table path
+keyFields = ["MUKEY", "COKEY", "CHKEY", "COMONTHKEY"]   # 2026-10-17 SSURGO key fields with database-wide integer ids
+dKeyIndex = dict()     # SSURGOKeyIndex for each (gdb, key field), see GetKeyIndex
+hzCacheRange = None    # 2026-10-17 (top, bot) set by gSSURGO_CreateSoilMaps to read chorizon once for all depth ranges
+dHorizonCache = dict() # chorizon records for hzCacheRange, see ReadHorizonTable
+bRatingCache = True    # 2026-10-17 reuse aggregated ratings from <gdb>_RatingCache.sqlite when nothing has changed
+ratingCacheVersion = 1 # change to invalidate all cached ratings
+ratingCacheLimit = 512 * 1024 * 1024   # rating cache size limit (bytes of compressed records)
+ratingWS = ""          # 2026-10-17 workspace for SDV_Data and the rating tables, "" for the soil geodatabase. See RatingWorkspace
+ratingCacheEntries = None   # list set by ComputeSoilRatings, new rating cache entries are returned to the parent in it
+bTableCache = False    # 2026-10-17 set by gSSURGO_CreateSoilMaps to keep table reads for the whole batch
+dTableCache = collections.OrderedDict()   # see ReadCachedTable
+tableCacheLimit = 1024 * 1024 * 1024   # table cache size limit (estimated bytes)
+dAggMethods = dict()   # 2026-10-17 aggregation dispatch table, see RegisterAggregation
+streamMemory = 0       # 2026-10-17 memory budget (MB) for streaming mode, 0 to read the whole database at once
+streamRowBytes = 1000  # estimated memory used by one SDV_Data record and the table records it came from
+streamLkeys = None     # legend keys for the chunk being processed, see CreateStreamRatingTable
+dStreamKeys = dict()   # MUKEY, COKEY, CHKEY and COMONTHKEY sets for that chunk, see GetStreamKeys
+bRunLog = False        # 2026-10-17 append stage timings for each map to <gdb>_RunLog.jsonl, see WriteRunLog
+bRunLogTable = False   # also write the stage timings to the SDV_RunLog table in the geodatabase
+dRunLog = dict()       # stage timings and counters for the map being created, see StartRunLog
+RegisterAggregations()
+
 # Create the environment
 from arcpy import env
 
@@ -2,6 +2,20 @@
 #
 # Batch-mode. Creates Soil Data Viewer-type maps using only the default settings. Designed to run in batch-mode.
 # Cannot be used to generate maps for layers that require a primary or secondary constraint (ex. Ecological Site Name)
+#
+# 2026-10-17 Horizon-level attributes now read the chorizon table once for the full set of depth
+# ranges (see gSSURGO_CreateSoilMap.ReadHorizonTable) instead of once per depth range.
+#
+# 2026-10-17 Table records read for one attribute are kept for the rest of the batch (see
+# gSSURGO_CreateSoilMap.ReadCachedTable) so the component table is not read again for every map.
+#
+# 2026-10-17 The rating tables are created in parallel worker processes before the map layers
+# are added (see gSSURGO_CreateSoilMap.ComputeSoilRatings). Each worker uses its own scratch
+# geodatabase and returns its ratings, which are written to the rating cache by this process only.
+# The map loop then uses the rating cache, so only the symbology and layer steps run one at a time.
+# The main section is now under __name__ == "__main__" because the worker processes import this script.
+#
+# 2026-10-17 Optional wide table mode (wideTableName) for component-level properties.
 
 ## ===================================================================================
 class MyError(Exception):
@@ -174,245 +188,333 @@ import arcpy, sys, string, os, traceback, locale, time, sqlite3
 # Create the environment
 from arcpy import env
 
+# 2026-10-17 Number of worker processes used to create the rating tables. Set to 1 to create
+# each table in the map loop as before. The workers hand their ratings to the map loop through
+# the rating cache, so they are only used when gSSURGO_CreateSoilMap.bRatingCache is set.
 try:
+    import multiprocessing
+    workerCnt = max(1, multiprocessing.cpu_count() - 1)
 
-    inputLayer = arcpy.GetParameterAsText(0)       # Input mapunit polygon layer
-    sdvAtts = arcpy.GetParameter(1)                # SDV Attribute
-    depthList = arcpy.GetParameterAsText(2)        # space-delimited list of depths
+except:
+    workerCnt = 1
 
-    num = 0
-    failedList = list()
-    PrintMsg(" \n", 0)
-    import gSSURGO_CreateSoilMap
+# 2026-10-17 Set to an output table name (ex. "SDV_WideRatings") to put the component-level
+# soil properties into a single mapunit table, read from one pass over the component table
+# (see gSSURGO_CreateSoilMap.CreateWideRatingTable), instead of creating a soil map for each one.
+wideTableName = ""
 
-    # Turn off display of the inputLayer to reduce potential screen redraws
-    mxd = arcpy.mapping.MapDocument("CURRENT")
-    df = mxd.activeDataFrame
-    layers = arcpy.mapping.ListLayers(mxd, inputLayer, df)
+try:
+    if __name__ == "__main__":
+        inputLayer = arcpy.GetParameterAsText(0)       # Input mapunit polygon layer
+        sdvAtts = arcpy.GetParameter(1)                # SDV Attribute
+        depthList = arcpy.GetParameterAsText(2)        # space-delimited list of depths
+
+        num = 0
+        failedList = list()
+        PrintMsg(" \n", 0)
+        import gSSURGO_CreateSoilMap
+
+        # Turn off display of the inputLayer to reduce potential screen redraws
+        mxd = arcpy.mapping.MapDocument("CURRENT")
+        df = mxd.activeDataFrame
+        layers = arcpy.mapping.ListLayers(mxd, inputLayer, df)
     
-    if len(layers) == 1:
-        soilLayer = layers[0]
-        soilLayer.visible = False
-        del soilLayer
+        if len(layers) == 1:
+            soilLayer = layers[0]
+            soilLayer.visible = False
+            del soilLayer
 
-    del layers
+        del layers
 
-    # Get gSSURGO DB behind inputLayer
-    desc = arcpy.Describe(inputLayer)
-    inputType = desc.dataType.lower()
+        # Get gSSURGO DB behind inputLayer
+        desc = arcpy.Describe(inputLayer)
+        inputType = desc.dataType.lower()
     
-    if inputType == "featurelayer":
-        fc = desc.featureclass.catalogPath
-        gdb = os.path.dirname(fc)
-
-    elif inputType == "rasterlayer":
-        gdb = os.path.dirname(desc.catalogPath)
-
-    aggMethod = ""
-    primCst = ""
-    secCst = ""
-    begMo = "January"
-    endMo = "December"
-    bZero = True
-    cutOff = 0
-    bFuzzy = False
-    bNulls = True
-    tieBreaker = ""
-    sRV = "Representative"
-
-    # Set up depth ranges using space delimited list of break values from parameter string
-    # ex. 0 10 25 ...
-    depthRanges = list()
-    d1 = depthList.split(" ")
-    d2 = [int(x) for x in d1]
-
-    for i in range(len(d2) - 1):
-        depthRanges.append((d2[i], d2[i + 1]))
-
-    depthRanges.reverse()
-    newAtts = list()
+        if inputType == "featurelayer":
+            fc = desc.featureclass.catalogPath
+            gdb = os.path.dirname(fc)
+
+        elif inputType == "rasterlayer":
+            fc = desc.catalogPath
+            gdb = os.path.dirname(desc.catalogPath)
+
+        aggMethod = ""
+        primCst = ""
+        secCst = ""
+        begMo = "January"
+        endMo = "December"
+        bZero = True
+        cutOff = 0
+        bFuzzy = False
+        bNulls = True
+        tieBreaker = ""
+        sRV = "Representative"
+
+        # Set up depth ranges using space delimited list of break values from parameter string
+        # ex. 0 10 25 ...
+        depthRanges = list()
+        d1 = depthList.split(" ")
+        d2 = [int(x) for x in d1]
+
+        for i in range(len(d2) - 1):
+            depthRanges.append((d2[i], d2[i + 1]))
+
+        depthRanges.reverse()
+        newAtts = list()
       
-    # Need logic to decide whether group layer hierarchy will work.
-    # If user did not consistently select folder names in menu, that might be a problem
-    dGroups = dict()
-    groupList = list()
-
-    if str(sdvAtts).find("*") >= 0:
-        # Use folder names as group layers
-        # Define tables used to populate the first "SDV Folder" choice list
-        sdvFolderTbl = os.path.join(gdb, "sdvfolder")
-        sdvFolderAttTbl = os.path.join(gdb, "sdvfolderattribute")
-        sdvAttTbl = os.path.join(gdb, "sdvattribute")
-        sdvQuery = os.path.join("IN_MEMORY", "SDVQueryTbl")
-        arcpy.MakeQueryTable_management([sdvAttTbl, sdvFolderAttTbl, sdvFolderTbl], sdvQuery, "USE_KEY_FIELDS", "#", [["sdvattribute.attributename", "attributename"],["sdvfolder.foldersequence", "foldersequence"], ["sdvfolder.foldername", "foldername"]], "sdvattribute.attributekey = sdvfolderattribute.attributekey AND sdvfolderattribute.folderkey = sdvfolder.folderkey")
-
-        with arcpy.da.SearchCursor(sdvQuery, ["sdvfolder.foldersequence", "sdvattribute.attributename", "sdvfolder.foldername"], sql_clause=(None, "ORDER BY sdvfolder.foldersequence, sdvattribute.attributename")) as cur:
-            for rec in cur:
-                dGroups[rec[1].encode('ascii')] = rec[2].encode('ascii').upper()
+        # Need logic to decide whether group layer hierarchy will work.
+        # If user did not consistently select folder names in menu, that might be a problem
+        dGroups = dict()
+        groupList = list()
+
+        if str(sdvAtts).find("*") >= 0:
+            # Use folder names as group layers
+            # Define tables used to populate the first "SDV Folder" choice list
+            sdvFolderTbl = os.path.join(gdb, "sdvfolder")
+            sdvFolderAttTbl = os.path.join(gdb, "sdvfolderattribute")
+            sdvAttTbl = os.path.join(gdb, "sdvattribute")
+            sdvQuery = os.path.join("IN_MEMORY", "SDVQueryTbl")
+            arcpy.MakeQueryTable_management([sdvAttTbl, sdvFolderAttTbl, sdvFolderTbl], sdvQuery, "USE_KEY_FIELDS", "#", [["sdvattribute.attributename", "attributename"],["sdvfolder.foldersequence", "foldersequence"], ["sdvfolder.foldername", "foldername"]], "sdvattribute.attributekey = sdvfolderattribute.attributekey AND sdvfolderattribute.folderkey = sdvfolder.folderkey")
+
+            with arcpy.da.SearchCursor(sdvQuery, ["sdvfolder.foldersequence", "sdvattribute.attributename", "sdvfolder.foldername"], sql_clause=(None, "ORDER BY sdvfolder.foldersequence, sdvattribute.attributename")) as cur:
+                for rec in cur:
+                    dGroups[rec[1].encode('ascii')] = rec[2].encode('ascii').upper()
         
-        #PrintMsg("\n" + str(sdvAtts), 0)
+            #PrintMsg("\n" + str(sdvAtts), 0)
         
-        for sdvAtt in sdvAtts:
-            att = sdvAtt.strip()
+            for sdvAtt in sdvAtts:
+                att = sdvAtt.strip()
             
-            if not att.startswith("*"):
-                # this is an attribute
-                newAtts.append(att)
+                if not att.startswith("*"):
+                    # this is an attribute
+                    newAtts.append(att)
             
-    else:
-        # No group layers
-        for sdvAtt in sdvAtts:
-            att = sdvAtt.strip()
-            newAtts.append(att)
-            dGroups[att] = ""
+        else:
+            # No group layers
+            for sdvAtt in sdvAtts:
+                att = sdvAtt.strip()
+                newAtts.append(att)
+                dGroups[att] = ""
 
 
-    # Create list of soil maps that use horizon-level attributes
-    #
-    flds3 = ["attributename", "depthqualifiermode"]
-    sql2 = "attributetablename = 'chorizon'"
-    #sql2 = "attributetablename = 'chorizon' and not depthqualifiermode = 'Surface Layer'"
-    hzAtts = list()
-    surfaceAtts = list()
-    sdvTbl = os.path.join(gdb, "sdvattribute")
+        # Create list of soil maps that use horizon-level attributes
+        #
+        flds3 = ["attributename", "depthqualifiermode"]
+        sql2 = "attributetablename = 'chorizon'"
+        #sql2 = "attributetablename = 'chorizon' and not depthqualifiermode = 'Surface Layer'"
+        hzAtts = list()
+        surfaceAtts = list()
+        sdvTbl = os.path.join(gdb, "sdvattribute")
+
+        with arcpy.da.SearchCursor(sdvTbl, flds3, where_clause=sql2) as aCur:
+            # populate list of sdv attribute names
+
+            for rec in aCur:
+                att = rec[0]
+                dq = rec[1]
+
+                if att in newAtts and not att in hzAtts and dq != 'Surface Layer':
+                    hzAtts.append(att) # accumulate sdv attribute names that use horizon data
+
+                if att in newAtts and dq == 'Surface Layer':
+                    surfaceAtts.append(att)
+
+        hzAtts.sort()
+
+        if wideTableName != "":
+            wideTbl = os.path.join(gdb, wideTableName)
+            wideAtts = gSSURGO_CreateSoilMap.CreateWideRatingTable(inputLayer, [[att, aggMethod] for att in newAtts if not att in hzAtts], wideTbl, cutOff, bZero)
+
+            if len(wideAtts) > 0:
+                PrintMsg(" \nAdded " + str(len(wideAtts)) + " component-level properties to " + wideTbl, 0)
+                newAtts = [att for att in newAtts if not att in wideAtts]
 
-    with arcpy.da.SearchCursor(sdvTbl, flds3, where_clause=sql2) as aCur:
-        # populate list of sdv attribute names
+        # Calculate the number of new map layers that will be created:
+        hzMaps = (len(hzAtts) * len(depthRanges) )
+        individualMaps = (len(newAtts) - len(hzAtts))
+        mapCnt = hzMaps + individualMaps
 
-        for rec in aCur:
-            att = rec[0]
-            dq = rec[1]
+        if hzMaps > 0:
+            PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps (" + str(individualMaps) + " individual map(s) plus " + str(hzMaps) + " horizon-level property maps)", 0)
 
-            if att in newAtts and not att in hzAtts and dq != 'Surface Layer':
-                hzAtts.append(att) # accumulate sdv attribute names that use horizon data
+        else:
+            PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps", 0)
+
+        if workerCnt > 1 and len(newAtts) > 1 and not gSSURGO_CreateSoilMap.bRatingCache:
+            PrintMsg(" \nThe rating cache is turned off, the rating tables will be created one at a time", 1)
+
+        if workerCnt > 1 and len(newAtts) > 1 and gSSURGO_CreateSoilMap.bRatingCache:
+            # 2026-10-17 Compute phase. Worker processes create the rating tables for several
+            # attributes at once in their own scratch geodatabases and return them as rating
+            # cache entries. Only this process writes to the cache. The map layers are still
+            # added one at a time below, each one using the cached ratings.
+            import multiprocessing
+
+            # Inside ArcMap sys.executable is ArcMap.exe
+            pythonExe = os.path.join(sys.exec_prefix, "pythonw.exe")
+
+            if os.path.isfile(pythonExe):
+                multiprocessing.set_executable(pythonExe)
+
+            taskList = list()
+
+            for sdvAtt in hzAtts + [att for att in newAtts if not att in hzAtts]:
+                if sdvAtt in hzAtts:
+                    taskRanges = depthRanges
+
+                else:
+                    taskRanges = [(0, 1)]
 
-            if att in newAtts and dq == 'Surface Layer':
-                surfaceAtts.append(att)
+                taskList.append((fc, sdvAtt, taskRanges, aggMethod, primCst, secCst, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV))
 
-    hzAtts.sort()
+            poolSize = min(workerCnt, len(taskList))
+            PrintMsg(" \nCreating rating tables for " + str(len(taskList)) + " attributes using " + str(poolSize) + " processes", 0)
+            arcpy.SetProgressor("step", "Creating rating tables...", 0, len(taskList), 1)
+            pool = multiprocessing.Pool(poolSize)
 
-    # Calculate the number of new map layers that will be created:
-    hzMaps = (len(hzAtts) * len(depthRanges) )
-    individualMaps = (len(newAtts) - len(hzAtts))
-    mapCnt = hzMaps + individualMaps
+            try:
+                for sdvAtt, failedRanges, cacheEntries in pool.imap_unordered(gSSURGO_CreateSoilMap.ComputeSoilRatings, taskList):
+                    gSSURGO_CreateSoilMap.WriteRatingCache(gdb, cacheEntries)
 
-    if hzMaps > 0:
-        PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps (" + str(individualMaps) + " individual map(s) plus " + str(hzMaps) + " horizon-level property maps)", 0)
+                    if len(failedRanges) > 0:
+                        # This one will be run again (and reported) in the map phase
+                        PrintMsg("\tNo rating table for " + sdvAtt, 1)
 
-    else:
-        PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps", 0)
+                    arcpy.SetProgressorPosition()
 
-    arcpy.SetProgressor("step", "Creating series of soil maps...", 0, mapCnt, 1)
-    num = 0
+                pool.close()
+
+            except:
+                pool.terminate()
+                raise
+
+            finally:
+                pool.join()
+
+            arcpy.ResetProgressor()
+
+        arcpy.SetProgressor("step", "Creating series of soil maps...", 0, mapCnt, 1)
+        num = 0
+
+        # Keep the soil table records read by each map for the rest of the batch
+        gSSURGO_CreateSoilMap.bTableCache = True
+
+        if hzMaps > 0:
+            # Read each chorizon table once, covering all depth ranges. Each map then
+            # filters its own depth range from that copy.
+            gSSURGO_CreateSoilMap.hzCacheRange = (min([d[0] for d in depthRanges]), max([d[1] for d in depthRanges]))
     
-    for sdvAtt in newAtts:
+        for sdvAtt in newAtts:
 
-        grpName = dGroups[sdvAtt]
+            grpName = dGroups[sdvAtt]
 
-        if not grpName == "":
-            if inputType == "featurelayer":
-                grpLayerName = grpName + "  (Polygon)"
+            if not grpName == "":
+                if inputType == "featurelayer":
+                    grpLayerName = grpName + "  (Polygon)"
 
-            else:
-                grpLayerName = grpName + "  (Raster)"
+                else:
+                    grpLayerName = grpName + "  (Raster)"
 
-            if len(groupList) > 0:
-                # Save the current group layer to a layerfile before moving on to the next
-                lyrName = groupList[-1]
-                grpLayerFile = os.path.join(os.path.dirname(gdb), lyrName)
-                arcpy.SaveToLayerFile_management(grpLayer, grpLayerFile)
+                if len(groupList) > 0:
+                    # Save the current group layer to a layerfile before moving on to the next
+                    lyrName = groupList[-1]
+                    grpLayerFile = os.path.join(os.path.dirname(gdb), lyrName)
+                    arcpy.SaveToLayerFile_management(grpLayer, grpLayerFile)
                                                  
-            grpLayer = CreateGroupLayer(grpLayerName, mxd, df)  
-            groupList.append(grpLayerName)
+                grpLayer = CreateGroupLayer(grpLayerName, mxd, df)  
+                groupList.append(grpLayerName)
 
-        else:
-            grpLayer = None
-            grpLayerName = ""
+            else:
+                grpLayer = None
+                grpLayerName = ""
+
+            if sdvAtt in hzAtts:
+
+                # This will only process data when there is a set of depth ranges specified
+                #
+                # I need to handle this differently when no depths are entered
+                #
+                for depths in depthRanges:
+                    top, bot = depths
+                    num += 1
+                    msg = "Creating hz map number " + str(num) + ":  " + sdvAtt + " " + str(top) + " to " + str(bot) + "cm"
+                    
+                    arcpy.SetProgressorLabel(msg)
+                    PrintMsg(" \n" + msg, 0)
+                    time.sleep(2)
 
-        if sdvAtt in hzAtts:
+                    # Trying here to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
+                    dfName = df.name
+                    finalMapLayer = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, grpLayerName, mxd, dfName) # external script
 
-            # This will only process data when there is a set of depth ranges specified
-            #
-            # I need to handle this differently when no depths are entered
-            #
-            for depths in depthRanges:
-                top, bot = depths
-                num += 1
-                msg = "Creating hz map number " + str(num) + ":  " + sdvAtt + " " + str(top) + " to " + str(bot) + "cm"
+                    if finalMapLayer is None:
+                        #PrintMsg("\tGot back None1 from gSSURGO_CreateSoilMap.CreateSoilMap for " + sdvAtt, 1)
+                    
+                        if not sdvAtt in failedList:
+                            failedList.append(sdvAtt)
+
+                    else:
+                        df = mxd.activeDataFrame
+                        newLayer = arcpy.mapping.ListLayers(mxd, finalMapLayer.name, df)[0]
                     
+                    arcpy.SetProgressorPosition()
+
+                # Release the chorizon records read for this attribute
+                gSSURGO_CreateSoilMap.dHorizonCache.clear()
+
+            else:
+                top, bot = (0, 1)  # this should cover the surface properties such as Texture
+                num += 1
+
+                if sdvAtt in surfaceAtts:
+                    msg = "Creating map number " + str(num) + ":  " + sdvAtt + " (surface)"
+
+                else:     
+                    msg = "Creating map number " + str(num) + ":  " + sdvAtt
+      
                 arcpy.SetProgressorLabel(msg)
                 PrintMsg(" \n" + msg, 0)
                 time.sleep(2)
 
-                # Trying here to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
+                # Trying to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
                 dfName = df.name
                 finalMapLayer = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, grpLayerName, mxd, dfName) # external script
-
+            
                 if finalMapLayer is None:
-                    #PrintMsg("\tGot back None1 from gSSURGO_CreateSoilMap.CreateSoilMap for " + sdvAtt, 1)
-                    
+                    #PrintMsg("\tGot back None2 from gSSURGO_CreateSoilMap.CreateSoilMap for " + sdvAtt, 1)
+                
                     if not sdvAtt in failedList:
                         failedList.append(sdvAtt)
 
                 else:
-                    df = mxd.activeDataFrame
+                    # PrintMsg(" \n2. Adding Final Map Layer Name: '" + finalMapLayer.name + "' to " + grpLayerName, 1)
                     newLayer = arcpy.mapping.ListLayers(mxd, finalMapLayer.name, df)[0]
-                    
-                arcpy.SetProgressorPosition()
-
-        else:
-            top, bot = (0, 1)  # this should cover the surface properties such as Texture
-            num += 1
-
-            if sdvAtt in surfaceAtts:
-                msg = "Creating map number " + str(num) + ":  " + sdvAtt + " (surface)"
-
-            else:     
-                msg = "Creating map number " + str(num) + ":  " + sdvAtt
-      
-            arcpy.SetProgressorLabel(msg)
-            PrintMsg(" \n" + msg, 0)
-            time.sleep(2)
-
-            # Trying to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
-            dfName = df.name
-            finalMapLayer = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, sRV, grpLayerName, mxd, dfName) # external script
             
-            if finalMapLayer is None:
-                #PrintMsg("\tGot back None2 from gSSURGO_CreateSoilMap.CreateSoilMap for " + sdvAtt, 1)
-                
-                if not sdvAtt in failedList:
-                    failedList.append(sdvAtt)
+                arcpy.SetProgressorPosition()
 
-            else:
-                # PrintMsg(" \n2. Adding Final Map Layer Name: '" + finalMapLayer.name + "' to " + grpLayerName, 1)
-                newLayer = arcpy.mapping.ListLayers(mxd, finalMapLayer.name, df)[0]
-            
-            arcpy.SetProgressorPosition()
-
-            # Original CreateSoilMap returns integer value for status. Trying to switch to returning maplayer object.
-            #
-            # Return values will control how the rest of the maps will be handled
-            #
-            #  1 Successful
-            # -1 No data
-            # -2 raised error
-            #  0 Error
+                # Original CreateSoilMap returns integer value for status. Trying to switch to returning maplayer object.
+                #
+                # Return values will control how the rest of the maps will be handled
+                #
+                #  1 Successful
+                # -1 No data
+                # -2 raised error
+                #  0 Error
                     
-    arcpy.RefreshActiveView()
+        arcpy.RefreshActiveView()
     
-    if len(failedList) > 0:
+        if len(failedList) > 0:
  
-        if len(failedList) == 1:
-            PrintMsg(" \nUnable to create soil map layers for this attribute: '" + failedList[0] + "' \n ", 1)
+            if len(failedList) == 1:
+                PrintMsg(" \nUnable to create soil map layers for this attribute: '" + failedList[0] + "' \n ", 1)
 
-        else:
-            PrintMsg(" \nUnable to create soil map layers for these attributes: '" + "', '".join(failedList) + "' \n ", 1)
+            else:
+                PrintMsg(" \nUnable to create soil map layers for these attributes: '" + "', '".join(failedList) + "' \n ", 1)
 
-    else:
-        PrintMsg(" \nCreateSoilMaps finished \n ", 0)
+        else:
+            PrintMsg(" \nCreateSoilMaps finished \n ", 0)
 
-    del failedList
+        del failedList
     
 except MyError, e:
     PrintMsg(str(e), 2)
@@ -421,6 +523,16 @@ except:
     errorMsg()
 
 finally:
+    try:
+        gSSURGO_CreateSoilMap.hzCacheRange = None
+        gSSURGO_CreateSoilMap.dHorizonCache.clear()
+        gSSURGO_CreateSoilMap.bTableCache = False
+        gSSURGO_CreateSoilMap.dTableCache.clear()
+        gSSURGO_CreateSoilMap.dKeyIndex.clear()
+
+    except:
+        pass
+
     try:
         del mxd, df
 
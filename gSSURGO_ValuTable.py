@@ -24,6 +24,22 @@
 #   look at array processing for calculations based upon depth ranges
 #
 # changed the OM to carbon conversion from * 0.58 to / 1.724 after running FY2017 value table
+#
+# 2026-10-17 Added CalcAWSSOC. Standard AWS and SOC for all depth ranges are now calculated from
+# one read of QueryTable_HZ and written to Valu1 and Co_VALU with one update pass. CalcAWS and
+# CalcSOC have been removed.
+#
+# 2026-10-17 Added an in-memory join layer (QueryTable, JoinTables, QueryCursor) and
+# CreateMemoryQueryTables. QueryTable_HZ and QueryTable_CR are now built in memory with
+# left outer joins and shared by all of the Calc functions. Set bMemoryQuery to False to
+# write them to the scratch geodatabase as before.
+#
+# 2026-10-17 Added a partitioned mode (partitionBy) that calculates the Valu1 data for each state
+# or survey area in a separate worker process and merges the partitions into Valu1. The
+# calculation steps from CreateValuTable are now in CalcValuTables.
+# Each worker reads the source table records for its own map units (a key range query on
+# each table, see ReadValuSources) and is given only the component percent sums and NCCPI
+# survey areas for them.
 
 ## ===================================================================================
 class MyError(Exception):
@@ -106,6 +122,598 @@ def GetLastDate(inputDB):
         errorMsg()
         return ""
 
+## ===================================================================================
+class QueryTable(object):
+    # In-memory, column-ordered relation used in place of the QueryTable_HZ and QueryTable_CR
+    # geodatabase tables. 2026-10-17
+    #
+    # Each field is stored as a typed column. Numeric fields are array('d') columns with NaN as
+    # the NULL value and integer fields are converted back to int when read. Text fields are
+    # lists. Field names are stored in lower case and a table prefix such as 'component.'
+    # is ignored, so the same field names and where clauses used with the on-disk query tables
+    # can be used here.
+    #
+    def __init__(self, name, fields, types):
+        self.name = name
+        self.fields = [fld.lower() for fld in fields]
+        self.dIndex = dict([(self.fields[i], i) for i in range(len(self.fields))])
+        self.types = list(types)
+        self.columns = list()
+        self.count = 0
+
+        for fldType in self.types:
+            if fldType == "TEXT":
+                self.columns.append(list())
+
+            else:
+                # SHORT, LONG, FLOAT, DOUBLE
+                self.columns.append(array.array('d'))
+
+    def fieldIndex(self, fld):
+        fld = fld.lower().split(".")[-1]
+
+        if not fld in self.dIndex:
+            raise MyError, "Field '" + fld + "' not found in " + self.name
+
+        return self.dIndex[fld]
+
+    def appendRow(self, rec):
+        for i in range(len(rec)):
+            val = rec[i]
+
+            if self.types[i] == "TEXT":
+                self.columns[i].append(val)
+
+            elif val is None:
+                self.columns[i].append(nan)
+
+            else:
+                self.columns[i].append(float(val))
+
+        self.count += 1
+
+    def getValue(self, iCol, iRow):
+        val = self.columns[iCol][iRow]
+
+        if self.types[iCol] == "TEXT":
+            return val
+
+        if val != val:
+            # NaN is NULL
+            return None
+
+        if self.types[iCol] in ["SHORT", "LONG"]:
+            return int(val)
+
+        return val
+
+    def groupRows(self, fld):
+        # Returns a dictionary of row numbers for each value of fld, in table order
+        #
+        iCol = self.fieldIndex(fld)
+        dGroups = dict()
+
+        for iRow in xrange(self.count):
+            val = self.getValue(iCol, iRow)
+
+            if val in dGroups:
+                dGroups[val].append(iRow)
+
+            else:
+                dGroups[val] = [iRow]
+
+        return dGroups
+
+    def sortRows(self, orderBy, rowList=None):
+        # Returns row numbers sorted by orderBy, a list of (field, bDescending).
+        # The sort is stable and NULL values sort first (ascending) or last (descending).
+        #
+        if rowList is None:
+            rowList = range(self.count)
+
+        else:
+            rowList = list(rowList)
+
+        for fld, bDesc in reversed(orderBy):
+            iCol = self.fieldIndex(fld)
+            getValue = self.getValue
+            rowList.sort(key=lambda iRow: (getValue(iCol, iRow) is not None, getValue(iCol, iRow)), reverse=bDesc)
+
+        return rowList
+
+    def take(self, rowList, fields=None, name=None):
+        # Returns a new QueryTable with just the rows in rowList, in that order. The
+        # optional fields list is used for column projection.
+        #
+        if fields is None:
+            fields = self.fields
+
+        iCols = [self.fieldIndex(fld) for fld in fields]
+        newTbl = QueryTable(name or self.name, [self.fields[iCol] for iCol in iCols], [self.types[iCol] for iCol in iCols])
+
+        for i in range(len(iCols)):
+            column = self.columns[iCols[i]]
+
+            if newTbl.types[i] == "TEXT":
+                newTbl.columns[i] = [column[iRow] for iRow in rowList]
+
+            else:
+                newTbl.columns[i] = array.array('d', [column[iRow] for iRow in rowList])
+
+        newTbl.count = len(rowList)
+
+        return newTbl
+
+## ===================================================================================
+class QueryTableCursor(object):
+    # Minimal stand-in for arcpy.da.SearchCursor on a QueryTable so that it can be used
+    # in a 'with' statement or a for loop the same way. 2026-10-17
+    #
+    def __init__(self, qTbl, fldList, rowList):
+        self.qTbl = qTbl
+        self.iCols = [qTbl.fieldIndex(fld) for fld in fldList]
+        self.rowList = rowList
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        return False
+
+    def __iter__(self):
+        getValue = self.qTbl.getValue
+        iCols = self.iCols
+
+        for iRow in self.rowList:
+            yield tuple([getValue(iCol, iRow) for iCol in iCols])
+
+## ===================================================================================
+def ReadQueryTable(inputTbl, fldList, whereClause=None, sqlClause=None, name=None, keyFilter=None):
+    # Read selected fields from a geodatabase table into a QueryTable. 2026-10-17
+    #
+    # Column types come from the geodatabase field types. keyFilter is an optional
+    # (fieldname, set of values) pair; records with other values are skipped.
+    # In a partition worker, source tables are taken from dSourceTables (see SourceCursor).
+    #
+    if os.path.basename(inputTbl).upper() in dSourceTables:
+        srcTbl = dSourceTables[os.path.basename(inputTbl).upper()]
+        rowList = SelectRows(srcTbl, whereClause, sqlClause)
+
+        if not keyFilter is None:
+            iKey = srcTbl.fieldIndex(keyFilter[0])
+            rowList = [iRow for iRow in rowList if srcTbl.getValue(iKey, iRow) in keyFilter[1]]
+
+        return srcTbl.take(rowList, fldList, name or os.path.basename(inputTbl))
+
+    dTypes = {"String":"TEXT", "SmallInteger":"SHORT", "Integer":"LONG", "OID":"LONG", "Single":"FLOAT", "Double":"DOUBLE"}
+    dFields = dict()
+
+    for fld in arcpy.ListFields(inputTbl):
+        dFields[fld.name.lower()] = dTypes.get(fld.type, "TEXT")
+
+    types = list()
+
+    for fld in fldList:
+        if not fld.lower() in dFields:
+            raise MyError, "Field '" + fld + "' not found in " + inputTbl
+
+        types.append(dFields[fld.lower()])
+
+    qTbl = QueryTable(name or os.path.basename(inputTbl), fldList, types)
+
+    if keyFilter is None:
+        with arcpy.da.SearchCursor(inputTbl, fldList, where_clause=whereClause, sql_clause=sqlClause) as cur:
+            for rec in cur:
+                qTbl.appendRow(rec)
+
+    else:
+        iKey = qTbl.fieldIndex(keyFilter[0])
+        keySet = keyFilter[1]
+
+        with arcpy.da.SearchCursor(inputTbl, fldList, where_clause=whereClause, sql_clause=sqlClause) as cur:
+            for rec in cur:
+                if rec[iKey] in keySet:
+                    qTbl.appendRow(rec)
+
+    return qTbl
+
+## ===================================================================================
+def JoinTables(leftTbl, rightTbl, leftKey, rightKey=None, name=None, rightFields=None, dFill=None, bOuter=True):
+    # Join rightTbl to leftTbl on a key field (mukey, cokey, chkey) and return a new
+    # QueryTable. 2026-10-17
+    #
+    # This is a left outer join unless bOuter is False. Output rows are in leftTbl order and,
+    # for each left row, in rightTbl order. Left rows with no match get one output row with the
+    # right fields set to NULL or to the value in dFill (dFill[fieldname] = value).
+    #
+    # rightFields is used for column projection; by default all of the rightTbl fields except
+    # for the key field are added.
+    #
+    if rightKey is None:
+        rightKey = leftKey
+
+    if rightFields is None:
+        rightFields = [fld for fld in rightTbl.fields if fld != rightKey.lower()]
+
+    if dFill is None:
+        dFill = dict()
+
+    rightCols = [rightTbl.fieldIndex(fld) for fld in rightFields]
+
+    for iCol in rightCols:
+        if rightTbl.fields[iCol] in leftTbl.dIndex:
+            raise MyError, "Field '" + rightTbl.fields[iCol] + "' is in both " + leftTbl.name + " and " + rightTbl.name
+
+    dGroups = rightTbl.groupRows(rightKey)
+    iKey = leftTbl.fieldIndex(leftKey)
+    leftRows = array.array('l')
+    rightRows = array.array('l')
+
+    for iRow in xrange(leftTbl.count):
+        key = leftTbl.getValue(iKey, iRow)
+
+        if key in dGroups:
+            for jRow in dGroups[key]:
+                leftRows.append(iRow)
+                rightRows.append(jRow)
+
+        elif bOuter:
+            leftRows.append(iRow)
+            rightRows.append(-1)
+
+    del dGroups
+
+    newTbl = QueryTable(name or leftTbl.name, leftTbl.fields + [rightTbl.fields[iCol] for iCol in rightCols], leftTbl.types + [rightTbl.types[iCol] for iCol in rightCols])
+
+    for i in range(len(leftTbl.fields)):
+        column = leftTbl.columns[i]
+
+        if leftTbl.types[i] == "TEXT":
+            newTbl.columns[i] = [column[iRow] for iRow in leftRows]
+
+        else:
+            newTbl.columns[i] = array.array('d', [column[iRow] for iRow in leftRows])
+
+    for i in range(len(rightCols)):
+        iCol = rightCols[i]
+        column = rightTbl.columns[iCol]
+        fill = dFill.get(rightTbl.fields[iCol], None)
+
+        if rightTbl.types[iCol] == "TEXT":
+            newTbl.columns[len(leftTbl.fields) + i] = [column[jRow] if jRow >= 0 else fill for jRow in rightRows]
+
+        else:
+            if fill is None:
+                fill = nan
+
+            newTbl.columns[len(leftTbl.fields) + i] = array.array('d', [column[jRow] if jRow >= 0 else fill for jRow in rightRows])
+
+    newTbl.count = len(leftRows)
+
+    return newTbl
+
+## ===================================================================================
+def ParseQueryValue(val):
+    # Convert a SQL literal to a value. 2026-10-17
+    #
+    val = val.strip()
+
+    if val.startswith("'") and val.endswith("'"):
+        return val[1:-1].replace("''", "'")
+
+    return float(val)
+
+## ===================================================================================
+def SelectRows(qTbl, whereClause, sqlClause):
+    # Returns the row numbers in qTbl that match the simple where clauses and ORDER BY
+    # clauses used with the query tables in this script. 2026-10-17
+    #
+    # Supported: conditions joined by AND, where each condition is 'field IS [NOT] NULL',
+    # 'field <op> value' (=, <>, <, >, <=, >=) or 'field IN (values)'. Any other query
+    # raises MyError.
+    #
+    dOps = {"=":operator.eq, "<>":operator.ne, "<":operator.lt, ">":operator.gt, "<=":operator.le, ">=":operator.ge}
+    rowList = xrange(qTbl.count)
+    getValue = qTbl.getValue
+
+    if not whereClause is None and whereClause.strip() != "":
+        # split on AND, skipping any that are inside quotes
+        for part in re.split(r"\s+and\s+(?=(?:[^']*'[^']*')*[^']*$)", whereClause.strip(), flags=re.IGNORECASE):
+            part = part.strip()
+            m = re.match(r"^([\w\.]+)\s+is\s+(not\s+)?null$", part, re.IGNORECASE)
+
+            if m:
+                iCol = qTbl.fieldIndex(m.group(1))
+
+                if m.group(2):
+                    rowList = [iRow for iRow in rowList if not getValue(iCol, iRow) is None]
+
+                else:
+                    rowList = [iRow for iRow in rowList if getValue(iCol, iRow) is None]
+
+                continue
+
+            m = re.match(r"^([\w\.]+)\s+in\s*\((.*)\)$", part, re.IGNORECASE)
+
+            if m:
+                iCol = qTbl.fieldIndex(m.group(1))
+                valList = [ParseQueryValue(val) for val in re.split(r",(?=(?:[^']*'[^']*')*[^']*$)", m.group(2))]
+                rowList = [iRow for iRow in rowList if getValue(iCol, iRow) in valList]
+                continue
+
+            m = re.match(r"^([\w\.]+)\s*(<>|<=|>=|=|<|>)\s*(.+)$", part)
+
+            if m:
+                iCol = qTbl.fieldIndex(m.group(1))
+                op = dOps[m.group(2)]
+                val = ParseQueryValue(m.group(3))
+                rowList = [iRow for iRow in rowList if not getValue(iCol, iRow) is None and op(getValue(iCol, iRow), val)]
+                continue
+
+            raise MyError, "Unable to run query on " + qTbl.name + ": " + whereClause
+
+    if not sqlClause is None and not sqlClause[1] is None:
+        if not sqlClause[0] is None:
+            raise MyError, "Unable to run query on " + qTbl.name + ": " + str(sqlClause[0])
+
+        m = re.match(r"^\s*order\s+by\s+(.+)$", sqlClause[1], re.IGNORECASE)
+
+        if not m:
+            raise MyError, "Unable to run query on " + qTbl.name + ": " + sqlClause[1]
+
+        orderBy = list()
+
+        for part in m.group(1).split(","):
+            part = part.split()
+            orderBy.append((part[0], len(part) > 1 and part[1].upper() == "DESC"))
+
+        rowList = qTbl.sortRows(orderBy, rowList)
+
+    return rowList
+
+## ===================================================================================
+def QueryCursor(outputDB, tblName, fldList, where_clause=None, sql_clause=None):
+    # Returns a search cursor on the in-memory query table (see CreateMemoryQueryTables) or,
+    # if there isn't one, an arcpy.da.SearchCursor on the table in outputDB. 2026-10-17
+    #
+    if tblName.upper() in dQueryTables:
+        qTbl = dQueryTables[tblName.upper()]
+        return QueryTableCursor(qTbl, fldList, SelectRows(qTbl, where_clause, sql_clause))
+
+    return arcpy.da.SearchCursor(os.path.join(outputDB, tblName), fldList, where_clause=where_clause, sql_clause=sql_clause)
+
+## ===================================================================================
+def QueryCount(outputDB, tblName):
+    # Record count for an in-memory or on-disk query table. 2026-10-17
+    #
+    if tblName.upper() in dQueryTables:
+        return dQueryTables[tblName.upper()].count
+
+    return int(arcpy.GetCount_management(os.path.join(outputDB, tblName)).getOutput(0))
+
+## ===================================================================================
+def QueryExists(outputDB, tblName):
+    # 2026-10-17
+    #
+    if tblName.upper() in dQueryTables:
+        return True
+
+    return arcpy.Exists(os.path.join(outputDB, tblName))
+
+## ===================================================================================
+def SourceCursor(inputDB, tblName, fldList, where_clause=None, sql_clause=None):
+    # Returns a search cursor on a gSSURGO source table. 2026-10-17
+    #
+    # In a partition worker (CreateValuPartition) the records for its map units are read once
+    # (ReadValuSources) and kept in dSourceTables. Otherwise this is an arcpy.da.SearchCursor
+    # on the table in inputDB.
+    #
+    if tblName.upper() in dSourceTables:
+        srcTbl = dSourceTables[tblName.upper()]
+        return QueryTableCursor(srcTbl, fldList, SelectRows(srcTbl, where_clause, sql_clause))
+
+    return arcpy.da.SearchCursor(os.path.join(inputDB, tblName), fldList, where_clause=where_clause, sql_clause=sql_clause)
+
+## ===================================================================================
+def ReadValuSources(inputDB, partList):
+    # Partitioned mode. Read each source table used by CalcValuTables once and split the
+    # records by partition. 2026-10-17
+    #
+    # partList is the list of (partition name, set of mukeys, set of lkeys) from GetValuPartitions.
+    # Each worker calls this for its own partition. Only the range of parent keys (mukey, cokey,
+    # chkey or chtgkey) from the lowest to the highest key in the partitions is read from each
+    # table, and the records for other map units within that range are skipped.
+    # Returns a dictionary of {table name: QueryTable} for each partition, in partList order.
+    # The records keep the order they were read in (dValuSources sort order), so the queries
+    # made by the workers return them in the same order as a full table read.
+    #
+    try:
+        dPart = dict()   # key value: partition number, for the parent key of the next table
+        partSources = [dict() for part in partList]
+
+        for i in range(len(partList)):
+            for mukey in partList[i][1]:
+                dPart[mukey] = i
+
+        dKeyParts = {"mukey":dPart}
+
+        # Tables in parent-child order: (table, parent key field, key field passed to the child tables)
+        for tblName, parentKey, childKey in [("mapunit", "mukey", None), ("component", "mukey", "cokey"), \
+        ("chorizon", "cokey", "chkey"), ("corestrictions", "cokey", None), ("chfrags", "chkey", None), \
+        ("chtexturegrp", "chkey", "chtgkey"), ("chtexture", "chtgkey", None)]:
+            arcpy.SetProgressorLabel("Reading " + tblName.upper() + " table for the partitions...")
+            fldList, sqlClause = dValuSources[tblName]
+            dParents = dKeyParts[parentKey]
+
+            if len(dParents) > 0:
+                whereClause = parentKey + " >= '" + str(min(dParents)) + "' AND " + parentKey + " <= '" + str(max(dParents)) + "'"
+
+            else:
+                whereClause = "1 = 0"
+
+            srcTbl = ReadQueryTable(os.path.join(inputDB, tblName), fldList, whereClause, sqlClause)
+            iParent = srcTbl.fieldIndex(parentKey)
+            partRows = [list() for part in partList]
+
+            if not childKey is None:
+                dChildren = dict()
+                iChild = srcTbl.fieldIndex(childKey)
+
+            for iRow in xrange(srcTbl.count):
+                part = dParents.get(srcTbl.getValue(iParent, iRow))
+
+                if part is None:
+                    continue
+
+                partRows[part].append(iRow)
+
+                if not childKey is None:
+                    dChildren[srcTbl.getValue(iChild, iRow)] = part
+
+            if not childKey is None:
+                dKeyParts[childKey] = dChildren
+
+            for i in range(len(partList)):
+                partSources[i][tblName.upper()] = srcTbl.take(partRows[i])
+
+            del srcTbl, partRows
+
+        return partSources
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return list()
+
+    except:
+        errorMsg()
+        return list()
+
+## ===================================================================================
+def CreateMemoryQueryTables(inputDB, outputDB, maxD, mukeys=None):
+    # In-memory version of CreateQueryTables. 2026-10-17
+    #
+    # The mapunit, component, chorizon, texture and corestrictions data are read once and
+    # joined in memory (left outer joins on mukey, cokey and chkey) instead of being written
+    # to the QueryTable_HZ and QueryTable_CR tables in outputDB. The results are stored in
+    # dQueryTables and read using QueryCursor by CalcRZDepth, GetCoRestrictions, CalcRZAWS,
+    # CalcAWSSOC and CalcPWSL.
+    #
+    # The rows, row order and NULL fill values are the same as those written by CreateQueryTables.
+    # If mukeys is a set of map unit keys, only the data for those map units are loaded.
+    #
+    try:
+        dQueryTables.clear()
+
+        # MAPUNIT TABLE
+        #
+        PrintMsg(" \n\tReading MAPUNIT table...", 0)
+        if mukeys is None:
+            muFilter = None
+
+        else:
+            muFilter = ("mukey", mukeys)
+
+        muTbl = ReadQueryTable(os.path.join(inputDB, "mapunit"), ["mukey", "musym", "muname"], sqlClause=(None, "ORDER BY mukey"), keyFilter=muFilter)
+        muTbl = muTbl.take(muTbl.sortRows([("mukey", False)]))
+
+        # COMPONENT TABLE
+        # Components for each map unit are written in order of comppct_r
+        #
+        PrintMsg(" \n\tReading COMPONENT table...", 0)
+        fldCo = ["mukey", "cokey", "comppct_r", "majcompflag", "compname", "compkind", "taxorder", "taxsubgrp", \
+        "localphase", "otherph", "hydricrating", "drainagecl"]
+        coTbl = ReadQueryTable(os.path.join(inputDB, "component"), fldCo, "comppct_r is not NULL", (None, "ORDER BY cokey, comppct_r DESC"), keyFilter=muFilter)
+        coTbl = coTbl.take(coTbl.sortRows([("comppct_r", False)]))
+
+        if mukeys is None:
+            coFilter = None
+
+        else:
+            coFilter = ("cokey", set(coTbl.columns[coTbl.fieldIndex("cokey")]))
+
+        # HORIZON TABLE
+        # Horizons for each component are written in order of hzdept_r
+        #
+        PrintMsg(" \n\tReading HORIZON table...", 0)
+        fldHz = ["cokey", "chkey", "hzname", "desgnmaster", "hzdept_r", "hzdepb_r", "sandtotal_r", \
+        "silttotal_r", "claytotal_r", "om_r", "dbthirdbar_r", "ec_r", "ph1to1h2o_r", "awc_r"]
+        hzTbl = ReadQueryTable(os.path.join(inputDB, "chorizon"), fldHz, "hzdept_r is not NULL and hzdepb_r is not NULL", (None, "ORDER BY chkey, hzdept_r ASC"), keyFilter=coFilter)
+        hzTbl = hzTbl.take(hzTbl.sortRows([("hzdept_r", False)]))
+
+        if mukeys is None:
+            hzFilter = None
+
+        else:
+            hzFilter = ("chkey", set(hzTbl.columns[hzTbl.fieldIndex("chkey")]))
+
+        # HORIZON TEXTURE
+        # Only organic textures are saved, one per horizon
+        #
+        arcpy.SetProgressorLabel("Getting horizon texture information for QueryTable_HZ...")
+        lieuList = ['Slightly decomposed plant material', 'Moderately decomposed plant material', \
+        'Highly decomposed plant material', 'Undecomposed plant material', 'Muck', 'Mucky peat', \
+        'Peat', 'Coprogenous earth']
+        txList = ["CE", "COP-MAT", "HPM", "MPM", "MPT", "MUCK", "PDOM", "PEAT", "SPM", "UDOM"]
+        tgTbl = ReadQueryTable(os.path.join(inputDB, "chtexturegrp"), ["chkey", "chtgkey", "texture"], "rvindicator = 'Yes'", keyFilter=hzFilter)
+        txTbl = ReadQueryTable(os.path.join(inputDB, "chtexture"), ["chtgkey", "lieutex"])
+        ctTbl = JoinTables(tgTbl, txTbl, "chtgkey", bOuter=False)
+        del tgTbl, txTbl
+
+        dTexture = dict()   # chkey: row number of the last organic texture record
+        iChkey, iTexture, iLieutex = [ctTbl.fieldIndex(fld) for fld in ["chkey", "texture", "lieutex"]]
+
+        for iRow in xrange(ctTbl.count):
+            if ctTbl.getValue(iTexture, iRow) in txList or ctTbl.getValue(iLieutex, iRow) in lieuList:
+                dTexture[ctTbl.getValue(iChkey, iRow)] = iRow
+
+        ctTbl = ctTbl.take(sorted(dTexture.values()), ["chkey", "texture", "lieutex"])
+        del dTexture
+
+        # COMPONENT RESTRICTIONS
+        # Only save the highest level restriction above maxD
+        #
+        crTbl = ReadQueryTable(os.path.join(inputDB, "corestrictions"), ["cokey", "reskind", "reshard", "resdept_r"], \
+        "resdept_r is not NULL and resdept_r < " + str(maxD), (None, "ORDER BY cokey, resdept_r ASC"), "QueryTable_CR", coFilter)
+        dCr = dict()
+        iCokey = crTbl.fieldIndex("cokey")
+
+        for iRow in xrange(crTbl.count):
+            cokey = crTbl.getValue(iCokey, iRow)
+
+            if not cokey in dCr:
+                dCr[cokey] = iRow
+
+        dQueryTables["QUERYTABLE_CR"] = crTbl.take(sorted(dCr.values()))
+        del crTbl, dCr
+
+        # Select component-horizon data for ALL components, including map units with no components
+        # and components with no horizons (empty cokey and chkey, the same as CreateQueryTables)
+        #
+        PrintMsg(" \nCreating in-memory table QueryTable_HZ", 0)
+        arcpy.SetProgressorLabel("Joining mapunit, component and horizon data...")
+        qTbl = JoinTables(muTbl, coTbl, "mukey", dFill={"cokey":""})
+        del muTbl, coTbl
+        qTbl = JoinTables(qTbl, hzTbl, "cokey", dFill={"chkey":""})
+        del hzTbl
+        qTbl = JoinTables(qTbl, ctTbl, "chkey", name="QueryTable_HZ")
+        del ctTbl
+
+        dQueryTables["QUERYTABLE_HZ"] = qTbl
+        PrintMsg("\t" + Number_Format(qTbl.count, 0, True) + " records", 0)
+
+        env.workspace = outputDB
+        return True
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
 ## ===================================================================================
 def CreateQueryTables(inputDB, outputDB, maxD):
     #
@@ -498,9 +1106,12 @@ def CreateQueryTables(inputDB, outputDB, maxD):
         return False
 
 ## ===================================================================================
-def CreateOutputTableMu(theMuTable, depthList, dPct):
+def CreateOutputTableMu(theMuTable, depthList, dPct, sourceDB=None, mukeys=None):
     # Create the Valu1 table (theMuTable). Probably should rename this variable.
     #
+    # 2026-10-17 The map units are read from sourceDB (default is the theMuTable geodatabase).
+    # If mukeys is a set of map unit keys, only those map units are added.
+    #
     try:
         # Create the output tables and add required fields
 
@@ -605,10 +1216,17 @@ def CreateOutputTableMu(theMuTable, depthList, dPct):
 
         # Reading from the original mapunit table, populate the output Valu1 table with mukey and musumpct
         #PrintMsg(" \n\tPopulating " + theMuTable + " with mukey values", 1)
-        with arcpy.da.SearchCursor(os.path.join(outputDB, "mapunit"), ["mukey"]) as incur:
+        if sourceDB is None:
+            sourceDB = outputDB
+
+        with SourceCursor(sourceDB, "mapunit", ["mukey"]) as incur:
             outcur = arcpy.da.InsertCursor(theMuTable, ["mukey", "musumcpct"])
             for inrec in incur:
                 mukey = inrec[0]
+
+                if not mukeys is None and not mukey in mukeys:
+                    continue
+
                 try:
                     sumPct = dPct[mukey][0]
 
@@ -629,10 +1247,13 @@ def CreateOutputTableMu(theMuTable, depthList, dPct):
         return False
 
 ## ===================================================================================
-def CreateOutputTableCo(theCompTable, depthList):
+def CreateOutputTableCo(theCompTable, depthList, sourceDB=None, mukeys=None):
     # Create the Co_Valu component level table (theCompTable). Probably should rename that variable.
     # The new input field is created using adaptive code from another script.
     #
+    # 2026-10-17 The components are read from sourceDB (default is the theCompTable geodatabase).
+    # If mukeys is a set of map unit keys, only the components for those map units are added.
+    #
     try:
         # Create two output tables and add required fields
         try:
@@ -722,9 +1343,15 @@ def CreateOutputTableCo(theCompTable, depthList):
 
         # populate table with mukey values
         #PrintMsg(" \n\tPopulating " + theCompTable + " with basic component values", 1)
-        with arcpy.da.SearchCursor(os.path.join(outputDB, "component"), ["mukey", "cokey", "compname", "localphase", "comppct_r"]) as incur:
+        if sourceDB is None:
+            sourceDB = outputDB
+
+        with SourceCursor(sourceDB, "component", ["mukey", "cokey", "compname", "localphase", "comppct_r"]) as incur:
             outcur = arcpy.da.InsertCursor(theCompTable, ["mukey", "cokey", "compname", "localphase", "comppct_r"])
             for inrec in incur:
+                if not mukeys is None and not inrec[0] in mukeys:
+                    continue
+
                 outcur.insertRow(inrec)
 
     except MyError, e:
@@ -967,7 +1594,7 @@ def CalcRZDepth(inputDB, outputDB, theCompTable, theMuTable, maxD, dPct, dCR):
         lastMukey = 'xxxx'
 
         # Display status of processing input table containing horizon data and component restrictions
-        inCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
+        inCnt = QueryCount(outputDB, "QueryTable_HZ")
 
         if inCnt > 0:
             arcpy.SetProgressor ("step", "Processing input table...", 0, inCnt, 1)
@@ -975,7 +1602,7 @@ def CalcRZDepth(inputDB, outputDB, theCompTable, theMuTable, maxD, dPct, dCR):
         else:
             raise MyError, "Input table contains no data"
 
-        with arcpy.da.SearchCursor(queryTbl, curFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with QueryCursor(outputDB, "QueryTable_HZ", curFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             # Reading horizon-level data
             for rec in cur:
 
@@ -1119,13 +1746,13 @@ def GetCoRestrictions(outputDB, maxD, resList):
         resTbl = os.path.join(outputDB, "QueryTable_CR")
         #PrintMsg("\tGetting corestrictions matching: " + resList, 1)
 
-        if not arcpy.Exists(resTbl):
+        if not QueryExists(outputDB, "QueryTable_CR"):
             raise MyError, "Missing required input table (" + resTbl + ")"
 
         dRestrictions = dict()
 
         # Get the top component restriction from the sorted table
-        with arcpy.da.SearchCursor(resTbl, ["cokey", "resdept_r", "reskind"], where_clause=rSQL, sql_clause=sqlClause) as cur:
+        with QueryCursor(outputDB, "QueryTable_CR", ["cokey", "resdept_r", "reskind"], where_clause=rSQL, sql_clause=sqlClause) as cur:
             for rec in cur:
                 cokey, resDept, reskind = rec
                 #PrintMsg("Restriction: " + str(rec), 1)
@@ -1161,7 +1788,7 @@ def CalcRZAWS(inputDB, outputDB, td, bd, theCompTable, theMuTable, dRestrictions
         # Using the same component horizon table that has been
         queryTbl = os.path.join(outputDB, "QueryTable_Hz")
 
-        numRows = int(arcpy.GetCount_management(queryTbl).getOutput(0))
+        numRows = QueryCount(outputDB, "QueryTable_HZ")
 
         PrintMsg(" \n\tCalculating Root Zone AWS for " + str(td) + " to " + str(bd) + "cm...", 0)
 
@@ -1188,7 +1815,7 @@ def CalcRZAWS(inputDB, outputDB, td, bd, theCompTable, theMuTable, dRestrictions
 
             # Process query table using cursor, write out horizon data for each major component
             sqlClause = [None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC"]
-            iCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
+            iCnt = QueryCount(outputDB, "QueryTable_HZ")
 
             # For root zone calculations, we only want earthy, major components
             #PrintMsg(" \nFiltering components in Query_HZ for CalcRZAWS1 function", 1)
@@ -1197,7 +1824,7 @@ def CalcRZAWS(inputDB, outputDB, td, bd, theCompTable, theMuTable, dRestrictions
             #hzSQL = "component.compkind <> 'Miscellaneous area' and component.compkind is not NULL and component.majcompflag = 'Yes'"
             # All Components
 
-            inCur = arcpy.da.SearchCursor(queryTbl, qFieldNames, sql_clause=sqlClause)
+            inCur = QueryCursor(outputDB, "QueryTable_HZ", qFieldNames, sql_clause=sqlClause)
 
             arcpy.SetProgressor("step", "Reading query table...",  0, iCnt, 1)
 
@@ -1478,422 +2105,193 @@ def CalcRZAWS(inputDB, outputDB, td, bd, theCompTable, theMuTable, dRestrictions
         return False
 
 ## ===================================================================================
-def CalcAWS(inputDB, outputDB, theCompTable, theMuTable, dPct, depthList):
-    # Create a component-level summary table
-    # Calculate the standard mapunit-weighted available waters supply for each mapunit and
-    # add it to the map unit-level table.
+def CalcAWSSOC(inputDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList, dRestrictions, maxD):
+    # 2026-10-17 One-pass version of CalcAWS and CalcSOC (removed).
+    #
+    # CalcAWS and CalcSOC read QueryTable_HZ and updated the Co_VALU and Valu1 tables once for each
+    # depth range. Here QueryTable_HZ is read once and the clipped horizon thickness, AWS and SOC
+    # for every depth range are summed at the same time. All of the AWS*, TK*A, SOC* and TK*S
+    # columns are then written with one update pass over each output table.
+    #
+    # The calculations and the order of the sums are the same as CalcAWS and CalcSOC, so the
+    # results are identical to theirs.
+    #
+    # Component sums are kept in one array per component: for depth range i, items 4i to 4i + 3
+    # are the AWS thickness, AWS, SOC thickness and SOC. A component has a value for a depth range
+    # when its thickness is greater than zero.
     #
-    # 12-08 I see that for mukey='2479901' my rating is
-
     try:
-        # Using the same component horizon table that has been
         queryTbl = os.path.join(outputDB, "QueryTable_HZ")
-        numRows = int(arcpy.GetCount_management(queryTbl).getOutput(0))
+        numRows = QueryCount(outputDB, "QueryTable_HZ")
+        qFieldNames = ["mukey", "cokey", "comppct_r", "chkey", "awc_r", "om_r", "dbthirdbar_r", "hzdept_r", "hzdepb_r"]
+        rngCnt = len(depthList)
+        dComp = dict()    # cokey: [mukey, compPct, array of sums]
 
-        # mukey, cokey, compPct,val, top, bot
-        qFieldNames = ["mukey", "cokey", "comppct_r", "awc_r", "hzdept_r", "hzdepb_r"]
+        PrintMsg(" \n\tCalculating standard available water supply and soil organic carbon for " + str(rngCnt) + " depth ranges in one pass", 0)
 
-        # Track map units that are missing data
-        missingList = list()
-        minusList = list()
+        hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
+        sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
+        arcpy.SetProgressor("step", "Reading QueryTable_HZ ...",  0, numRows, 1)
 
-        PrintMsg(" \n\tCalculating standard available water supply for:", 0)
+        with QueryCursor(outputDB, "QueryTable_HZ", qFieldNames, where_clause=hzSQL, sql_clause=sqlClause) as inCur:
+            for rec in inCur:
+                mukey, cokey, compPct, chkey, awc, om, db3, top, bot = rec
+                sumCompPct = float(dPct[mukey][0])   # every map unit must be in dPct, as in CalcSOC
 
-        for rng in depthList:
-            # Calculating and updating just one AWS column at a time
-            #
-            td = rng[0]
-            bd = rng[1]
-            #outputFields = "AWS" + str(td) + "_" + str(bd), "TK" + str(td) + "_" + str(bd) + "A"
+                if awc is None and (om is None or db3 is None):
+                    arcpy.SetProgressorPosition()
+                    continue
 
-            # Open output table Mu...All in write mode
-            muFieldNames = ["MUKEY", "MUSUMCPCTA", "AWS" + str(td) + "_" + str(bd), "TK" + str(td) + "_" + str(bd) + "A"]
-            coFieldNames = ["COKEY", "AWS" + str(td) + "_" + str(bd), "TK" + str(td) + "_" + str(bd) + "A"]
+                if cokey in dComp:
+                    sums = dComp[cokey][2]
+                    dComp[cokey][1] = compPct
 
-            # Create dictionaries to handle the mapunit and component summaries
-            dMu = dict()
-            dComp = dict()
-            dSum = dict()     # store sum of comppct_r and total thickness for the component
-            dHz = dict()      # Trying a new dictionary that will s
+                else:
+                    sums = array.array('d', [0.0] * (4 * rngCnt))
+                    dComp[cokey] = [mukey, compPct, sums]
 
+                if om is not None and db3 is not None:
+                    om = round(om, 3)
+                    db3 = round(db3, 2)
 
-            arcpy.SetProgressorLabel("Creating output tables using dominant component...")
-            arcpy.SetProgressor("step", "Aggregating data for the dominant component..." , 0, numRows, 1)
+                    try:
+                        rz, resKind = dRestrictions[cokey]
 
-            # Open edit session on geodatabase to allow multiple insert cursors
-            with arcpy.da.Editor(inputDB) as edit:
+                    except:
+                        rz = maxD
+                        resKind = ""
 
-                # Open output mapunit-level table in update mode
-                # MUKEY, AWS
-                muCursor = arcpy.da.UpdateCursor(theMuTable, muFieldNames)
+                    try:
+                        fragvol = dFrags[chkey]
 
-                # Open output component-level table in write mode
-                # MUKEY, AWS
-                coCursor = arcpy.da.UpdateCursor(theCompTable, coFieldNames)
+                    except:
+                        fragvol = 0.0
 
-                # Process query table using a searchcursor, write out horizon data for each component
-                # At this time, almost all components are being used! There is no filter.
-                sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
-                #hzSQL = "compkind is not null and hzdept_r is not null"  # prevent divide-by-zero errors
-                hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
-
-                iCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
-                inCur = arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=hzSQL, sql_clause=sqlClause)
-
-                arcpy.SetProgressor("step", "Reading QueryTable_HZ ...",  0, iCnt, 1)
-
-                for rec in inCur:
-                    # read each horizon-level input record from the query table ...
-
-                    mukey, cokey, compPct, awc, top, bot = rec
+                for i in range(rngCnt):
+                    td, bd = depthList[i]
 
                     if awc is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
+                        # AWS, same as CalcAWS
                         hzT = min(bot, bd) - max(top, td)   # usable thickness from this horizon
 
                         if hzT > 0:
-                            aws = float(hzT) * float(awc) * 10
-
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = (mukey, compPct, hzT, aws)
-
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, compName, dHzT, dAWS = dComp[cokey]
-                                dAWS = dAWS + aws
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = (mukey, compPct, dHzT, dAWS)
-
-                    arcpy.SetProgressorPosition()
-
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
-
-                # Read through the component-level data and summarize to the mapunit level
-
-                if iComp > 0:
-                    PrintMsg("\t\t" + str(td) + " - " + str(bd) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
-                    arcpy.SetProgressor("step", "Saving map unit and component AWS data...",  0, iComp, 1)
-
-                    for corec in coCursor:
-                        # get component level data  CHK
-                        cokey = corec[0]
-
-                        if cokey in dComp:
-                            dRec = dComp[cokey]
-                            mukey, compPct, hzT, awc = dRec
-
-                            # get sum of component percent for the mapunit  CHK
-                            try:
-                                # Value[0] is for all components,
-                                # Value[1] is just for major-earthy components,
-                                # Value[2] is all major components
-                                # Value[3] is earthy components
-                                sumCompPct = float(dPct[mukey][0])
-                                #sumCompPct = float(dPct[mukey][1])
-
-                            except:
-                                # set the component percent to zero if it is not found in the
-                                # dictionary. This is probably a 'Miscellaneous area' not included in the  CHK
-                                # data or it has no horizon information.
-                                sumCompPct = 0
-                                #missingList.append("'" + mukey + "'")
-
-                            # calculate component percentage adjustment
-                            if sumCompPct > 0:
-                                # If there is no data for any of the component horizons, could end up with 0 for
-                                # sum of comppct_r
-                                #PrintMsg(" \nMUKEY " + mukey + " - " + compName + " has zero percent Sum Comppct", 1)
-
-
-                                #adjCompPct = float(compPct) / sumCompPct   # WSS method
-                                adjCompPct = compPct / 100.0                # VALU table method
-
-                                # adjust the rating value down by the component percentage and by the sum of the usable horizon thickness for this component
-                                aws = round((adjCompPct * awc), 2) # component rating
-
-                                corec[1] = aws
-                                hzT = hzT * adjCompPct    # Adjust component share of horizon thickness by comppct
-                                corec[2] = hzT             # This is new for the TK0_5A column
-                                coCursor.updateRow(corec)
-
-                                # Update component values in component dictionary   CHK
-                                # Not sure what dComp is being used for ???
-                                dComp[cokey] = mukey, compPct, hzT, aws
-
-                                # Try to fix high mapunit aggregate HZ by weighting with comppct
-
-                                # Testing new mapunit aggregation 09-08-2014
-                                # Trying to replace dMu dictionary
-                                if mukey in dMu:
-                                    val1, val2, val3 = dMu[mukey]
-                                    #dMu[mukey] = (compPct + val1, hzT + val2, aws + val2)
-                                    compPct = compPct + val1
-                                    hzT = hzT + val2
-                                    aws = aws + val3
-
-                                #else:
-                                dMu[mukey] = (compPct, hzT, aws)
-                                #PrintMsg("\tAWS for " + mukey + ": " + str(dMu[mukey]), 1)
-
-
-                else:
-                    PrintMsg("\t" + Number_Format(iComp, 0, True) + " components for "  + str(td) + " - " + str(bd) + "cm", 1)
-
-                # Write out map unit aggregated AWS
-                #
-                for murec in muCursor:
-                    mukey = murec[0]
-
-                    if mukey in dMu:
-                        compPct, hzT, aws = dMu[mukey]
-                        murec[1] = compPct
-                        murec[2] = aws
-                        murec[3] = round(hzT, 2)  # sometimes this ends up being 2 or 3X what it should
-                        muCursor.updateRow(murec)
-
-        if len(missingList) > 0:
-            missingList = list(set(missingList))
-            PrintMsg(" \n\tFollowing mapunits have no comppct_r: " + ", ".join(missingList), 1)
-
-        PrintMsg("", 0)
-
-        return True
-
-    except MyError, e:
-        # Example: raise MyError("this is an error message")
-        PrintMsg(str(e) + " \n", 2)
-        return False
-
-    except:
-        errorMsg()
-        return False
-
-## ===================================================================================
-def CalcSOC(inputDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList, dRestrictions, maxD):
-    # Modified SDP 2017-10-12
-    #
-    # Create a component-level summary table
-    # Calculate the standard mapunit-weighted available SOC for each mapunit and
-    # add it to the map unit-level table
-    # Does not calculate SOC below the following component restrictions:
-    #     Lithic bedrock, Paralithic bedrock, Densic bedrock, Fragipan, Duripan, Sulfuric
-
-    try:
-        # Using the same component horizon table that has been
-        queryTbl = os.path.join(outputDB, "QueryTable_HZ")
-        numRows = int(arcpy.GetCount_management(queryTbl).getOutput(0))
-
-        # mukey, cokey, compPct,val, top, bot
-        #qFieldNames = ["mukey", "cokey", "comppct_r", "hzdept_r", "hzdepb_r", "om_r", "dbthirdbar_r"]
-
-        qFieldNames = ["mukey","cokey","comppct_r","compname","localphase","chkey","om_r","dbthirdbar_r", "hzdept_r","hzdepb_r"]
-
-        # Track map units that are missing data
-        missingList = list()
-        minusList = list()
-
-        bCarbon = False # Temporary flag. Dump out SOC 0-30 data to a csv file
-
-        PrintMsg(" \n\tCalculating soil organic carbon for:", 0)
-
-        for rng in depthList:
-            # Calculating and updating just one SOC column at a time
-            #
-            td = rng[0]
-            bd = rng[1]
-
-            # Open output table Mu...All in write mode
-            # I lately added the "MUSUMCPCTS" to the output. Need to check output because
-            # it will be writing this out for every range. Lots more overhead.
-            #
-
-            # Create dictionaries to handle the mapunit and component summaries
-            dMu = dict()
-            dComp = dict()
-            #dSumPct = dict()  # store the sum of comppct_r for each mapunit to use in the calculations
-            dSum = dict()     # store sum of comppct_r and total thickness for the component
-            dHz = dict()      # Trying a new dictionary that will s
-            mCnt = 0
-            dMinMax = dict()
-
-            arcpy.SetProgressorLabel("Creating output tables using dominant component...")
-            arcpy.SetProgressor("step", "Aggregating data for the dominant component..." , 0, numRows, 1)
-
-            # Open edit session on geodatabase to allow multiple insert cursors
-            with arcpy.da.Editor(inputDB) as edit:
-
-                # Open output mapunit-level table in update mode
-                muFieldNames = ["MUKEY", "MUSUMCPCTS", "SOC" + str(td) + "_" + str(bd), "TK" + str(td) + "_" + str(bd) + "S"]
-                muCursor = arcpy.da.UpdateCursor(theMuTable, muFieldNames)
-
-                # Open output component-level table in write mode
-
-                coFieldNames = ["COKEY", "SOC" + str(td) + "_" + str(bd), "TK" + str(td) + "_" + str(bd) + "S"]
-                coCursor = arcpy.da.UpdateCursor(theCompTable, coFieldNames)
-
-                # Process query table using a searchcursor, write out horizon data for each component
-                # At this time, almost all components are being used! There is no filter.
-                hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
-                sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
-
-                iCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
-                inCur = arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=hzSQL, sql_clause=sqlClause)
-                arcpy.SetProgressor("step", "Reading QueryTable_HZ ...",  0, iCnt, 1)
-
-                for rec in inCur:
-                    # read each horizon-level input record from the query table ...
-
-                    mukey, cokey, compPct, compName, localPhase, chkey, om, db3, top, bot = rec
-                    sumCompPct = float(dPct[mukey][0])
+                            sums[4 * i] += hzT
+                            sums[4 * i + 1] += float(hzT) * float(awc) * 10
 
                     if om is not None and db3 is not None:
-                        # Calculate sum of horizon thickness and sum of component ratings for
-                        # that portion of the horizon that is with in the td-bd range
-                        top = max(top, td)
-                        bot = min(bot, bd)
-                        om = round(om, 3)
-
-                        try:
-                            rz, resKind = dRestrictions[cokey]
+                        # SOC, same as CalcSOC. Stop at root zone restrictive layers.
+                        sTop = max(top, td)
+                        sBot = min(bot, bd)
 
-                        except:
-                            rz = maxD
-                            resKind = ""
-
-                        # Now check for horizon restrictions within this range. Do not calculate SOC past
-                        # root zone restrictive layers.
-                        #
-                        if top < rz < bot:
-                            # restriction found in this horizon, use it to set a new depth
-                            #PrintMsg("\t\t" + resKind + " restriction for " + mukey + ":" + cokey + " at " + str(rz) + "cm", 1)
+                        if sTop < rz < sBot:
                             cBot = rz
 
                         else:
-                            cBot = min(rz, bot)
+                            cBot = min(rz, sBot)
 
-                        # Calculate initial usable horizon thickness
-                        hzT = cBot - top
-
-                        if hzT > 0 and top < cBot:
-                            # get horizon fragment volume
-                            try:
-                                fragvol = dFrags[chkey]
+                        hzT = cBot - sTop
 
-                            except:
-                                fragvol = 0.0
-                                pass
-
-                            # Calculate SOC using horizon thickness, OM, BD, FragVol, CompPct.
-                            # changed the OM to carbon conversion from * 0.58 to / 1.724 after running FY2017 value table
-                            db3 = round(db3, 2)
+                        if hzT > 0 and sTop < cBot:
+                            sums[4 * i + 2] += hzT
+                            sums[4 * i + 3] += ( (hzT * ( ( om / 1.724 ) * db3 )) / 100.0 ) * ((100.0 - fragvol) / 100.0) * ( compPct * 100 )
 
-                            soc =  ( (hzT * ( ( om / 1.724 ) * db3 )) / 100.0 ) * ((100.0 - fragvol) / 100.0) * ( compPct * 100 )
+                arcpy.SetProgressorPosition()
 
-                            #if td == 0 and bd == 5.0:
-                                # Everything here matches the other script
-                            #    test = [mukey, cokey, compPct, compName, localPhase, chkey, om, db3, top, bot, hzT, fragvol, round(soc, 2)]
-                                #PrintMsg(str(test), 1)
+        for i in range(rngCnt):
+            td, bd = depthList[i]
+            iAWS = len([1 for val in dComp.values() if val[2][4 * i] > 0])
+            iSOC = len([1 for val in dComp.values() if val[2][4 * i + 2] > 0])
+            PrintMsg("\t\t" + str(td) + " - " + str(bd) + "cm (" + Number_Format(iAWS, 0, True) + " components for AWS, " + Number_Format(iSOC, 0, True) + " for SOC)", 0)
 
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horizon CHK
-                                dComp[cokey] = (mukey, compPct, hzT, soc)
+        # Map unit sums for each depth range: items 8i to 8i + 7 are [has AWS, comppct, thickness, AWS,
+        # has SOC, comppct, thickness, SOC]
+        dMu = dict()
+        awsFlds = ["AWS" + str(td) + "_" + str(bd) for td, bd in depthList]
+        tkaFlds = ["TK" + str(td) + "_" + str(bd) + "A" for td, bd in depthList]
+        socFlds = ["SOC" + str(td) + "_" + str(bd) for td, bd in depthList]
+        tksFlds = ["TK" + str(td) + "_" + str(bd) + "S" for td, bd in depthList]
 
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, compName, dHzT, dSOC = dComp[cokey]
-                                dSOC = dSOC + soc
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = (mukey, compPct, dHzT, dSOC)
+        with arcpy.da.Editor(inputDB) as edit:
+            arcpy.SetProgressor("step", "Saving component AWS and SOC data...",  0, len(dComp), 1)
 
-                    arcpy.SetProgressorPosition()
+            with arcpy.da.UpdateCursor(theCompTable, ["COKEY"] + awsFlds + tkaFlds + socFlds + tksFlds) as coCursor:
+                for corec in coCursor:
+                    cokey = corec[0]
 
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
+                    if not cokey in dComp:
+                        continue
 
-                # Read through the component-level data and summarize to the mapunit level
-                #
-                if iComp > 0:
-                    PrintMsg("\t\t" + str(td) + " - " + str(bd) + "cm (" + Number_Format(iComp, 0, True) + " components)", 0)
-                    arcpy.SetProgressor("step", "Saving map unit and component SOC data...",  0, iComp, 1)
+                    mukey, compPct, sums = dComp[cokey]
 
-                    for corec in coCursor:
-                        # Could this be where I am losing minor components????
-                        #
-                        # get component level data  CHK
-                        cokey = corec[0]
+                    try:
+                        sumCompPct = float(dPct[mukey][0])
 
-                        if cokey in dComp:
-                            # get SOC-related data from dComp by cokey
-                            # reminder that soc = ( (hzT * ( ( om * 0.58 ) * db3 )) / 100.0 ) * ((100.0 - fragvol) / 100.0) * ( compPct * 100 )
-                            mukey, compPct, hzT, soc = dComp[corec[0]]
-
-                            # get sum of component percent for the mapunit (all components???)
-                            # Value[0] is for all components,
-                            # Value[1] is just for major-earthy components,
-                            # Value[2] is all major components
-                            # Value[3] is earthy components
-                            try:
-                                sumCompPct = float(dPct[mukey][0]) # Sum comppct for ALl components
+                    except:
+                        sumCompPct = 0.0
 
-                            except:
-                                # set the component percent to zero if it is not found in the
-                                # dictionary. This is probably a 'Miscellaneous area' not included in the  CHK
-                                # data or it has no horizon information.
-                                sumCompPct = 0.0
+                    if sumCompPct > 0:
+                        if not mukey in dMu:
+                            dMu[mukey] = array.array('d', [0.0] * (8 * rngCnt))
 
+                        muSums = dMu[mukey]
 
-                            # calculate component percentage adjustment
-                            if sumCompPct > 0:
+                        for i in range(rngCnt):
+                            if sums[4 * i] > 0:
+                                adjCompPct = compPct / 100.0                # VALU table method
+                                aws = round((adjCompPct * sums[4 * i + 1]), 2) # component rating
+                                hzT = sums[4 * i] * adjCompPct
+                                corec[1 + i] = aws
+                                corec[1 + rngCnt + i] = hzT
+                                muSums[8 * i] = 1
+                                muSums[8 * i + 1] += compPct
+                                muSums[8 * i + 2] += hzT
+                                muSums[8 * i + 3] += aws
+
+                            if sums[4 * i + 2] > 0:
+                                soc = sums[4 * i + 3]
+                                hzT = sums[4 * i + 2] * compPct / 100.0     # Adjust component share of horizon thickness by comppct/100
+                                corec[1 + 2 * rngCnt + i] = soc
+                                corec[1 + 3 * rngCnt + i] = hzT
+                                muSums[8 * i + 4] = 1
+                                muSums[8 * i + 5] += compPct
+                                muSums[8 * i + 6] += hzT
+                                muSums[8 * i + 7] += soc
 
-                                # write the new component-level SOC data to the Co_VALU table
-                                #soc = soc  * 100.0 * compPct / sumCompPct   # metric tons per hectare for this component
-                                #soc = soc  * 10000 * compPct / sumCompPct    # grams per square meter for this component
-                                # soc = soc * compPct / sumCompPct    # grams per square meter for this component  2017-11-14
-                                corec[1] = soc                      # Test
-                                hzT = hzT * compPct / 100.0         # Adjust component share of horizon thickness by comppct/100
-                                #hzT = hzT * compPct / adjCompPct   # Adjust component share of horizon thickness by (comppct/sum of comppct)
-                                corec[2] = hzT                      # This is new for the TK0_5A column
-                                coCursor.updateRow(corec)
+                        coCursor.updateRow(corec)
 
-                                # Update component values in component dictionary   CHK
-                                dComp[cokey] = mukey, compPct, hzT, soc
+                    arcpy.SetProgressorPosition()
 
-                                if mukey in dMu:
-                                    # add this component's data to the map unit
-                                    val1, val2, val3 = dMu[mukey]
-                                    compPct = compPct + val1
-                                    hzT = hzT + val2
-                                    soc = soc + val3
+            del dComp
 
-                                dMu[mukey] = (compPct, hzT, soc)
-                                #PrintMsg(str((compPct, hzT, soc)), 1)
+            # Write out map unit aggregated AWS and SOC. As in CalcAWS and CalcSOC, MUSUMCPCTA and
+            # MUSUMCPCTS are from the last depth range with data.
+            arcpy.SetProgressor("step", "Saving map unit AWS and SOC data...",  0, len(dMu), 1)
 
-                        arcpy.SetProgressorPosition()
+            with arcpy.da.UpdateCursor(theMuTable, ["MUKEY", "MUSUMCPCTA", "MUSUMCPCTS"] + awsFlds + tkaFlds + socFlds + tksFlds) as muCursor:
+                for murec in muCursor:
+                    mukey = murec[0]
 
-                    arcpy.ResetProgressor()
+                    if not mukey in dMu:
+                        continue
 
-                else:
-                    PrintMsg("\t" + Number_Format(iComp, 0, True) + " components for "  + str(td) + " - " + str(bd) + "cm", 1)
+                    muSums = dMu[mukey]
 
-                # Write out map unit aggregated SOC
-                #
-                for murec in muCursor:
-                    mukey = murec[0]
+                    for i in range(rngCnt):
+                        if muSums[8 * i] == 1:
+                            murec[1] = int(muSums[8 * i + 1])
+                            murec[3 + i] = muSums[8 * i + 3]
+                            murec[3 + rngCnt + i] = round(muSums[8 * i + 2], 2)
 
-                    if mukey in dMu:
-                        compPct, hzT, soc = dMu[mukey]
-                        murec[1] = compPct
-                        murec[2] = round(soc, 0)
-                        murec[3] = round(hzT, 0)  # this value appears to be low sometimes
-                        muCursor.updateRow(murec)
+                        if muSums[8 * i + 4] == 1:
+                            murec[2] = int(muSums[8 * i + 5])
+                            murec[3 + 2 * rngCnt + i] = round(muSums[8 * i + 7], 0)
+                            murec[3 + 3 * rngCnt + i] = round(muSums[8 * i + 6], 0)
 
-                        #if td == 0 and bd == 100.0:
-                            # Mismatch here for some mapunits
-                        #    PrintMsg(str(murec), 1)
+                    muCursor.updateRow(murec)
+                    arcpy.SetProgressorPosition()
 
+        arcpy.ResetProgressor()
+        PrintMsg("", 0)
 
         return True
 
@@ -1907,12 +2305,14 @@ def CalcSOC(inputDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList
         return False
 
 ## ===================================================================================
-def GetFragVol(inputDB):
+def GetFragVol(inputDB, chkeys=None):
     # Get the horizon summary of rock fragment volume (percent)
     # load sum of comppct_r into a dictionary by chkey. This
     # value will be used to reduce amount of SOC for each horizon
     # If not all horizons are not present in the dictionary, failover to
     # zero for the fragvol value.
+    #
+    # 2026-10-17 If chkeys is a set of horizon keys, only those horizons are loaded.
 
     try:
 
@@ -1920,10 +2320,13 @@ def GetFragVol(inputDB):
 
         dFrags = dict()
 
-        with arcpy.da.SearchCursor(os.path.join(inputDB, "chfrags"), fragFlds) as fragCur:
+        with SourceCursor(inputDB, "chfrags", fragFlds) as fragCur:
             for rec in fragCur:
                 chkey, fragvol = rec
 
+                if not chkeys is None and not chkey in chkeys:
+                    continue
+
                 if chkey in dFrags:
                     # This horizon already has a volume for another fragsize
                     # Get the existing value and add to it.
@@ -2012,10 +2415,13 @@ def GetSumPct(inputDB):
         return dict()
 
 ## ===================================================================================
-def MakeNCCPIQueryTable(inputDB, qTable):
+def MakeNCCPIQueryTable(inputDB, qTable, lkeys=None):
     # create query table containing information from component and chorizon tables
     # return name of querytable. Failure returns an empty string for the table name.
     #
+    # 2026-10-17 If lkeys is a set of legend keys (partitioned mode), only the map units in
+    # those survey areas are included. The mapunit table is added to the join for LKEY.
+    #
     # Bob Dobos wanted the Valu1 table to use only major components for NCCPI
     #
     # Web Soil Survey uses ALL components, not just majors. To switch to the WSS method,
@@ -2067,6 +2473,10 @@ def MakeNCCPIQueryTable(inputDB, qTable):
         else:
             theSQL = "COMPONENT.MAJCOMPFLAG = 'Yes' AND COMPONENT.COKEY = COINTERP.COKEY  AND COINTERP.MRULENAME = '" + mainRuleName + "'"
 
+        if not lkeys is None:
+            inTables.append(os.path.join(inputDB, "mapunit"))
+            theSQL += " AND MAPUNIT.MUKEY = COMPONENT.MUKEY AND MAPUNIT.LKEY IN ('" + "', '".join(sorted([str(lkey) for lkey in lkeys])) + "')"
+
         PrintMsg(" \n\tCalculating NCCPI weighted averages for all major components...", 0)
         #PrintMsg("Using SQL: " + theSQL, 1)
 
@@ -2488,7 +2898,7 @@ def CalcPWSL(inputDB, outputDB, theMuTable, dPct):
 
         # Using the same component horizon table as always
         queryTbl = os.path.join(outputDB, "QueryTable_Hz")
-        numRows = int(arcpy.GetCount_management(queryTbl).getOutput(0))
+        numRows = QueryCount(outputDB, "QueryTable_HZ")
         PrintMsg(" \n\tCalculating Potential Wet Soil Landscapes using...", 0)
         qFieldNames = ["mukey", "muname", "cokey", "comppct_r",  "compname", "localphase", "otherph", "majcompflag", "compkind", "hydricrating", "drainagecl"]
         pwSQL = "COMPPCT_R > 0"
@@ -2506,11 +2916,11 @@ def CalcPWSL(inputDB, outputDB, theMuTable, dPct):
         # 5. compname like '% swamp'
         # nameList = []
 
-        iCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
+        iCnt = QueryCount(outputDB, "QueryTable_HZ")
         lastCokey = 'xxx'
         arcpy.SetProgressor("step", "Reading query table table for wetland information...",  0, iCnt, 1)
 
-        with arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=pwSQL) as pwCur:
+        with QueryCursor(outputDB, "QueryTable_HZ", qFieldNames, where_clause=pwSQL) as pwCur:
             for rec in pwCur:
                 mukey, muname, cokey, comppct_r,  compname, localphase, otherph, majcompflag, compkind, hydricrating, drainagecl = rec
 
@@ -2988,6 +3398,383 @@ def UpdateMetadata(outputWS, target, surveyInfo):
         errorMsg()
         return False
 
+## ===================================================================================
+def CalcValuTables(inputDB, outputDB, editDB, theMuTable, theCompTable, dPct, mukeys=None, lkeys=None):
+    # Create and populate the map unit (theMuTable) and component (theCompTable) level tables.
+    # 2026-10-17 moved here from CreateValuTable so that it can also be run for one partition.
+    #
+    # inputDB is the gSSURGO database with the soils data. editDB is the geodatabase that
+    # contains theMuTable and theCompTable. mukeys is an optional set of map unit keys; when it
+    # is used, only those map units are written to the output tables. lkeys is the set of
+    # legend keys for those map units, used to limit the NCCPI query table.
+    #
+    try:
+        # Create initial set of query tables used for RZAWS, AWS and SOC
+        if bMemoryQuery or not mukeys is None:
+            if CreateMemoryQueryTables(inputDB, outputDB, 150.0, mukeys) == False:
+                raise MyError, ""
+
+        elif CreateQueryTables(inputDB, outputDB, 150.0) == False:
+            raise MyError, ""
+
+        # Create permanent output tables for the map unit and component levels
+        depthList = [(0,5), (5, 20), (20, 50), (50, 100), (100, 150), (150, 999), (0, 20), (0, 30), (0, 100), (0, 150), (0, 999)]
+
+        if CreateOutputTableMu(theMuTable, depthList, dPct, inputDB, mukeys) == False:
+            raise MyError, ""
+
+        if CreateOutputTableCo(theCompTable, depthList, inputDB, mukeys) == False:
+            raise MyError, ""
+
+        # Store component restrictions for root growth in a dictionary
+        resListAWS = "('Lithic bedrock','Paralithic bedrock','Densic bedrock', 'Densic material', 'Fragipan', 'Duripan', 'Sulfuric')"
+        dRZRestrictions = GetCoRestrictions(outputDB, 150.0, resListAWS)
+
+        # Find the top restriction for each component, both from the corestrictions table and the horizon properties
+        dComp2 = CalcRZDepth(editDB, outputDB, theCompTable, theMuTable, 150.0, dPct, dRZRestrictions)
+        del dRZRestrictions
+
+        # Calculate root zone available water capacity using a floor of 150cm or a root restriction depth
+        #
+        # dComp2[cokey] = [mukey, compName, localPhase, compPct, resDept, restriction]
+        if CalcRZAWS(editDB, outputDB, 0.0, 150.0, theCompTable, theMuTable, dComp2, 150.0, dPct) == False:
+            raise MyError, ""
+
+        # Get bedrock restrictions for SOC  and write them to the output tables
+        maxD = 999.0
+        resListSOC = "('Lithic bedrock', 'Paralithic bedrock', 'Densic bedrock')"
+        dSOCRestrictions = GetCoRestrictions(outputDB, maxD, resListSOC)
+
+        # Store all component-horizon fragment volumes (percent) in a dictionary (by chkey)
+        # and use in the root zone SOC calculations
+        if mukeys is None:
+            dFrags = GetFragVol(inputDB)
+
+        else:
+            qTbl = dQueryTables["QUERYTABLE_HZ"]
+            dFrags = GetFragVol(inputDB, set(qTbl.columns[qTbl.fieldIndex("chkey")]))
+
+        if len(dFrags) == 0:
+            raise MyError, "No fragment volume information"
+
+        # Calculate standard available water supply and soil organic carbon for all the different
+        # depth ranges using a single read of QueryTable_HZ (replaces CalcAWS and CalcSOC)
+        if CalcAWSSOC(editDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList, dSOCRestrictions, maxD) == False:
+            raise MyError, ""
+
+        del dSOCRestrictions
+
+        # Calculate NCCPI
+        # Create query table using component and chorizon tables
+        arcpy.SetProgressor("default", "Calculating NCCPI data elements...")
+        nccpiTbl = "NCCPI_Table"
+
+        if  MakeNCCPIQueryTable(inputDB, nccpiTbl, lkeys) == False:
+            pass
+
+        else:
+            if mainRuleName == "NCCPI - National Commodity Crop Productivity Index (Ver 3.0)":
+                if CalcNCCPI3(editDB, theMuTable, nccpiTbl, dPct) == False:
+                    raise MyError, ""
+
+            elif mainRuleName == "NCCPI - National Commodity Crop Productivity Index (Ver 2.0)":
+                if CalcNCCPI2(editDB, theMuTable, nccpiTbl, dPct) == False:
+                    raise MyError, ""
+
+        # Calculate Potential Wetland Soils
+        #
+        if CalcPWSL(editDB, outputDB, theMuTable, dPct) == False:
+            raise MyError, ""
+
+        return True
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def GetValuPartitions(inputDB, partitionBy):
+    # Split the map units into partitions by AREASYMBOL or by STATE (the 2-letter areasymbol
+    # prefix). Returns a sorted list of (partition name, set of mukeys, set of lkeys). 2026-10-17
+    #
+    try:
+        dLegends = dict()
+
+        with arcpy.da.SearchCursor(os.path.join(inputDB, "legend"), ["lkey", "areasymbol"]) as cur:
+            for lkey, areasym in cur:
+                if partitionBy == "STATE":
+                    dLegends[lkey] = str(areasym)[0:2].upper()
+
+                elif partitionBy == "AREASYMBOL":
+                    dLegends[lkey] = str(areasym).upper()
+
+                else:
+                    raise MyError, "Partitions must be by STATE or AREASYMBOL, not " + str(partitionBy)
+
+        dParts = dict()
+
+        with arcpy.da.SearchCursor(os.path.join(inputDB, "mapunit"), ["mukey", "lkey"]) as cur:
+            for mukey, lkey in cur:
+                partName = dLegends.get(lkey, "Unknown")
+
+                if partName in dParts:
+                    dParts[partName][0].add(mukey)
+                    dParts[partName][1].add(lkey)
+
+                else:
+                    dParts[partName] = (set([mukey]), set([lkey]))
+
+        return sorted([(partName, mukeys, lkeys) for partName, (mukeys, lkeys) in dParts.items()])
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return list()
+
+    except:
+        errorMsg()
+        return list()
+
+## ===================================================================================
+def CreateValuPartition(task):
+    # Worker process for partitioned mode. 2026-10-17
+    #
+    # Creates the Valu1 and Co_VALU tables for one set of map units in a new geodatabase (partDB).
+    # dPct is the GetSumPct data for just these map units. The source table records for them
+    # are read here (ReadValuSources). Returns (partition name, partDB, bResult).
+    #
+    partName, inputDB, partDB, mukeys, lkeys, dPct, ruleName, bKey = task
+
+    try:
+        global mainRuleName, bRulekey
+        mainRuleName = ruleName
+        bRulekey = bKey
+        env.overwriteOutput = True
+
+        if arcpy.Exists(partDB):
+            arcpy.Delete_management(partDB)
+
+        arcpy.CreateFileGDB_management(os.path.dirname(partDB), os.path.basename(partDB))
+        partSources = ReadValuSources(inputDB, [(partName, mukeys, lkeys)])
+
+        if len(partSources) == 0:
+            raise MyError, "Unable to read the source tables for " + partName
+
+        dSourceTables.update(partSources[0])
+        del partSources
+        bResult = CalcValuTables(inputDB, partDB, partDB, os.path.join(partDB, "Valu1"), os.path.join(partDB, "Co_VALU"), dPct, mukeys, lkeys)
+
+        return partName, partDB, bResult
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return partName, partDB, False
+
+    except:
+        errorMsg()
+        return partName, partDB, False
+
+    finally:
+        dQueryTables.clear()
+        dSourceTables.clear()
+
+## ===================================================================================
+def MergeValuPartitions(theMuTable, partList):
+    # Copy the data from each partition Valu1 table into theMuTable, which must already have a
+    # record for every map unit (CreateOutputTableMu). 2026-10-17
+    #
+    # Partitions are read into memory until there are about maxRecs records, and then written
+    # with one update pass over theMuTable.
+    #
+    try:
+        maxRecs = 100000
+        fldList = [fld.name for fld in arcpy.ListFields(theMuTable) if not fld.type in ["OID", "Geometry"] and fld.name.upper() != "MUKEY"]
+        fldList.insert(0, "MUKEY")
+        dVals = dict()
+        iCnt = 0
+        arcpy.SetProgressor("step", "Merging partitions into " + os.path.basename(theMuTable) + "...",  0, len(partList), 1)
+
+        for i in range(len(partList)):
+            with arcpy.da.SearchCursor(os.path.join(partList[i], os.path.basename(theMuTable)), fldList) as cur:
+                for rec in cur:
+                    dVals[rec[0]] = rec
+
+            arcpy.SetProgressorPosition()
+
+            if len(dVals) >= maxRecs or i == len(partList) - 1:
+                with arcpy.da.UpdateCursor(theMuTable, fldList) as cur:
+                    for rec in cur:
+                        if rec[0] in dVals:
+                            cur.updateRow(dVals[rec[0]])
+                            iCnt += 1
+
+                dVals.clear()
+
+        arcpy.ResetProgressor()
+        PrintMsg("\tMerged " + Number_Format(iCnt, 0, True) + " map unit records from " + str(len(partList)) + " partitions", 0)
+
+        return True
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def CompareValuTables(tbl1, tbl2):
+    # Compare two Valu1 tables, record by record (by mukey) and field by field.
+    # Returns the number of map units that are different or missing. 2026-10-17
+    #
+    try:
+        fldList = [fld.name.upper() for fld in arcpy.ListFields(tbl1) if not fld.type in ["OID", "Geometry"] and fld.name.upper() != "MUKEY"]
+        fldList.insert(0, "MUKEY")
+        dVals = dict()
+
+        with arcpy.da.SearchCursor(tbl1, fldList) as cur:
+            for rec in cur:
+                dVals[rec[0]] = rec
+
+        iDiff = 0
+
+        with arcpy.da.SearchCursor(tbl2, fldList) as cur:
+            for rec in cur:
+                if dVals.pop(rec[0], None) != rec:
+                    if iDiff < 10:
+                        PrintMsg("\tValu1 data for mukey " + str(rec[0]) + " does not match", 1)
+
+                    iDiff += 1
+
+        return iDiff + len(dVals)
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return -1
+
+    except:
+        errorMsg()
+        return -1
+
+## ===================================================================================
+def CreatePartitionedValuTable(inputDB, outputDB, theMuTable, dPct):
+    # Partitioned mode for CreateValuTable. 2026-10-17
+    #
+    # The map units are split by partitionBy (STATE or AREASYMBOL). The Valu1 calculations are
+    # done for each partition in a worker process, writing to a separate geodatabase in the
+    # scratch folder, and then the partitions are merged into theMuTable. The calculations for a
+    # map unit do not use data from other map units, so the results are the same as a single-process
+    # run. If bVerifyPartitions is True, a single-process Valu1 table is also created in the scratch
+    # folder and compared with the merged table.
+    #
+    try:
+        import multiprocessing
+
+        partList = GetValuPartitions(inputDB, partitionBy)
+
+        if len(partList) == 0:
+            raise MyError, "Unable to partition map units by " + partitionBy
+
+        # Each worker reads the source table records for its own map units and is given
+        # the GetSumPct data for them
+        taskList = list()
+
+        for i in range(len(partList)):
+            partName, mukeys, lkeys = partList[i]
+            partDB = os.path.join(env.scratchFolder, "Valu1_" + re.sub(r"\W", "_", partName) + ".gdb")
+            partPct = dict([(mukey, dPct[mukey]) for mukey in mukeys if mukey in dPct])
+            taskList.append((partName, inputDB, partDB, mukeys, lkeys, partPct, mainRuleName, bRulekey))
+
+        # Inside ArcMap sys.executable is ArcMap.exe
+        pythonExe = os.path.join(sys.exec_prefix, "pythonw.exe")
+
+        if os.path.isfile(pythonExe):
+            multiprocessing.set_executable(pythonExe)
+
+        poolSize = max(1, min(workerCnt, len(taskList)))
+        PrintMsg(" \n\tCalculating " + os.path.basename(theMuTable) + " data for " + str(len(taskList)) + " partitions (by " + partitionBy.lower() + ") using " + str(poolSize) + " processes", 0)
+        arcpy.SetProgressor("step", "Calculating partitions...", 0, len(taskList), 1)
+        pool = multiprocessing.Pool(poolSize, maxtasksperchild=1)
+        partDBs = list()
+        failedList = list()
+
+        try:
+            for partName, partDB, bResult in pool.imap_unordered(CreateValuPartition, taskList):
+                if bResult:
+                    partDBs.append(partDB)
+                    PrintMsg("\t\t" + partName, 0)
+
+                else:
+                    failedList.append(partName)
+
+                arcpy.SetProgressorPosition()
+
+            pool.close()
+
+        except:
+            pool.terminate()
+            raise
+
+        finally:
+            pool.join()
+
+        arcpy.ResetProgressor()
+
+        if len(failedList) > 0:
+            raise MyError, "Failed to calculate Valu1 data for: " + ", ".join(failedList)
+
+        # Create the Valu1 table with a record for every map unit and fill it from the partitions
+        depthList = [(0,5), (5, 20), (20, 50), (50, 100), (100, 150), (150, 999), (0, 20), (0, 30), (0, 100), (0, 150), (0, 999)]
+
+        if CreateOutputTableMu(theMuTable, depthList, dPct) == False:
+            raise MyError, ""
+
+        if MergeValuPartitions(theMuTable, partDBs) == False:
+            raise MyError, ""
+
+        for partDB in partDBs:
+            arcpy.Delete_management(partDB)
+
+        if bVerifyPartitions:
+            PrintMsg(" \n\tVerifying partitioned " + os.path.basename(theMuTable) + " against a single-process run...", 0)
+            checkDB = os.path.join(env.scratchFolder, "Valu1_Check.gdb")
+
+            if arcpy.Exists(checkDB):
+                arcpy.Delete_management(checkDB)
+
+            arcpy.CreateFileGDB_management(os.path.dirname(checkDB), os.path.basename(checkDB))
+
+            if CalcValuTables(inputDB, outputDB, checkDB, os.path.join(checkDB, "Valu1"), os.path.join(checkDB, "Co_VALU"), dPct) == False:
+                raise MyError, ""
+
+            iDiff = CompareValuTables(os.path.join(checkDB, "Valu1"), theMuTable)
+
+            if iDiff != 0:
+                raise MyError, "Partitioned " + os.path.basename(theMuTable) + " table does not match the single-process table (" + str(iDiff) + " map units)"
+
+            arcpy.Delete_management(checkDB)
+            PrintMsg("\t\tPartitioned table is identical", 0)
+
+        return True
+
+    except MyError, e:
+        # Example: raise MyError("this is an error message")
+        PrintMsg(str(e) + " \n", 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
 ## ===================================================================================
 def CreateValuTable(inputDB):
     # Run all processes from here
@@ -3084,78 +3871,13 @@ def CreateValuTable(inputDB):
         if len(dPct) == 0:
             raise MyError, ""
 
-        # Create initial set of query tables used for RZAWS, AWS and SOC
-        if CreateQueryTables(inputDB, outputDB, 150.0) == False:
-            raise MyError, ""
-
-        # Create permanent output tables for the map unit and component levels
-        depthList = [(0,5), (5, 20), (20, 50), (50, 100), (100, 150), (150, 999), (0, 20), (0, 30), (0, 100), (0, 150), (0, 999)]
-
-        if CreateOutputTableMu(theMuTable, depthList, dPct) == False:
-            raise MyError, ""
-
-        if CreateOutputTableCo(theCompTable, depthList) == False:
-            raise MyError, ""
-
-        # Store component restrictions for root growth in a dictionary
-        resListAWS = "('Lithic bedrock','Paralithic bedrock','Densic bedrock', 'Densic material', 'Fragipan', 'Duripan', 'Sulfuric')"
-        dRZRestrictions = GetCoRestrictions(outputDB, 150.0, resListAWS)
-
-        # Find the top restriction for each component, both from the corestrictions table and the horizon properties
-        dComp2 = CalcRZDepth(inputDB, outputDB, theCompTable, theMuTable, 150.0, dPct, dRZRestrictions)
-        del dRZRestrictions
-
-        # Calculate root zone available water capacity using a floor of 150cm or a root restriction depth
-        #
-        # dComp2[cokey] = [mukey, compName, localPhase, compPct, resDept, restriction]
-        if CalcRZAWS(inputDB, outputDB, 0.0, 150.0, theCompTable, theMuTable, dComp2, 150.0, dPct) == False:
-            raise MyError, ""
-
-        # Calculate standard available water supply
-        if CalcAWS(inputDB, outputDB, theCompTable, theMuTable, dPct, depthList) == False:
-            raise MyError, ""
+        if partitionBy != "":
+            # 2026-10-17 Partitioned mode. Each partition is calculated in a worker process and
+            # then merged into the Valu1 table.
+            if CreatePartitionedValuTable(inputDB, outputDB, theMuTable, dPct) == False:
+                raise MyError, ""
 
-        # Run SOC calculations
-        # Seems to be a problem with SOC calculations, numbers are high
-        maxD = 999.0
-        # Get bedrock restrictions for SOC  and write them to the output tables
-        resListSOC = "('Lithic bedrock', 'Paralithic bedrock', 'Densic bedrock')"
-        dSOCRestrictions = GetCoRestrictions(outputDB, maxD, resListSOC)
-
-        # Store all component-horizon fragment volumes (percent) in a dictionary (by chkey)
-        # and use in the root zone SOC calculations
-        dFrags = GetFragVol(inputDB)
-
-        if len(dFrags) == 0:
-            raise MyError, "No fragment volume information"
-
-        # Calculate soil organic carbon for all the different depth ranges
-        depthList = [(0,5), (5, 20), (20, 50), (50, 100), (100, 150), (150, 999), (0, 20), (0, 30), (0, 100), (0, 150), (0, 999)]
-        if CalcSOC(inputDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList, dSOCRestrictions, maxD) == False:
-            raise MyError, ""
-
-        del dSOCRestrictions
-
-        # Calculate NCCPI
-        # Create query table using component and chorizon tables
-        arcpy.SetProgressor("default", "Calculating NCCPI data elements...")
-        nccpiTbl = "NCCPI_Table"
-
-        if  MakeNCCPIQueryTable(inputDB, nccpiTbl) == False:
-            pass
-
-        else:
-            if mainRuleName == "NCCPI - National Commodity Crop Productivity Index (Ver 3.0)":
-                if CalcNCCPI3(inputDB, theMuTable, nccpiTbl, dPct) == False:
-                    raise MyError, ""
-
-            elif mainRuleName == "NCCPI - National Commodity Crop Productivity Index (Ver 2.0)":
-                if CalcNCCPI2(inputDB, theMuTable, nccpiTbl, dPct) == False:
-                    raise MyError, ""
-
-        # Calculate Potential Wetland Soils
-        #
-        if CalcPWSL(inputDB, outputDB, theMuTable, dPct) == False:
+        elif CalcValuTables(inputDB, outputDB, inputDB, theMuTable, theCompTable, dPct) == False:
             raise MyError, ""
 
         PrintMsg(" \n\tAll calculations complete", 0)
@@ -3195,6 +3917,8 @@ def CreateValuTable(inputDB):
         if arcpy.Exists(os.path.join(env.scratchGDB, "QueryTable_HZ")):
             arcpy.Delete_management(os.path.join(env.scratchGDB, "QueryTable_HZ"))
 
+        dQueryTables.clear()
+
         PrintMsg(" \n\tValu1 table complete for " + inputDB + " \n ", 0)
 
         return True
@@ -3211,7 +3935,7 @@ def CreateValuTable(inputDB):
 ## ===================================================================================
 ## ====================================== Main Body ==================================
 # Import modules
-import os, sys, string, re, locale, arcpy, traceback, collections
+import os, sys, string, re, locale, arcpy, traceback, collections, array, operator
 from operator import itemgetter, attrgetter
 import xml.etree.cElementTree as ET
 from datetime import datetime
@@ -3254,6 +3978,40 @@ from arcpy import env
 # compkind filter for earthy components:  <> 'Miscellaneous area'
 
 
+# 2026-10-17 Build QueryTable_HZ and QueryTable_CR in memory (CreateMemoryQueryTables) instead of
+# writing them to the scratch geodatabase. Set to False to use CreateQueryTables.
+bMemoryQuery = True
+dQueryTables = dict()   # in-memory query tables by upper case table name
+dSourceTables = dict()  # partition worker: source table records by upper case table name, see SourceCursor
+nan = float("nan")      # NULL value for numeric QueryTable columns
+
+# 2026-10-17 Partitioned mode. Set partitionBy to "STATE" or "AREASYMBOL" to split the map units
+# by survey area (or 2-letter state prefix) and calculate each partition in a worker process
+# (see CreatePartitionedValuTable). workerCnt is the number of worker processes. Set
+# bVerifyPartitions to True to compare the merged Valu1 table with a single-process run.
+partitionBy = ""
+bVerifyPartitions = False
+
+# Fields and sort order for each source table read by ReadValuSources in partitioned mode.
+# They must include every field and ORDER BY used for that table in CalcValuTables.
+dValuSources = dict()
+dValuSources["mapunit"] = (["mukey", "musym", "muname"], (None, "ORDER BY mukey"))
+dValuSources["component"] = (["mukey", "cokey", "comppct_r", "majcompflag", "compname", "compkind", "taxorder", "taxsubgrp", \
+"localphase", "otherph", "hydricrating", "drainagecl"], (None, "ORDER BY cokey, comppct_r DESC"))
+dValuSources["chorizon"] = (["cokey", "chkey", "hzname", "desgnmaster", "hzdept_r", "hzdepb_r", "sandtotal_r", \
+"silttotal_r", "claytotal_r", "om_r", "dbthirdbar_r", "ec_r", "ph1to1h2o_r", "awc_r"], (None, "ORDER BY chkey, hzdept_r ASC"))
+dValuSources["chtexturegrp"] = (["chkey", "chtgkey", "texture", "rvindicator"], None)
+dValuSources["chtexture"] = (["chtgkey", "lieutex"], None)
+dValuSources["corestrictions"] = (["cokey", "reskind", "reshard", "resdept_r"], (None, "ORDER BY cokey, resdept_r ASC"))
+dValuSources["chfrags"] = (["chkey", "fragvol_r"], None)
+
+try:
+    import multiprocessing
+    workerCnt = max(1, multiprocessing.cpu_count() - 1)
+
+except:
+    workerCnt = 1
+
 try:
     if __name__ == "__main__":
 